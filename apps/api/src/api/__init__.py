@@ -4,7 +4,7 @@ API Routes.
 
 from fastapi import APIRouter
 
-from src.api.v1 import auth, users, courses, groups, lessons, payments, notifications, tests
+from src.api.v1 import auth, users, courses, groups, lessons, schedule, payments, reports, notifications, tests
 
 router = APIRouter()
 
@@ -14,7 +14,9 @@ router.include_router(users.router, prefix="/users", tags=["Users"])
 router.include_router(courses.router, prefix="/courses", tags=["Courses"])
 router.include_router(groups.router, prefix="/groups", tags=["Groups"])
 router.include_router(lessons.router, prefix="/lessons", tags=["Lessons"])
+router.include_router(schedule.router, prefix="/schedule", tags=["Schedule"])
 router.include_router(payments.router, prefix="/payments", tags=["Payments"])
+router.include_router(reports.router, prefix="/reports", tags=["Reports"])
 router.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
 router.include_router(tests.router, prefix="/tests", tags=["Tests"])
 
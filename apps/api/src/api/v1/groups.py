@@ -2,9 +2,11 @@
 Group management endpoints.
 """
 
+from datetime import date
 from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from src.schemas.group import (
     GroupResponse,
@@ -12,10 +14,20 @@ from src.schemas.group import (
     GroupCreateRequest,
     GroupUpdateRequest,
     EnrollStudentRequest,
+    BulkEnrollRequest,
+    EnrollmentStatusUpdateRequest,
 )
 from src.schemas.common import PaginationParams
 from src.services.group_service import GroupService
-from src.core.deps import get_group_service, get_current_user, require_admin, require_staff
+from src.services.gradebook_service import GradebookService
+from src.core.deps import (
+    get_group_service,
+    get_gradebook_service,
+    get_current_user,
+    require_admin,
+    require_staff,
+)
+from src.core.idempotency import idempotency_key
 from db.models import User
 
 
@@ -54,6 +66,18 @@ async def create_group(
     return await group_service.create_group(request)
 
 
+@router.post("/reconcile-counters")
+async def reconcile_counters(
+    group_service: Annotated[GroupService, Depends(get_group_service)],
+    _: Annotated[User, Depends(require_admin)],
+) -> dict:
+    """
+    Recompute active student counters of all groups (admin only).
+    """
+    fixed = await group_service.reconcile_counters()
+    return {"message": f"{fixed} group counters corrected"}
+
+
 @router.get("/{group_id}", response_model=GroupResponse)
 async def get_group(
     group_id: str,
@@ -66,6 +90,31 @@ async def get_group(
     return await group_service.get_group(group_id)
 
 
+@router.get("/{group_id}/gradebook")
+async def get_gradebook(
+    group_id: str,
+    gradebook_service: Annotated[GradebookService, Depends(get_gradebook_service)],
+    _: Annotated[User, Depends(require_staff)],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    export_format: str = Query("json", alias="format", pattern="^(json|csv)$"),
+) -> StreamingResponse:
+    """
+    Get students x lessons gradebook as JSON or CSV (staff only).
+    """
+    gradebook = await gradebook_service.get_gradebook(group_id, date_from, date_to)
+
+    if export_format == "csv":
+        return StreamingResponse(
+            gradebook.iter_csv(),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f'attachment; filename="gradebook-{group_id}.csv"',
+            },
+        )
+    return StreamingResponse(gradebook.iter_json(), media_type="application/json")
+
+
 @router.patch("/{group_id}", response_model=GroupResponse)
 async def update_group(
     group_id: str,
@@ -92,7 +141,7 @@ async def delete_group(
     return {"message": "Group deleted successfully"}
 
 
-@router.post("/{group_id}/enroll")
+@router.post("/{group_id}/enroll", dependencies=[Depends(idempotency_key)])
 async def enroll_student(
     group_id: str,
     request: EnrollStudentRequest,
@@ -113,3 +162,31 @@ async def enroll_student(
     await group_service.enroll_student(group_id, request)
     return {"message": "Student enrolled successfully"}
 
+
+@router.post("/{group_id}/enroll/bulk", dependencies=[Depends(idempotency_key)])
+async def enroll_students_bulk(
+    group_id: str,
+    request: BulkEnrollRequest,
+    group_service: Annotated[GroupService, Depends(get_group_service)],
+    _: Annotated[User, Depends(require_admin)],
+) -> dict:
+    """
+    Enroll a class list to group (admin only).
+    """
+    count = await group_service.enroll_students_bulk(group_id, request)
+    return {"message": f"{count} students enrolled"}
+
+
+@router.patch("/{group_id}/enrollments/{enrollment_id}", dependencies=[Depends(idempotency_key)])
+async def update_enrollment_status(
+    group_id: str,
+    enrollment_id: str,
+    request: EnrollmentStatusUpdateRequest,
+    group_service: Annotated[GroupService, Depends(get_group_service)],
+    _: Annotated[User, Depends(require_staff)],
+) -> dict:
+    """
+    Change enrollment status (staff only).
+    """
+    await group_service.update_enrollment_status(group_id, enrollment_id, request)
+    return {"message": "Enrollment status updated"}
@@ -2,9 +2,10 @@
 Lesson management endpoints.
 """
 
+from datetime import date
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, HTTPException, status
 
 from src.schemas.lesson import (
     LessonResponse,
@@ -12,10 +13,19 @@ from src.schemas.lesson import (
     LessonCreateRequest,
     LessonUpdateRequest,
     AttendanceRequest,
+    BulkAttendanceRequest,
 )
 from src.schemas.common import PaginationParams
+from src.schemas.dashboard import TeacherDashboardResponse
 from src.services.lesson_service import LessonService
-from src.core.deps import get_lesson_service, get_current_user, require_staff
+from src.services.dashboard_service import DashboardService
+from src.core.deps import (
+    get_lesson_service,
+    get_dashboard_service,
+    get_current_user,
+    require_staff,
+)
+from shared.constants import UserRole
 from db.models import User
 
 
@@ -57,6 +67,38 @@ async def create_lesson(
     return await lesson_service.create_lesson(request)
 
 
+@router.post("/attendance")
+async def mark_attendance_bulk(
+    request: BulkAttendanceRequest,
+    lesson_service: Annotated[LessonService, Depends(get_lesson_service)],
+    _: Annotated[User, Depends(require_staff)],
+) -> dict:
+    """
+    Mark attendance for several lessons at once (staff only).
+    """
+    count = await lesson_service.mark_attendance_bulk(request)
+    return {"message": f"{count} attendance records saved"}
+
+
+@router.get("/today", response_model=TeacherDashboardResponse)
+async def get_teacher_today(
+    dashboard_service: Annotated[DashboardService, Depends(get_dashboard_service)],
+    current_user: Annotated[User, Depends(require_staff)],
+    teacher_id: Optional[str] = None,
+    day: Optional[date] = None,
+) -> TeacherDashboardResponse:
+    """
+    Teacher's lessons of the day with head counts and attendance progress.
+    Teachers see their own; other staff may pass teacher_id.
+    """
+    if current_user.role == UserRole.TEACHER.value and teacher_id not in (None, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Teachers can only view their own dashboard",
+        )
+    return await dashboard_service.get_teacher_today(teacher_id or current_user.id, day)
+
+
 @router.get("/{lesson_id}", response_model=LessonResponse)
 async def get_lesson(
     lesson_id: str,
@@ -2,22 +2,35 @@
 Notification endpoints.
 """
 
-from typing import Annotated, Optional
+from typing import Annotated, Optional, Union
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from shared import get_settings
 
 from src.schemas.notification import (
+    BroadcastRequest,
+    BroadcastResponse,
     NotificationResponse,
     NotificationListResponse,
     NotificationCreateRequest,
+    StreamTokenResponse,
 )
 from src.schemas.common import PaginationParams
 from src.services.notification_service import NotificationService
-from src.core.deps import get_notification_service, get_current_user, require_admin
+from src.services.notification_stream import notification_events
+from src.core.security import create_stream_token
+from src.core.deps import (
+    get_notification_service,
+    get_current_user,
+    get_stream_user_id,
+    require_admin,
+)
 from db.models import User
 
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.get("", response_model=NotificationListResponse)
@@ -39,18 +52,62 @@ async def list_notifications(
     )
 
 
-@router.post("", response_model=NotificationResponse)
+@router.post("", response_model=Union[NotificationResponse, BroadcastResponse])
 async def create_notification(
     request: NotificationCreateRequest,
     notification_service: Annotated[NotificationService, Depends(get_notification_service)],
     _: Annotated[User, Depends(require_admin)],
-) -> NotificationResponse:
+) -> Union[NotificationResponse, BroadcastResponse]:
     """
     Create and send notification (admin only).
     """
     return await notification_service.create_notification(request)
 
 
+@router.post("/broadcast", response_model=BroadcastResponse)
+async def broadcast(
+    request: BroadcastRequest,
+    notification_service: Annotated[NotificationService, Depends(get_notification_service)],
+    _: Annotated[User, Depends(require_admin)],
+) -> BroadcastResponse:
+    """
+    Send notification to everyone, a role, a course or a group (admin only).
+    """
+    return await notification_service.broadcast(request)
+
+
+@router.post("/stream-token", response_model=StreamTokenResponse)
+async def get_stream_token(
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> StreamTokenResponse:
+    """
+    Get a short-lived token for ``GET /stream?stream_token=...``.
+
+    For EventSource clients, which cannot send an Authorization header.
+    """
+    return StreamTokenResponse(
+        token=create_stream_token(current_user.id),
+        expires_in=settings.jwt_stream_token_expire_seconds,
+    )
+
+
+@router.get("/stream")
+async def stream_notifications(
+    user_id: Annotated[str, Depends(get_stream_user_id)],
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of new notifications and unread counts.
+
+    Emits ``unread_count`` on connect and whenever it changes, and
+    ``notification`` for each new notification.
+    """
+    return StreamingResponse(
+        notification_events(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/unread-count")
 async def get_unread_count(
     notification_service: Annotated[NotificationService, Depends(get_notification_service)],
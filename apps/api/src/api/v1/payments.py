@@ -4,16 +4,28 @@ Payment endpoints.
 
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Query, UploadFile
 
 from src.schemas.payment import (
     PaymentResponse,
     PaymentListResponse,
     PaymentCreateRequest,
+    BalanceResponse,
+    StatementImportResponse,
 )
 from src.schemas.common import PaginationParams
 from src.services.payment_service import PaymentService
-from src.core.deps import get_payment_service, get_current_user, require_staff
+from src.services.statement_service import StatementService, detect_format, iter_upload
+from src.core.deps import (
+    get_payment_service,
+    get_statement_service,
+    get_current_user,
+    require_admin,
+    require_staff,
+)
+from src.core.idempotency import idempotency_key
+from shared import PermissionDeniedError
+from shared.constants import PaymentMethod
 from db.models import User
 
 
@@ -45,7 +57,7 @@ async def list_payments(
     )
 
 
-@router.post("", response_model=PaymentResponse)
+@router.post("", response_model=PaymentResponse, dependencies=[Depends(idempotency_key)])
 async def create_payment(
     request: PaymentCreateRequest,
     payment_service: Annotated[PaymentService, Depends(get_payment_service)],
@@ -57,6 +69,53 @@ async def create_payment(
     return await payment_service.create_payment(request)
 
 
+@router.post("/reconcile")
+async def reconcile_ledger(
+    payment_service: Annotated[PaymentService, Depends(get_payment_service)],
+    _: Annotated[User, Depends(require_admin)],
+) -> dict:
+    """
+    Verify payment ledger and balances, fixing drift (admin only).
+    """
+    fixed = await payment_service.reconcile_ledger()
+    return {"message": "Ledger reconciled", **fixed}
+
+
+@router.post("/import", response_model=StatementImportResponse)
+async def import_statement(
+    provider: PaymentMethod,
+    file: Annotated[UploadFile, File()],
+    statement_service: Annotated[StatementService, Depends(get_statement_service)],
+    admin: Annotated[User, Depends(require_admin)],
+    dry_run: bool = False,
+) -> StatementImportResponse:
+    """
+    Import a Payme/Click statement (CSV, JSON or JSON Lines) and report
+    rows that do not match our payments (admin only).
+    """
+    return await statement_service.import_statement(
+        provider,
+        iter_upload(file),
+        file_format=detect_format(file.filename),
+        processed_by=admin.id,
+        dry_run=dry_run,
+    )
+
+
+@router.get("/balance/{user_id}", response_model=BalanceResponse)
+async def get_balance(
+    user_id: str,
+    payment_service: Annotated[PaymentService, Depends(get_payment_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> BalanceResponse:
+    """
+    Get user's paid total and debts (staff or the user).
+    """
+    if not current_user.is_staff and current_user.id != user_id:
+        raise PermissionDeniedError("Access denied")
+    return await payment_service.get_balance(user_id)
+
+
 @router.get("/{payment_id}", response_model=PaymentResponse)
 async def get_payment(
     payment_id: str,
@@ -69,7 +128,7 @@ async def get_payment(
     return await payment_service.get_payment(payment_id, current_user)
 
 
-@router.post("/{payment_id}/confirm")
+@router.post("/{payment_id}/confirm", dependencies=[Depends(idempotency_key)])
 async def confirm_payment(
     payment_id: str,
     payment_service: Annotated[PaymentService, Depends(get_payment_service)],
@@ -80,3 +139,26 @@ async def confirm_payment(
     """
     return await payment_service.confirm_payment(payment_id, staff.id)
 
+
+@router.post("/{payment_id}/refund", dependencies=[Depends(idempotency_key)])
+async def refund_payment(
+    payment_id: str,
+    payment_service: Annotated[PaymentService, Depends(get_payment_service)],
+    staff: Annotated[User, Depends(require_staff)],
+) -> PaymentResponse:
+    """
+    Refund confirmed payment (staff only).
+    """
+    return await payment_service.refund_payment(payment_id, staff.id)
+
+
+@router.post("/{payment_id}/cancel", dependencies=[Depends(idempotency_key)])
+async def cancel_payment(
+    payment_id: str,
+    payment_service: Annotated[PaymentService, Depends(get_payment_service)],
+    staff: Annotated[User, Depends(require_staff)],
+) -> PaymentResponse:
+    """
+    Cancel payment (staff only).
+    """
+    return await payment_service.cancel_payment(payment_id, staff.id)
@@ -0,0 +1,60 @@
+"""
+Financial report endpoints.
+"""
+
+from datetime import date
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from src.schemas.report import DebtReport, RevenueReport
+from src.services.report_service import ReportService
+from src.core.deps import get_report_service, require_admin
+from shared.constants import PaymentStatus, ReportDimension
+from db.models import User
+
+
+router = APIRouter()
+
+
+@router.get("/revenue", response_model=RevenueReport)
+async def get_revenue(
+    date_from: date,
+    date_to: date,
+    report_service: Annotated[ReportService, Depends(get_report_service)],
+    _: Annotated[User, Depends(require_admin)],
+    group_by: ReportDimension = ReportDimension.DAY,
+    status: Optional[PaymentStatus] = None,
+) -> RevenueReport:
+    """
+    Revenue by day, month, course, method or status with the previous
+    period for comparison (admin only).
+    """
+    return await report_service.get_revenue(date_from, date_to, group_by, status)
+
+
+@router.get("/debts", response_model=DebtReport)
+async def get_debts(
+    report_service: Annotated[ReportService, Depends(get_report_service)],
+    _: Annotated[User, Depends(require_admin)],
+    course_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+) -> DebtReport:
+    """
+    Outstanding debts per group (admin only).
+    """
+    return await report_service.get_debts(course_id, limit)
+
+
+@router.post("/rebuild")
+async def rebuild_rollups(
+    report_service: Annotated[ReportService, Depends(get_report_service)],
+    _: Annotated[User, Depends(require_admin)],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> dict:
+    """
+    Rebuild report rollups from payments and enrollments (admin only).
+    """
+    written = await report_service.rebuild(date_from, date_to)
+    return {"message": "Report rollups rebuilt", **written}
@@ -0,0 +1,136 @@
+"""
+Schedule endpoints.
+"""
+
+from datetime import date
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from src.schemas.schedule import (
+    ScheduleGenerateRequest,
+    ScheduleGenerateResponse,
+    ScheduleConflictReport,
+)
+from src.services.schedule_service import ScheduleService
+from src.services.conflict_service import ConflictService
+from src.services.timetable_service import TimetableService
+from src.core.deps import (
+    get_schedule_service,
+    get_conflict_service,
+    get_timetable_service,
+    get_current_user,
+    require_admin,
+    require_staff,
+)
+from shared.constants import UserRole
+from db.models import User
+
+
+router = APIRouter()
+
+
+@router.post("/generate", response_model=ScheduleGenerateResponse)
+async def generate_schedule(
+    request: ScheduleGenerateRequest,
+    schedule_service: Annotated[ScheduleService, Depends(get_schedule_service)],
+    _: Annotated[User, Depends(require_admin)],
+) -> ScheduleGenerateResponse:
+    """
+    Generate term lessons from group schedules (admin only).
+
+    Set ``preview`` to see the lessons without saving them.
+    """
+    return await schedule_service.generate(request)
+
+
+@router.get("/conflicts", response_model=ScheduleConflictReport)
+async def get_conflicts(
+    date_from: date,
+    date_to: date,
+    conflict_service: Annotated[ConflictService, Depends(get_conflict_service)],
+    _: Annotated[User, Depends(require_staff)],
+) -> ScheduleConflictReport:
+    """
+    Room and teacher double bookings in a date range (staff only).
+    """
+    conflicts = await conflict_service.find_conflicts(date_from, date_to)
+    return ScheduleConflictReport(
+        date_from=date_from,
+        date_to=date_to,
+        total=len(conflicts),
+        items=conflicts,
+    )
+
+
+@router.get("/export.ics")
+async def export_ics(
+    timetable_service: Annotated[TimetableService, Depends(get_timetable_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    student_id: Optional[str] = None,
+    teacher_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> StreamingResponse:
+    """
+    Timetable as iCalendar for a student, teacher or group.
+    Without filters exports the current user's own timetable; other people's
+    and group timetables are staff only.
+    """
+    if sum(x is not None for x in (student_id, teacher_id, group_id)) > 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use only one of student_id, teacher_id, group_id",
+        )
+
+    if student_id is None and teacher_id is None and group_id is None:
+        if current_user.role == UserRole.TEACHER.value:
+            teacher_id = current_user.id
+        else:
+            student_id = current_user.id
+    elif not current_user.is_staff and (group_id or (student_id or teacher_id) != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Staff access required",
+        )
+
+    date_from, date_to = timetable_service.resolve_range(date_from, date_to)
+    target = group_id or teacher_id or student_id
+    return StreamingResponse(
+        timetable_service.iter_ics(
+            date_from,
+            date_to,
+            name="Uzbek Ta'lim",
+            group_id=group_id,
+            teacher_id=teacher_id,
+            student_id=student_id,
+        ),
+        media_type="text/calendar; charset=utf-8",
+        headers={
+            "Content-Disposition": f'attachment; filename="timetable-{target}.ics"',
+        },
+    )
+
+
+@router.get("/export.csv")
+async def export_csv(
+    timetable_service: Annotated[TimetableService, Depends(get_timetable_service)],
+    _: Annotated[User, Depends(require_admin)],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> StreamingResponse:
+    """
+    Whole-centre timetable as CSV (admin only).
+    """
+    date_from, date_to = timetable_service.resolve_range(date_from, date_to)
+    return StreamingResponse(
+        timetable_service.iter_csv(date_from, date_to),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="timetable-{date_from.isoformat()}-{date_to.isoformat()}.csv"'
+            ),
+        },
+    )
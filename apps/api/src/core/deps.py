@@ -4,7 +4,7 @@ FastAPI Dependencies.
 
 from typing import Annotated, AsyncGenerator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,13 +12,21 @@ from shared import get_settings, AuthenticationError, PermissionDeniedError
 from db.session import AsyncSessionLocal
 from db.models import User
 
-from src.core.security import decode_access_token
+from src.core.idempotency import transaction_committed, transaction_started
+from src.core.security import decode_access_token, decode_stream_token
 from src.services.auth_service import AuthService
 from src.services.user_service import UserService
 from src.services.course_service import CourseService
 from src.services.group_service import GroupService
+from src.services.gradebook_service import GradebookService
+from src.services.schedule_service import ScheduleService
+from src.services.conflict_service import ConflictService
+from src.services.dashboard_service import DashboardService
+from src.services.timetable_service import TimetableService
 from src.services.lesson_service import LessonService
 from src.services.payment_service import PaymentService
+from src.services.report_service import ReportService
+from src.services.statement_service import StatementService
 from src.services.notification_service import NotificationService
 from src.services.test_service import TestService
 from src.repositories.user_repository import UserRepository
@@ -26,6 +34,8 @@ from src.repositories.course_repository import CourseRepository
 from src.repositories.group_repository import GroupRepository
 from src.repositories.lesson_repository import LessonRepository
 from src.repositories.payment_repository import PaymentRepository
+from src.repositories.ledger_repository import LedgerRepository
+from src.repositories.report_repository import ReportRepository
 from src.repositories.notification_repository import NotificationRepository
 from src.repositories.test_repository import (
     TestRepository,
@@ -51,9 +61,11 @@ oauth2_scheme = OAuth2PasswordBearer(
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
     async with AsyncSessionLocal() as session:
+        transaction_started()
         try:
             yield session
             await session.commit()
+            transaction_committed()
         except Exception:
             await session.rollback()
             raise
@@ -99,6 +111,20 @@ def get_payment_repository(
     return PaymentRepository(db)
 
 
+def get_ledger_repository(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> LedgerRepository:
+    """Get ledger repository."""
+    return LedgerRepository(db)
+
+
+def get_report_repository(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> ReportRepository:
+    """Get report repository."""
+    return ReportRepository(db)
+
+
 def get_notification_repository(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> NotificationRepository:
@@ -155,9 +181,45 @@ def get_course_service(
 
 def get_group_service(
     group_repo: Annotated[GroupRepository, Depends(get_group_repository)],
+    report_repo: Annotated[ReportRepository, Depends(get_report_repository)],
 ) -> GroupService:
     """Get group service."""
-    return GroupService(group_repo)
+    return GroupService(group_repo, report_repo)
+
+
+def get_gradebook_service(
+    group_repo: Annotated[GroupRepository, Depends(get_group_repository)],
+    lesson_repo: Annotated[LessonRepository, Depends(get_lesson_repository)],
+) -> GradebookService:
+    """Get gradebook service."""
+    return GradebookService(group_repo, lesson_repo)
+
+
+def get_schedule_service(
+    group_repo: Annotated[GroupRepository, Depends(get_group_repository)],
+    lesson_repo: Annotated[LessonRepository, Depends(get_lesson_repository)],
+) -> ScheduleService:
+    """Get schedule service."""
+    return ScheduleService(group_repo, lesson_repo)
+
+
+def get_conflict_service(
+    lesson_repo: Annotated[LessonRepository, Depends(get_lesson_repository)],
+) -> ConflictService:
+    """Get schedule conflict service."""
+    return ConflictService(lesson_repo)
+
+
+def get_dashboard_service(
+    lesson_repo: Annotated[LessonRepository, Depends(get_lesson_repository)],
+) -> DashboardService:
+    """Get dashboard service."""
+    return DashboardService(lesson_repo)
+
+
+def get_timetable_service() -> TimetableService:
+    """Get timetable export service (opens its own sessions while streaming)."""
+    return TimetableService(AsyncSessionLocal)
 
 
 def get_lesson_service(
@@ -169,9 +231,27 @@ def get_lesson_service(
 
 def get_payment_service(
     payment_repo: Annotated[PaymentRepository, Depends(get_payment_repository)],
+    ledger_repo: Annotated[LedgerRepository, Depends(get_ledger_repository)],
+    report_repo: Annotated[ReportRepository, Depends(get_report_repository)],
 ) -> PaymentService:
     """Get payment service."""
-    return PaymentService(payment_repo)
+    return PaymentService(payment_repo, ledger_repo, report_repo)
+
+
+def get_statement_service(
+    payment_repo: Annotated[PaymentRepository, Depends(get_payment_repository)],
+    ledger_repo: Annotated[LedgerRepository, Depends(get_ledger_repository)],
+    report_repo: Annotated[ReportRepository, Depends(get_report_repository)],
+) -> StatementService:
+    """Get statement import service."""
+    return StatementService(payment_repo, ledger_repo, report_repo)
+
+
+def get_report_service(
+    report_repo: Annotated[ReportRepository, Depends(get_report_repository)],
+) -> ReportService:
+    """Get report service."""
+    return ReportService(report_repo)
 
 
 def get_notification_service(
@@ -237,6 +317,59 @@ async def get_current_user(
     return user
 
 
+async def get_stream_user_id(
+    token: Annotated[str | None, Depends(oauth2_scheme)],
+    stream_token: Annotated[
+        str | None,
+        Query(description="Token from POST /notifications/stream-token, for EventSource clients"),
+    ] = None,
+) -> str:
+    """
+    Authenticate a long-lived stream.
+
+    Takes an access token in the Authorization header, or a stream token in
+    the query string for clients that cannot send headers; access tokens
+    are not accepted in the URL. Uses its own short session instead of
+    ``get_db``, whose session would stay checked out for the whole
+    connection.
+    """
+    if not token and not stream_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        if token:
+            user_id = decode_access_token(token).get("sub")
+        else:
+            user_id = decode_stream_token(stream_token).get("sub")
+        if not user_id:
+            raise AuthenticationError("Invalid token")
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from None
+
+    async with AsyncSessionLocal() as session:
+        user = await UserRepository(session).get_by_id(user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not active",
+        )
+    return user.id
+
+
 async def get_optional_user(
     token: Annotated[str | None, Depends(oauth2_scheme)],
     user_repo: Annotated[UserRepository, Depends(get_user_repository)],
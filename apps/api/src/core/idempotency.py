@@ -0,0 +1,415 @@
+"""
+Idempotency keys for mutating requests.
+
+A client sends an ``Idempotency-Key`` header with a POST/PUT/PATCH/DELETE
+request. The first response for (key, method and path, user) is stored and
+replayed to retries for ``idempotency_ttl`` seconds; a retry with the same
+key but a different query string or body is rejected. Duplicates arriving
+while the first request is still running wait for its response instead of
+executing again. A response is stored only once the request's database
+transaction committed: FastAPI commits in ``get_db`` after the response
+was sent, and a failed commit must not be replayed as a success.
+
+Responses are kept in process memory or, with ``idempotency_backend=redis``,
+in Redis so that all API workers share them.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Header
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared import AuthenticationError, ValidationError, get_settings
+from shared.exceptions import AppException, ConflictError
+
+from src.core.security import decode_access_token
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+MAX_KEY_LENGTH = 255
+# Larger requests and responses (e.g. statement uploads) are not deduplicated
+MAX_REQUEST_BODY = 1024 * 1024
+MAX_RESPONSE_BODY = 1024 * 1024
+
+LOCK_TTL = 60  # seconds a lock outlives a request that stopped refreshing it
+LOCK_REFRESH_INTERVAL = LOCK_TTL / 3
+WAIT_TIMEOUT = 30.0  # seconds a duplicate waits for the running one
+POLL_INTERVAL = 0.05
+MAX_MEMORY_ENTRIES = 10000
+
+
+@dataclass
+class StoredResponse:
+    """Response replayed for a repeated key."""
+
+    fingerprint: str
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+    def dumps(self) -> str:
+        return json.dumps({
+            "fingerprint": self.fingerprint,
+            "status": self.status,
+            "headers": self.headers,
+            "body": base64.b64encode(self.body).decode(),
+        })
+
+    @classmethod
+    def loads(cls, data: str | bytes) -> "StoredResponse":
+        raw = json.loads(data)
+        return cls(
+            fingerprint=raw["fingerprint"],
+            status=raw["status"],
+            headers=[tuple(h) for h in raw["headers"]],
+            body=base64.b64decode(raw["body"]),
+        )
+
+
+@dataclass
+class _Transactions:
+    """Database sessions of a request that have not committed yet."""
+
+    pending: int = 0
+
+
+_transactions: ContextVar[Optional[_Transactions]] = ContextVar("idempotency_transactions", default=None)
+
+
+def transaction_started() -> None:
+    """Record that the current request opened a database transaction."""
+    transactions = _transactions.get()
+    if transactions is not None:
+        transactions.pending += 1
+
+
+def transaction_committed() -> None:
+    """Record that a transaction of the current request committed."""
+    transactions = _transactions.get()
+    if transactions is not None:
+        transactions.pending -= 1
+
+
+class IdempotencyStore:
+    """In-process store (one API worker)."""
+
+    def __init__(self, max_entries: int = MAX_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self._records: Dict[str, Tuple[float, StoredResponse]] = {}
+        self._running: Dict[str, asyncio.Event] = {}
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        """Stored response of a key."""
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._records[key]
+            return None
+        return entry[1]
+
+    async def acquire(self, key: str) -> bool:
+        """Claim a key for execution; False if another request holds it."""
+        if key in self._running:
+            return False
+        self._running[key] = asyncio.Event()
+        return True
+
+    async def refresh(self, key: str) -> None:
+        """Keep holding a claimed key while its request runs."""
+
+    async def wait(self, key: str, timeout: float) -> Optional[StoredResponse]:
+        """Wait for the holder of a key to finish, then return its response."""
+        event = self._running.get(key)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return await self.get(key)
+
+    async def save(self, key: str, response: StoredResponse, ttl: int) -> None:
+        """Store a response."""
+        if len(self._records) >= self.max_entries:
+            now = time.monotonic()
+            self._records = {k: v for k, v in self._records.items() if v[0] > now}
+            while len(self._records) >= self.max_entries:
+                self._records.pop(next(iter(self._records)))
+        self._records[key] = (time.monotonic() + ttl, response)
+
+    async def release(self, key: str) -> None:
+        """Release a claimed key and wake up waiting duplicates."""
+        event = self._running.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def close(self) -> None:
+        """Release resources."""
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Redis store shared by all API workers."""
+
+    def __init__(self, url: str, prefix: str = "idempotency:"):
+        from redis import asyncio as aioredis
+
+        super().__init__()
+        self.redis = aioredis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        data = await self.redis.get(self.prefix + key)
+        return StoredResponse.loads(data) if data else None
+
+    async def acquire(self, key: str) -> bool:
+        return bool(await self.redis.set(f"{self.prefix}{key}:lock", 1, nx=True, ex=LOCK_TTL))
+
+    async def refresh(self, key: str) -> None:
+        await self.redis.expire(f"{self.prefix}{key}:lock", LOCK_TTL)
+
+    async def wait(self, key: str, timeout: float) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            response = await self.get(key)
+            if response is not None:
+                return response
+            if not await self.redis.exists(f"{self.prefix}{key}:lock"):
+                return None
+            await asyncio.sleep(POLL_INTERVAL)
+        return None
+
+    async def save(self, key: str, response: StoredResponse, ttl: int) -> None:
+        await self.redis.set(self.prefix + key, response.dumps(), ex=ttl)
+
+    async def release(self, key: str) -> None:
+        await self.redis.delete(f"{self.prefix}{key}:lock")
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Store configured by ``idempotency_backend``."""
+    global _store
+    if _store is None:
+        settings = get_settings()
+        if settings.idempotency_backend == "redis":
+            _store = RedisIdempotencyStore(settings.redis_cache_url)
+        else:
+            _store = IdempotencyStore()
+    return _store
+
+
+async def close_idempotency_store() -> None:
+    """Close the store on shutdown."""
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
+
+
+async def idempotency_key(
+    key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        max_length=MAX_KEY_LENGTH,
+        description="Retries with the same key get the first response instead of running again",
+    ),
+) -> Optional[str]:
+    """Declare the Idempotency-Key header on an endpoint (handled by the middleware)."""
+    return key
+
+
+def _user_of(headers: Headers) -> str:
+    authorization = headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return "anonymous"
+    try:
+        return str(decode_access_token(token).get("sub", "anonymous"))
+    except AuthenticationError:
+        return "anonymous"
+
+
+async def _send_error(send: Send, exc: AppException) -> None:
+    body = json.dumps({"detail": exc.message, **exc.to_dict()}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": exc.status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _hold(store: IdempotencyStore, key: str) -> None:
+    while True:
+        await asyncio.sleep(LOCK_REFRESH_INTERVAL)
+        await store.refresh(key)
+
+
+async def _replay(send: Send, response: StoredResponse) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": response.status,
+        "headers": [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in response.headers
+        ] + [(REPLAYED_HEADER.lower().encode(), b"true")],
+    })
+    await send({"type": "http.response.body", "body": response.body})
+
+
+class IdempotencyMiddleware:
+    """Deduplicate mutating requests that carry an Idempotency-Key."""
+
+    def __init__(self, app: ASGIApp, ttl: Optional[int] = None):
+        self.app = app
+        self.ttl = ttl or get_settings().idempotency_ttl
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client_key = headers.get(IDEMPOTENCY_HEADER)
+        if not client_key:
+            await self.app(scope, receive, send)
+            return
+        if len(client_key) > MAX_KEY_LENGTH:
+            await _send_error(send, ValidationError(
+                f"{IDEMPOTENCY_HEADER} must not exceed {MAX_KEY_LENGTH} characters"
+            ))
+            return
+        if int(headers.get("content-length") or 0) > MAX_REQUEST_BODY:
+            await self.app(scope, receive, send)
+            return
+
+        # Buffer the body to fingerprint it, then hand it on unchanged.
+        # Chunked bodies have no Content-Length, so the limit is checked
+        # while reading as well.
+        chunks = []
+        received = 0
+        more = True
+        while more and received <= MAX_REQUEST_BODY:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            received += len(chunks[-1])
+            more = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        delivered = False
+
+        async def replay_receive() -> Message:
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": more}
+            return await receive()
+
+        if received > MAX_REQUEST_BODY:
+            await self.app(scope, replay_receive, send)
+            return
+
+        fingerprint = hashlib.sha256(
+            scope.get("query_string", b"") + b"\n" + body
+        ).hexdigest()
+
+        key = hashlib.sha256(
+            "\n".join((
+                _user_of(headers),
+                scope["method"],
+                scope["path"],
+                client_key,
+            )).encode()
+        ).hexdigest()
+        store = get_idempotency_store()
+
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        stored = await store.get(key)
+        while stored is None and not await store.acquire(key):
+            stored = await store.wait(key, max(deadline - time.monotonic(), 0))
+            if stored is None and time.monotonic() >= deadline:
+                await _send_error(send, ConflictError(
+                    "A request with this Idempotency-Key is still in progress"
+                ))
+                return
+
+        if stored is None:
+            # Holder of the key; it may have finished between get and acquire
+            stored = await store.get(key)
+            if stored is not None:
+                await store.release(key)
+
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                await _send_error(send, ValidationError(
+                    f"{IDEMPOTENCY_HEADER} was already used with a different request"
+                ))
+            else:
+                await _replay(send, stored)
+            return
+
+        start: Optional[Message] = None
+        parts: List[bytes] = []
+        size = 0
+
+        async def capture_send(message: Message) -> None:
+            nonlocal start, size
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if size <= MAX_RESPONSE_BODY:
+                    parts.append(message.get("body", b""))
+            await send(message)
+
+        transactions = _Transactions()
+        token = _transactions.set(transactions)
+        holder = asyncio.create_task(_hold(store, key))
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            # Server errors and uncommitted work are not stored so that a
+            # retry can succeed
+            if (
+                start is not None
+                and start["status"] < 500
+                and size <= MAX_RESPONSE_BODY
+                and not transactions.pending
+            ):
+                await store.save(
+                    key,
+                    StoredResponse(
+                        fingerprint=fingerprint,
+                        status=start["status"],
+                        headers=[
+                            (name.decode("latin-1"), value.decode("latin-1"))
+                            for name, value in start.get("headers", [])
+                        ],
+                        body=b"".join(parts),
+                    ),
+                    self.ttl,
+                )
+        finally:
+            _transactions.reset(token)
+            holder.cancel()
+            await store.release(key)
@@ -0,0 +1,110 @@
+"""
+Token bucket rate limiting for outgoing Telegram traffic.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    ``acquire`` waits until a token is available; callers are served in
+    arrival order because the wait is computed on reservation.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take one token (possibly going negative); returns seconds to wait."""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Seconds until a token is available, without taking it."""
+        now = time.monotonic() if now is None else now
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    async def acquire(self) -> None:
+        """Wait for one token."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @property
+    def idle(self) -> bool:
+        """True once the bucket has refilled completely."""
+        elapsed = time.monotonic() - self.updated
+        return self.tokens + elapsed * self.rate >= self.capacity
+
+
+class TelegramRateLimiter:
+    """
+    Global and per-chat limits of the Bot API.
+
+    Telegram allows about 30 messages per second per bot and about one per
+    second per chat; a 429 ``retry_after`` pauses all sending via ``block``.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 1.0,
+        max_chats: int = 10000,
+    ):
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_chats = max_chats
+        self.chats: Dict[int, TokenBucket] = {}
+        self.blocked_until = 0.0
+
+    def block(self, seconds: float) -> None:
+        """Pause all sending (Telegram flood control)."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def delay(self, chat_id: int) -> float:
+        """Seconds until a message to ``chat_id`` could be sent."""
+        now = time.monotonic()
+        bucket = self.chats.get(chat_id)
+        return max(
+            bucket.delay(now) if bucket is not None else 0.0,
+            self.global_bucket.delay(now),
+            self.blocked_until - now,
+            0.0,
+        )
+
+    async def acquire(self, chat_id: int, deadline: Optional[float] = None) -> bool:
+        """
+        Wait until a message to ``chat_id`` may be sent.
+
+        With a ``deadline`` (``time.monotonic()`` value) nothing is waited for
+        and False is returned when the message could not go out before it.
+        """
+        if deadline is not None and time.monotonic() + self.delay(chat_id) > deadline:
+            return False
+
+        bucket = self.chats.get(chat_id)
+        if bucket is None:
+            if len(self.chats) >= self.max_chats:
+                self.chats = {k: v for k, v in self.chats.items() if not v.idle}
+            bucket = self.chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+
+        await bucket.acquire()
+        await self.global_bucket.acquire()
+        while (delay := self.blocked_until - time.monotonic()) > 0:
+            if deadline is not None and self.blocked_until > deadline:
+                return False
+            await asyncio.sleep(delay)
+        return deadline is None or time.monotonic() <= deadline
@@ -81,6 +81,30 @@ def create_refresh_token(
     )
 
 
+def create_stream_token(user_id: str) -> str:
+    """
+    Create a short-lived token that only opens the notification stream.
+
+    EventSource cannot send headers, so the token goes in the URL, where it
+    may end up in proxy and access logs; it is useless anywhere else and
+    expires after ``jwt_stream_token_expire_seconds``.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Encoded JWT token
+    """
+    expire = datetime.now(timezone.utc) + timedelta(
+        seconds=settings.jwt_stream_token_expire_seconds
+    )
+    return jwt.encode(
+        {"sub": user_id, "exp": expire, "type": "stream"},
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm,
+    )
+
+
 def decode_access_token(token: str) -> Dict[str, Any]:
     """
     Decode and validate access token.
@@ -132,3 +156,29 @@ def decode_refresh_token(token: str) -> Dict[str, Any]:
     except JWTError as e:
         raise AuthenticationError(f"Token validation failed: {e}")
 
+
+
+def decode_stream_token(token: str) -> Dict[str, Any]:
+    """
+    Decode and validate notification stream token.
+
+    Args:
+        token: JWT token to decode
+
+    Returns:
+        Token payload
+
+    Raises:
+        AuthenticationError: If token is invalid
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.jwt_secret_key,
+            algorithms=[settings.jwt_algorithm],
+        )
+        if payload.get("type") != "stream":
+            raise AuthenticationError("Invalid token type")
+        return payload
+    except JWTError as e:
+        raise AuthenticationError(f"Token validation failed: {e}") from e
@@ -19,6 +19,10 @@ from src.core.middleware import (
     RateLimitMiddleware,
 )
 from src.core.exception_handlers import register_exception_handlers
+from src.core.idempotency import IdempotencyMiddleware, close_idempotency_store
+from src.services.course_service import close_catalog_redis
+from src.services.notification_stream import close_notification_broker, get_notification_broker
+from src.services.telegram_service import close_telegram_service, get_telegram_service
 
 
 settings = get_settings()
@@ -34,8 +38,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     if settings.debug:
         await init_db()
+    await get_notification_broker().start()
+    get_telegram_service().start()
     yield
     # Shutdown
+    await close_telegram_service()
+    await close_notification_broker()
+    await close_idempotency_store()
+    await close_catalog_redis()
     await close_db()
 
 
@@ -53,6 +63,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Idempotency-Key handling (innermost, so replays pass through CORS and logging)
+    app.add_middleware(IdempotencyMiddleware)
+
     # CORS Middleware
     app.add_middleware(
         CORSMiddleware,
@@ -8,6 +8,8 @@ from src.repositories.course_repository import CourseRepository
 from src.repositories.group_repository import GroupRepository
 from src.repositories.lesson_repository import LessonRepository
 from src.repositories.payment_repository import PaymentRepository
+from src.repositories.ledger_repository import LedgerRepository
+from src.repositories.report_repository import ReportRepository
 from src.repositories.notification_repository import NotificationRepository
 
 __all__ = [
@@ -17,6 +19,8 @@ __all__ = [
     "GroupRepository",
     "LessonRepository",
     "PaymentRepository",
+    "LedgerRepository",
+    "ReportRepository",
     "NotificationRepository",
 ]
 
@@ -1,10 +1,13 @@
 """
 Base repository with common CRUD operations.
+
+Soft-deleted rows are hidden from every SELECT by the session-level filter in
+``db.base``; use ``include_deleted()`` to opt a statement out of it.
 """
 
 from typing import Generic, TypeVar, Type, List, Optional, Any
 
-from sqlalchemy import select, func, delete
+from sqlalchemy import ColumnElement, cast, select, func, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.base import Base
@@ -13,6 +16,17 @@ from db.base import Base
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+def typed(column: ColumnElement) -> ColumnElement:
+    """
+    Cast a ``values()`` column to its declared type.
+
+    Postgres infers VALUES column types from the data, so a column that is
+    NULL in every row comes out as text and no longer compares or assigns
+    to uuid/timestamp columns.
+    """
+    return cast(column, column.type)
+
+
 class BaseRepository(Generic[ModelType]):
     """Base repository with common CRUD operations."""
 
@@ -101,6 +115,12 @@ class BaseRepository(Generic[ModelType]):
 
     async def exists(self, id: str) -> bool:
         """Check if entity exists."""
+        import uuid
+        try:
+            uuid.UUID(id)
+        except (ValueError, TypeError):
+            return False
+
         result = await self.session.execute(
             select(func.count(self.model.id)).where(self.model.id == id)
         )
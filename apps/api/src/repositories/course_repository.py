@@ -19,7 +19,7 @@ class CourseRepository(BaseRepository[Course]):
     async def get_by_slug(self, slug: str) -> Optional[Course]:
         """Get course by slug."""
         result = await self.session.execute(
-            select(Course).where(Course.slug == slug, Course.deleted_at.is_(None))
+            select(Course).where(Course.slug == slug)
         )
         return result.scalar_one_or_none()
 
@@ -33,7 +33,6 @@ class CourseRepository(BaseRepository[Course]):
             select(Course)
             .where(
                 Course.status == CourseStatus.PUBLISHED.value,
-                Course.deleted_at.is_(None),
             )
             .offset(skip)
             .limit(limit)
@@ -47,7 +46,6 @@ class CourseRepository(BaseRepository[Course]):
             .where(
                 Course.is_featured.is_(True),
                 Course.status == CourseStatus.PUBLISHED.value,
-                Course.deleted_at.is_(None),
             )
             .limit(limit)
         )
@@ -65,7 +63,6 @@ class CourseRepository(BaseRepository[Course]):
             .where(
                 Course.category == category,
                 Course.status == CourseStatus.PUBLISHED.value,
-                Course.deleted_at.is_(None),
             )
             .offset(skip)
             .limit(limit)
@@ -83,7 +80,6 @@ class CourseRepository(BaseRepository[Course]):
         result = await self.session.execute(
             select(Course)
             .where(
-                Course.deleted_at.is_(None),
                 or_(
                     Course.name.ilike(search_pattern),
                     Course.description.ilike(search_pattern),
@@ -100,7 +96,6 @@ class CourseRepository(BaseRepository[Course]):
         result = await self.session.execute(
             select(func.count(Course.id)).where(
                 Course.status == CourseStatus.PUBLISHED.value,
-                Course.deleted_at.is_(None),
             )
         )
         return result.scalar() or 0
@@ -113,7 +108,6 @@ class CourseRepository(BaseRepository[Course]):
         """Get all courses (not deleted)."""
         result = await self.session.execute(
             select(Course)
-            .where(Course.deleted_at.is_(None))
             .offset(skip)
             .limit(limit)
             .order_by(Course.created_at.desc())
@@ -123,7 +117,7 @@ class CourseRepository(BaseRepository[Course]):
     async def count_all(self) -> int:
         """Count all courses (not deleted)."""
         result = await self.session.execute(
-            select(func.count(Course.id)).where(Course.deleted_at.is_(None))
+            select(func.count(Course.id))
         )
         return result.scalar() or 0
 
@@ -138,7 +132,6 @@ class CourseRepository(BaseRepository[Course]):
             select(Course)
             .where(
                 Course.status == status,
-                Course.deleted_at.is_(None),
             )
             .offset(skip)
             .limit(limit)
@@ -151,7 +144,6 @@ class CourseRepository(BaseRepository[Course]):
         result = await self.session.execute(
             select(func.count(Course.id)).where(
                 Course.status == status,
-                Course.deleted_at.is_(None),
             )
         )
         return result.scalar() or 0
@@ -169,7 +161,6 @@ class CourseRepository(BaseRepository[Course]):
             .where(
                 Course.category == category,
                 Course.status == status,
-                Course.deleted_at.is_(None),
             )
             .offset(skip)
             .limit(limit)
@@ -183,7 +174,6 @@ class CourseRepository(BaseRepository[Course]):
             select(func.count(Course.id)).where(
                 Course.category == category,
                 Course.status == status,
-                Course.deleted_at.is_(None),
             )
         )
         return result.scalar() or 0
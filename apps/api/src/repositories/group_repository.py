@@ -2,12 +2,13 @@
 Group repository.
 """
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, insert, select, func, update
 from sqlalchemy.orm import selectinload
 
-from db.models import Group, Enrollment
+from db.models import Group, Enrollment, User
+from shared.constants import EnrollmentStatus, SEAT_HOLDING_ENROLLMENT_STATUSES
 from src.repositories.base import BaseRepository
 
 
@@ -17,14 +18,11 @@ class GroupRepository(BaseRepository[Group]):
     model = Group
 
     async def get_with_relations(self, id: str) -> Optional[Group]:
-        """Get group with course and enrollments."""
+        """Get group with course."""
         result = await self.session.execute(
             select(Group)
-            .options(
-                selectinload(Group.course),
-                selectinload(Group.enrollments),
-            )
-            .where(Group.id == id, Group.deleted_at.is_(None))
+            .options(selectinload(Group.course))
+            .where(Group.id == id)
         )
         return result.scalar_one_or_none()
 
@@ -38,7 +36,7 @@ class GroupRepository(BaseRepository[Group]):
         result = await self.session.execute(
             select(Group)
             .options(selectinload(Group.course))
-            .where(Group.course_id == course_id, Group.deleted_at.is_(None))
+            .where(Group.course_id == course_id)
             .offset(skip)
             .limit(limit)
         )
@@ -53,7 +51,7 @@ class GroupRepository(BaseRepository[Group]):
         result = await self.session.execute(
             select(Group)
             .options(selectinload(Group.course))
-            .where(Group.is_active.is_(True), Group.deleted_at.is_(None))
+            .where(Group.is_active.is_(True))
             .offset(skip)
             .limit(limit)
         )
@@ -63,21 +61,60 @@ class GroupRepository(BaseRepository[Group]):
         self,
         course_id: Optional[str] = None,
     ) -> List[Group]:
-        """Get groups that have capacity for new students."""
-        query = (
-            select(Group)
-            .options(selectinload(Group.enrollments))
-            .where(Group.is_active.is_(True), Group.deleted_at.is_(None))
+        """Get groups that have capacity for new students (uses ix_groups_open_seats)."""
+        query = select(Group).where(
+            Group.is_active.is_(True),
+            Group.reserved_seats < Group.max_students,
         )
 
         if course_id:
             query = query.where(Group.course_id == course_id)
 
         result = await self.session.execute(query)
-        groups = list(result.scalars().all())
+        return list(result.scalars().all())
 
-        # Filter by capacity
-        return [g for g in groups if g.has_capacity]
+    async def get_schedule_settings(
+        self,
+        group_ids: Optional[List[str]] = None,
+        lock: bool = False,
+    ) -> List[Row]:
+        """
+        Get recurrence columns of groups (all active groups if ids not given).
+
+        With ``lock`` the group rows stay locked until commit, so concurrent
+        schedule generations of a group run one after another.
+
+        Rows: (id, start_date, end_date, start_time, end_time, days_of_week,
+        teacher_id, room)
+        """
+        query = select(
+            Group.id,
+            Group.start_date,
+            Group.end_date,
+            Group.start_time,
+            Group.end_time,
+            Group.days_of_week,
+            Group.teacher_id,
+            Group.room,
+        )
+        if group_ids is None:
+            query = query.where(Group.is_active.is_(True))
+        else:
+            import uuid
+
+            valid_ids = []
+            for id in group_ids:
+                try:
+                    uuid.UUID(id)
+                except (ValueError, TypeError):
+                    continue
+                valid_ids.append(id)
+            query = query.where(Group.id.in_(valid_ids))
+        if lock:
+            query = query.order_by(Group.id).with_for_update()
+
+        result = await self.session.execute(query)
+        return list(result.all())
 
     async def get_student_groups(self, student_id: str) -> List[Group]:
         """Get groups where student is enrolled."""
@@ -88,7 +125,6 @@ class GroupRepository(BaseRepository[Group]):
             .where(
                 Enrollment.student_id == student_id,
                 Enrollment.status == "active",
-                Group.deleted_at.is_(None),
             )
         )
         return list(result.scalars().all())
@@ -96,9 +132,152 @@ class GroupRepository(BaseRepository[Group]):
     async def count_by_course(self, course_id: str) -> int:
         """Count groups by course."""
         result = await self.session.execute(
-            select(func.count(Group.id)).where(
-                Group.course_id == course_id, Group.deleted_at.is_(None)
-            )
+            select(func.count(Group.id)).where(Group.course_id == course_id)
         )
         return result.scalar() or 0
 
+    async def get_enrollment(self, group_id: str, enrollment_id: str) -> Optional[Enrollment]:
+        """Get enrollment of a group."""
+        result = await self.session.execute(
+            select(Enrollment).where(
+                Enrollment.id == enrollment_id,
+                Enrollment.group_id == group_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def lock(self, group_id: str) -> bool:
+        """
+        Lock the group row until commit.
+
+        Enrollment writes take this lock before checking the group's
+        enrollments, so duplicate checks and seat reservations of one group
+        run one at a time.
+
+        Returns:
+            False if the group does not exist
+        """
+        import uuid
+        try:
+            uuid.UUID(group_id)
+        except (ValueError, TypeError):
+            return False
+
+        result = await self.session.execute(
+            select(Group.id).where(Group.id == group_id).with_for_update()
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def get_enrolled_student_ids(
+        self,
+        group_id: str,
+        student_ids: List[str],
+    ) -> set[str]:
+        """Get which of the given students already hold a seat in the group."""
+        result = await self.session.execute(
+            select(Enrollment.student_id).where(
+                Enrollment.group_id == group_id,
+                Enrollment.student_id.in_(student_ids),
+                Enrollment.status.in_(SEAT_HOLDING_ENROLLMENT_STATUSES),
+            )
+        )
+        return {str(student_id) for student_id in result.scalars().all()}
+
+    async def reserve_seats(self, group_id: str, count: int = 1) -> bool:
+        """
+        Atomically take seats in an active group.
+
+        The conditional UPDATE row-locks the group until commit, so concurrent
+        reservations are serialized and can never overbook it.
+        """
+        result = await self.session.execute(
+            update(Group)
+            .where(
+                Group.id == group_id,
+                Group.is_active.is_(True),
+                Group.deleted_at.is_(None),
+                Group.reserved_seats + count <= Group.max_students,
+            )
+            .values(reserved_seats=Group.reserved_seats + count)
+            .returning(Group.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def release_seats(self, group_id: str, count: int = 1) -> None:
+        """Give seats back to the group."""
+        await self.session.execute(
+            update(Group)
+            .where(Group.id == group_id)
+            .values(reserved_seats=func.greatest(Group.reserved_seats - count, 0))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def add_enrollments(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert enrollments in one statement."""
+        if rows:
+            await self.session.execute(insert(Enrollment), rows)
+
+    async def set_enrollment_status(
+        self,
+        enrollment: Enrollment,
+        status: str,
+    ) -> bool:
+        """
+        Move enrollment to a new status if it still has the status we read.
+
+        Returns False if the enrollment was changed concurrently.
+        """
+        result = await self.session.execute(
+            update(Enrollment)
+            .where(
+                Enrollment.id == enrollment.id,
+                Enrollment.status == enrollment.status,
+            )
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return False
+
+        await self.session.refresh(enrollment)
+        return True
+
+    async def reconcile_reserved_seats(self) -> int:
+        """Recompute Group.reserved_seats from seat-holding enrollments; return groups fixed."""
+        counts = (
+            select(
+                Group.id.label("group_id"),
+                func.count(Enrollment.id).label("actual"),
+            )
+            .outerjoin(
+                Enrollment,
+                (Enrollment.group_id == Group.id)
+                & (Enrollment.status.in_(SEAT_HOLDING_ENROLLMENT_STATUSES)),
+            )
+            .group_by(Group.id)
+            .subquery()
+        )
+        result = await self.session.execute(
+            update(Group)
+            .where(
+                Group.id == counts.c.group_id,
+                Group.reserved_seats != counts.c.actual,
+            )
+            .values(reserved_seats=counts.c.actual)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+    async def get_roster(self, group_id: str) -> List[Row]:
+        """Get (student_id, first_name, last_name) of non-pending enrollments."""
+        result = await self.session.execute(
+            select(Enrollment.student_id, User.first_name, User.last_name)
+            .join(User, User.id == Enrollment.student_id)
+            .where(
+                Enrollment.group_id == group_id,
+                Enrollment.status != EnrollmentStatus.PENDING.value,
+            )
+            .order_by(User.last_name, User.first_name)
+        )
+        return list(result.all())
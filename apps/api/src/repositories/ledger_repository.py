@@ -0,0 +1,229 @@
+"""
+Ledger repository.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Numeric, Row, case, column, func, insert, literal, select, update, values
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+
+from db.models import Enrollment, LedgerEntry, Payment, UserBalance
+from shared.constants import LedgerEntryType, PaymentStatus
+from src.repositories.base import BaseRepository
+
+
+class LedgerRepository(BaseRepository[LedgerEntry]):
+    """Ledger repository."""
+
+    model = LedgerEntry
+
+    async def post(
+        self,
+        entry_type: LedgerEntryType,
+        amount: Decimal,
+        user_id: str,
+        enrollment_id: Optional[str] = None,
+        payment_id: Optional[str] = None,
+    ) -> Optional[Row]:
+        """
+        Write a ledger entry and move the running sums by the same amount.
+
+        Returns the enrollment change (see ``post_many``), if any.
+        """
+        changes = await self.post_many([{
+            "entry_type": entry_type,
+            "amount": amount,
+            "user_id": user_id,
+            "enrollment_id": enrollment_id,
+            "payment_id": payment_id,
+        }])
+        return changes[0] if changes else None
+
+    async def post_many(self, entries: List[Dict[str, Any]]) -> List[Row]:
+        """
+        Write ledger entries and move the running sums by their amounts.
+
+        Each entry has entry_type, amount, user_id, enrollment_id and
+        payment_id. Sums are updated with one statement per table however
+        many entries there are. Executes in the caller's transaction, so
+        entries and aggregates commit or roll back together.
+
+        Returns:
+            (id, group_id, status, agreed_price, paid_amount, delta) of every
+            changed enrollment, paid_amount being the value after the change
+        """
+        if not entries:
+            return []
+
+        await self.session.execute(
+            insert(LedgerEntry).values([
+                {**entry, "entry_type": LedgerEntryType(entry["entry_type"]).value}
+                for entry in entries
+            ])
+        )
+
+        per_enrollment: Dict[str, Decimal] = defaultdict(Decimal)
+        per_user: Dict[str, Decimal] = defaultdict(Decimal)
+        for entry in entries:
+            if entry.get("enrollment_id"):
+                per_enrollment[str(entry["enrollment_id"])] += entry["amount"]
+            per_user[str(entry["user_id"])] += entry["amount"]
+
+        changed: List[Row] = []
+        if per_enrollment:
+            deltas = (
+                values(
+                    column("id", UUID(as_uuid=False)),
+                    column("delta", Numeric(14, 2)),
+                    name="deltas",
+                )
+                .data(list(per_enrollment.items()))
+            )
+            result = await self.session.execute(
+                update(Enrollment)
+                .where(Enrollment.id == deltas.c.id)
+                .values(paid_amount=Enrollment.paid_amount + deltas.c.delta)
+                .returning(
+                    Enrollment.id,
+                    Enrollment.group_id,
+                    Enrollment.status,
+                    Enrollment.agreed_price,
+                    Enrollment.paid_amount,
+                    deltas.c.delta,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            changed = list(result.all())
+
+        stmt = pg_insert(UserBalance).values([
+            {"user_id": user_id, "paid_total": amount}
+            for user_id, amount in per_user.items()
+        ])
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserBalance.user_id],
+                set_={
+                    "paid_total": UserBalance.paid_total + stmt.excluded.paid_total,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+        return changed
+
+    async def get_paid_total(self, user_id: str) -> Decimal:
+        """Get user's total of confirmed payments."""
+        result = await self.session.execute(
+            select(UserBalance.paid_total).where(UserBalance.user_id == user_id)
+        )
+        return result.scalar() or Decimal(0)
+
+    async def get_enrollment_balances(self, user_id: str) -> List[Row]:
+        """Get (id, group_id, status, agreed_price, paid_amount) of user's enrollments."""
+        result = await self.session.execute(
+            select(
+                Enrollment.id,
+                Enrollment.group_id,
+                Enrollment.status,
+                Enrollment.agreed_price,
+                Enrollment.paid_amount,
+            )
+            .where(Enrollment.student_id == user_id)
+            .order_by(Enrollment.enrolled_at)
+        )
+        return list(result.all())
+
+    async def reconcile(self) -> Dict[str, int]:
+        """
+        Verify ledger and running sums in bulk and fix drift.
+
+        1. Every payment's ledger net must equal its amount if completed,
+           otherwise zero; differences get an adjustment entry.
+        2. ``Enrollment.paid_amount`` and ``UserBalance.paid_total`` are
+           recomputed from the ledger where they differ; balances of users
+           without ledger entries are reset to zero.
+
+        Returns:
+            Number of rows fixed per step
+        """
+        ledger_net = (
+            select(
+                LedgerEntry.payment_id,
+                func.sum(LedgerEntry.amount).label("net"),
+            )
+            .where(LedgerEntry.payment_id.is_not(None))
+            .group_by(LedgerEntry.payment_id)
+            .subquery()
+        )
+        expected = case(
+            (Payment.status == PaymentStatus.COMPLETED.value, Payment.amount),
+            else_=literal(0),
+        )
+        difference = expected - func.coalesce(ledger_net.c.net, 0)
+        adjustments = await self.session.execute(
+            insert(LedgerEntry).from_select(
+                ["id", "payment_id", "user_id", "enrollment_id", "entry_type", "amount"],
+                select(
+                    func.gen_random_uuid(),
+                    Payment.id,
+                    Payment.user_id,
+                    Payment.enrollment_id,
+                    literal(LedgerEntryType.ADJUSTMENT.value),
+                    difference,
+                )
+                .outerjoin(ledger_net, ledger_net.c.payment_id == Payment.id)
+                .where(difference != 0),
+            )
+        )
+
+        enrollment_totals = (
+            select(
+                Enrollment.id.label("enrollment_id"),
+                func.coalesce(func.sum(LedgerEntry.amount), 0).label("total"),
+            )
+            .outerjoin(LedgerEntry, LedgerEntry.enrollment_id == Enrollment.id)
+            .group_by(Enrollment.id)
+            .subquery()
+        )
+        enrollments = await self.session.execute(
+            update(Enrollment)
+            .where(
+                Enrollment.id == enrollment_totals.c.enrollment_id,
+                Enrollment.paid_amount != enrollment_totals.c.total,
+            )
+            .values(paid_amount=enrollment_totals.c.total)
+            .execution_options(synchronize_session=False)
+        )
+
+        stmt = pg_insert(UserBalance).from_select(
+            ["user_id", "paid_total"],
+            select(LedgerEntry.user_id, func.sum(LedgerEntry.amount)).group_by(
+                LedgerEntry.user_id
+            ),
+        )
+        balances = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UserBalance.user_id],
+                set_={"paid_total": stmt.excluded.paid_total, "updated_at": func.now()},
+                where=UserBalance.paid_total != stmt.excluded.paid_total,
+            )
+        )
+        # Balances of users left without any ledger entries
+        zeroed = await self.session.execute(
+            update(UserBalance)
+            .where(
+                UserBalance.paid_total != 0,
+                ~select(LedgerEntry.id)
+                .where(LedgerEntry.user_id == UserBalance.user_id)
+                .exists(),
+            )
+            .values(paid_total=0)
+            .execution_options(synchronize_session=False)
+        )
+
+        return {
+            "ledger_adjustments": adjustments.rowcount or 0,
+            "enrollments_fixed": enrollments.rowcount or 0,
+            "balances_fixed": (balances.rowcount or 0) + (zeroed.rowcount or 0),
+        }
@@ -2,16 +2,26 @@
 Lesson repository.
 """
 
+import uuid
 from datetime import date
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, delete, exists, or_, select, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 
-from db.models import Lesson, Attendance
+from db.models import Lesson, Attendance, Course, Enrollment, Group, User
+from shared.constants import AttendanceStatus, EnrollmentStatus, LessonStatus
 from src.repositories.base import BaseRepository
 
 
+# Rows per INSERT statement (keeps bind parameters well below PostgreSQL's limit)
+ATTENDANCE_UPSERT_CHUNK_SIZE = 1000
+LESSON_INSERT_CHUNK_SIZE = 1000
+# Rows fetched per round trip by server-side cursor exports
+TIMETABLE_STREAM_BATCH_SIZE = 500
+
+
 class LessonRepository(BaseRepository[Lesson]):
     """Lesson repository."""
 
@@ -118,3 +128,348 @@ class LessonRepository(BaseRepository[Lesson]):
         )
         return result.scalar_one_or_none()
 
+
+    async def get_existing_ids(self, ids: List[str]) -> set[str]:
+        """Get which of the given lesson IDs exist."""
+        import uuid
+
+        valid_ids = []
+        for id in ids:
+            try:
+                uuid.UUID(id)
+            except (ValueError, TypeError):
+                continue
+            valid_ids.append(id)
+        if not valid_ids:
+            return set()
+
+        result = await self.session.execute(
+            select(Lesson.id).where(Lesson.id.in_(valid_ids))
+        )
+        return set(result.scalars().all())
+
+    async def upsert_attendances(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update attendance records in bulk.
+
+        Uses ``INSERT ... ON CONFLICT (lesson_id, student_id) DO UPDATE`` so a
+        whole submission costs one statement per chunk instead of a
+        SELECT + flush + refresh per student.
+
+        Args:
+            rows: Attendance values (lesson_id, student_id, status, grade,
+                homework_grade, notes); (lesson_id, student_id) must be unique
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        total = 0
+        for start in range(0, len(rows), ATTENDANCE_UPSERT_CHUNK_SIZE):
+            chunk = rows[start:start + ATTENDANCE_UPSERT_CHUNK_SIZE]
+            stmt = insert(Attendance).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Attendance.lesson_id, Attendance.student_id],
+                set_={
+                    "status": stmt.excluded.status,
+                    "grade": stmt.excluded.grade,
+                    "homework_grade": stmt.excluded.homework_grade,
+                    "notes": stmt.excluded.notes,
+                    "updated_at": func.now(),
+                },
+            )
+            result = await self.session.execute(stmt)
+            total += result.rowcount
+        return total
+
+    async def get_gradebook_lessons(
+        self,
+        group_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[Row]:
+        """Get (id, lesson_number, date) of a group's lessons in date order."""
+        query = (
+            select(Lesson.id, Lesson.lesson_number, Lesson.date)
+            .where(Lesson.group_id == group_id)
+            .order_by(Lesson.date, Lesson.start_time, Lesson.lesson_number)
+        )
+        if date_from:
+            query = query.where(Lesson.date >= date_from)
+        if date_to:
+            query = query.where(Lesson.date <= date_to)
+
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def get_gradebook_cells(
+        self,
+        group_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[Row]:
+        """
+        Get raw (lesson_id, student_id, status, grade, homework_grade) tuples.
+
+        Column projection only: no Attendance/Lesson entities are built.
+        """
+        query = (
+            select(
+                Attendance.lesson_id,
+                Attendance.student_id,
+                Attendance.status,
+                Attendance.grade,
+                Attendance.homework_grade,
+            )
+            .join(Lesson, Lesson.id == Attendance.lesson_id)
+            .where(Lesson.group_id == group_id)
+        )
+        if date_from:
+            query = query.where(Lesson.date >= date_from)
+        if date_to:
+            query = query.where(Lesson.date <= date_to)
+
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    @staticmethod
+    def _is_untouched():
+        """Lesson is still scheduled and has no attendance recorded."""
+        return (Lesson.status == LessonStatus.SCHEDULED.value) & ~exists().where(
+            Attendance.lesson_id == Lesson.id
+        )
+
+    async def get_schedule_rows(self, group_ids: List[str]) -> List[Row]:
+        """Get (group_id, date, untouched) of the groups' lessons."""
+        result = await self.session.execute(
+            select(
+                Lesson.group_id,
+                Lesson.date,
+                self._is_untouched().label("untouched"),
+            ).where(Lesson.group_id.in_(group_ids))
+        )
+        return list(result.all())
+
+    async def delete_untouched_lessons(
+        self,
+        group_ids: List[str],
+        date_from: Optional[date] = None,
+    ) -> int:
+        """Delete scheduled lessons without attendance (for regeneration)."""
+        stmt = delete(Lesson).where(
+            Lesson.group_id.in_(group_ids),
+            self._is_untouched(),
+        )
+        if date_from:
+            stmt = stmt.where(Lesson.date >= date_from)
+
+        result = await self.session.execute(
+            stmt.execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def insert_lessons(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert lessons with multi-row INSERT statements."""
+        for start in range(0, len(rows), LESSON_INSERT_CHUNK_SIZE):
+            await self.session.execute(
+                insert(Lesson).values(rows[start:start + LESSON_INSERT_CHUNK_SIZE])
+            )
+        return len(rows)
+
+    async def get_group_resources(self, group_id: str) -> Optional[Row]:
+        """Get (room, teacher_id) of a group."""
+        import uuid
+        try:
+            uuid.UUID(group_id)
+        except (ValueError, TypeError):
+            return None
+
+        result = await self.session.execute(
+            select(Group.room, Group.teacher_id).where(Group.id == group_id)
+        )
+        return result.one_or_none()
+
+    async def get_bookings(
+        self,
+        date_from: date,
+        date_to: date,
+        rooms: Optional[List[str]] = None,
+        teacher_ids: Optional[List[str]] = None,
+        exclude_lesson_id: Optional[str] = None,
+    ) -> List[Row]:
+        """
+        Get non-cancelled lessons with the room and teacher they occupy.
+
+        Rows: (lesson_id, group_id, date, start_time, end_time, room,
+        teacher_id, untouched). Teacher is the lesson override or the group
+        teacher. If rooms/teacher_ids are given, only lessons using one of
+        them are returned (rooms compared trimmed and case-insensitively).
+        """
+        teacher_id = func.coalesce(Lesson.teacher_id, Group.teacher_id)
+        query = (
+            select(
+                Lesson.id.label("lesson_id"),
+                Lesson.group_id,
+                Lesson.date,
+                Lesson.start_time,
+                Lesson.end_time,
+                Group.room,
+                teacher_id.label("teacher_id"),
+                self._is_untouched().label("untouched"),
+            )
+            .join(Group, Group.id == Lesson.group_id)
+            .where(
+                Lesson.date >= date_from,
+                Lesson.date <= date_to,
+                Lesson.status != LessonStatus.CANCELLED.value,
+            )
+        )
+
+        resources = []
+        if rooms:
+            resources.append(func.lower(func.trim(Group.room)).in_(rooms))
+        if teacher_ids:
+            resources.append(teacher_id.in_(teacher_ids))
+        if rooms is not None or teacher_ids is not None:
+            if not resources:
+                return []
+            query = query.where(or_(*resources))
+
+        if exclude_lesson_id:
+            query = query.where(Lesson.id != exclude_lesson_id)
+
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def get_teacher_day(self, teacher_id: str, day: date) -> List[Row]:
+        """
+        Get a teacher's lessons of a day with head count and attendance totals.
+
+        One statement; counts are correlated subqueries instead of loaded
+        relationships. Rows: (lesson_id, title, lesson_number, start_time,
+        end_time, status, group_id, group_name, room, head_count,
+        marked_count, present_count).
+        """
+        import uuid
+        try:
+            uuid.UUID(teacher_id)
+        except (ValueError, TypeError):
+            return []
+
+        head_count = (
+            select(func.count(Enrollment.id))
+            .where(
+                Enrollment.group_id == Group.id,
+                Enrollment.status == EnrollmentStatus.ACTIVE.value,
+            )
+            .correlate(Group)
+            .scalar_subquery()
+        )
+        marked_count = (
+            select(func.count(Attendance.id))
+            .where(Attendance.lesson_id == Lesson.id)
+            .correlate(Lesson)
+            .scalar_subquery()
+        )
+        present_count = (
+            select(func.count(Attendance.id))
+            .where(
+                Attendance.lesson_id == Lesson.id,
+                Attendance.status.in_([
+                    AttendanceStatus.PRESENT.value,
+                    AttendanceStatus.LATE.value,
+                ]),
+            )
+            .correlate(Lesson)
+            .scalar_subquery()
+        )
+
+        result = await self.session.execute(
+            select(
+                Lesson.id.label("lesson_id"),
+                Lesson.title,
+                Lesson.lesson_number,
+                Lesson.start_time,
+                Lesson.end_time,
+                Lesson.status,
+                Group.id.label("group_id"),
+                Group.name.label("group_name"),
+                Group.room,
+                head_count.label("head_count"),
+                marked_count.label("marked_count"),
+                present_count.label("present_count"),
+            )
+            .join(Group, Group.id == Lesson.group_id)
+            .where(
+                Lesson.date == day,
+                func.coalesce(Lesson.teacher_id, Group.teacher_id) == teacher_id,
+            )
+            .order_by(Lesson.start_time, Group.name)
+        )
+        return list(result.all())
+
+    async def stream_timetable(
+        self,
+        date_from: date,
+        date_to: date,
+        group_id: Optional[str] = None,
+        teacher_id: Optional[str] = None,
+        student_id: Optional[str] = None,
+    ) -> AsyncIterator[Row]:
+        """
+        Stream timetable rows through a server-side cursor.
+
+        Rows: (lesson_id, date, start_time, end_time, title, lesson_number,
+        status, group_name, course_name, room, teacher_first_name,
+        teacher_last_name), ordered by date and time. Column projection with
+        ``yield_per`` keeps memory flat regardless of the range size.
+        """
+        for id in (group_id, teacher_id, student_id):
+            if id is None:
+                continue
+            try:
+                uuid.UUID(id)
+            except (ValueError, TypeError):
+                return
+
+        lesson_teacher_id = func.coalesce(Lesson.teacher_id, Group.teacher_id)
+        query = (
+            select(
+                Lesson.id.label("lesson_id"),
+                Lesson.date,
+                Lesson.start_time,
+                Lesson.end_time,
+                Lesson.title,
+                Lesson.lesson_number,
+                Lesson.status,
+                Group.name.label("group_name"),
+                Course.name.label("course_name"),
+                Group.room,
+                User.first_name.label("teacher_first_name"),
+                User.last_name.label("teacher_last_name"),
+            )
+            .join(Group, Group.id == Lesson.group_id)
+            .join(Course, Course.id == Group.course_id)
+            .outerjoin(User, User.id == lesson_teacher_id)
+            .where(Lesson.date >= date_from, Lesson.date <= date_to)
+            .order_by(Lesson.date, Lesson.start_time, Group.name)
+        )
+        if group_id:
+            query = query.where(Lesson.group_id == group_id)
+        if teacher_id:
+            query = query.where(lesson_teacher_id == teacher_id)
+        if student_id:
+            query = query.where(
+                Lesson.group_id.in_(
+                    select(Enrollment.group_id).where(
+                        Enrollment.student_id == student_id,
+                        Enrollment.status == EnrollmentStatus.ACTIVE.value,
+                    )
+                )
+            )
+
+        result = await self.session.stream(
+            query.execution_options(yield_per=TIMETABLE_STREAM_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            for row in partition:
+                yield row
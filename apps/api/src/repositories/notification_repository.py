@@ -2,12 +2,81 @@
 Notification repository.
 """
 
-from typing import Optional, List
+import hashlib
+import re
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, List, Tuple
 
-from sqlalchemy import select, func, update
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Integer,
+    Row,
+    Select,
+    String,
+    any_,
+    case,
+    cast,
+    column,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    table,
+    text,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert as pg_insert
 
-from db.models import Notification
-from src.repositories.base import BaseRepository
+from db.models import (
+    ArchivedNotification,
+    Enrollment,
+    Group,
+    Notification,
+    NotificationCounter,
+    User,
+)
+from shared.constants import BroadcastAudience, TelegramDeliveryStatus
+from src.repositories.base import BaseRepository, typed
+
+
+def broadcast_notification_id(broadcast_id: str, user_id: str) -> str:
+    """ID of the notification a broadcast created for a user (see ``broadcast``)."""
+    return str(uuid.UUID(hashlib.md5(f"{broadcast_id}:{user_id}".encode(), usedforsecurity=False).hexdigest()))
+
+
+# Columns copied to archived_notifications
+_ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "title",
+    "message",
+    "type",
+    "is_read",
+    "read_at",
+    "sent_via_telegram",
+    "sent_at",
+    "telegram_status",
+    "action_url",
+    "created_at",
+)
+
+_PARTITION_NAME = re.compile(r"^notifications_(\d{4})_(\d{2})$")
+
+
+def partition_name(month: date) -> str:
+    """Name of the monthly partition holding ``month``."""
+    return f"notifications_{month:%Y_%m}"
+
+
+def next_month(month: date) -> date:
+    """First day of the month after ``month``."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
 
 
 class NotificationRepository(BaseRepository[Notification]):
@@ -46,24 +115,73 @@ class NotificationRepository(BaseRepository[Notification]):
         return await self.get_by_user(user_id, limit=limit, is_read=False)
 
     async def count_unread(self, user_id: str) -> int:
-        """Count unread notifications."""
+        """Count unread notifications (maintained counter)."""
         result = await self.session.execute(
-            select(func.count(Notification.id)).where(
-                Notification.user_id == user_id,
-                Notification.is_read.is_(False),
+            select(NotificationCounter.unread_count).where(
+                NotificationCounter.user_id == user_id
             )
         )
         return result.scalar() or 0
 
+    async def add_unread(self, user_id: str, delta: int) -> None:
+        """Add a delta to a user's unread counter."""
+        if not delta:
+            return
+        stmt = pg_insert(NotificationCounter).values(
+            user_id=user_id,
+            unread_count=max(delta, 0),
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationCounter.user_id],
+                set_={
+                    "unread_count": func.greatest(NotificationCounter.unread_count + delta, 0),
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    async def create(self, obj: Notification) -> Notification:
+        """Create notification and count it as unread."""
+        obj = await super().create(obj)
+        if not obj.is_read:
+            await self.add_unread(obj.user_id, 1)
+        return obj
+
+    async def delete(self, id: str) -> bool:
+        """Hard delete notification, keeping the unread counter in step."""
+        result = await self.session.execute(
+            delete(Notification)
+            .where(Notification.id == id)
+            .returning(Notification.user_id, Notification.is_read)
+        )
+        row = result.first()
+        if row is None:
+            return False
+        if not row.is_read:
+            await self.add_unread(row.user_id, -1)
+        return True
+
     async def mark_as_read(self, id: str, user_id: str) -> Optional[Notification]:
         """Mark notification as read."""
         from datetime import datetime, timezone
 
+        # Only the request that flips is_read decrements the counter
+        result = await self.session.execute(
+            update(Notification)
+            .where(
+                Notification.id == id,
+                Notification.user_id == user_id,
+                Notification.is_read.is_(False),
+            )
+            .values(is_read=True, read_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await self.add_unread(user_id, -1)
+
         notification = await self.get_by_id(id)
         if notification and notification.user_id == user_id:
-            notification.is_read = True
-            notification.read_at = datetime.now(timezone.utc)
-            await self.session.flush()
             await self.session.refresh(notification)
             return notification
         return None
@@ -80,15 +198,395 @@ class NotificationRepository(BaseRepository[Notification]):
             )
             .values(is_read=True, read_at=datetime.now(timezone.utc))
         )
+        await self.add_unread(user_id, -result.rowcount)
         return result.rowcount
 
-    async def get_unsent_telegram(self, limit: int = 100) -> List[Notification]:
-        """Get notifications not yet sent via Telegram."""
+    async def reconcile_unread_counters(self) -> int:
+        """Recompute unread counters from notifications in bulk; return counters fixed."""
+        actual = (
+            select(Notification.user_id, func.count())
+            .where(Notification.is_read.is_(False))
+            .group_by(Notification.user_id)
+        )
+        stmt = pg_insert(NotificationCounter).from_select(["user_id", "unread_count"], actual)
+        upserted = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationCounter.user_id],
+                set_={"unread_count": stmt.excluded.unread_count, "updated_at": func.now()},
+                where=NotificationCounter.unread_count != stmt.excluded.unread_count,
+            )
+        )
+        zeroed = await self.session.execute(
+            update(NotificationCounter)
+            .where(
+                NotificationCounter.unread_count != 0,
+                ~select(Notification.id)
+                .where(
+                    Notification.user_id == NotificationCounter.user_id,
+                    Notification.is_read.is_(False),
+                )
+                .exists(),
+            )
+            .values(unread_count=0)
+            .execution_options(synchronize_session=False)
+        )
+        return (upserted.rowcount or 0) + (zeroed.rowcount or 0)
+
+    async def claim_telegram_batch(self, limit: int, lease: timedelta) -> List[Row]:
+        """
+        Lease due pending Telegram deliveries.
+
+        Rows are locked with SKIP LOCKED and pushed ``lease`` into the future,
+        so concurrent workers never claim the same notification; a worker that
+        dies leaves its batch to be picked up again once the lease expires.
+
+        Returns:
+            (id, telegram_id, title, message, action_url, telegram_attempts) rows
+        """
+        due = (
+            select(Notification.id)
+            .where(
+                Notification.telegram_status == TelegramDeliveryStatus.PENDING.value,
+                Notification.telegram_next_attempt_at <= func.now(),
+            )
+            .order_by(Notification.telegram_next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
         result = await self.session.execute(
-            select(Notification)
-            .where(Notification.sent_via_telegram.is_(False))
+            update(Notification)
+            .where(Notification.id.in_(due), User.id == Notification.user_id)
+            .values(
+                telegram_attempts=Notification.telegram_attempts + 1,
+                telegram_next_attempt_at=func.now() + lease,
+            )
+            .returning(
+                Notification.id,
+                User.telegram_id,
+                Notification.title,
+                Notification.message,
+                Notification.action_url,
+                Notification.telegram_attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.all())
+
+    async def record_telegram_results(self, results: List[Dict[str, Any]]) -> int:
+        """
+        Store delivery outcomes in bulk.
+
+        Each result has id, attempts (``telegram_attempts`` as claimed),
+        attempted, status, sent_at, next_attempt_at and error. A row that was
+        claimed again by another worker since (its lease ran out) is left to
+        that worker; a row that was not attempted gets its attempt back.
+
+        Returns:
+            Number of notifications updated
+        """
+        if not results:
+            return 0
+        outcome = (
+            values(
+                column("id", UUID(as_uuid=False)),
+                column("attempts", Integer),
+                column("attempted", Boolean),
+                column("status", String),
+                column("sent_at", DateTime(timezone=True)),
+                column("next_attempt_at", DateTime(timezone=True)),
+                column("error", String),
+                name="outcome",
+            )
+            .data([
+                (
+                    result["id"],
+                    result["attempts"],
+                    result["attempted"],
+                    result["status"],
+                    result["sent_at"],
+                    result["next_attempt_at"],
+                    result["error"],
+                )
+                for result in results
+            ])
+        )
+        attempted = typed(outcome.c.attempted)
+        updated = await self.session.execute(
+            update(Notification)
+            .where(
+                Notification.id == outcome.c.id,
+                Notification.telegram_attempts == typed(outcome.c.attempts),
+            )
+            .values(
+                telegram_attempts=case(
+                    (attempted, Notification.telegram_attempts),
+                    else_=Notification.telegram_attempts - 1,
+                ),
+                telegram_status=outcome.c.status,
+                sent_via_telegram=outcome.c.status == TelegramDeliveryStatus.SENT.value,
+                sent_at=func.coalesce(typed(outcome.c.sent_at), Notification.sent_at),
+                telegram_next_attempt_at=typed(outcome.c.next_attempt_at),
+                telegram_error=case(
+                    (attempted, func.left(typed(outcome.c.error), 500)),
+                    else_=Notification.telegram_error,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return updated.rowcount or 0
+
+    def select_audience(
+        self,
+        audience: BroadcastAudience,
+        roles: Optional[List[str]] = None,
+        course_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+        user_ids: Optional[List[str]] = None,
+        enrollment_statuses: Optional[List[str]] = None,
+    ) -> Select:
+        """Build a SELECT of distinct active recipients (id, telegram_id)."""
+        # Used inside INSERT ... SELECT, where the soft-delete filter is not applied
+        query = select(User.id, User.telegram_id).where(
+            User.is_active.is_(True),
+            User.deleted_at.is_(None),
+        )
+
+        if audience == BroadcastAudience.ROLE:
+            query = query.where(User.role.in_(roles or []))
+        elif audience == BroadcastAudience.USERS:
+            # One array parameter instead of one bind per id
+            ids = literal(user_ids or [], ARRAY(UUID(as_uuid=False)))
+            query = query.where(User.id == any_(ids))
+        elif audience in (BroadcastAudience.COURSE, BroadcastAudience.GROUP):
+            enrolled = (
+                select(Enrollment.student_id)
+                .join(Group, Group.id == Enrollment.group_id)
+                .where(Group.deleted_at.is_(None))
+            )
+            if audience == BroadcastAudience.GROUP:
+                enrolled = enrolled.where(Enrollment.group_id == group_id)
+            else:
+                enrolled = enrolled.where(Group.course_id == course_id)
+            if enrollment_statuses:
+                enrolled = enrolled.where(Enrollment.status.in_(enrollment_statuses))
+            query = query.where(User.id.in_(enrolled))
+        return query
+
+    async def broadcast(
+        self,
+        recipients: Select,
+        broadcast_id: str,
+        title: str,
+        message: str,
+        type: str,
+        action_url: Optional[str] = None,
+        send_telegram: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Create one notification per recipient with a single INSERT ... SELECT.
+
+        Notification ids are derived from ``broadcast_id`` and the recipient
+        (``broadcast_notification_id``), so they can be told to connected
+        clients without returning every row. With ``send_telegram`` linked
+        recipients are queued in the Telegram outbox and the rest are marked
+        skipped. Unread counters are updated by the same statement.
+
+        Returns:
+            New unread count of each recipient
+        """
+        recipients = recipients.subquery("recipients")
+        notification_id = func.md5(
+            literal(f"{broadcast_id}:") + cast(recipients.c.id, String)
+        )
+        telegram_status = literal(None, String)
+        if send_telegram:
+            telegram_status = case(
+                (recipients.c.telegram_id.is_(None), TelegramDeliveryStatus.SKIPPED.value),
+                else_=TelegramDeliveryStatus.PENDING.value,
+            )
+        inserted = (
+            insert(Notification).from_select(
+                [
+                    "id",
+                    "user_id",
+                    "title",
+                    "message",
+                    "type",
+                    "is_read",
+                    "sent_via_telegram",
+                    "telegram_status",
+                    "telegram_next_attempt_at",
+                    "action_url",
+                ],
+                select(
+                    cast(notification_id, UUID(as_uuid=False)),
+                    recipients.c.id,
+                    literal(title),
+                    literal(message),
+                    literal(type),
+                    false(),
+                    false(),
+                    telegram_status,
+                    func.now(),
+                    literal(action_url, Notification.action_url.type),
+                ),
+            )
+            .returning(Notification.user_id)
+            .cte("inserted")
+        )
+        # Counters are bumped in the same statement, one row per recipient
+        counters = pg_insert(NotificationCounter).from_select(
+            ["user_id", "unread_count"],
+            select(inserted.c.user_id, literal(1)),
+        )
+        result = await self.session.execute(
+            counters.on_conflict_do_update(
+                index_elements=[NotificationCounter.user_id],
+                set_={
+                    "unread_count": NotificationCounter.unread_count + 1,
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(NotificationCounter.user_id, NotificationCounter.unread_count)
+        )
+        return {str(user_id): count for user_id, count in result.all()}
+
+    async def purge_expired(
+        self,
+        read_before: Optional[datetime],
+        unread_before: Optional[datetime],
+        limit: int,
+        archive: bool = True,
+    ) -> int:
+        """
+        Move (or delete) up to ``limit`` expired notifications, oldest first.
+
+        One statement deletes the batch, copies it to the archive and
+        takes unread rows off the counters. Locked rows are skipped.
+
+        Returns:
+            Number of notifications removed
+        """
+        expired = []
+        if read_before:
+            expired.append(Notification.is_read.is_(True) & (Notification.created_at < read_before))
+        if unread_before:
+            expired.append(
+                Notification.is_read.is_(False) & (Notification.created_at < unread_before)
+            )
+        if not expired:
+            return 0
+
+        batch = (
+            select(Notification.id)
+            .where(or_(*expired))
             .order_by(Notification.created_at)
             .limit(limit)
+            .with_for_update(skip_locked=True)
         )
-        return list(result.scalars().all())
+        moved = (
+            delete(Notification)
+            .where(Notification.id.in_(batch))
+            .returning(*(Notification.__table__.c[name] for name in _ARCHIVED_COLUMNS))
+            .cte("moved")
+        )
+        unread = (
+            select(moved.c.user_id, func.count().label("removed"))
+            .where(moved.c.is_read.is_(False))
+            .group_by(moved.c.user_id)
+            .subquery("unread")
+        )
+        counters = (
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == unread.c.user_id)
+            .values(
+                unread_count=func.greatest(NotificationCounter.unread_count - unread.c.removed, 0)
+            )
+            .cte("counters")
+        )
+        stmt = select(func.count()).select_from(moved).add_cte(counters)
+        if archive:
+            stmt = stmt.add_cte(
+                insert(ArchivedNotification)
+                .from_select(
+                    list(_ARCHIVED_COLUMNS),
+                    select(*(moved.c[name] for name in _ARCHIVED_COLUMNS)),
+                )
+                .cte("archived")
+            )
+        result = await self.session.execute(stmt)
+        return result.scalar() or 0
+
+    async def is_partitioned(self) -> bool:
+        """Whether notifications is range-partitioned (optional migration)."""
+        result = await self.session.execute(
+            text(
+                "SELECT count(*) FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'notifications'"
+            )
+        )
+        return bool(result.scalar())
+
+    async def get_partitions(self) -> List[Tuple[str, date]]:
+        """Get (name, first day of month) of the monthly partitions, oldest first."""
+        result = await self.session.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'notifications'::regclass"
+            )
+        )
+        partitions = []
+        for (name,) in result.all():
+            match = _PARTITION_NAME.match(name)
+            if match:
+                partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    async def create_partitions(self, first: date, months: int) -> List[str]:
+        """Create missing monthly partitions starting at ``first``; return names created."""
+        existing = {name for name, _ in await self.get_partitions()}
+        created = []
+        month = first.replace(day=1)
+        for _ in range(months):
+            name = partition_name(month)
+            if name not in existing:
+                await self.session.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF notifications "
+                        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                        f"TO ('{next_month(month).isoformat()} 00:00:00+00')"
+                    )
+                )
+                created.append(name)
+            month = next_month(month)
+        return created
 
+    async def drop_partition(self, name: str, archive: bool = True) -> None:
+        """Archive, uncount and drop a whole monthly partition."""
+        if not _PARTITION_NAME.match(name):
+            raise ValueError(f"Not a notifications partition: {name}")
+        await self.session.execute(text(f"ALTER TABLE notifications DETACH PARTITION {name}"))
+        partition = table(name, *(column(c.name, c.type) for c in Notification.__table__.c))
+        unread = (
+            select(partition.c.user_id, func.count().label("removed"))
+            .where(partition.c.is_read.is_(False))
+            .group_by(partition.c.user_id)
+            .subquery("unread")
+        )
+        await self.session.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == unread.c.user_id)
+            .values(
+                unread_count=func.greatest(NotificationCounter.unread_count - unread.c.removed, 0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if archive:
+            await self.session.execute(
+                insert(ArchivedNotification).from_select(
+                    list(_ARCHIVED_COLUMNS),
+                    select(*(partition.c[column_name] for column_name in _ARCHIVED_COLUMNS)),
+                )
+            )
+        await self.session.execute(text(f"DROP TABLE {name}"))
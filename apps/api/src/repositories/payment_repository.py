@@ -2,15 +2,16 @@
 Payment repository.
 """
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from decimal import Decimal
 
-from sqlalchemy import select, func
+from sqlalchemy import DateTime, Row, String, column, select, func, update, values
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
 from sqlalchemy.orm import selectinload
 
-from db.models import Payment
+from db.models import Enrollment, Payment, UserBalance
 from shared.constants import PaymentStatus
-from src.repositories.base import BaseRepository
+from src.repositories.base import BaseRepository, typed
 
 
 class PaymentRepository(BaseRepository[Payment]):
@@ -85,25 +86,45 @@ class PaymentRepository(BaseRepository[Payment]):
         return result.scalar_one_or_none()
 
     async def sum_by_user(self, user_id: str) -> Decimal:
-        """Sum completed payments for user."""
+        """Sum completed payments for user (maintained by the ledger)."""
         result = await self.session.execute(
-            select(func.sum(Payment.amount)).where(
-                Payment.user_id == user_id,
-                Payment.status == PaymentStatus.COMPLETED.value,
-            )
+            select(UserBalance.paid_total).where(UserBalance.user_id == user_id)
         )
         return result.scalar() or Decimal(0)
 
     async def sum_by_enrollment(self, enrollment_id: str) -> Decimal:
-        """Sum completed payments for enrollment."""
+        """Sum completed payments for enrollment (maintained by the ledger)."""
         result = await self.session.execute(
-            select(func.sum(Payment.amount)).where(
-                Payment.enrollment_id == enrollment_id,
-                Payment.status == PaymentStatus.COMPLETED.value,
-            )
+            select(Enrollment.paid_amount).where(Enrollment.id == enrollment_id)
         )
         return result.scalar() or Decimal(0)
 
+    async def change_status(
+        self,
+        payment: Payment,
+        status: str,
+        **values,
+    ) -> bool:
+        """
+        Move payment to a new status if it still has the status we read.
+
+        Returns False if the payment was changed concurrently.
+        """
+        result = await self.session.execute(
+            update(Payment)
+            .where(
+                Payment.id == payment.id,
+                Payment.status == payment.status,
+            )
+            .values(status=status, **values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return False
+
+        await self.session.refresh(payment)
+        return True
+
     async def count_by_status(self, status: PaymentStatus) -> int:
         """Count payments by status."""
         result = await self.session.execute(
@@ -111,3 +132,121 @@ class PaymentRepository(BaseRepository[Payment]):
         )
         return result.scalar() or 0
 
+    def _statement_columns(self) -> tuple:
+        return (
+            Payment.id,
+            Payment.user_id,
+            Payment.enrollment_id,
+            Payment.amount,
+            Payment.method,
+            Payment.status,
+            Payment.external_id,
+            Payment.transaction_id,
+            Payment.created_at,
+            Payment.paid_at,
+        )
+
+    async def get_by_external_ids(self, method: str, external_ids: List[str]) -> List[Row]:
+        """Get statement-relevant columns of payments by provider transaction IDs."""
+        if not external_ids:
+            return []
+        result = await self.session.execute(
+            select(*self._statement_columns()).where(
+                Payment.method == method,
+                Payment.external_id.in_(external_ids),
+            )
+        )
+        return list(result.all())
+
+    async def get_by_transaction_ids(self, transaction_ids: List[str]) -> List[Row]:
+        """Get statement-relevant columns of payments by our transaction IDs."""
+        if not transaction_ids:
+            return []
+        result = await self.session.execute(
+            select(*self._statement_columns()).where(
+                Payment.transaction_id.in_(transaction_ids)
+            )
+        )
+        return list(result.all())
+
+    async def get_enrollment_students(self, enrollment_ids: List[str]) -> Dict[str, str]:
+        """Map enrollment IDs to their student IDs."""
+        if not enrollment_ids:
+            return {}
+        result = await self.session.execute(
+            select(Enrollment.id, Enrollment.student_id).where(
+                Enrollment.id.in_(enrollment_ids)
+            )
+        )
+        return {str(row.id): str(row.student_id) for row in result.all()}
+
+    async def insert_payments(self, rows: List[Dict[str, Any]]) -> List[Row]:
+        """
+        Insert payments in bulk, skipping known provider transaction IDs.
+
+        Returns:
+            Statement-relevant columns of the inserted payments
+        """
+        if not rows:
+            return []
+        result = await self.session.execute(
+            pg_insert(Payment)
+            .values(rows)
+            .on_conflict_do_nothing(
+                index_elements=[Payment.method, Payment.external_id],
+                index_where=Payment.external_id.is_not(None),
+            )
+            .returning(*self._statement_columns())
+        )
+        return list(result.all())
+
+    async def change_statuses(
+        self,
+        status: str,
+        changes: List[Dict[str, Any]],
+        processed_by: Optional[str] = None,
+    ) -> List[Row]:
+        """
+        Move payments to a status in bulk, each only if it still has the
+        status we read.
+
+        Each change has id, status (as read), external_id and paid_at;
+        external_id, paid_at and processed_by are kept when not given.
+
+        Returns:
+            Statement-relevant columns of the changed payments
+        """
+        if not changes:
+            return []
+        expected = (
+            values(
+                column("id", UUID(as_uuid=False)),
+                column("status", String),
+                column("external_id", String),
+                column("paid_at", DateTime(timezone=True)),
+                name="expected",
+            )
+            .data([
+                (change["id"], change["status"], change["external_id"], change["paid_at"])
+                for change in changes
+            ])
+        )
+        updates = {
+            "status": status,
+            "external_id": func.coalesce(typed(expected.c.external_id), Payment.external_id),
+            "paid_at": func.coalesce(typed(expected.c.paid_at), Payment.paid_at),
+        }
+        if processed_by:
+            updates["processed_by"] = processed_by
+        result = await self.session.execute(
+            update(Payment)
+            .where(
+                Payment.id == expected.c.id,
+                Payment.status == expected.c.status,
+            )
+            .values(**updates)
+            .returning(*self._statement_columns())
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.all())
+
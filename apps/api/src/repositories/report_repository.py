@@ -0,0 +1,362 @@
+"""
+Report repository.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import (
+    Date,
+    Integer,
+    Numeric,
+    Row,
+    String,
+    case,
+    column,
+    delete,
+    func,
+    literal,
+    select,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+
+from db.base import include_deleted
+from db.models import Course, Enrollment, Group, GroupBalance, Payment, PaymentDailyRollup
+from shared.constants import (
+    DEBT_BEARING_ENROLLMENT_STATUSES,
+    REPORT_TIMEZONE,
+    ReportDimension,
+)
+from src.repositories.base import BaseRepository, typed
+
+
+_REPORT_ZONE = ZoneInfo(REPORT_TIMEZONE)
+
+
+def local_day(moment: datetime) -> date:
+    """Report day of a timestamp."""
+    return moment.astimezone(_REPORT_ZONE).date()
+
+
+def debt_of(agreed_price: Decimal, paid_amount: Decimal) -> Decimal:
+    """Outstanding debt of one enrollment."""
+    return max(agreed_price - paid_amount, Decimal(0))
+
+
+def _payment_day():
+    """SQL counterpart of ``local_day(paid_at or created_at)``."""
+    return func.timezone(
+        REPORT_TIMEZONE,
+        func.coalesce(Payment.paid_at, Payment.created_at),
+    ).cast(Date)
+
+
+class ReportRepository(BaseRepository[PaymentDailyRollup]):
+    """Report repository."""
+
+    model = PaymentDailyRollup
+
+    async def add_payment_deltas(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Add (day, enrollment_id, method, status, payments_count, amount_total) deltas.
+
+        The course of each row is resolved from its enrollment; rows falling
+        into the same bucket are summed before the upsert.
+        """
+        if not rows:
+            return
+        deltas = (
+            values(
+                column("day", Date),
+                column("enrollment_id", UUID(as_uuid=False)),
+                column("method", String),
+                column("status", String),
+                column("payments_count", Integer),
+                column("amount_total", Numeric(14, 2)),
+                name="deltas",
+            )
+            .data([
+                (
+                    row["day"],
+                    row["enrollment_id"],
+                    row["method"],
+                    row["status"],
+                    row["payments_count"],
+                    row["amount_total"],
+                )
+                for row in rows
+            ])
+        )
+        stmt = pg_insert(PaymentDailyRollup).from_select(
+            ["id", "day", "course_id", "method", "status", "payments_count", "amount_total"],
+            select(
+                func.gen_random_uuid(),
+                deltas.c.day,
+                Group.course_id,
+                deltas.c.method,
+                deltas.c.status,
+                func.sum(deltas.c.payments_count),
+                func.sum(deltas.c.amount_total),
+            )
+            .select_from(deltas)
+            .outerjoin(Enrollment, Enrollment.id == typed(deltas.c.enrollment_id))
+            .outerjoin(Group, Group.id == Enrollment.group_id)
+            .group_by(deltas.c.day, Group.course_id, deltas.c.method, deltas.c.status),
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    PaymentDailyRollup.day,
+                    PaymentDailyRollup.course_id,
+                    PaymentDailyRollup.method,
+                    PaymentDailyRollup.status,
+                ],
+                set_={
+                    "payments_count": (
+                        PaymentDailyRollup.payments_count + stmt.excluded.payments_count
+                    ),
+                    "amount_total": PaymentDailyRollup.amount_total + stmt.excluded.amount_total,
+                },
+            )
+        )
+
+    async def add_group_delta(
+        self,
+        group_id: str,
+        enrollments_count: int = 0,
+        agreed_total: Decimal = Decimal(0),
+        paid_total: Decimal = Decimal(0),
+        debt_total: Decimal = Decimal(0),
+    ) -> None:
+        """Add deltas to a group's balance."""
+        await self.add_group_deltas([{
+            "group_id": group_id,
+            "enrollments_count": enrollments_count,
+            "agreed_total": agreed_total,
+            "paid_total": paid_total,
+            "debt_total": debt_total,
+        }])
+
+    async def add_group_deltas(self, rows: List[Dict[str, Any]]) -> None:
+        """Add deltas to group balances (one row per group)."""
+        if not rows:
+            return
+        stmt = pg_insert(GroupBalance).values(rows)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[GroupBalance.group_id],
+                set_={
+                    "enrollments_count": (
+                        GroupBalance.enrollments_count + stmt.excluded.enrollments_count
+                    ),
+                    "agreed_total": GroupBalance.agreed_total + stmt.excluded.agreed_total,
+                    "paid_total": GroupBalance.paid_total + stmt.excluded.paid_total,
+                    "debt_total": GroupBalance.debt_total + stmt.excluded.debt_total,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    async def add_enrollment_payments(self, changes: List[Row]) -> None:
+        """
+        Apply enrollment paid amount changes to group balances.
+
+        Takes the rows returned by ``LedgerRepository.post_many``.
+        """
+        per_group: Dict[str, Dict[str, Any]] = {}
+        for change in changes:
+            if change.status not in DEBT_BEARING_ENROLLMENT_STATUSES:
+                continue
+            group = per_group.setdefault(str(change.group_id), {
+                "group_id": str(change.group_id),
+                "enrollments_count": 0,
+                "agreed_total": Decimal(0),
+                "paid_total": Decimal(0),
+                "debt_total": Decimal(0),
+            })
+            group["paid_total"] += change.delta
+            group["debt_total"] += (
+                debt_of(change.agreed_price, change.paid_amount)
+                - debt_of(change.agreed_price, change.paid_amount - change.delta)
+            )
+        await self.add_group_deltas(list(per_group.values()))
+
+    async def rebuild(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Dict[str, int]:
+        """
+        Recompute rollups from payments and enrollments in bulk.
+
+        Payment rollups are replaced only within the given days; group
+        balances are always recomputed in full.
+
+        Returns:
+            Number of rollup rows written per table
+        """
+        day = _payment_day()
+        in_range = []
+        if date_from:
+            in_range.append(PaymentDailyRollup.day >= date_from)
+        if date_to:
+            in_range.append(PaymentDailyRollup.day <= date_to)
+        await self.session.execute(
+            delete(PaymentDailyRollup)
+            .where(*in_range)
+            .execution_options(synchronize_session=False)
+        )
+
+        source = (
+            select(
+                func.gen_random_uuid(),
+                day,
+                Group.course_id,
+                Payment.method,
+                Payment.status,
+                func.count(),
+                func.sum(Payment.amount),
+            )
+            .outerjoin(Enrollment, Enrollment.id == Payment.enrollment_id)
+            .outerjoin(Group, Group.id == Enrollment.group_id)
+            .group_by(day, Group.course_id, Payment.method, Payment.status)
+        )
+        if date_from:
+            source = source.where(day >= date_from)
+        if date_to:
+            source = source.where(day <= date_to)
+        payments = await self.session.execute(
+            pg_insert(PaymentDailyRollup).from_select(
+                ["id", "day", "course_id", "method", "status", "payments_count", "amount_total"],
+                source,
+            )
+        )
+
+        await self.session.execute(
+            delete(GroupBalance).execution_options(synchronize_session=False)
+        )
+        groups = await self.session.execute(
+            pg_insert(GroupBalance).from_select(
+                ["group_id", "enrollments_count", "agreed_total", "paid_total", "debt_total"],
+                select(
+                    Enrollment.group_id,
+                    func.count(),
+                    func.sum(Enrollment.agreed_price),
+                    func.sum(Enrollment.paid_amount),
+                    func.sum(func.greatest(Enrollment.agreed_price - Enrollment.paid_amount, 0)),
+                )
+                .where(Enrollment.status.in_(DEBT_BEARING_ENROLLMENT_STATUSES))
+                .group_by(Enrollment.group_id),
+            )
+        )
+
+        return {
+            "payment_rollups": payments.rowcount or 0,
+            "group_balances": groups.rowcount or 0,
+        }
+
+    async def get_revenue(
+        self,
+        dimension: ReportDimension,
+        date_from: date,
+        date_to: date,
+        previous_from: date,
+        status: Optional[str] = None,
+    ) -> List[Row]:
+        """
+        Aggregate rollups of a period and the one before it in one pass.
+
+        Previous-period days are shifted onto the current period before
+        bucketing, so day and month keys line up.
+
+        Returns:
+            (key, label, payments_count, amount_total, previous_count,
+            previous_amount) rows ordered by key
+        """
+        rollup = PaymentDailyRollup
+        current = rollup.day >= date_from
+        label = literal(None)
+
+        if dimension in (ReportDimension.DAY, ReportDimension.MONTH):
+            aligned = case(
+                (current, rollup.day),
+                else_=rollup.day + (date_from - previous_from).days,
+            )
+            key = aligned if dimension == ReportDimension.DAY else (
+                func.date_trunc("month", aligned).cast(Date)
+            )
+        elif dimension == ReportDimension.COURSE:
+            key = rollup.course_id
+            label = func.min(Course.name)
+        elif dimension == ReportDimension.METHOD:
+            key = rollup.method
+        else:
+            key = rollup.status
+
+        stmt = (
+            select(
+                key.label("key"),
+                label.label("label"),
+                func.coalesce(func.sum(rollup.payments_count).filter(current), 0)
+                .label("payments_count"),
+                func.coalesce(func.sum(rollup.amount_total).filter(current), 0)
+                .label("amount_total"),
+                func.coalesce(func.sum(rollup.payments_count).filter(~current), 0)
+                .label("previous_count"),
+                func.coalesce(func.sum(rollup.amount_total).filter(~current), 0)
+                .label("previous_amount"),
+            )
+            .where(rollup.day >= previous_from, rollup.day <= date_to)
+            .group_by(key)
+            .order_by(key)
+        )
+        if dimension == ReportDimension.COURSE:
+            # Deleted courses keep their name in the history
+            stmt = include_deleted(stmt.outerjoin(Course, Course.id == rollup.course_id))
+        if status:
+            stmt = stmt.where(rollup.status == status)
+
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def get_group_debts(
+        self,
+        course_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Row]:
+        """Get groups with outstanding debt, largest first."""
+        stmt = (
+            select(
+                GroupBalance.group_id,
+                Group.name.label("group_name"),
+                Group.course_id,
+                Course.name.label("course_name"),
+                GroupBalance.enrollments_count,
+                GroupBalance.agreed_total,
+                GroupBalance.paid_total,
+                GroupBalance.debt_total,
+            )
+            .join(Group, Group.id == GroupBalance.group_id)
+            .join(Course, Course.id == Group.course_id)
+            .where(GroupBalance.debt_total > 0)
+            .order_by(GroupBalance.debt_total.desc())
+            .limit(limit)
+        )
+        if course_id:
+            stmt = stmt.where(Group.course_id == course_id)
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def get_debt_total(self, course_id: Optional[str] = None) -> Decimal:
+        """Get total outstanding debt (of the groups get_group_debts lists)."""
+        # The join also drops deleted groups through the soft-delete filter
+        stmt = select(func.coalesce(func.sum(GroupBalance.debt_total), 0)).join(
+            Group, Group.id == GroupBalance.group_id
+        )
+        if course_id:
+            stmt = stmt.where(Group.course_id == course_id)
+        result = await self.session.execute(stmt)
+        return result.scalar()
@@ -20,7 +20,7 @@ class TestRepository(BaseRepository[Test]):
         """Get test with questions and options."""
         result = await self.session.execute(
             select(Test)
-            .where(Test.id == test_id, Test.deleted_at.is_(None))
+            .where(Test.id == test_id)
             .options(
                 selectinload(Test.questions).selectinload(TestQuestion.options)
             )
@@ -36,7 +36,7 @@ class TestRepository(BaseRepository[Test]):
         """List tests by course."""
         result = await self.session.execute(
             select(Test)
-            .where(Test.course_id == course_id, Test.deleted_at.is_(None))
+            .where(Test.course_id == course_id)
             .offset(skip)
             .limit(limit)
             .order_by(Test.created_at.desc())
@@ -46,9 +46,7 @@ class TestRepository(BaseRepository[Test]):
     async def count_by_course(self, course_id: str) -> int:
         """Count tests by course."""
         result = await self.session.execute(
-            select(func.count(Test.id)).where(
-                Test.course_id == course_id, Test.deleted_at.is_(None)
-            )
+            select(func.count(Test.id)).where(Test.course_id == course_id)
         )
         return result.scalar() or 0
 
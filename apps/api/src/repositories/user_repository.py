@@ -18,23 +18,21 @@ class UserRepository(BaseRepository[User]):
     async def get_by_phone(self, phone: str) -> Optional[User]:
         """Get user by phone number."""
         result = await self.session.execute(
-            select(User).where(User.phone == phone, User.deleted_at.is_(None))
+            select(User).where(User.phone == phone)
         )
         return result.scalar_one_or_none()
 
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         result = await self.session.execute(
-            select(User).where(User.email == email, User.deleted_at.is_(None))
+            select(User).where(User.email == email)
         )
         return result.scalar_one_or_none()
 
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """Get user by Telegram ID."""
         result = await self.session.execute(
-            select(User).where(
-                User.telegram_id == telegram_id, User.deleted_at.is_(None)
-            )
+            select(User).where(User.telegram_id == telegram_id)
         )
         return result.scalar_one_or_none()
 
@@ -49,7 +47,6 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(
             select(User)
             .where(
-                User.deleted_at.is_(None),
                 or_(
                     User.phone.ilike(search_pattern),
                     User.first_name.ilike(search_pattern),
@@ -71,7 +68,7 @@ class UserRepository(BaseRepository[User]):
         """Get users by role."""
         result = await self.session.execute(
             select(User)
-            .where(User.role == role, User.deleted_at.is_(None))
+            .where(User.role == role)
             .offset(skip)
             .limit(limit)
         )
@@ -80,9 +77,7 @@ class UserRepository(BaseRepository[User]):
     async def count_by_role(self, role: str) -> int:
         """Count users by role."""
         result = await self.session.execute(
-            select(func.count(User.id)).where(
-                User.role == role, User.deleted_at.is_(None)
-            )
+            select(func.count(User.id)).where(User.role == role)
         )
         return result.scalar() or 0
 
@@ -94,7 +89,7 @@ class UserRepository(BaseRepository[User]):
         """Get active users."""
         result = await self.session.execute(
             select(User)
-            .where(User.is_active.is_(True), User.deleted_at.is_(None))
+            .where(User.is_active.is_(True))
             .offset(skip)
             .limit(limit)
         )
@@ -0,0 +1,37 @@
+"""
+Dashboard schemas.
+"""
+
+from datetime import date, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class DashboardLesson(BaseModel):
+    """Lesson card on the teacher dashboard."""
+
+    lesson_id: str
+    title: str
+    lesson_number: int
+    start_time: time
+    end_time: time
+    status: str
+    group_id: str
+    group_name: str
+    room: Optional[str] = None
+    head_count: int = 0
+    marked_count: int = 0
+    present_count: int = 0
+    attendance_complete: bool = False
+
+
+class TeacherDashboardResponse(BaseModel):
+    """Teacher's lessons for a day."""
+
+    teacher_id: str
+    date: date
+    total_lessons: int = 0
+    total_students: int = 0
+    completed_lessons: int = 0  # lessons with attendance marked for everyone
+    lessons: List[DashboardLesson] = []
@@ -4,10 +4,12 @@ Group schemas.
 
 from datetime import date, time, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from shared.constants import EnrollmentStatus
+
 from src.schemas.common import PaginatedResponse
 
 
@@ -102,3 +104,14 @@ class EnrollStudentRequest(BaseModel):
     discount_reason: Optional[str] = None
     notes: Optional[str] = None
 
+
+class BulkEnrollRequest(BaseModel):
+    """Bulk enrollment request (class list import)."""
+
+    students: List[EnrollStudentRequest] = Field(..., min_length=1, max_length=500)
+
+
+class EnrollmentStatusUpdateRequest(BaseModel):
+    """Enrollment status change request."""
+
+    status: EnrollmentStatus
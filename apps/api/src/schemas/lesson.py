@@ -102,3 +102,16 @@ class AttendanceRequest(BaseModel):
 
     attendances: List[StudentAttendance]
 
+
+class LessonAttendance(BaseModel):
+    """Attendance for a single lesson inside a bulk request."""
+
+    lesson_id: str
+    attendances: List[StudentAttendance]
+
+
+class BulkAttendanceRequest(BaseModel):
+    """Attendance marking request for several lessons at once."""
+
+    lessons: List[LessonAttendance] = Field(..., min_length=1)
+
@@ -2,15 +2,29 @@
 Notification schemas.
 """
 
+import uuid
 from datetime import datetime
 from typing import Optional, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
-from shared.constants import NotificationType
+from shared.constants import (
+    BroadcastAudience,
+    EnrollmentStatus,
+    NotificationType,
+    UserRole,
+)
 from src.schemas.common import PaginatedResponse
 
 
+def _uuid(value: str) -> str:
+    """Canonical form of a UUID string."""
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        raise ValueError(f"{value!r} is not a valid UUID") from None
+
+
 class NotificationCreateRequest(BaseModel):
     """Notification creation request."""
 
@@ -20,7 +34,67 @@ class NotificationCreateRequest(BaseModel):
     message: str = Field(..., min_length=2)
     type: NotificationType = NotificationType.INFO
     action_url: Optional[str] = None
-    send_telegram: bool = True
+    # Default: Telegram for given users, in-app only for everyone
+    send_telegram: Optional[bool] = None
+
+    @field_validator("user_id")
+    @classmethod
+    def validate_user_id(cls, v: Optional[str]) -> Optional[str]:
+        """Validate the recipient ID."""
+        return _uuid(v) if v is not None else None
+
+    @field_validator("user_ids")
+    @classmethod
+    def validate_user_ids(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        """Validate the recipient IDs."""
+        return [_uuid(item) for item in v] if v is not None else None
+
+
+class BroadcastRequest(BaseModel):
+    """Notification broadcast request."""
+
+    audience: BroadcastAudience
+    roles: Optional[List[UserRole]] = None  # audience=role
+    course_id: Optional[str] = None  # audience=course
+    group_id: Optional[str] = None  # audience=group
+    user_ids: Optional[List[str]] = Field(None, max_length=50000)  # audience=users
+    # Enrollments counted for course/group audiences
+    enrollment_statuses: List[EnrollmentStatus] = Field(
+        default_factory=lambda: [EnrollmentStatus.ACTIVE],
+        min_length=1,
+    )
+    title: str = Field(..., min_length=2, max_length=255)
+    message: str = Field(..., min_length=2)
+    type: NotificationType = NotificationType.INFO
+    action_url: Optional[str] = None
+    # Telegram messages to a whole audience are opt-in
+    send_telegram: bool = False
+
+    @field_validator("course_id", "group_id")
+    @classmethod
+    def validate_id(cls, v: Optional[str]) -> Optional[str]:
+        """Validate course and group IDs."""
+        return _uuid(v) if v is not None else None
+
+    @field_validator("user_ids")
+    @classmethod
+    def validate_user_ids(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        """Validate the recipient IDs."""
+        return [_uuid(item) for item in v] if v is not None else None
+
+
+class BroadcastResponse(BaseModel):
+    """Notification broadcast result."""
+
+    audience: str
+    recipients_count: int
+
+
+class StreamTokenResponse(BaseModel):
+    """Token for opening the notification stream."""
+
+    token: str
+    expires_in: int
 
 
 class NotificationResponse(BaseModel):
@@ -35,6 +109,7 @@ class NotificationResponse(BaseModel):
     read_at: Optional[datetime] = None
     sent_via_telegram: bool
     sent_at: Optional[datetime] = None
+    telegram_status: Optional[str] = None
     action_url: Optional[str] = None
     created_at: datetime
 
@@ -4,7 +4,7 @@ Payment schemas.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -65,3 +65,53 @@ class PaymentListResponse(PaginatedResponse[PaymentBriefResponse]):
 
     pass
 
+
+class EnrollmentBalance(BaseModel):
+    """Paid amount and debt of one enrollment."""
+
+    enrollment_id: str
+    group_id: str
+    status: str
+    agreed_price: Decimal
+    paid_amount: Decimal
+    debt: Decimal
+
+
+class BalanceResponse(BaseModel):
+    """User's confirmed payments and debts."""
+
+    user_id: str
+    paid_total: Decimal
+    debt_total: Decimal
+    enrollments: List[EnrollmentBalance] = []
+
+
+class StatementMismatch(BaseModel):
+    """Provider statement row that was not applied."""
+
+    line: int  # CSV line or JSON item number
+    type: str
+    external_id: Optional[str] = None
+    payment_id: Optional[str] = None
+    amount: Optional[Decimal] = None  # amount in our records
+    statement_amount: Optional[Decimal] = None
+    status: Optional[str] = None  # status in our records
+    statement_status: Optional[str] = None
+    message: str = ""
+
+
+class StatementImportResponse(BaseModel):
+    """Result of a provider statement import."""
+
+    provider: str
+    dry_run: bool = False
+    total_rows: int = 0
+    confirmed: int = 0  # pending payments completed
+    cancelled: int = 0  # pending payments cancelled
+    created: int = 0  # payments created from enrollment references
+    linked: int = 0  # completed payments given their provider ID
+    unchanged: int = 0  # already in the statement's state
+    skipped: int = 0  # still in progress at the provider
+    mismatch_count: int = 0
+    mismatches: List[StatementMismatch] = []  # first MAX_REPORTED_MISMATCHES
+    duration_ms: int = 0
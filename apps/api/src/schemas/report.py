@@ -0,0 +1,58 @@
+"""
+Financial report schemas.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class RevenueRow(BaseModel):
+    """One bucket of a revenue report with the previous period's figures."""
+
+    key: Optional[str] = None  # day, month start, course ID, method or status
+    label: Optional[str] = None  # course name
+    payments_count: int = 0
+    amount: Decimal = Decimal(0)
+    previous_count: int = 0
+    previous_amount: Decimal = Decimal(0)
+    change_percent: Optional[float] = None  # None when previous amount is zero
+
+
+class RevenueReport(BaseModel):
+    """Revenue grouped by a dimension, compared with the previous period."""
+
+    group_by: str
+    status: Optional[str] = None
+    date_from: date
+    date_to: date
+    previous_from: date
+    previous_to: date
+    payments_count: int = 0
+    amount: Decimal = Decimal(0)
+    previous_count: int = 0
+    previous_amount: Decimal = Decimal(0)
+    change_percent: Optional[float] = None
+    items: List[RevenueRow] = []
+
+
+class GroupDebt(BaseModel):
+    """Outstanding debt of a group."""
+
+    group_id: str
+    group_name: str
+    course_id: str
+    course_name: str
+    enrollments_count: int
+    agreed_total: Decimal
+    paid_total: Decimal
+    debt_total: Decimal
+
+
+class DebtReport(BaseModel):
+    """Groups with outstanding debt."""
+
+    debt_total: Decimal = Decimal(0)
+    items: List[GroupDebt] = []
@@ -0,0 +1,72 @@
+"""
+Schedule schemas.
+"""
+
+from datetime import date, time
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ScheduleGenerateRequest(BaseModel):
+    """Term schedule generation request."""
+
+    group_ids: Optional[List[str]] = Field(
+        None, description="Groups to schedule (all active groups if omitted)"
+    )
+    date_from: Optional[date] = Field(
+        None, description="Generate from this date (group start date if omitted)"
+    )
+    replace: bool = Field(
+        False, description="Regenerate scheduled lessons that have no attendance yet"
+    )
+    preview: bool = Field(False, description="Return lessons without saving them")
+
+
+class ScheduledLesson(BaseModel):
+    """Generated lesson."""
+
+    group_id: str
+    lesson_number: int
+    title: str
+    date: date
+    start_time: time
+    end_time: time
+    teacher_id: Optional[str] = None
+
+
+class ScheduleConflict(BaseModel):
+    """Two lessons using the same room or teacher at overlapping times."""
+
+    resource_type: str  # "room" | "teacher"
+    resource: str
+    date: date
+    lesson_id: Optional[str] = None  # None for a lesson not saved yet
+    group_id: str
+    start_time: time
+    end_time: time
+    other_lesson_id: Optional[str] = None
+    other_group_id: str
+    other_start_time: time
+    other_end_time: time
+
+
+class ScheduleGenerateResponse(BaseModel):
+    """Term schedule generation result."""
+
+    groups: int
+    lessons: int
+    replaced: int = 0
+    skipped_groups: List[str] = []
+    conflicts: List[ScheduleConflict] = []
+    preview: bool = False
+    items: List[ScheduledLesson] = []
+
+
+class ScheduleConflictReport(BaseModel):
+    """Conflicts in a date range."""
+
+    date_from: date
+    date_to: date
+    total: int
+    items: List[ScheduleConflict] = []
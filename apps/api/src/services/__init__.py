@@ -6,8 +6,15 @@ from src.services.auth_service import AuthService
 from src.services.user_service import UserService
 from src.services.course_service import CourseService
 from src.services.group_service import GroupService
+from src.services.gradebook_service import GradebookService
 from src.services.lesson_service import LessonService
+from src.services.schedule_service import ScheduleService
+from src.services.conflict_service import ConflictService
+from src.services.dashboard_service import DashboardService
+from src.services.timetable_service import TimetableService
 from src.services.payment_service import PaymentService
+from src.services.report_service import ReportService
+from src.services.statement_service import StatementService
 from src.services.notification_service import NotificationService
 
 __all__ = [
@@ -15,8 +22,15 @@ __all__ = [
     "UserService",
     "CourseService",
     "GroupService",
+    "GradebookService",
     "LessonService",
+    "ScheduleService",
+    "ConflictService",
+    "DashboardService",
+    "TimetableService",
     "PaymentService",
+    "ReportService",
+    "StatementService",
     "NotificationService",
 ]
 
@@ -117,6 +117,7 @@ class AuthService:
         # Try to send code via Telegram if user has telegram_id
         # (User might register via web but have telegram_id from bot)
         # IMPORTANT: Telegram auth orqali tekshirish - agar telegram_id bo'lsa, kod Telegram orqali yuboriladi
+        # Kod fonda yuboriladi: ro'yxatdan o'tish Telegram javobini kutmaydi
         if user.telegram_id:
             try:
                 await self.telegram_service.send_verification_code(
@@ -124,6 +125,7 @@ class AuthService:
                     code=code,
                     phone=request.phone,
                     is_login=False,
+                    background=True,
                 )
             except Exception:
                 # Telegram yuborish xatolik bo'lsa ham, kod saqlanadi (fallback SMS yoki boshqa usul)
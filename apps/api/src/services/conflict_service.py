@@ -0,0 +1,244 @@
+"""
+Schedule conflict detection.
+
+Lessons are bucketed per resource (room or teacher) and day. Each bucket is
+a list of intervals sorted by start time with a running maximum of end
+times, so finding the bookings that overlap a new interval is a bisect plus
+a walk over the actual overlaps: O(log n + k) instead of a pairwise scan.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import Row
+
+from shared import ValidationError
+
+from src.schemas.schedule import ScheduleConflict
+from src.repositories.lesson_repository import LessonRepository
+
+
+# Longest range the conflict report accepts
+MAX_REPORT_DAYS = 366
+
+
+class Booking(NamedTuple):
+    """A lesson occupying a room and a teacher for a time interval."""
+
+    lesson_id: Optional[str]
+    group_id: str
+    date: date
+    start_time: time
+    end_time: time
+    room: Optional[str]
+    teacher_id: Optional[str]
+
+
+def normalize_room(room: Optional[str]) -> Optional[str]:
+    """Rooms are free text: "101 " and "101" are the same room."""
+    if not room or not room.strip():
+        return None
+    return room.strip().lower()
+
+
+class _Bucket:
+    """Intervals of one resource on one day, sorted by start."""
+
+    __slots__ = ("starts", "entries", "max_ends")
+
+    def __init__(self) -> None:
+        self.starts: List[time] = []
+        self.entries: List[tuple] = []
+        self.max_ends: List[time] = []
+
+    def add(self, start: time, end: time, item: Any) -> None:
+        pos = bisect_right(self.starts, start)
+        self.starts.insert(pos, start)
+        self.entries.insert(pos, (start, end, item))
+        self.max_ends.insert(pos, end)
+        running = self.max_ends[pos - 1] if pos else end
+        for i in range(pos, len(self.entries)):
+            running = max(running, self.entries[i][1])
+            self.max_ends[i] = running
+
+    def overlapping(self, start: time, end: time) -> List[Any]:
+        # Only intervals starting before `end` can overlap; walk back while
+        # some interval at or before i still ends after `start`.
+        i = bisect_left(self.starts, end) - 1
+        found = []
+        while i >= 0 and self.max_ends[i] > start:
+            if self.entries[i][1] > start:
+                found.append(self.entries[i][2])
+            i -= 1
+        found.reverse()
+        return found
+
+
+class IntervalIndex:
+    """Per-resource, per-day interval index."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[tuple, _Bucket] = {}
+
+    def add(self, key: Hashable, day: date, start: time, end: time, item: Any) -> None:
+        """Book [start, end) for a resource."""
+        bucket = self._buckets.get((key, day))
+        if bucket is None:
+            bucket = self._buckets[(key, day)] = _Bucket()
+        bucket.add(start, end, item)
+
+    def overlapping(self, key: Hashable, day: date, start: time, end: time) -> List[Any]:
+        """Items booked on the resource that overlap [start, end)."""
+        bucket = self._buckets.get((key, day))
+        if bucket is None:
+            return []
+        return bucket.overlapping(start, end)
+
+
+class ScheduleIndex:
+    """Room and teacher interval indexes over lessons."""
+
+    def __init__(self, bookings: Iterable[Booking] = ()) -> None:
+        self.rooms = IntervalIndex()
+        self.teachers = IntervalIndex()
+        for booking in bookings:
+            self.add(booking)
+
+    def add(self, booking: Booking) -> None:
+        """Add a lesson to the indexes."""
+        room = normalize_room(booking.room)
+        if room:
+            self.rooms.add(room, booking.date, booking.start_time, booking.end_time, booking)
+        if booking.teacher_id:
+            self.teachers.add(
+                str(booking.teacher_id),
+                booking.date,
+                booking.start_time,
+                booking.end_time,
+                booking,
+            )
+
+    def conflicts(self, booking: Booking) -> List[ScheduleConflict]:
+        """Conflicts of a lesson with the indexed ones."""
+        found = []
+        room = normalize_room(booking.room)
+        if room:
+            for other in self.rooms.overlapping(
+                room, booking.date, booking.start_time, booking.end_time
+            ):
+                found.append(self._conflict("room", booking.room, booking, other))
+        if booking.teacher_id:
+            for other in self.teachers.overlapping(
+                str(booking.teacher_id), booking.date, booking.start_time, booking.end_time
+            ):
+                found.append(self._conflict("teacher", str(booking.teacher_id), booking, other))
+        return found
+
+    def check_and_add(self, booking: Booking) -> List[ScheduleConflict]:
+        """Conflicts of a lesson, then add it to the indexes."""
+        found = self.conflicts(booking)
+        self.add(booking)
+        return found
+
+    @staticmethod
+    def _conflict(
+        resource_type: str,
+        resource: str,
+        booking: Booking,
+        other: Booking,
+    ) -> ScheduleConflict:
+        return ScheduleConflict(
+            resource_type=resource_type,
+            resource=resource,
+            date=booking.date,
+            lesson_id=booking.lesson_id,
+            group_id=str(booking.group_id),
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            other_lesson_id=other.lesson_id,
+            other_group_id=str(other.group_id),
+            other_start_time=other.start_time,
+            other_end_time=other.end_time,
+        )
+
+
+class ConflictService:
+    """Schedule conflict service."""
+
+    def __init__(self, lesson_repo: LessonRepository):
+        """Initialize service."""
+        self.lesson_repo = lesson_repo
+
+    async def check(
+        self,
+        bookings: List[Booking],
+        exclude_lesson_id: Optional[str] = None,
+        skip: Optional[Callable[[Row], bool]] = None,
+    ) -> List[ScheduleConflict]:
+        """
+        Check new lessons against stored ones and each other.
+
+        Args:
+            bookings: Lessons to be created or moved
+            exclude_lesson_id: Stored lesson being moved (not a conflict with itself)
+            skip: Predicate for stored lessons that are about to be removed
+
+        Returns:
+            Conflicts of the new lessons
+        """
+        if not bookings:
+            return []
+
+        rooms = {normalize_room(b.room) for b in bookings} - {None}
+        teacher_ids = {str(b.teacher_id) for b in bookings if b.teacher_id}
+        rows = await self.lesson_repo.get_bookings(
+            min(b.date for b in bookings),
+            max(b.date for b in bookings),
+            rooms=list(rooms),
+            teacher_ids=list(teacher_ids),
+            exclude_lesson_id=exclude_lesson_id,
+        )
+        index = ScheduleIndex(
+            Booking(*row[:7]) for row in rows if not (skip and skip(row))
+        )
+
+        conflicts = []
+        for booking in sorted(bookings, key=lambda b: (b.date, b.start_time)):
+            conflicts.extend(index.check_and_add(booking))
+        return conflicts
+
+    async def find_conflicts(
+        self,
+        date_from: date,
+        date_to: date,
+    ) -> List[ScheduleConflict]:
+        """
+        Find room and teacher double bookings in a date range.
+
+        Args:
+            date_from: First date (inclusive)
+            date_to: Last date (inclusive)
+
+        Returns:
+            Conflicting lesson pairs
+
+        Raises:
+            ValidationError: If range is invalid or too long
+        """
+        if date_to < date_from:
+            raise ValidationError("date_to must not be before date_from")
+        if (date_to - date_from).days >= MAX_REPORT_DAYS:
+            raise ValidationError(f"Date range must not exceed {MAX_REPORT_DAYS} days")
+
+        rows = await self.lesson_repo.get_bookings(date_from, date_to)
+        bookings = sorted(
+            (Booking(*row[:7]) for row in rows),
+            key=lambda b: (b.date, b.start_time),
+        )
+
+        index = ScheduleIndex()
+        conflicts = []
+        for booking in bookings:
+            conflicts.extend(index.check_and_add(booking))
+        return conflicts
@@ -2,13 +2,17 @@
 Course service.
 """
 
+import logging
 import uuid
 from typing import Optional
 
-from shared import NotFoundError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared import NotFoundError, get_settings
 from shared.utils import slugify
-from shared.constants import CourseStatus
+from shared.constants import CATALOG_VERSION_KEY, CourseStatus
 from db.models import Course
+from db.session import run_on_commit
 
 from src.schemas.course import (
     CourseCreateRequest,
@@ -21,6 +25,46 @@ from src.schemas.common import PaginationParams
 from src.repositories.course_repository import CourseRepository
 
 
+logger = logging.getLogger(__name__)
+
+_redis = None
+
+
+def get_catalog_redis():
+    """Redis client used to bump the catalog version."""
+    global _redis
+    if _redis is None:
+        from redis import asyncio as aioredis
+
+        _redis = aioredis.from_url(get_settings().redis_cache_url)
+    return _redis
+
+
+async def close_catalog_redis() -> None:
+    """Close the client on shutdown."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def bump_catalog_version() -> None:
+    """Tell bot replicas that the course catalog changed."""
+    try:
+        await get_catalog_redis().incr(CATALOG_VERSION_KEY)
+    except Exception:
+        # Bots still reload after bot_catalog_ttl
+        logger.warning("Course catalog version bump failed", exc_info=True)
+
+
+def catalog_changed_on_commit(session: AsyncSession) -> None:
+    """Bump the bot catalog version once the session's transaction commits."""
+    if get_settings().bot_cache_backend != "redis":
+        return
+    # One bump per transaction, however many courses it changed
+    run_on_commit(session, bump_catalog_version, key=CATALOG_VERSION_KEY)
+
+
 class CourseService:
     """Course service."""
 
@@ -194,6 +238,7 @@ class CourseService:
         )
 
         await self.course_repo.create(course)
+        catalog_changed_on_commit(self.course_repo.session)
         return CourseResponse.model_validate(course)
 
     async def update_course(
@@ -224,6 +269,7 @@ class CourseService:
             update_data["slug"] = slugify(update_data["name"])
 
         await self.course_repo.update(course, **update_data)
+        catalog_changed_on_commit(self.course_repo.session)
         return CourseResponse.model_validate(course)
 
     async def delete_course(self, course_id: str) -> None:
@@ -241,6 +287,7 @@ class CourseService:
             raise NotFoundError("Course", course_id)
 
         await self.course_repo.soft_delete(course)
+        catalog_changed_on_commit(self.course_repo.session)
 
     async def publish_course(self, course_id: str) -> CourseResponse:
         """
@@ -260,5 +307,6 @@ class CourseService:
             raise NotFoundError("Course", course_id)
 
         await self.course_repo.update(course, status=CourseStatus.PUBLISHED.value)
+        catalog_changed_on_commit(self.course_repo.session)
         return CourseResponse.model_validate(course)
 
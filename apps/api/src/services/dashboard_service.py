@@ -0,0 +1,97 @@
+"""
+Dashboard service.
+
+Read model for the teacher "today" screen: one aggregate query per
+(teacher, day), cached in-process for a short TTL so repeated app opens
+do not hit the database.
+"""
+
+import time
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from shared.constants import CACHE_TTL_SHORT
+
+from src.schemas.dashboard import DashboardLesson, TeacherDashboardResponse
+from src.repositories.lesson_repository import LessonRepository
+
+
+DASHBOARD_CACHE_TTL_SECONDS = CACHE_TTL_SHORT
+_DASHBOARD_CACHE_MAX_ENTRIES = 1000
+
+# (teacher_id, day) -> (expires_at monotonic, response); in-memory, per-process
+_dashboard_cache: Dict[Tuple[str, date], Tuple[float, TeacherDashboardResponse]] = {}
+
+
+def clear_dashboard_cache() -> None:
+    """Drop all cached dashboards."""
+    _dashboard_cache.clear()
+
+
+class DashboardService:
+    """Dashboard service."""
+
+    def __init__(self, lesson_repo: LessonRepository):
+        """Initialize service."""
+        self.lesson_repo = lesson_repo
+
+    async def get_teacher_today(
+        self,
+        teacher_id: str,
+        day: Optional[date] = None,
+    ) -> TeacherDashboardResponse:
+        """
+        Get teacher's lessons of a day with head counts and attendance progress.
+
+        Args:
+            teacher_id: Teacher user ID
+            day: Date (today if not given)
+
+        Returns:
+            Dashboard (may be up to DASHBOARD_CACHE_TTL_SECONDS old)
+        """
+        day = day or date.today()
+        key = (teacher_id, day)
+        now = time.monotonic()
+
+        cached = _dashboard_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        rows = await self.lesson_repo.get_teacher_day(teacher_id, day)
+        lessons = [
+            DashboardLesson(
+                lesson_id=str(row.lesson_id),
+                title=row.title,
+                lesson_number=row.lesson_number,
+                start_time=row.start_time,
+                end_time=row.end_time,
+                status=row.status,
+                group_id=str(row.group_id),
+                group_name=row.group_name,
+                room=row.room,
+                head_count=row.head_count,
+                marked_count=row.marked_count,
+                present_count=row.present_count,
+                attendance_complete=row.head_count > 0 and row.marked_count >= row.head_count,
+            )
+            for row in rows
+        ]
+        response = TeacherDashboardResponse(
+            teacher_id=teacher_id,
+            date=day,
+            total_lessons=len(lessons),
+            total_students=sum(
+                {lesson.group_id: lesson.head_count for lesson in lessons}.values()
+            ),
+            completed_lessons=sum(lesson.attendance_complete for lesson in lessons),
+            lessons=lessons,
+        )
+
+        if len(_dashboard_cache) >= _DASHBOARD_CACHE_MAX_ENTRIES:
+            for stale in [k for k, (expires_at, _) in _dashboard_cache.items() if expires_at <= now]:
+                del _dashboard_cache[stale]
+            if len(_dashboard_cache) >= _DASHBOARD_CACHE_MAX_ENTRIES:
+                _dashboard_cache.clear()
+        _dashboard_cache[key] = (now + DASHBOARD_CACHE_TTL_SECONDS, response)
+        return response
@@ -0,0 +1,224 @@
+"""
+Gradebook service.
+
+Builds the students x lessons matrix of attendance status, grade and
+homework grade for a group from raw column tuples. Cells live in flat typed
+arrays (one slot per student/lesson pair, -1 = empty) addressed through
+index maps, so no ORM objects are created and per-student statistics reduce
+to C-level ``count``/``sum`` calls over row slices.
+"""
+
+import csv
+import io
+import json
+from array import array
+from datetime import date
+from typing import Iterator, List, Optional
+
+from shared import NotFoundError
+from shared.constants import AttendanceStatus
+
+from src.repositories.group_repository import GroupRepository
+from src.repositories.lesson_repository import LessonRepository
+
+
+EMPTY = -1
+
+# Status <-> compact code (index in this tuple)
+STATUS_CODES = tuple(status.value for status in AttendanceStatus)
+_STATUS_INDEX = {status: code for code, status in enumerate(STATUS_CODES)}
+_PRESENT_CODES = (
+    _STATUS_INDEX[AttendanceStatus.PRESENT.value],
+    _STATUS_INDEX[AttendanceStatus.LATE.value],
+)
+
+
+class Gradebook:
+    """Dense students x lessons matrix backed by typed arrays."""
+
+    def __init__(
+        self,
+        group_id: str,
+        lessons: List[tuple],
+        students: List[tuple],
+    ):
+        """
+        Initialize empty matrix.
+
+        Args:
+            group_id: Group ID
+            lessons: (id, lesson_number, date) rows in column order
+            students: (id, first_name, last_name) rows in row order
+        """
+        self.group_id = group_id
+        self.lessons = lessons
+        self.students = []
+        self.lesson_index: dict[str, int] = {}
+        self.student_index: dict[str, int] = {}
+
+        for lesson in lessons:
+            self.lesson_index.setdefault(str(lesson[0]), len(self.lesson_index))
+        for student in students:
+            student_id = str(student[0])
+            if student_id not in self.student_index:
+                self.student_index[student_id] = len(self.students)
+                self.students.append(student)
+
+        size = len(self.students) * len(self.lessons)
+        self.status = array("b", [EMPTY]) * size
+        self.grade = array("h", [EMPTY]) * size
+        self.homework_grade = array("h", [EMPTY]) * size
+
+    @property
+    def width(self) -> int:
+        """Number of lessons (row length)."""
+        return len(self.lessons)
+
+    def fill(self, cells: List[tuple]) -> None:
+        """
+        Place raw attendance tuples into the matrix.
+
+        Args:
+            cells: (lesson_id, student_id, status, grade, homework_grade) rows
+        """
+        width = self.width
+        for lesson_id, student_id, status, grade, homework_grade in cells:
+            row = self.student_index.get(str(student_id))
+            col = self.lesson_index.get(str(lesson_id))
+            if row is None or col is None:
+                continue
+            pos = row * width + col
+            self.status[pos] = _STATUS_INDEX.get(status, EMPTY)
+            if grade is not None:
+                self.grade[pos] = grade
+            if homework_grade is not None:
+                self.homework_grade[pos] = homework_grade
+
+    @staticmethod
+    def _average(values: array) -> Optional[float]:
+        """Average of non-empty slots (empty slots are -1 each)."""
+        empty = values.count(EMPTY)
+        filled = len(values) - empty
+        if not filled:
+            return None
+        return round((sum(values) + empty) / filled, 2)
+
+    def student_stats(self, row: int) -> dict:
+        """Compute average grades and attendance rate for one student."""
+        start = row * self.width
+        end = start + self.width
+        statuses = self.status[start:end]
+        marked = len(statuses) - statuses.count(EMPTY)
+        present = sum(statuses.count(code) for code in _PRESENT_CODES)
+        return {
+            "average_grade": self._average(self.grade[start:end]),
+            "average_homework_grade": self._average(self.homework_grade[start:end]),
+            "attendance_rate": round(present / marked, 4) if marked else None,
+        }
+
+    def _cells(self, row: int) -> Iterator[tuple]:
+        """Yield (status, grade, homework_grade) for one student row."""
+        start = row * self.width
+        for pos in range(start, start + self.width):
+            code = self.status[pos]
+            grade = self.grade[pos]
+            homework_grade = self.homework_grade[pos]
+            yield (
+                STATUS_CODES[code] if code != EMPTY else None,
+                grade if grade != EMPTY else None,
+                homework_grade if homework_grade != EMPTY else None,
+            )
+
+    def iter_json(self) -> Iterator[str]:
+        """Stream the matrix as a JSON document, one student per chunk."""
+        lessons = [
+            {"id": str(lesson_id), "lesson_number": number, "date": day.isoformat()}
+            for lesson_id, number, day in self.lessons
+        ]
+        yield (
+            f'{{"group_id": {json.dumps(self.group_id)}, '
+            f'"lessons": {json.dumps(lessons)}, "students": ['
+        )
+        for row, (student_id, first_name, last_name) in enumerate(self.students):
+            item = {
+                "id": str(student_id),
+                "name": f"{first_name} {last_name}",
+                "cells": list(self._cells(row)),
+                **self.student_stats(row),
+            }
+            yield ("," if row else "") + json.dumps(item)
+        yield "]}"
+
+    def iter_csv(self) -> Iterator[str]:
+        """Stream the matrix as CSV, one student per chunk."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        header = ["student_id", "student_name"]
+        for _, number, day in self.lessons:
+            label = f"#{number} {day.isoformat()}"
+            header += [f"{label} status", f"{label} grade", f"{label} homework"]
+        header += ["average_grade", "average_homework_grade", "attendance_rate"]
+        writer.writerow(header)
+
+        for row, (student_id, first_name, last_name) in enumerate(self.students):
+            line = [str(student_id), f"{first_name} {last_name}"]
+            for cell in self._cells(row):
+                line += ["" if value is None else value for value in cell]
+            stats = self.student_stats(row)
+            line += [
+                "" if stats[key] is None else stats[key]
+                for key in ("average_grade", "average_homework_grade", "attendance_rate")
+            ]
+            writer.writerow(line)
+
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+class GradebookService:
+    """Gradebook service."""
+
+    def __init__(
+        self,
+        group_repo: GroupRepository,
+        lesson_repo: LessonRepository,
+    ):
+        """Initialize service."""
+        self.group_repo = group_repo
+        self.lesson_repo = lesson_repo
+
+    async def get_gradebook(
+        self,
+        group_id: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Gradebook:
+        """
+        Build gradebook for a group.
+
+        Args:
+            group_id: Group ID
+            date_from: First lesson date (inclusive)
+            date_to: Last lesson date (inclusive)
+
+        Returns:
+            Filled gradebook matrix
+
+        Raises:
+            NotFoundError: If group not found
+        """
+        if not await self.group_repo.exists(group_id):
+            raise NotFoundError("Group", group_id)
+
+        lessons = await self.lesson_repo.get_gradebook_lessons(group_id, date_from, date_to)
+        students = await self.group_repo.get_roster(group_id)
+        cells = await self.lesson_repo.get_gradebook_cells(group_id, date_from, date_to)
+
+        gradebook = Gradebook(group_id, lessons, students)
+        gradebook.fill(cells)
+        return gradebook
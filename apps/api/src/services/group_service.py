@@ -2,12 +2,18 @@
 Group service.
 """
 
-from typing import Optional
+from typing import List, Optional
 from datetime import date
+from decimal import Decimal
 
 from shared import NotFoundError, ValidationError
-from shared.constants import EnrollmentStatus
-from db.models import Group, Enrollment
+from shared.exceptions import ConflictError
+from shared.constants import (
+    DEBT_BEARING_ENROLLMENT_STATUSES,
+    SEAT_HOLDING_ENROLLMENT_STATUSES,
+    EnrollmentStatus,
+)
+from db.models import Group
 
 from src.schemas.group import (
     GroupCreateRequest,
@@ -16,17 +22,21 @@ from src.schemas.group import (
     GroupListResponse,
     GroupBriefResponse,
     EnrollStudentRequest,
+    BulkEnrollRequest,
+    EnrollmentStatusUpdateRequest,
 )
 from src.schemas.common import PaginationParams
 from src.repositories.group_repository import GroupRepository
+from src.repositories.report_repository import ReportRepository, debt_of
 
 
 class GroupService:
     """Group service."""
 
-    def __init__(self, group_repo: GroupRepository):
+    def __init__(self, group_repo: GroupRepository, report_repo: ReportRepository):
         """Initialize service."""
         self.group_repo = group_repo
+        self.report_repo = report_repo
 
     async def get_group(self, group_id: str) -> GroupResponse:
         """
@@ -187,27 +197,169 @@ class GroupService:
 
         Raises:
             NotFoundError: If group not found
+            ConflictError: If student is already enrolled
             ValidationError: If group is full
         """
-        group = await self.group_repo.get_with_relations(group_id)
-        if not group:
+        await self.enroll_students(group_id, [request])
+
+    async def enroll_students_bulk(
+        self,
+        group_id: str,
+        request: BulkEnrollRequest,
+    ) -> int:
+        """
+        Enroll a class list to group.
+
+        Students already holding a seat in the group are skipped. Seats for
+        the rest are reserved all-or-nothing.
+
+        Args:
+            group_id: Group ID
+            request: Enrollment data per student
+
+        Returns:
+            Number of students enrolled
+
+        Raises:
+            NotFoundError: If group not found
+            ValidationError: If group does not have enough free seats
+        """
+        return await self.enroll_students(group_id, request.students, skip_enrolled=True)
+
+    async def enroll_students(
+        self,
+        group_id: str,
+        students: List[EnrollStudentRequest],
+        skip_enrolled: bool = False,
+    ) -> int:
+        """
+        Reserve seats and insert pending enrollments.
+
+        Args:
+            group_id: Group ID
+            students: Enrollment data per student
+            skip_enrolled: Skip instead of rejecting already enrolled students
+
+        Returns:
+            Number of students enrolled
+
+        Raises:
+            NotFoundError: If group not found
+            ConflictError: If a student is already enrolled and not skipped
+            ValidationError: If group does not have enough free seats
+        """
+        # Held until commit, so no concurrent request enrolls the same student
+        if not await self.group_repo.lock(group_id):
             raise NotFoundError("Group", group_id)
 
-        if not group.has_capacity:
+        # Last entry wins for repeated students
+        requests = {item.student_id: item for item in students}
+        enrolled = await self.group_repo.get_enrolled_student_ids(group_id, list(requests))
+        if enrolled and not skip_enrolled:
+            raise ConflictError("Student is already enrolled in this group")
+        requests = {
+            student_id: item
+            for student_id, item in requests.items()
+            if student_id not in enrolled
+        }
+        if not requests:
+            return 0
+
+        if not await self.group_repo.reserve_seats(group_id, len(requests)):
             raise ValidationError("Group is full")
 
-        # Create enrollment
-        enrollment = Enrollment(
-            student_id=request.student_id,
-            group_id=group_id,
-            enrolled_at=date.today(),
-            agreed_price=request.agreed_price,
-            discount_percent=request.discount_percent,
-            discount_reason=request.discount_reason,
-            notes=request.notes,
-            status=EnrollmentStatus.PENDING.value,
+        today = date.today()
+        await self.group_repo.add_enrollments([
+            {
+                "student_id": student_id,
+                "group_id": group_id,
+                "enrolled_at": today,
+                "agreed_price": item.agreed_price,
+                "discount_percent": item.discount_percent,
+                "discount_reason": item.discount_reason,
+                "notes": item.notes,
+                "status": EnrollmentStatus.PENDING.value,
+            }
+            for student_id, item in requests.items()
+        ])
+
+        agreed_total = sum((item.agreed_price for item in requests.values()), Decimal(0))
+        await self.report_repo.add_group_delta(
+            group_id,
+            enrollments_count=len(requests),
+            agreed_total=agreed_total,
+            debt_total=agreed_total,
         )
+        return len(requests)
 
-        self.group_repo.session.add(enrollment)
-        await self.group_repo.session.flush()
+    async def update_enrollment_status(
+        self,
+        group_id: str,
+        enrollment_id: str,
+        request: EnrollmentStatusUpdateRequest,
+    ) -> None:
+        """
+        Change enrollment status.
+
+        Args:
+            group_id: Group ID
+            enrollment_id: Enrollment ID
+            request: New status
 
+        Raises:
+            NotFoundError: If group or enrollment not found
+            ValidationError: If re-admitting into a full group
+            ConflictError: If enrollment was changed concurrently, or the
+                student already holds another seat in the group
+        """
+        if not await self.group_repo.lock(group_id):
+            raise NotFoundError("Group", group_id)
+
+        enrollment = await self.group_repo.get_enrollment(group_id, enrollment_id)
+        if not enrollment:
+            raise NotFoundError("Enrollment", enrollment_id)
+
+        status = request.status.value
+        previous = enrollment.status
+        if status == previous:
+            return
+
+        delta = (
+            (status in SEAT_HOLDING_ENROLLMENT_STATUSES)
+            - (previous in SEAT_HOLDING_ENROLLMENT_STATUSES)
+        )
+        if delta > 0:
+            # Re-admitted while a newer enrollment holds the seat
+            if await self.group_repo.get_enrolled_student_ids(group_id, [enrollment.student_id]):
+                raise ConflictError("Student is already enrolled in this group")
+            if not await self.group_repo.reserve_seats(group_id):
+                raise ValidationError("Group is full")
+
+        if not await self.group_repo.set_enrollment_status(enrollment, status):
+            raise ConflictError("Enrollment was modified, please retry")
+
+        if delta < 0:
+            await self.group_repo.release_seats(group_id)
+
+        # Dropping an enrollment removes it from the group's debt
+        sign = (
+            (status in DEBT_BEARING_ENROLLMENT_STATUSES)
+            - (previous in DEBT_BEARING_ENROLLMENT_STATUSES)
+        )
+        if sign:
+            await self.report_repo.add_group_delta(
+                group_id,
+                enrollments_count=sign,
+                agreed_total=sign * enrollment.agreed_price,
+                paid_total=sign * enrollment.paid_amount,
+                debt_total=sign * debt_of(enrollment.agreed_price, enrollment.paid_amount),
+            )
+
+    async def reconcile_counters(self) -> int:
+        """
+        Recompute seat counters of all groups.
+
+        Returns:
+            Number of groups whose counter was corrected
+        """
+        return await self.group_repo.reconcile_reserved_seats()
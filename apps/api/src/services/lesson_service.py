@@ -3,10 +3,12 @@ Lesson service.
 """
 
 from datetime import date
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from shared import NotFoundError
-from db.models import User, Lesson, Attendance
+from shared import NotFoundError, ValidationError
+from shared.constants import LessonStatus
+from shared.exceptions import ConflictError
+from db.models import User, Lesson
 
 from src.schemas.lesson import (
     LessonCreateRequest,
@@ -15,9 +17,13 @@ from src.schemas.lesson import (
     LessonListResponse,
     LessonBriefResponse,
     AttendanceRequest,
+    BulkAttendanceRequest,
+    StudentAttendance,
 )
 from src.schemas.common import PaginationParams
 from src.repositories.lesson_repository import LessonRepository
+from src.services.conflict_service import Booking, ConflictService
+from src.services.dashboard_service import clear_dashboard_cache
 
 
 class LessonService:
@@ -114,7 +120,26 @@ class LessonService:
 
         Returns:
             Created lesson
+
+        Raises:
+            NotFoundError: If group not found
+            ValidationError: If lesson ends before it starts
+            ConflictError: If room or teacher is already booked
         """
+        resources = await self.lesson_repo.get_group_resources(request.group_id)
+        if not resources:
+            raise NotFoundError("Group", request.group_id)
+
+        await self._check_conflicts(Booking(
+            None,
+            request.group_id,
+            request.date,
+            request.start_time,
+            request.end_time,
+            resources.room,
+            resources.teacher_id,
+        ))
+
         lesson = Lesson(
             title=request.title,
             description=request.description,
@@ -151,6 +176,8 @@ class LessonService:
 
         Raises:
             NotFoundError: If lesson not found
+            ValidationError: If lesson ends before it starts
+            ConflictError: If lesson is moved onto a booked room or teacher
         """
         lesson = await self.lesson_repo.get_by_id(lesson_id)
         if not lesson:
@@ -162,6 +189,24 @@ class LessonService:
         if "status" in update_data and update_data["status"]:
             update_data["status"] = update_data["status"].value
 
+        schedule_fields = {"date", "start_time", "end_time", "status"}
+        if (
+            schedule_fields & update_data.keys()
+            and update_data.get("status", lesson.status) != LessonStatus.CANCELLED.value
+        ):
+            await self._check_conflicts(
+                Booking(
+                    lesson.id,
+                    lesson.group_id,
+                    update_data.get("date") or lesson.date,
+                    update_data.get("start_time") or lesson.start_time,
+                    update_data.get("end_time") or lesson.end_time,
+                    lesson.group.room if lesson.group else None,
+                    lesson.teacher_id or (lesson.group.teacher_id if lesson.group else None),
+                ),
+                exclude_lesson_id=lesson.id,
+            )
+
         await self.lesson_repo.update(lesson, **update_data)
 
         # Reload with relations
@@ -170,11 +215,29 @@ class LessonService:
         response.group_name = lesson.group.name if lesson.group else ""
         return response
 
+    async def _check_conflicts(
+        self,
+        booking: Booking,
+        exclude_lesson_id: Optional[str] = None,
+    ) -> None:
+        """Reject a lesson that double-books its room or teacher."""
+        if booking.end_time <= booking.start_time:
+            raise ValidationError("Lesson end time must be after start time")
+
+        conflicts = await ConflictService(self.lesson_repo).check(
+            [booking], exclude_lesson_id=exclude_lesson_id
+        )
+        if conflicts:
+            raise ConflictError(
+                "Room or teacher is already booked at this time",
+                details={"conflicts": [c.model_dump(mode="json") for c in conflicts]},
+            )
+
     async def mark_attendance(
         self,
         lesson_id: str,
         request: AttendanceRequest,
-    ) -> None:
+    ) -> int:
         """
         Mark attendance for lesson.
 
@@ -182,38 +245,66 @@ class LessonService:
             lesson_id: Lesson ID
             request: Attendance data
 
+        Returns:
+            Number of attendance records written
+
         Raises:
             NotFoundError: If lesson not found
         """
-        lesson = await self.lesson_repo.get_by_id(lesson_id)
-        if not lesson:
+        if lesson_id not in await self.lesson_repo.get_existing_ids([lesson_id]):
             raise NotFoundError("Lesson", lesson_id)
 
-        for student_attendance in request.attendances:
-            # Check if attendance exists
-            existing = await self.lesson_repo.get_attendance(
-                lesson_id,
-                student_attendance.student_id,
-            )
+        rows = self._attendance_rows(lesson_id, request.attendances)
+        count = await self.lesson_repo.upsert_attendances(list(rows.values()))
+        clear_dashboard_cache()
+        return count
+
+    async def mark_attendance_bulk(self, request: BulkAttendanceRequest) -> int:
+        """
+        Mark attendance for several lessons in one statement.
+
+        Args:
+            request: Attendance data grouped by lesson
 
-            if existing:
-                # Update existing
-                await self.lesson_repo.update(
-                    existing,
-                    status=student_attendance.status.value,
-                    grade=student_attendance.grade,
-                    homework_grade=student_attendance.homework_grade,
-                    notes=student_attendance.notes,
-                )
-            else:
-                # Create new
-                attendance = Attendance(
-                    lesson_id=lesson_id,
-                    student_id=student_attendance.student_id,
-                    status=student_attendance.status.value,
-                    grade=student_attendance.grade,
-                    homework_grade=student_attendance.homework_grade,
-                    notes=student_attendance.notes,
-                )
-                await self.lesson_repo.create_attendance(attendance)
+        Returns:
+            Number of attendance records written
 
+        Raises:
+            NotFoundError: If any lesson not found
+        """
+        lesson_ids = list(dict.fromkeys(item.lesson_id for item in request.lessons))
+        existing = await self.lesson_repo.get_existing_ids(lesson_ids)
+        for lesson_id in lesson_ids:
+            if lesson_id not in existing:
+                raise NotFoundError("Lesson", lesson_id)
+
+        rows: Dict[tuple[str, str], Dict[str, Any]] = {}
+        for item in request.lessons:
+            rows.update(self._attendance_rows(item.lesson_id, item.attendances))
+
+        count = await self.lesson_repo.upsert_attendances(list(rows.values()))
+        clear_dashboard_cache()
+        return count
+
+    @staticmethod
+    def _attendance_rows(
+        lesson_id: str,
+        attendances: List[StudentAttendance],
+    ) -> Dict[tuple[str, str], Dict[str, Any]]:
+        """
+        Build upsert rows keyed by (lesson_id, student_id).
+
+        A repeated student keeps the last submitted values, since PostgreSQL
+        rejects an upsert that touches the same row twice.
+        """
+        return {
+            (lesson_id, a.student_id): {
+                "lesson_id": lesson_id,
+                "student_id": a.student_id,
+                "status": a.status.value,
+                "grade": a.grade,
+                "homework_grade": a.homework_grade,
+                "notes": a.notes,
+            }
+            for a in attendances
+        }
@@ -3,12 +3,16 @@ Notification service.
 """
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, Union
 
-from shared import NotFoundError
+from shared import NotFoundError, ValidationError
+from shared.constants import BroadcastAudience, TelegramDeliveryStatus
+from shared.utils import generate_uuid
 from db.models import Notification
 
 from src.schemas.notification import (
+    BroadcastRequest,
+    BroadcastResponse,
     NotificationCreateRequest,
     NotificationResponse,
     NotificationListResponse,
@@ -16,6 +20,7 @@ from src.schemas.notification import (
 )
 from src.schemas.common import PaginationParams
 from src.repositories.notification_repository import NotificationRepository
+from src.services.notification_stream import BROADCAST_PUSH_CHUNK_SIZE, publish_on_commit
 
 
 class NotificationService:
@@ -67,52 +72,126 @@ class NotificationService:
     async def create_notification(
         self,
         request: NotificationCreateRequest,
-    ) -> NotificationResponse:
+    ) -> Union[NotificationResponse, BroadcastResponse]:
         """
         Create and send notification.
 
+        A single ``user_id`` creates one notification; ``user_ids`` or no
+        recipient at all is sent as a broadcast.
+
         Args:
             request: Notification creation data
 
         Returns:
-            Created notification
+            Created notification, or broadcast result for several recipients
         """
-        # Determine recipients
-        user_ids = []
-        if request.user_id:
-            user_ids = [request.user_id]
-        elif request.user_ids:
-            user_ids = request.user_ids
-        else:
-            # TODO: Broadcast to all users
-            pass
-
-        # Create notifications for each user
-        created_notification = None
-        for user_id in user_ids:
-            notification = Notification(
-                user_id=user_id,
-                title=request.title,
-                message=request.message,
-                type=request.type.value,
-                action_url=request.action_url,
-            )
-            await self.notification_repo.create(notification)
-            created_notification = notification
-
-            # Send via Telegram if requested
-            if request.send_telegram:
-                # TODO: Send via Telegram bot
-                await self.notification_repo.update(
-                    notification,
-                    sent_via_telegram=True,
-                    sent_at=datetime.now(timezone.utc),
+        if not request.user_id:
+            audience = BroadcastAudience.USERS if request.user_ids else BroadcastAudience.ALL
+            send_telegram = request.send_telegram
+            if send_telegram is None:
+                send_telegram = audience == BroadcastAudience.USERS
+            return await self.broadcast(
+                BroadcastRequest(
+                    audience=audience,
+                    user_ids=request.user_ids,
+                    title=request.title,
+                    message=request.message,
+                    type=request.type,
+                    action_url=request.action_url,
+                    send_telegram=send_telegram,
                 )
+            )
+
+        notification = Notification(
+            user_id=request.user_id,
+            title=request.title,
+            message=request.message,
+            type=request.type.value,
+            action_url=request.action_url,
+        )
+        if request.send_telegram is not False:
+            # Delivered by the Telegram outbox worker
+            notification.telegram_status = TelegramDeliveryStatus.PENDING.value
+            notification.telegram_next_attempt_at = datetime.now(timezone.utc)
+        await self.notification_repo.create(notification)
+
+        brief = NotificationBriefResponse.model_validate(notification)
+        publish_on_commit(self.notification_repo.session, {
+            "type": "notification",
+            "user_id": notification.user_id,
+            "notification": brief.model_dump(mode="json"),
+            "unread_count": await self.notification_repo.count_unread(notification.user_id),
+        })
+
+        return NotificationResponse.model_validate(notification)
+
+    async def broadcast(self, request: BroadcastRequest) -> BroadcastResponse:
+        """
+        Send a notification to an audience.
+
+        Notifications are materialized by one INSERT ... SELECT over users
+        and enrollments, so the audience size does not add round trips.
+
+        Args:
+            request: Broadcast data
+
+        Returns:
+            Number of notifications created
+
+        Raises:
+            ValidationError: If the audience selector is incomplete
+        """
+        audience = request.audience
+        if audience == BroadcastAudience.ROLE and not request.roles:
+            raise ValidationError("roles is required for the role audience")
+        if audience == BroadcastAudience.COURSE and not request.course_id:
+            raise ValidationError("course_id is required for the course audience")
+        if audience == BroadcastAudience.GROUP and not request.group_id:
+            raise ValidationError("group_id is required for the group audience")
+        if audience == BroadcastAudience.USERS and not request.user_ids:
+            raise ValidationError("user_ids is required for the users audience")
+
+        recipients = self.notification_repo.select_audience(
+            audience,
+            roles=[role.value for role in request.roles or []],
+            course_id=request.course_id,
+            group_id=request.group_id,
+            user_ids=request.user_ids,
+            enrollment_statuses=[status.value for status in request.enrollment_statuses],
+        )
+        broadcast_id = generate_uuid()
+        unread_counts = await self.notification_repo.broadcast(
+            recipients,
+            broadcast_id,
+            title=request.title,
+            message=request.message,
+            type=request.type.value,
+            action_url=request.action_url,
+            send_telegram=request.send_telegram,
+        )
 
-        if created_notification:
-            return NotificationResponse.model_validate(created_notification)
+        # Recipients travel with the event, so API processes deliver it
+        # without querying the audience again
+        notification = {
+            "title": request.title,
+            "message": request.message,
+            "type": request.type.value,
+            "is_read": False,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        recipient_ids = list(unread_counts)
+        for start in range(0, len(recipient_ids), BROADCAST_PUSH_CHUNK_SIZE):
+            publish_on_commit(self.notification_repo.session, {
+                "type": "broadcast",
+                "broadcast_id": broadcast_id,
+                "notification": notification,
+                "unread_counts": {
+                    user_id: unread_counts[user_id]
+                    for user_id in recipient_ids[start:start + BROADCAST_PUSH_CHUNK_SIZE]
+                },
+            })
 
-        raise ValueError("No notifications created")
+        return BroadcastResponse(audience=audience.value, recipients_count=len(unread_counts))
 
     async def get_unread_count(self, user_id: str) -> int:
         """
@@ -151,6 +230,11 @@ class NotificationService:
         if not notification:
             raise NotFoundError("Notification", notification_id)
 
+        publish_on_commit(self.notification_repo.session, {
+            "type": "unread_count",
+            "user_id": user_id,
+            "unread_count": await self.notification_repo.count_unread(user_id),
+        })
         return NotificationResponse.model_validate(notification)
 
     async def mark_all_as_read(self, user_id: str) -> int:
@@ -163,5 +247,12 @@ class NotificationService:
         Returns:
             Number of notifications marked as read
         """
-        return await self.notification_repo.mark_all_as_read(user_id)
+        count = await self.notification_repo.mark_all_as_read(user_id)
+        if count:
+            publish_on_commit(self.notification_repo.session, {
+                "type": "unread_count",
+                "user_id": user_id,
+                "unread_count": 0,
+            })
+        return count
 
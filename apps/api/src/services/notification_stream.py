@@ -0,0 +1,227 @@
+"""
+Real-time notification push.
+
+Each connected client holds one ``Subscription`` (a small bounded queue)
+in the process-local ``NotificationBroker``. ``NotificationService``
+publishes events once its transaction commits; with
+``notification_broker=redis`` they go through one Redis pub/sub channel so
+that every API worker delivers them to its own connections.
+
+Messages:
+    {"type": "notification", "user_id", "notification", "unread_count"}
+    {"type": "unread_count", "user_id", "unread_count"}
+    {"type": "broadcast", "broadcast_id", "notification", "unread_counts"}
+
+A broadcast carries one notification without an id and the new unread
+count of each recipient (split over several messages for a large
+audience); each recipient's frame gets the id of its own copy
+(``broadcast_notification_id``).
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import AsyncSessionLocal, run_on_commit
+from shared import get_settings
+
+from src.repositories.notification_repository import (
+    NotificationRepository,
+    broadcast_notification_id,
+)
+
+
+logger = logging.getLogger(__name__)
+
+STREAM_QUEUE_SIZE = 16  # Events buffered per connection; the oldest are dropped
+KEEPALIVE_INTERVAL = 25.0  # Seconds between comments that keep proxies from closing
+REDIS_CHANNEL = "notifications:events"
+BROADCAST_PUSH_CHUNK_SIZE = 1000  # Recipients per broadcast message
+
+
+def format_event(name: str, data: Any) -> str:
+    """Server-Sent Events frame."""
+    return f"event: {name}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """One client connection."""
+
+    __slots__ = ("user_id", "queue")
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+
+    def put(self, frame: str) -> None:
+        """Queue a frame, dropping the oldest one for a slow client."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(frame)
+
+
+class NotificationBroker:
+    """In-process fan-out to connected clients."""
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[Subscription]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def subscribe(self, user_id: str) -> Subscription:
+        """Register a connection of a user."""
+        subscription = Subscription(user_id)
+        self.subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a closed connection."""
+        connections = self.subscribers.get(subscription.user_id)
+        if connections is not None:
+            connections.discard(subscription)
+            if not connections:
+                del self.subscribers[subscription.user_id]
+
+    def publish_soon(self, message: Dict[str, Any]) -> None:
+        """Publish from synchronous code (e.g. a session event)."""
+        task = asyncio.get_running_loop().create_task(self.publish(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        """Publish a message to every API process."""
+        await self.dispatch(message)
+
+    async def dispatch(self, message: Dict[str, Any]) -> None:
+        """Deliver a message to this process's connections."""
+        if not self.subscribers:
+            return
+        if message["type"] == "broadcast":
+            self._dispatch_broadcast(message)
+            return
+
+        user_id = message["user_id"]
+        if user_id not in self.subscribers:
+            return
+        if message["type"] == "notification":
+            self._deliver(user_id, format_event("notification", message["notification"]))
+        self._deliver(user_id, format_event("unread_count", {"count": message["unread_count"]}))
+
+    def _dispatch_broadcast(self, message: Dict[str, Any]) -> None:
+        """Deliver a broadcast to the connected users among its recipients."""
+        unread_counts = message["unread_counts"]
+        broadcast_id = message["broadcast_id"]
+        for user_id in self.subscribers.keys() & unread_counts.keys():
+            notification = {
+                "id": broadcast_notification_id(broadcast_id, user_id),
+                **message["notification"],
+            }
+            self._deliver(user_id, format_event("notification", notification))
+            self._deliver(user_id, format_event("unread_count", {"count": unread_counts[user_id]}))
+
+    def _deliver(self, user_id: str, frame: str) -> None:
+        for subscription in self.subscribers.get(user_id, ()):
+            subscription.put(frame)
+
+    async def start(self) -> None:
+        """Start receiving messages from other processes."""
+
+    async def close(self) -> None:
+        """Stop receiving messages."""
+        for task in list(self._tasks):
+            task.cancel()
+
+
+class RedisNotificationBroker(NotificationBroker):
+    """Fan-out across API workers through Redis pub/sub."""
+
+    def __init__(self, url: str, channel: str = REDIS_CHANNEL):
+        from redis import asyncio as aioredis
+
+        super().__init__()
+        self.redis = aioredis.from_url(url)
+        self.channel = channel
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        await self.redis.publish(self.channel, json.dumps(message, default=str))
+
+    async def start(self) -> None:
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub) -> None:
+        try:
+            async for message in pubsub.listen():
+                try:
+                    await self.dispatch(json.loads(message["data"]))
+                except Exception:
+                    logger.exception("Failed to dispatch notification event")
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+        await super().close()
+        await self.redis.aclose()
+
+
+_broker: Optional[NotificationBroker] = None
+
+
+def get_notification_broker() -> NotificationBroker:
+    """Broker configured by ``notification_broker``."""
+    global _broker
+    if _broker is None:
+        settings = get_settings()
+        if settings.notification_broker == "redis":
+            _broker = RedisNotificationBroker(settings.redis_url)
+        else:
+            _broker = NotificationBroker()
+    return _broker
+
+
+async def close_notification_broker() -> None:
+    """Close the broker on shutdown."""
+    global _broker
+    if _broker is not None:
+        await _broker.close()
+        _broker = None
+
+
+def publish_on_commit(session: AsyncSession, message: Dict[str, Any]) -> None:
+    """Publish ``message`` once the session's transaction commits."""
+    run_on_commit(session, lambda: get_notification_broker().publish_soon(message))
+
+
+async def notification_events(
+    user_id: str,
+    broker: Optional[NotificationBroker] = None,
+) -> AsyncIterator[str]:
+    """
+    Event stream of one connection.
+
+    Starts with the current unread count, then relays broker events and
+    sends a keep-alive comment when idle.
+    """
+    broker = broker or get_notification_broker()
+    subscription = broker.subscribe(user_id)
+    try:
+        async with AsyncSessionLocal() as session:
+            unread = await NotificationRepository(session).count_unread(user_id)
+        yield format_event("unread_count", {"count": unread})
+
+        while True:
+            try:
+                yield await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        broker.unsubscribe(subscription)
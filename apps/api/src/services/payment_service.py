@@ -3,10 +3,12 @@ Payment service.
 """
 
 from datetime import datetime, timezone
-from typing import Optional
+from decimal import Decimal
+from typing import Any, Dict, Optional
 
-from shared import NotFoundError, PermissionDeniedError
-from shared.constants import PaymentStatus
+from shared import NotFoundError, PermissionDeniedError, ValidationError
+from shared.constants import LedgerEntryType, PaymentStatus
+from shared.exceptions import ConflictError
 from shared.utils import generate_uuid
 from db.models import User, Payment
 
@@ -15,17 +17,45 @@ from src.schemas.payment import (
     PaymentResponse,
     PaymentListResponse,
     PaymentBriefResponse,
+    BalanceResponse,
+    EnrollmentBalance,
 )
 from src.schemas.common import PaginationParams
 from src.repositories.payment_repository import PaymentRepository
+from src.repositories.ledger_repository import LedgerRepository
+from src.repositories.report_repository import ReportRepository, local_day
+
+
+# Allowed status changes: target -> {current status: ledger entry written (or None)}
+PAYMENT_TRANSITIONS: Dict[str, Dict[str, Optional[LedgerEntryType]]] = {
+    PaymentStatus.COMPLETED.value: {
+        PaymentStatus.PENDING.value: LedgerEntryType.PAYMENT,
+        PaymentStatus.PROCESSING.value: LedgerEntryType.PAYMENT,
+    },
+    PaymentStatus.REFUNDED.value: {
+        PaymentStatus.COMPLETED.value: LedgerEntryType.REFUND,
+    },
+    PaymentStatus.CANCELLED.value: {
+        PaymentStatus.PENDING.value: None,
+        PaymentStatus.PROCESSING.value: None,
+        PaymentStatus.COMPLETED.value: LedgerEntryType.REVERSAL,
+    },
+}
 
 
 class PaymentService:
     """Payment service."""
 
-    def __init__(self, payment_repo: PaymentRepository):
+    def __init__(
+        self,
+        payment_repo: PaymentRepository,
+        ledger_repo: LedgerRepository,
+        report_repo: ReportRepository,
+    ):
         """Initialize service."""
         self.payment_repo = payment_repo
+        self.ledger_repo = ledger_repo
+        self.report_repo = report_repo
 
     async def get_payment(self, payment_id: str, user: User) -> PaymentResponse:
         """
@@ -133,6 +163,7 @@ class PaymentService:
 
         # Reload with user
         payment = await self.payment_repo.get_with_user(payment.id)
+        await self.report_repo.add_payment_deltas([self._rollup_delta(payment, 1)])
         response = PaymentResponse.model_validate(payment)
         response.user_name = payment.user.full_name if payment.user else ""
         return response
@@ -154,24 +185,159 @@ class PaymentService:
 
         Raises:
             NotFoundError: If payment not found
+            ValidationError: If payment cannot be confirmed
+            ConflictError: If payment was changed concurrently
+        """
+        return await self._change_status(
+            payment_id,
+            PaymentStatus.COMPLETED.value,
+            paid_at=datetime.now(timezone.utc),
+            processed_by=processed_by,
+        )
+
+    async def refund_payment(
+        self,
+        payment_id: str,
+        processed_by: str,
+    ) -> PaymentResponse:
+        """
+        Refund a confirmed payment.
+
+        Args:
+            payment_id: Payment ID
+            processed_by: User ID who processed the refund
+
+        Returns:
+            Refunded payment
+
+        Raises:
+            NotFoundError: If payment not found
+            ValidationError: If payment is not confirmed
+            ConflictError: If payment was changed concurrently
+        """
+        return await self._change_status(
+            payment_id,
+            PaymentStatus.REFUNDED.value,
+            processed_by=processed_by,
+        )
+
+    async def cancel_payment(
+        self,
+        payment_id: str,
+        processed_by: str,
+    ) -> PaymentResponse:
+        """
+        Cancel a pending or confirmed payment.
+
+        Args:
+            payment_id: Payment ID
+            processed_by: User ID who cancelled the payment
+
+        Returns:
+            Cancelled payment
+
+        Raises:
+            NotFoundError: If payment not found
+            ValidationError: If payment cannot be cancelled
+            ConflictError: If payment was changed concurrently
         """
+        return await self._change_status(
+            payment_id,
+            PaymentStatus.CANCELLED.value,
+            processed_by=processed_by,
+        )
+
+    async def _change_status(
+        self,
+        payment_id: str,
+        status: str,
+        **values,
+    ) -> PaymentResponse:
+        """Apply a status change and its ledger entry in one transaction."""
         payment = await self.payment_repo.get_with_user(payment_id)
         if not payment:
             raise NotFoundError("Payment", payment_id)
 
-        await self.payment_repo.update(
-            payment,
-            status=PaymentStatus.COMPLETED.value,
-            paid_at=datetime.now(timezone.utc),
-            processed_by=processed_by,
-        )
+        allowed = PAYMENT_TRANSITIONS[status]
+        if payment.status not in allowed:
+            raise ValidationError(f"Cannot change payment from {payment.status} to {status}")
+        entry_type = allowed[payment.status]
+        before = self._rollup_delta(payment, -1)
+
+        if not await self.payment_repo.change_status(payment, status, **values):
+            raise ConflictError("Payment was modified, please retry")
 
-        # Update enrollment paid amount if applicable
-        if payment.enrollment_id:
-            # TODO: Update enrollment.paid_amount
-            pass
+        await self.report_repo.add_payment_deltas([before, self._rollup_delta(payment, 1)])
+
+        if entry_type:
+            amount = payment.amount if entry_type == LedgerEntryType.PAYMENT else -payment.amount
+            enrollment = await self.ledger_repo.post(
+                entry_type,
+                amount,
+                user_id=payment.user_id,
+                enrollment_id=payment.enrollment_id,
+                payment_id=payment.id,
+            )
+            if enrollment:
+                await self.report_repo.add_enrollment_payments([enrollment])
 
         response = PaymentResponse.model_validate(payment)
         response.user_name = payment.user.full_name if payment.user else ""
         return response
 
+    @staticmethod
+    def _rollup_delta(payment: Payment, sign: int) -> Dict[str, Any]:
+        """Payment's contribution to its daily rollup bucket."""
+        return {
+            "day": local_day(payment.paid_at or payment.created_at),
+            "enrollment_id": payment.enrollment_id,
+            "method": payment.method,
+            "status": payment.status,
+            "payments_count": sign,
+            "amount_total": sign * payment.amount,
+        }
+
+    async def get_balance(self, user_id: str) -> BalanceResponse:
+        """
+        Get user's paid total and per-enrollment debts.
+
+        Reads the ledger-maintained sums; no payment history is aggregated.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Balance response
+        """
+        paid_total = await self.ledger_repo.get_paid_total(user_id)
+        enrollments = [
+            EnrollmentBalance(
+                enrollment_id=str(row.id),
+                group_id=str(row.group_id),
+                status=row.status,
+                agreed_price=row.agreed_price,
+                paid_amount=row.paid_amount,
+                debt=max(row.agreed_price - row.paid_amount, Decimal(0)),
+            )
+            for row in await self.ledger_repo.get_enrollment_balances(user_id)
+        ]
+        return BalanceResponse(
+            user_id=user_id,
+            paid_total=paid_total,
+            debt_total=sum((e.debt for e in enrollments), Decimal(0)),
+            enrollments=enrollments,
+        )
+
+    async def reconcile_ledger(self) -> Dict[str, int]:
+        """
+        Verify ledger against payments and running sums, fixing drift.
+
+        Report rollups are rebuilt when enrollment sums had to be fixed.
+
+        Returns:
+            Number of rows fixed per step
+        """
+        fixed = await self.ledger_repo.reconcile()
+        if fixed["enrollments_fixed"]:
+            fixed.update(await self.report_repo.rebuild())
+        return fixed
@@ -0,0 +1,160 @@
+"""
+Financial report service.
+
+Reports read only the rollup tables (``payment_daily_rollups``,
+``group_balances``), which are kept current by the payment and enrollment
+write paths and can be rebuilt in bulk.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Optional
+
+from shared import ValidationError
+from shared.constants import PaymentStatus, ReportDimension
+
+from src.schemas.report import DebtReport, GroupDebt, RevenueReport, RevenueRow
+from src.repositories.report_repository import ReportRepository
+
+
+# Longest period a revenue report accepts (three years)
+MAX_REPORT_DAYS = 1096
+
+
+def change_percent(current: Decimal, previous: Decimal) -> Optional[float]:
+    """Relative change against the previous period."""
+    if not previous:
+        return None
+    return round(float((current - previous) / previous * 100), 2)
+
+
+class ReportService:
+    """Financial report service."""
+
+    def __init__(self, report_repo: ReportRepository):
+        """Initialize service."""
+        self.report_repo = report_repo
+
+    async def get_revenue(
+        self,
+        date_from: date,
+        date_to: date,
+        group_by: ReportDimension = ReportDimension.DAY,
+        status: Optional[PaymentStatus] = None,
+    ) -> RevenueReport:
+        """
+        Revenue of a period grouped by a dimension.
+
+        The previous period has the same length and ends the day before
+        ``date_from``; both are aggregated by one query over the rollups.
+
+        Args:
+            date_from: First date (inclusive)
+            date_to: Last date (inclusive)
+            group_by: Report dimension
+            status: Payment status (completed unless grouping by status)
+
+        Returns:
+            Revenue report
+
+        Raises:
+            ValidationError: If range is invalid or too long
+        """
+        if date_to < date_from:
+            raise ValidationError("date_to must not be before date_from")
+        if (date_to - date_from).days >= MAX_REPORT_DAYS:
+            raise ValidationError(f"Date range must not exceed {MAX_REPORT_DAYS} days")
+
+        if status is None and group_by != ReportDimension.STATUS:
+            status = PaymentStatus.COMPLETED
+
+        length = date_to - date_from + timedelta(days=1)
+        previous_from = date_from - length
+        rows = await self.report_repo.get_revenue(
+            group_by,
+            date_from,
+            date_to,
+            previous_from,
+            status=status.value if status else None,
+        )
+
+        items = [
+            RevenueRow(
+                key=str(row.key) if row.key is not None else None,
+                label=row.label,
+                payments_count=row.payments_count,
+                amount=row.amount_total,
+                previous_count=row.previous_count,
+                previous_amount=row.previous_amount,
+                change_percent=change_percent(row.amount_total, row.previous_amount),
+            )
+            for row in rows
+        ]
+        amount = sum((item.amount for item in items), Decimal(0))
+        previous_amount = sum((item.previous_amount for item in items), Decimal(0))
+        return RevenueReport(
+            group_by=group_by.value,
+            status=status.value if status else None,
+            date_from=date_from,
+            date_to=date_to,
+            previous_from=previous_from,
+            previous_to=date_from - timedelta(days=1),
+            payments_count=sum(item.payments_count for item in items),
+            amount=amount,
+            previous_count=sum(item.previous_count for item in items),
+            previous_amount=previous_amount,
+            change_percent=change_percent(amount, previous_amount),
+            items=items,
+        )
+
+    async def get_debts(
+        self,
+        course_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> DebtReport:
+        """
+        Groups with outstanding debt, largest first.
+
+        Args:
+            course_id: Filter by course
+            limit: Maximum number of groups
+
+        Returns:
+            Debt report
+        """
+        rows = await self.report_repo.get_group_debts(course_id, limit)
+        return DebtReport(
+            debt_total=await self.report_repo.get_debt_total(course_id),
+            items=[
+                GroupDebt(
+                    group_id=str(row.group_id),
+                    group_name=row.group_name,
+                    course_id=str(row.course_id),
+                    course_name=row.course_name,
+                    enrollments_count=row.enrollments_count,
+                    agreed_total=row.agreed_total,
+                    paid_total=row.paid_total,
+                    debt_total=row.debt_total,
+                )
+                for row in rows
+            ],
+        )
+
+    async def rebuild(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Dict[str, int]:
+        """
+        Rebuild rollups from source tables.
+
+        Args:
+            date_from: First day of payment rollups to rebuild (all if not given)
+            date_to: Last day of payment rollups to rebuild (all if not given)
+
+        Returns:
+            Number of rollup rows written per table
+        """
+        if date_from and date_to and date_to < date_from:
+            raise ValidationError("date_to must not be before date_from")
+        return await self.report_repo.rebuild(date_from, date_to)
@@ -0,0 +1,200 @@
+"""
+Schedule service.
+
+Expands a group's recurrence (start/end date, weekdays, lesson time) into the
+lessons of a term and inserts them in bulk.
+"""
+
+from datetime import date, timedelta
+from typing import Collection, Dict, List, Optional, Set
+
+from shared import NotFoundError, get_settings
+from shared.constants import UZ_PUBLIC_HOLIDAYS, LessonStatus
+from shared.exceptions import ConflictError
+
+from src.schemas.schedule import (
+    ScheduleGenerateRequest,
+    ScheduleGenerateResponse,
+    ScheduledLesson,
+)
+from src.repositories.group_repository import GroupRepository
+from src.repositories.lesson_repository import LessonRepository
+from src.services.conflict_service import Booking, ConflictService
+
+
+# Conflicts listed in the error of a rejected generation
+MAX_REPORTED_CONFLICTS = 100
+
+
+def parse_days_of_week(days_of_week: Optional[str]) -> List[int]:
+    """Parse "1,3,5" into ISO weekdays [1, 3, 5] (1 = Monday)."""
+    if not days_of_week:
+        return []
+    days = set()
+    for part in days_of_week.split(","):
+        part = part.strip()
+        if part.isdigit() and 1 <= int(part) <= 7:
+            days.add(int(part))
+    return sorted(days)
+
+
+def is_holiday(day: date, holidays: Collection[date] = ()) -> bool:
+    """Check built-in fixed holidays and configured extra dates."""
+    return (day.month, day.day) in UZ_PUBLIC_HOLIDAYS or day in holidays
+
+
+def expand_dates(
+    start_date: date,
+    end_date: date,
+    weekdays: List[int],
+) -> List[date]:
+    """All dates in [start_date, end_date] falling on the given ISO weekdays."""
+    dates = []
+    for weekday in weekdays:
+        day = start_date + timedelta(days=(weekday - start_date.isoweekday()) % 7)
+        while day <= end_date:
+            dates.append(day)
+            day += timedelta(days=7)
+    dates.sort()
+    return dates
+
+
+class ScheduleService:
+    """Schedule service."""
+
+    def __init__(
+        self,
+        group_repo: GroupRepository,
+        lesson_repo: LessonRepository,
+    ):
+        """Initialize service."""
+        self.group_repo = group_repo
+        self.lesson_repo = lesson_repo
+
+    async def generate(self, request: ScheduleGenerateRequest) -> ScheduleGenerateResponse:
+        """
+        Generate term lessons for groups.
+
+        Lessons are numbered in date order, continuing after the group's
+        lessons before the generated range. Dates that already have a lesson
+        are kept; with ``replace`` scheduled lessons without attendance are
+        deleted and generated again. The groups stay locked until commit,
+        so a concurrent generation of the same groups waits and then sees
+        these lessons instead of inserting the same dates again. The result is checked for room and
+        teacher double bookings against stored lessons and itself.
+
+        Args:
+            request: Groups, range and mode
+
+        Returns:
+            Generation summary (with the lessons themselves in preview mode)
+
+        Raises:
+            NotFoundError: If a requested group not found
+            ConflictError: If generated lessons conflict (not in preview)
+        """
+        groups = await self.group_repo.get_schedule_settings(
+            request.group_ids, lock=not request.preview
+        )
+        if request.group_ids is not None:
+            missing = set(request.group_ids) - {str(g.id) for g in groups}
+            if missing:
+                raise NotFoundError("Group", ", ".join(sorted(missing)))
+
+        holidays = set(get_settings().schedule_holidays)
+        skipped_groups = []
+        schedulable = []
+        for group in groups:
+            weekdays = parse_days_of_week(group.days_of_week)
+            if not (group.start_date and group.end_date and group.start_time
+                    and group.end_time and weekdays):
+                skipped_groups.append(str(group.id))
+                continue
+            schedulable.append((group, weekdays))
+
+        group_ids = [str(group.id) for group, _ in schedulable]
+        existing: Dict[str, List[tuple]] = {group_id: [] for group_id in group_ids}
+        if group_ids:
+            for group_id, day, untouched in await self.lesson_repo.get_schedule_rows(group_ids):
+                existing[str(group_id)].append((day, untouched))
+
+        rows = []
+        bookings = []
+        replaced = 0
+        for group, weekdays in schedulable:
+            group_id = str(group.id)
+            date_from = max(request.date_from or group.start_date, group.start_date)
+
+            kept: Set[date] = set()
+            number = 0
+            for day, untouched in existing[group_id]:
+                if request.replace and untouched and (
+                    request.date_from is None or day >= request.date_from
+                ):
+                    replaced += 1
+                    continue
+                if day < date_from:
+                    number += 1
+                else:
+                    kept.add(day)
+
+            for day in expand_dates(date_from, group.end_date, weekdays):
+                if is_holiday(day, holidays):
+                    continue
+                number += 1
+                if day in kept:
+                    continue
+                rows.append({
+                    "title": f"Lesson {number}",
+                    "lesson_number": number,
+                    "group_id": group_id,
+                    "date": day,
+                    "start_time": group.start_time,
+                    "end_time": group.end_time,
+                    "status": LessonStatus.SCHEDULED.value,
+                })
+                bookings.append(Booking(
+                    None, group_id, day, group.start_time, group.end_time,
+                    group.room, group.teacher_id,
+                ))
+
+        regenerated = set(group_ids)
+
+        def is_replaced(row) -> bool:
+            return (
+                request.replace
+                and row.untouched
+                and str(row.group_id) in regenerated
+                and (request.date_from is None or row.date >= request.date_from)
+            )
+
+        conflicts = await ConflictService(self.lesson_repo).check(bookings, skip=is_replaced)
+        if conflicts and not request.preview:
+            raise ConflictError(
+                f"Generated schedule has {len(conflicts)} room/teacher conflicts",
+                details={
+                    "conflicts": [
+                        c.model_dump(mode="json") for c in conflicts[:MAX_REPORTED_CONFLICTS]
+                    ],
+                },
+            )
+
+        if not request.preview and group_ids:
+            if request.replace:
+                replaced = await self.lesson_repo.delete_untouched_lessons(
+                    group_ids, request.date_from
+                )
+            await self.lesson_repo.insert_lessons(rows)
+
+        teachers = {str(group.id): group.teacher_id for group, _ in schedulable}
+        return ScheduleGenerateResponse(
+            groups=len(schedulable),
+            lessons=len(rows),
+            replaced=replaced,
+            skipped_groups=skipped_groups,
+            conflicts=conflicts,
+            preview=request.preview,
+            items=[
+                ScheduledLesson(**row, teacher_id=teachers[row["group_id"]]) for row in rows
+            ] if request.preview else [],
+        )
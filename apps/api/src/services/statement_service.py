@@ -0,0 +1,728 @@
+"""
+Provider statement import.
+
+Reconciles Payme/Click statements with our payments. The file is read in
+chunks and parsed incrementally, rows are processed in batches with one
+``IN`` lookup per key, and all changes of a batch are written with bulk
+statements (payments, ledger, report rollups).
+
+Accepted formats:
+    - CSV with a header row (quoted fields may contain line breaks)
+    - JSON: the first array in the document (a bare array or e.g. Payme's
+      ``{"result": {"transactions": [...]}}``)
+    - JSON Lines, one object per line
+
+Columns may use the provider's own names (Payme: id, amount in tiyin,
+state, perform_time, account; Click: click_trans_id, merchant_trans_id,
+amount, status/error, sign_time) or the normalized ones: external_id,
+amount (in sum), status, paid_at, transaction_id, enrollment_id.
+"""
+
+import codecs
+import csv
+import json
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, AsyncIterator, Deque, Dict, List, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+from shared import ValidationError
+from shared.constants import (
+    REPORT_TIMEZONE,
+    LedgerEntryType,
+    PaymentMethod,
+    PaymentStatus,
+    StatementMismatchType,
+)
+from shared.utils import generate_uuid
+
+from src.schemas.payment import StatementImportResponse, StatementMismatch
+from src.repositories.payment_repository import PaymentRepository
+from src.repositories.ledger_repository import LedgerRepository
+from src.repositories.report_repository import ReportRepository, local_day
+
+
+STATEMENT_PROVIDERS = (PaymentMethod.PAYME, PaymentMethod.CLICK)
+STATEMENT_FORMATS = ("csv", "json", "jsonl")
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_MISMATCHES = 1000
+READ_CHUNK_SIZE = 64 * 1024
+
+_OPEN_STATUSES = (PaymentStatus.PENDING.value, PaymentStatus.PROCESSING.value)
+_LOCAL_ZONE = ZoneInfo(REPORT_TIMEZONE)
+_CENT = Decimal("0.01")
+
+# Provider column names -> normalized names
+_ALIASES = {
+    PaymentMethod.PAYME: {
+        "id": "external_id",
+        "transaction": "external_id",
+        "state": "status",
+        "perform_time": "paid_at",
+        "order_id": "transaction_id",
+    },
+    PaymentMethod.CLICK: {
+        "click_trans_id": "external_id",
+        "merchant_trans_id": "transaction_id",
+        "sign_time": "paid_at",
+        "payment_status": "status",
+    },
+}
+
+_STATUS_WORDS = {
+    "completed": PaymentStatus.COMPLETED.value,
+    "success": PaymentStatus.COMPLETED.value,
+    "successful": PaymentStatus.COMPLETED.value,
+    "confirmed": PaymentStatus.COMPLETED.value,
+    "paid": PaymentStatus.COMPLETED.value,
+    "performed": PaymentStatus.COMPLETED.value,
+    "cancelled": PaymentStatus.CANCELLED.value,
+    "canceled": PaymentStatus.CANCELLED.value,
+    "rejected": PaymentStatus.CANCELLED.value,
+    "failed": PaymentStatus.CANCELLED.value,
+    "pending": PaymentStatus.PENDING.value,
+    "created": PaymentStatus.PENDING.value,
+    "processing": PaymentStatus.PENDING.value,
+}
+
+# Payme transaction states
+_PAYME_STATES = {
+    "2": PaymentStatus.COMPLETED.value,
+    "1": PaymentStatus.PENDING.value,
+    "-1": PaymentStatus.CANCELLED.value,
+    "-2": PaymentStatus.CANCELLED.value,
+}
+
+
+class StatementRow(NamedTuple):
+    """Statement row in normalized form."""
+
+    line: int
+    external_id: str
+    amount: Decimal
+    status: str
+    paid_at: Optional[datetime]
+    transaction_id: Optional[str]
+    enrollment_id: Optional[str]
+
+
+def detect_format(filename: Optional[str]) -> str:
+    """Statement format from a file name (CSV by default)."""
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".json"):
+        return "json"
+    return "csv"
+
+
+async def _decode(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+    """Complete lines of the stream, one list per read chunk."""
+    rest = ""
+    async for text in _decode(chunks):
+        lines = (rest + text).split("\n")
+        rest = lines.pop()
+        yield lines
+    if rest:
+        yield [rest]
+
+
+class InvalidRecord(NamedTuple):
+    """Record that could not be parsed at all."""
+
+    reason: str
+
+
+class _LineFeed:
+    """Line iterator of a csv.reader, filled as the stream arrives."""
+
+    def __init__(self) -> None:
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """
+    Yield (line number, record) from a CSV stream.
+
+    One csv.reader parses the whole stream. It only reads queued lines that
+    end outside a quoted field, so quoted fields may span lines and chunks.
+    The line number is the physical line the record starts on.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed, strict=True)
+    header: Optional[List[str]] = None
+    quoted = False
+
+    async for lines in _lines(chunks):
+        for line in lines:
+            feed.lines.append(line + "\n")
+            if line.count('"') % 2:
+                quoted = not quoted
+
+        while feed.lines and not quoted:
+            number = reader.line_num + 1
+            try:
+                values = next(reader)
+            except csv.Error as e:
+                yield number, InvalidRecord(f"malformed CSV: {e}")
+                continue
+            if not values or not any(v.strip() for v in values):
+                continue
+            if header is None:
+                header = [h.strip().lower() for h in values]
+                continue
+            if len(values) != len(header):
+                yield number, InvalidRecord(
+                    f"expected {len(header)} columns, got {len(values)}"
+                )
+                continue
+            yield number, dict(zip(header, values, strict=True))
+
+    if feed.lines:
+        yield reader.line_num + 1, InvalidRecord("unterminated quoted field")
+
+
+async def iter_jsonl_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """Yield (line number, record) from a JSON Lines stream."""
+    number = 0
+    async for lines in _lines(chunks):
+        for line in lines:
+            number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                record = InvalidRecord(f"invalid JSON: {e.msg}")
+            yield number, record
+
+
+async def iter_json_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple]:
+    """Yield (item number, record) from the first JSON array of a stream."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    number = 0
+    async for text in _decode(chunks):
+        buffer += text
+        pos = 0
+        if not started:
+            pos = buffer.find("[")
+            if pos < 0:
+                buffer = ""
+                continue
+            started = True
+            pos += 1
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # incomplete item, read more
+            number += 1
+            yield number, record
+        buffer = buffer[pos:]
+
+    if not started or buffer.strip():
+        raise ValidationError("Malformed JSON statement")
+
+
+def _parse_amount(value: Any, in_tiyin: bool) -> Decimal:
+    amount = Decimal(str(value).replace(" ", "").replace(",", "."))
+    if in_tiyin:
+        amount /= 100
+    if amount <= 0:
+        raise ValueError("amount must be positive")
+    return amount.quantize(_CENT)
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if value in (None, "", 0, "0"):
+        return None
+    text = str(value).strip()
+    if text.isdigit():
+        # Epoch milliseconds (Payme) or seconds
+        stamp = int(text)
+        try:
+            return datetime.fromtimestamp(stamp / 1000 if stamp > 10**11 else stamp, timezone.utc)
+        except (OverflowError, OSError) as e:
+            raise ValueError(f"timestamp out of range: {text}") from e
+    moment = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=_LOCAL_ZONE)
+    return moment
+
+
+def _parse_status(provider: PaymentMethod, record: Dict[str, Any]) -> str:
+    value = record.get("status")
+    if value is None and provider == PaymentMethod.CLICK and "error" in record:
+        # Click: error 0 is success, negative codes are failures
+        value = "success" if str(record["error"]).strip() == "0" else "failed"
+    text = str(value).strip().lower() if value is not None else ""
+    if provider == PaymentMethod.PAYME and text in _PAYME_STATES:
+        return _PAYME_STATES[text]
+    if text in _STATUS_WORDS:
+        return _STATUS_WORDS[text]
+    raise ValueError(f"unknown status {value!r}")
+
+
+def normalize_record(
+    provider: PaymentMethod,
+    line: int,
+    record: Any,
+    in_tiyin: bool,
+) -> StatementRow:
+    """
+    Map a provider record to a StatementRow.
+
+    Raises:
+        ValueError: If the record is not usable
+    """
+    if isinstance(record, InvalidRecord):
+        raise ValueError(record.reason)
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+
+    aliases = _ALIASES[provider]
+    fields: Dict[str, Any] = {}
+    for key, value in record.items():
+        key = str(key).strip().lower()
+        if key == "account" and isinstance(value, dict):
+            # Payme: merchant-defined account fields
+            for account_key, account_value in value.items():
+                name = aliases.get(account_key.lower(), account_key.lower())
+                fields.setdefault(name, account_value)
+            continue
+        fields.setdefault(aliases.get(key, key), value)
+
+    external_id = str(fields.get("external_id") or "").strip()
+    if not external_id:
+        raise ValueError("missing transaction ID")
+    if fields.get("amount") in (None, ""):
+        raise ValueError("missing amount")
+
+    try:
+        amount = _parse_amount(fields["amount"], in_tiyin)
+    except (InvalidOperation, ValueError) as e:
+        raise ValueError(f"invalid amount {fields['amount']!r}") from e
+
+    enrollment_id = str(fields.get("enrollment_id") or "").strip() or None
+    if enrollment_id:
+        try:
+            uuid.UUID(enrollment_id)
+        except ValueError as e:
+            raise ValueError(f"invalid enrollment ID {enrollment_id!r}") from e
+
+    return StatementRow(
+        line=line,
+        external_id=external_id,
+        amount=amount,
+        status=_parse_status(provider, fields),
+        paid_at=_parse_time(fields.get("paid_at")),
+        transaction_id=str(fields.get("transaction_id") or "").strip() or None,
+        enrollment_id=enrollment_id,
+    )
+
+
+class _Batch:
+    """Changes collected from one batch of statement rows."""
+
+    def __init__(self) -> None:
+        self.confirm: List[tuple] = []  # (payment row, statement row)
+        self.cancel: List[tuple] = []
+        self.link: List[tuple] = []
+        self.create: List[tuple] = []  # (student ID, statement row)
+
+
+class StatementService:
+    """Provider statement import service."""
+
+    def __init__(
+        self,
+        payment_repo: PaymentRepository,
+        ledger_repo: LedgerRepository,
+        report_repo: ReportRepository,
+    ):
+        """Initialize service."""
+        self.payment_repo = payment_repo
+        self.ledger_repo = ledger_repo
+        self.report_repo = report_repo
+
+    async def import_statement(
+        self,
+        provider: PaymentMethod,
+        chunks: AsyncIterator[bytes],
+        file_format: str = "csv",
+        processed_by: Optional[str] = None,
+        dry_run: bool = False,
+    ) -> StatementImportResponse:
+        """
+        Import a provider statement.
+
+        Pending payments are completed or cancelled as the statement says,
+        completed payments matched by our transaction ID get the provider's
+        ID, and rows referring to an enrollment without a payment create
+        one. Everything else is reported as a mismatch.
+
+        Args:
+            provider: Payme or Click
+            chunks: Statement file content
+            file_format: csv, json or jsonl
+            processed_by: User ID of the importing admin
+            dry_run: Only report what would change
+
+        Returns:
+            Import summary with mismatches
+
+        Raises:
+            ValidationError: If provider or format is not supported
+        """
+        if provider not in STATEMENT_PROVIDERS:
+            raise ValidationError(f"Statements are not supported for {provider.value}")
+        if file_format not in STATEMENT_FORMATS:
+            raise ValidationError(f"Unsupported statement format: {file_format}")
+
+        started = time.monotonic()
+        result = StatementImportResponse(provider=provider.value, dry_run=dry_run)
+        # Payme's API amounts are in tiyin; exported CSV files use sum
+        in_tiyin = provider == PaymentMethod.PAYME and file_format != "csv"
+        records = {
+            "csv": iter_csv_records,
+            "json": iter_json_records,
+            "jsonl": iter_jsonl_records,
+        }[file_format](chunks)
+
+        seen = set()
+        batch: List[StatementRow] = []
+        async for line, record in records:
+            result.total_rows += 1
+            try:
+                row = normalize_record(provider, line, record, in_tiyin)
+            except ValueError as e:
+                self._mismatch(result, StatementMismatchType.INVALID_ROW, line, message=str(e))
+                continue
+            if row.external_id in seen:
+                self._mismatch(
+                    result,
+                    StatementMismatchType.DUPLICATE,
+                    line,
+                    row,
+                    message="Transaction repeated in the statement",
+                )
+                continue
+            seen.add(row.external_id)
+
+            batch.append(row)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await self._process_batch(provider, batch, result, processed_by, dry_run)
+                batch = []
+        if batch:
+            await self._process_batch(provider, batch, result, processed_by, dry_run)
+
+        result.duration_ms = int((time.monotonic() - started) * 1000)
+        return result
+
+    async def _process_batch(
+        self,
+        provider: PaymentMethod,
+        rows: List[StatementRow],
+        result: StatementImportResponse,
+        processed_by: Optional[str],
+        dry_run: bool,
+    ) -> None:
+        by_external = {
+            payment.external_id: payment
+            for payment in await self.payment_repo.get_by_external_ids(
+                provider.value, [row.external_id for row in rows]
+            )
+        }
+        by_reference = {
+            payment.transaction_id: payment
+            for payment in await self.payment_repo.get_by_transaction_ids([
+                row.transaction_id
+                for row in rows
+                if row.external_id not in by_external and row.transaction_id
+            ])
+        }
+        students = await self.payment_repo.get_enrollment_students([
+            row.enrollment_id
+            for row in rows
+            if row.external_id not in by_external
+            and row.transaction_id not in by_reference
+            and row.enrollment_id
+        ])
+
+        batch = _Batch()
+        for row in rows:
+            payment = by_external.get(row.external_id)
+            if payment is None and row.transaction_id:
+                payment = by_reference.get(row.transaction_id)
+            if payment is None:
+                if row.enrollment_id in students and row.status == PaymentStatus.COMPLETED.value:
+                    batch.create.append((students[row.enrollment_id], row))
+                elif row.status == PaymentStatus.COMPLETED.value:
+                    self._mismatch(
+                        result,
+                        StatementMismatchType.NOT_FOUND,
+                        row.line,
+                        row,
+                        message="No payment or enrollment for this transaction",
+                    )
+                else:
+                    result.skipped += 1
+                continue
+            self._classify(provider, payment, row, batch, result)
+
+        if dry_run:
+            result.confirmed += len(batch.confirm)
+            result.cancelled += len(batch.cancel)
+            result.linked += len(batch.link)
+            result.created += len(batch.create)
+            return
+
+        await self._apply(provider, batch, result, processed_by)
+
+    def _classify(
+        self,
+        provider: PaymentMethod,
+        payment,
+        row: StatementRow,
+        batch: _Batch,
+        result: StatementImportResponse,
+    ) -> None:
+        if payment.method != provider.value:
+            self._mismatch(
+                result,
+                StatementMismatchType.METHOD_MISMATCH,
+                row.line,
+                row,
+                payment,
+                message=f"Payment method is {payment.method}",
+            )
+            return
+        if payment.external_id and payment.external_id != row.external_id:
+            self._mismatch(
+                result,
+                StatementMismatchType.EXTERNAL_ID_CONFLICT,
+                row.line,
+                row,
+                payment,
+                message=f"Payment is linked to transaction {payment.external_id}",
+            )
+            return
+        if payment.amount != row.amount:
+            self._mismatch(
+                result,
+                StatementMismatchType.AMOUNT_MISMATCH,
+                row.line,
+                row,
+                payment,
+                message="Amounts differ",
+            )
+            return
+
+        ours = PaymentStatus.PENDING.value if payment.status in _OPEN_STATUSES else payment.status
+        if row.status == PaymentStatus.PENDING.value:
+            result.skipped += 1
+        elif ours == row.status:
+            if payment.external_id or ours != PaymentStatus.COMPLETED.value:
+                result.unchanged += 1
+            else:
+                batch.link.append((payment, row))
+        elif ours == PaymentStatus.PENDING.value:
+            if row.status == PaymentStatus.COMPLETED.value:
+                batch.confirm.append((payment, row))
+            else:
+                batch.cancel.append((payment, row))
+        else:
+            # Completed, refunded or cancelled here but not at the provider:
+            # refunds and reversals are done by staff, not by the import
+            self._mismatch(
+                result,
+                StatementMismatchType.STATUS_MISMATCH,
+                row.line,
+                row,
+                payment,
+                message=f"Payment is {payment.status}, provider says {row.status}",
+            )
+
+    async def _apply(
+        self,
+        provider: PaymentMethod,
+        batch: _Batch,
+        result: StatementImportResponse,
+        processed_by: Optional[str],
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        rollups: List[Dict[str, Any]] = []
+        completed = []
+
+        created = await self.payment_repo.insert_payments([
+            {
+                "user_id": student_id,
+                "enrollment_id": row.enrollment_id,
+                "amount": row.amount,
+                "method": provider.value,
+                "status": PaymentStatus.COMPLETED.value,
+                "external_id": row.external_id,
+                "transaction_id": generate_uuid(),
+                "paid_at": row.paid_at or now,
+                "processed_by": processed_by,
+                "description": f"{provider.value} statement import",
+            }
+            for student_id, row in batch.create
+        ])
+        result.created += len(created)
+        self._report_lost(
+            result,
+            [row for _, row in batch.create],
+            {payment.external_id for payment in created},
+        )
+        completed.extend(created)
+        rollups.extend(self._rollup(payment, 1) for payment in created)
+
+        for status, pairs, counter in (
+            (PaymentStatus.COMPLETED.value, batch.confirm, "confirmed"),
+            (PaymentStatus.CANCELLED.value, batch.cancel, "cancelled"),
+        ):
+            paid = status == PaymentStatus.COMPLETED.value
+            changed = await self.payment_repo.change_statuses(
+                status,
+                [
+                    {
+                        "id": payment.id,
+                        "status": payment.status,
+                        "external_id": row.external_id,
+                        "paid_at": (row.paid_at or now) if paid else None,
+                    }
+                    for payment, row in pairs
+                ],
+                processed_by=processed_by,
+            )
+            setattr(result, counter, getattr(result, counter) + len(changed))
+            self._report_lost(result, [row for _, row in pairs], {p.external_id for p in changed})
+
+            before = {str(payment.id): payment for payment, _ in pairs}
+            for payment in changed:
+                rollups.append(self._rollup(before[str(payment.id)], -1))
+                rollups.append(self._rollup(payment, 1))
+            if paid:
+                completed.extend(changed)
+
+        linked = await self.payment_repo.change_statuses(
+            PaymentStatus.COMPLETED.value,
+            [
+                {
+                    "id": payment.id,
+                    "status": payment.status,
+                    "external_id": row.external_id,
+                    "paid_at": None,
+                }
+                for payment, row in batch.link
+            ],
+        )
+        result.linked += len(linked)
+        self._report_lost(result, [row for _, row in batch.link], {p.external_id for p in linked})
+
+        await self.report_repo.add_payment_deltas(rollups)
+        changes = await self.ledger_repo.post_many([
+            {
+                "entry_type": LedgerEntryType.PAYMENT,
+                "amount": payment.amount,
+                "user_id": payment.user_id,
+                "enrollment_id": payment.enrollment_id,
+                "payment_id": payment.id,
+            }
+            for payment in completed
+        ])
+        await self.report_repo.add_enrollment_payments(changes)
+
+    @staticmethod
+    def _rollup(payment, sign: int) -> Dict[str, Any]:
+        return {
+            "day": local_day(payment.paid_at or payment.created_at),
+            "enrollment_id": payment.enrollment_id,
+            "method": payment.method,
+            "status": payment.status,
+            "payments_count": sign,
+            "amount_total": sign * payment.amount,
+        }
+
+    def _report_lost(
+        self,
+        result: StatementImportResponse,
+        rows: List[StatementRow],
+        applied: set,
+    ) -> None:
+        """Report rows whose payment changed between lookup and update."""
+        for row in rows:
+            if row.external_id not in applied:
+                self._mismatch(
+                    result,
+                    StatementMismatchType.CHANGED_CONCURRENTLY,
+                    row.line,
+                    row,
+                    message="Payment was changed during the import, import again",
+                )
+
+    @staticmethod
+    def _mismatch(
+        result: StatementImportResponse,
+        mismatch_type: StatementMismatchType,
+        line: int,
+        row: Optional[StatementRow] = None,
+        payment=None,
+        message: str = "",
+    ) -> None:
+        result.mismatch_count += 1
+        if len(result.mismatches) >= MAX_REPORTED_MISMATCHES:
+            return
+        result.mismatches.append(StatementMismatch(
+            line=line,
+            type=mismatch_type.value,
+            external_id=row.external_id if row else None,
+            payment_id=str(payment.id) if payment else None,
+            amount=payment.amount if payment else None,
+            statement_amount=row.amount if row else None,
+            status=payment.status if payment else None,
+            statement_status=row.status if row else None,
+            message=message,
+        ))
+
+
+async def iter_upload(file, chunk_size: int = READ_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read an uploaded file in chunks."""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
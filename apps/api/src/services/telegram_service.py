@@ -1,31 +1,91 @@
 """
 Telegram bot service for sending messages from API.
+
+One long-lived ``TelegramService`` per process holds a pooled HTTP
+session; the API starts it and closes it in the lifespan. Every send goes
+through the rate limiter. ``send_many`` fans out with bounded
+concurrency, and ``enqueue`` hands a message to background workers so
+that request handlers never wait on Telegram.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramBadRequest, TelegramAPIError
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
 
 from shared import get_settings
 
+from src.core.rate_limit import TelegramRateLimiter
+
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+MAX_INLINE_RETRY_AFTER = 30.0  # Longer flood-control waits are not retried by send_message
+CLOSE_DRAIN_TIMEOUT = 5.0  # Seconds given to queued messages on shutdown
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of one rate-limited send."""
+
+    sent: bool
+    error: Optional[str] = None
+    retry_after: Optional[float] = None  # Flood control: retry after this many seconds
+    permanent: bool = False  # Retrying will not help (bot blocked, chat not found)
+    attempted: bool = True  # False: not sent before the deadline, nothing was requested
+
 
 class TelegramService:
     """Service for sending messages via Telegram bot."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
         """Initialize service."""
         self.bot: Optional[Bot] = None
+        self.limiter = TelegramRateLimiter(
+            global_rate=settings.telegram_rate_limit,
+            chat_rate=settings.telegram_chat_rate_limit,
+        )
+        self.concurrency = concurrency or settings.telegram_concurrency
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size or settings.telegram_queue_size)
+        self._workers: List[asyncio.Task] = []
         if settings.telegram_bot_token:
             try:
-                self.bot = Bot(token=settings.telegram_bot_token)
+                session_options = {"limit": pool_size or settings.telegram_pool_size}
+                if settings.telegram_api_url:
+                    # Local Bot API server or the fake one used for load tests
+                    session_options["api"] = TelegramAPIServer.from_base(
+                        settings.telegram_api_url
+                    )
+                self.bot = Bot(
+                    token=settings.telegram_bot_token,
+                    session=AiohttpSession(**session_options),
+                )
             except Exception as e:
                 logger.error(f"Failed to initialize Telegram bot: {e}")
 
+    def start(self) -> None:
+        """Start the background send workers (idempotent)."""
+        if self._workers or not self.bot:
+            return
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.concurrency)
+        ]
+
     async def send_message(
         self,
         telegram_id: int,
@@ -47,22 +107,130 @@ class TelegramService:
             logger.warning("Telegram bot not initialized")
             return False
 
+        result = await self.deliver(telegram_id, text, parse_mode)
+        if result.retry_after is not None and result.retry_after <= MAX_INLINE_RETRY_AFTER:
+            # The limiter holds the retry until flood control is over
+            result = await self.deliver(telegram_id, text, parse_mode)
+        if not result.sent:
+            logger.error(f"Telegram API error: {result.error}")
+        return result.sent
+
+    async def deliver(
+        self,
+        telegram_id: int,
+        text: str,
+        parse_mode: Optional[str] = "HTML",
+        deadline: Optional[float] = None,
+    ) -> DeliveryResult:
+        """
+        Send message within the global and per-chat rate limits.
+
+        Unlike ``send_message`` the result tells retryable failures apart
+        from permanent ones; a 429 pauses all further sends for
+        ``retry_after`` seconds.
+
+        Args:
+            telegram_id: Telegram user ID
+            text: Message text
+            parse_mode: Parse mode (HTML, Markdown, etc.)
+            deadline: ``time.monotonic()`` by which the request must start;
+                a message the limits hold back longer is not sent
+
+        Returns:
+            Delivery result
+        """
+        if not self.bot:
+            return DeliveryResult(sent=False, error="Telegram bot not initialized")
+
+        if not await self.limiter.acquire(telegram_id, deadline):
+            return DeliveryResult(
+                sent=False,
+                retry_after=self.limiter.delay(telegram_id),
+                attempted=False,
+            )
         try:
             await self.bot.send_message(
                 chat_id=telegram_id,
                 text=text,
                 parse_mode=parse_mode,
             )
-            return True
-        except TelegramBadRequest as e:
-            logger.error(f"Telegram API error: {e}")
-            return False
+            return DeliveryResult(sent=True)
+        except TelegramRetryAfter as e:
+            self.limiter.block(e.retry_after)
+            return DeliveryResult(sent=False, error=str(e), retry_after=e.retry_after)
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            return DeliveryResult(sent=False, error=str(e), permanent=True)
         except TelegramAPIError as e:
-            logger.error(f"Telegram API error: {e}")
-            return False
+            return DeliveryResult(sent=False, error=str(e))
         except Exception as e:
             logger.error(f"Unexpected error sending Telegram message: {e}")
+            return DeliveryResult(sent=False, error=str(e))
+
+    async def send_many(
+        self,
+        messages: Iterable[Tuple[int, str]],
+        parse_mode: Optional[str] = "HTML",
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> List[DeliveryResult]:
+        """
+        Send many messages with bounded concurrency.
+
+        Args:
+            messages: (telegram_id, text) pairs
+            parse_mode: Parse mode (HTML, Markdown, etc.)
+            concurrency: Requests in flight (default ``telegram_concurrency``)
+            deadline: ``time.monotonic()`` after which no send is started
+
+        Returns:
+            Delivery results in the order of ``messages``
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def send(telegram_id: int, text: str) -> DeliveryResult:
+            async with semaphore:
+                return await self.deliver(telegram_id, text, parse_mode, deadline)
+
+        return list(await asyncio.gather(*(send(chat, text) for chat, text in messages)))
+
+    def enqueue(
+        self,
+        telegram_id: int,
+        text: str,
+        parse_mode: Optional[str] = "HTML",
+    ) -> bool:
+        """
+        Send a message in the background without waiting for Telegram.
+
+        Args:
+            telegram_id: Telegram user ID
+            text: Message text
+            parse_mode: Parse mode (HTML, Markdown, etc.)
+
+        Returns:
+            False if the message was dropped (bot not configured or queue full)
+        """
+        if not self.bot:
+            logger.warning("Telegram bot not initialized")
+            return False
+
+        self.start()
+        try:
+            self.queue.put_nowait((telegram_id, text, parse_mode))
+        except asyncio.QueueFull:
+            logger.warning(f"Telegram send queue full, dropping message to {telegram_id}")
             return False
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            telegram_id, text, parse_mode = await self.queue.get()
+            try:
+                await self.send_message(telegram_id, text, parse_mode)
+            except Exception:
+                logger.exception("Background Telegram send failed")
+            finally:
+                self.queue.task_done()
 
     async def send_verification_code(
         self,
@@ -70,6 +238,7 @@ class TelegramService:
         code: str,
         phone: str,
         is_login: bool = False,
+        background: bool = False,
     ) -> bool:
         """
         Send verification code to Telegram user.
@@ -79,9 +248,10 @@ class TelegramService:
             code: Verification code
             phone: Phone number
             is_login: True if login, False if registration
+            background: Queue the message instead of waiting for Telegram
 
         Returns:
-            True if sent successfully, False otherwise
+            True if sent (or queued) successfully, False otherwise
         """
         action = "kirish" if is_login else "ro'yxatdan o'tish"
         text = (
@@ -93,14 +263,25 @@ class TelegramService:
             f"⏱️ Kod 5 daqiqa davomida amal qiladi."
         )
 
+        if background:
+            return self.enqueue(telegram_id, text, parse_mode="HTML")
         return await self.send_message(
             telegram_id=telegram_id,
             text=text,
             parse_mode="HTML",
         )
 
-    async def close(self):
-        """Close bot session."""
+    async def close(self, drain_timeout: float = CLOSE_DRAIN_TIMEOUT):
+        """Send what is still queued (up to ``drain_timeout``), then close bot session."""
+        if self._workers:
+            try:
+                await asyncio.wait_for(self.queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dropping {self.queue.qsize()} queued Telegram messages")
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
         if self.bot:
             await self.bot.session.close()
 
@@ -116,3 +297,11 @@ def get_telegram_service() -> TelegramService:
         _telegram_service = TelegramService()
     return _telegram_service
 
+
+async def close_telegram_service() -> None:
+    """Close the service on shutdown."""
+    global _telegram_service
+    if _telegram_service is not None:
+        await _telegram_service.close()
+        _telegram_service = None
+
@@ -70,7 +70,6 @@ class TestService:
             # Students see only active tests
             query = select(Test).where(
                 Test.is_active == True,
-                Test.deleted_at.is_(None),
             )
             # Students can see course tests and public tests
             if course_id:
@@ -85,7 +84,7 @@ class TestService:
                 )
         else:
             # Teachers and admins see all tests
-            query = select(Test).where(Test.deleted_at.is_(None))
+            query = select(Test)
             if course_id:
                 query = query.where(Test.course_id == course_id)
 
@@ -94,7 +93,7 @@ class TestService:
             query = query.where(Test.test_type == test_type)
 
         # Get total count
-        count_query = select(func.count(Test.id)).where(Test.deleted_at.is_(None))
+        count_query = select(func.count(Test.id))
         if course_id:
             count_query = count_query.where(Test.course_id == course_id)
         if test_type:
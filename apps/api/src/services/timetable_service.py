@@ -0,0 +1,226 @@
+"""
+Timetable export service.
+
+Streams lessons as iCalendar (per student, teacher or group) or CSV (whole
+centre). Rows come from a server-side cursor and are written out in chunks,
+so memory does not grow with the export range.
+
+Exports run after the request's dependencies have been closed, so each
+export opens its own session from the session factory.
+"""
+
+import csv
+import io
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared import ValidationError
+from shared.constants import LessonStatus
+
+from src.repositories.lesson_repository import LessonRepository
+
+
+MAX_EXPORT_DAYS = 366
+EXPORT_CHUNK_ROWS = 200
+
+CALENDAR_TIMEZONE = "Asia/Tashkent"
+CALENDAR_PRODID = "-//Uzbek Ta'lim//Timetable//UZ"
+UID_DOMAIN = "uzbek-talim"
+
+# Asia/Tashkent is UTC+5 all year (no DST)
+_VTIMEZONE = (
+    "BEGIN:VTIMEZONE\r\n"
+    f"TZID:{CALENDAR_TIMEZONE}\r\n"
+    "BEGIN:STANDARD\r\n"
+    "DTSTART:19700101T000000\r\n"
+    "TZOFFSETFROM:+0500\r\n"
+    "TZOFFSETTO:+0500\r\n"
+    "TZNAME:+05\r\n"
+    "END:STANDARD\r\n"
+    "END:VTIMEZONE\r\n"
+)
+
+CSV_HEADER = [
+    "date",
+    "start_time",
+    "end_time",
+    "course",
+    "group",
+    "lesson_number",
+    "title",
+    "room",
+    "teacher",
+    "status",
+]
+
+
+def _escape(value: Optional[str]) -> str:
+    """Escape TEXT value (RFC 5545 3.3.11)."""
+    if not value:
+        return ""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold content line to 75 octets (RFC 5545 3.1)."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Do not split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _teacher_name(row) -> str:
+    return " ".join(filter(None, (row.teacher_first_name, row.teacher_last_name)))
+
+
+def format_event(row, stamp: str) -> str:
+    """Render one timetable row as a VEVENT."""
+    summary = f"{row.course_name}: {row.title}" if row.course_name else row.title
+    description = f"{row.group_name}, #{row.lesson_number}"
+    teacher = _teacher_name(row)
+    if teacher:
+        description += f"\n{teacher}"
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{row.lesson_id}@{UID_DOMAIN}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;TZID={CALENDAR_TIMEZONE}:{datetime.combine(row.date, row.start_time):%Y%m%dT%H%M%S}",
+        f"DTEND;TZID={CALENDAR_TIMEZONE}:{datetime.combine(row.date, row.end_time):%Y%m%dT%H%M%S}",
+        f"SUMMARY:{_escape(summary)}",
+        f"DESCRIPTION:{_escape(description)}",
+    ]
+    if row.room:
+        lines.append(f"LOCATION:{_escape(row.room)}")
+    if row.status == LessonStatus.CANCELLED.value:
+        lines.append("STATUS:CANCELLED")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+class TimetableService:
+    """Timetable export service."""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        """Initialize service."""
+        self.session_factory = session_factory
+
+    @staticmethod
+    def resolve_range(
+        date_from: Optional[date],
+        date_to: Optional[date],
+    ) -> tuple[date, date]:
+        """
+        Default and validate an export range.
+
+        Args:
+            date_from: First date (today if not given)
+            date_to: Last date (a year after date_from if not given)
+
+        Returns:
+            (date_from, date_to)
+
+        Raises:
+            ValidationError: If range is invalid or too long
+        """
+        date_from = date_from or date.today()
+        date_to = date_to or date_from + timedelta(days=MAX_EXPORT_DAYS - 1)
+        if date_to < date_from:
+            raise ValidationError("date_to must not be before date_from")
+        if (date_to - date_from).days >= MAX_EXPORT_DAYS:
+            raise ValidationError(f"Date range must not exceed {MAX_EXPORT_DAYS} days")
+        return date_from, date_to
+
+    async def _rows(self, date_from: date, date_to: date, **filters) -> AsyncIterator:
+        async with self.session_factory() as session:
+            async for row in LessonRepository(session).stream_timetable(
+                date_from, date_to, **filters
+            ):
+                yield row
+
+    async def iter_ics(
+        self,
+        date_from: date,
+        date_to: date,
+        name: str,
+        group_id: Optional[str] = None,
+        teacher_id: Optional[str] = None,
+        student_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Stream lessons as an iCalendar document."""
+        yield (
+            "BEGIN:VCALENDAR\r\n"
+            "VERSION:2.0\r\n"
+            f"PRODID:{CALENDAR_PRODID}\r\n"
+            "CALSCALE:GREGORIAN\r\n"
+            "METHOD:PUBLISH\r\n"
+            + _fold(f"X-WR-CALNAME:{_escape(name)}")
+            + f"X-WR-TIMEZONE:{CALENDAR_TIMEZONE}\r\n"
+            + _VTIMEZONE
+        )
+
+        stamp = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}"
+        chunk: List[str] = []
+        async for row in self._rows(
+            date_from,
+            date_to,
+            group_id=group_id,
+            teacher_id=teacher_id,
+            student_id=student_id,
+        ):
+            chunk.append(format_event(row, stamp))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield "".join(chunk)
+                chunk.clear()
+        if chunk:
+            yield "".join(chunk)
+
+        yield "END:VCALENDAR\r\n"
+
+    async def iter_csv(self, date_from: date, date_to: date) -> AsyncIterator[str]:
+        """Stream all lessons in a range as CSV."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADER)
+
+        rows = 0
+        async for row in self._rows(date_from, date_to):
+            writer.writerow([
+                row.date.isoformat(),
+                row.start_time.strftime("%H:%M"),
+                row.end_time.strftime("%H:%M"),
+                row.course_name,
+                row.group_name,
+                row.lesson_number,
+                row.title,
+                row.room or "",
+                _teacher_name(row),
+                row.status,
+            ])
+            rows += 1
+            if rows % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+
+        if buffer.tell():
+            yield buffer.getvalue()
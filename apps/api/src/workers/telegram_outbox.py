@@ -0,0 +1,199 @@
+"""
+Telegram notification delivery worker.
+
+Drains notifications with ``telegram_status = 'pending'``: each batch is
+leased with ``FOR UPDATE SKIP LOCKED``, sent through the shared
+``TelegramService`` (``send_many``, at most ``telegram_concurrency``
+requests in flight) within Telegram's global and per-chat limits, and the
+outcomes are written back with one bulk UPDATE. Any number of worker
+processes can run side by side without sending a notification twice.
+
+Sends are only started during the first half of the lease; messages the
+rate limits (per-chat pacing, flood control) hold back longer go back to
+the queue unsent instead of outliving the lease.
+
+Usage:
+    python -m src.workers.telegram_outbox
+    python -m src.workers.telegram_outbox --once
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+from html import escape
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import AsyncSessionLocal, close_db
+from shared import get_settings
+from shared.constants import TelegramDeliveryStatus
+
+from src.repositories.notification_repository import NotificationRepository
+from src.services.telegram_service import (
+    DeliveryResult,
+    TelegramService,
+    get_telegram_service,
+)
+
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MAX_MESSAGE_LENGTH = 4096
+MAX_BACKOFF = timedelta(hours=1)
+SEND_WINDOW = 0.5  # Share of the lease in which sends may start
+
+
+def format_notification(title: str, message: str, action_url: Optional[str] = None) -> str:
+    """Telegram HTML text of a notification."""
+    text = f"<b>{escape(title)}</b>\n\n{escape(message)}"
+    if action_url:
+        text += f"\n\n{escape(action_url)}"
+    return text[:MAX_MESSAGE_LENGTH]
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after a failed attempt."""
+    return min(timedelta(seconds=30 * 2 ** (attempts - 1)), MAX_BACKOFF)
+
+
+class TelegramOutboxWorker:
+    """Deliver pending notifications via Telegram."""
+
+    def __init__(
+        self,
+        telegram: TelegramService,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        idle_interval: float = 1.0,
+    ):
+        self.telegram = telegram
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.telegram_outbox_batch_size
+        self.max_attempts = max_attempts or settings.telegram_outbox_max_attempts
+        self.idle_interval = idle_interval
+        # Requests started late in the window still finish within the lease
+        self.lease = timedelta(
+            seconds=max(60.0, 4 * self.batch_size / settings.telegram_rate_limit)
+        )
+
+    async def run_once(self) -> int:
+        """
+        Claim, send and record one batch.
+
+        Returns:
+            Number of notifications processed
+        """
+        deadline = time.monotonic() + self.lease.total_seconds() * SEND_WINDOW
+        async with self.session_factory() as session:
+            rows = await NotificationRepository(session).claim_telegram_batch(
+                self.batch_size, self.lease
+            )
+            await session.commit()
+        if not rows:
+            return 0
+
+        linked = [row for row in rows if row.telegram_id is not None]
+        outcomes = await self.telegram.send_many(
+            [
+                (row.telegram_id, format_notification(row.title, row.message, row.action_url))
+                for row in linked
+            ],
+            deadline=deadline,
+        )
+        delivered = dict(zip((row.id for row in linked), outcomes, strict=True))
+        results = [self._result(row, delivered.get(row.id)) for row in rows]
+
+        async with self.session_factory() as session:
+            recorded = await NotificationRepository(session).record_telegram_results(results)
+            await session.commit()
+
+        sent = sum(result["status"] == TelegramDeliveryStatus.SENT.value for result in results)
+        deferred = sum(not result["attempted"] for result in results)
+        logger.info(f"Telegram outbox: {sent}/{len(rows)} sent, {deferred} deferred")
+        if recorded < len(results):
+            logger.warning(
+                f"Telegram outbox: {len(results) - recorded} leases expired before recording"
+            )
+        return len(rows)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process batches until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Telegram outbox batch failed")
+                processed = 0
+            if processed < self.batch_size:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), self.idle_interval)
+
+    def _result(self, row: Row, outcome: Optional[DeliveryResult]) -> Dict[str, Any]:
+        """Row update for a send outcome (None: recipient has no Telegram)."""
+        result: Dict[str, Any] = {
+            "id": row.id,
+            "attempts": row.telegram_attempts,
+            "attempted": True,
+            "status": TelegramDeliveryStatus.PENDING.value,
+            "sent_at": None,
+            "next_attempt_at": None,
+            "error": None,
+        }
+        if outcome is None:
+            result["status"] = TelegramDeliveryStatus.SKIPPED.value
+            result["error"] = "Recipient has no linked Telegram account"
+            return result
+
+        now = datetime.now(timezone.utc)
+        if not outcome.attempted:
+            result["attempted"] = False
+            result["next_attempt_at"] = now + timedelta(seconds=outcome.retry_after or 0)
+        elif outcome.sent:
+            result["status"] = TelegramDeliveryStatus.SENT.value
+            result["sent_at"] = now
+        elif outcome.retry_after is not None:
+            # Flood control is not the message's fault; retry without giving up
+            result["next_attempt_at"] = now + timedelta(seconds=outcome.retry_after)
+            result["error"] = outcome.error
+        elif outcome.permanent or row.telegram_attempts >= self.max_attempts:
+            result["status"] = TelegramDeliveryStatus.FAILED.value
+            result["error"] = outcome.error
+        else:
+            result["next_attempt_at"] = now + retry_delay(row.telegram_attempts)
+            result["error"] = outcome.error
+        return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Telegram notification delivery worker")
+    parser.add_argument("--once", action="store_true", help="Process one batch and exit")
+    parser.add_argument("--batch-size", type=int, default=None, help="Notifications per batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.log_level)
+    telegram = get_telegram_service()
+    worker = TelegramOutboxWorker(telegram, batch_size=args.batch_size)
+    try:
+        if args.once:
+            await worker.run_once()
+        else:
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+            await worker.run(stop)
+    finally:
+        await telegram.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Attendance upsert tests.
+"""
+
+from datetime import date, time
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Attendance, Course, Group, Lesson, User
+from db.session import StatementCounter
+from shared.constants import AttendanceStatus, UserRole
+from src.repositories.lesson_repository import LessonRepository
+from src.schemas.lesson import AttendanceRequest
+from src.services.lesson_service import LessonService
+
+
+async def seed_lesson(session: AsyncSession, students: int) -> tuple[str, list[str]]:
+    """Create a lesson and ``students`` students."""
+    course = Course(name="Attendance", slug="attendance-test", price=Decimal(0))
+    session.add(course)
+    await session.flush()
+    group = Group(name="Attendance", course_id=course.id)
+    session.add(group)
+    await session.flush()
+    lesson = Lesson(
+        title="Lesson 1",
+        lesson_number=1,
+        group_id=group.id,
+        date=date.today(),
+        start_time=time(9, 0),
+        end_time=time(10, 30),
+    )
+    pupils = [
+        User(
+            phone=f"+99890000{i:04d}",
+            first_name="Test",
+            last_name=f"Student {i}",
+            role=UserRole.STUDENT.value,
+        )
+        for i in range(students)
+    ]
+    session.add_all([lesson, *pupils])
+    await session.flush()
+    return lesson.id, [pupil.id for pupil in pupils]
+
+
+def attendance_request(student_ids: list[str], status: AttendanceStatus) -> AttendanceRequest:
+    return AttendanceRequest(
+        attendances=[
+            {"student_id": student_id, "status": status.value}
+            for student_id in student_ids
+        ]
+    )
+
+
+async def test_mark_attendance_upserts(db_session: AsyncSession, test_engine) -> None:
+    lesson_id, student_ids = await seed_lesson(db_session, students=5)
+    service = LessonService(LessonRepository(db_session))
+
+    with StatementCounter(test_engine) as counter:
+        written = await service.mark_attendance(
+            lesson_id, attendance_request(student_ids, AttendanceStatus.PRESENT)
+        )
+    assert written == 5
+    # Lesson check and one upsert, not a round trip per student
+    assert counter.count == 2
+
+    # Marking again updates the same rows instead of adding new ones
+    await service.mark_attendance(
+        lesson_id, attendance_request(student_ids[:2], AttendanceStatus.ABSENT)
+    )
+    rows = (
+        await db_session.execute(
+            select(Attendance.student_id, Attendance.status).where(
+                Attendance.lesson_id == lesson_id
+            )
+        )
+    ).all()
+    statuses = dict(rows)
+    assert len(rows) == 5
+    assert [statuses[s] for s in student_ids] == [
+        AttendanceStatus.ABSENT.value,
+        AttendanceStatus.ABSENT.value,
+        AttendanceStatus.PRESENT.value,
+        AttendanceStatus.PRESENT.value,
+        AttendanceStatus.PRESENT.value,
+    ]
+
+
+async def test_mark_attendance_keeps_last_duplicate(db_session: AsyncSession) -> None:
+    lesson_id, (student_id,) = await seed_lesson(db_session, students=1)
+    service = LessonService(LessonRepository(db_session))
+
+    request = AttendanceRequest(
+        attendances=[
+            {"student_id": student_id, "status": AttendanceStatus.PRESENT.value},
+            {"student_id": student_id, "status": AttendanceStatus.LATE.value},
+        ]
+    )
+    assert await service.mark_attendance(lesson_id, request) == 1
+    status = await db_session.scalar(
+        select(Attendance.status).where(Attendance.lesson_id == lesson_id)
+    )
+    assert status == AttendanceStatus.LATE.value
@@ -0,0 +1,119 @@
+"""
+Schedule conflict detection tests.
+"""
+
+from datetime import date, time
+from decimal import Decimal
+from typing import Optional
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Course, Group, Lesson, User
+from shared.constants import UserRole
+from src.repositories.lesson_repository import LessonRepository
+from src.services.conflict_service import Booking, ConflictService, ScheduleIndex
+
+
+DAY = date(2026, 5, 4)
+
+
+def booking(
+    start: str,
+    end: str,
+    room: Optional[str] = None,
+    teacher_id: Optional[str] = None,
+    group_id: str = "g",
+    day: date = DAY,
+) -> Booking:
+    return Booking(None, group_id, day, time.fromisoformat(start), time.fromisoformat(end), room, teacher_id)
+
+
+@pytest.mark.parametrize("start, end, expected", [
+    ("09:00", "10:30", 1),  # same interval
+    ("10:00", "11:00", 1),  # starts inside
+    ("08:00", "09:30", 1),  # ends inside
+    ("08:00", "12:00", 1),  # contains it
+    ("09:30", "10:00", 1),  # inside it
+    ("10:30", "12:00", 0),  # starts when it ends
+    ("08:00", "09:00", 0),  # ends when it starts
+])
+def test_room_overlap(start: str, end: str, expected: int) -> None:
+    index = ScheduleIndex([booking("09:00", "10:30", room="101")])
+
+    conflicts = index.conflicts(booking(start, end, room=" 101 "))
+
+    assert len(conflicts) == expected
+    assert all(c.resource_type == "room" for c in conflicts)
+
+
+def test_teacher_overlap_and_adjacent() -> None:
+    index = ScheduleIndex([
+        booking("09:00", "10:30", teacher_id="t1", group_id="a"),
+        booking("10:30", "12:00", teacher_id="t1", group_id="b"),
+    ])
+
+    # Overlaps the first lesson only, touches the second
+    conflicts = index.conflicts(booking("08:30", "10:30", teacher_id="t1"))
+    assert [(c.resource_type, c.other_group_id) for c in conflicts] == [("teacher", "a")]
+
+    assert index.conflicts(booking("08:00", "09:00", teacher_id="t1")) == []
+    assert index.conflicts(booking("12:00", "13:00", teacher_id="t1")) == []
+    assert index.conflicts(booking("09:00", "10:30", teacher_id="t2")) == []
+    assert index.conflicts(booking("09:00", "10:30", teacher_id="t1", day=date(2026, 5, 5))) == []
+
+
+def test_long_lesson_is_found_behind_short_ones() -> None:
+    index = ScheduleIndex([
+        booking("08:00", "18:00", room="hall", group_id="long"),
+        booking("09:00", "09:30", room="hall", group_id="short"),
+    ])
+
+    conflicts = index.conflicts(booking("12:00", "13:00", room="hall"))
+
+    assert [c.other_group_id for c in conflicts] == ["long"]
+
+
+async def test_find_conflicts_reports_room_and_teacher(db_session: AsyncSession) -> None:
+    teacher = User(
+        phone="+998940000001",
+        first_name="Test",
+        last_name="Teacher",
+        role=UserRole.TEACHER.value,
+    )
+    course = Course(name="Conflicts", slug="conflicts", price=Decimal(0))
+    db_session.add_all([teacher, course])
+    await db_session.flush()
+    groups = [
+        Group(name=name, course_id=course.id, teacher_id=teacher.id, room=room)
+        for name, room in (("A", "101"), ("B", "101 "), ("C", "202"))
+    ]
+    db_session.add_all(groups)
+    await db_session.flush()
+
+    def lesson(group: Group, start: str, end: str) -> Lesson:
+        return Lesson(
+            title=group.name,
+            lesson_number=1,
+            group_id=group.id,
+            date=DAY,
+            start_time=time.fromisoformat(start),
+            end_time=time.fromisoformat(end),
+        )
+
+    db_session.add_all([
+        lesson(groups[0], "09:00", "10:30"),
+        # Same room and teacher, overlapping
+        lesson(groups[1], "10:00", "11:00"),
+        # Same teacher, right after: not a conflict
+        lesson(groups[2], "11:00", "12:00"),
+    ])
+    await db_session.flush()
+
+    conflicts = await ConflictService(LessonRepository(db_session)).find_conflicts(DAY, DAY)
+
+    found = {(c.resource_type, c.group_id, c.other_group_id) for c in conflicts}
+    assert found == {
+        ("room", groups[1].id, groups[0].id),
+        ("teacher", groups[1].id, groups[0].id),
+    }
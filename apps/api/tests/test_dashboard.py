@@ -0,0 +1,87 @@
+"""
+Teacher dashboard tests.
+"""
+
+from datetime import date, time
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Attendance, Course, Enrollment, Group, Lesson, User
+from db.session import StatementCounter
+from shared.constants import AttendanceStatus, EnrollmentStatus, UserRole
+from src.repositories.lesson_repository import LessonRepository
+from src.services.dashboard_service import DashboardService, clear_dashboard_cache
+
+
+async def seed_teacher(session: AsyncSession, groups: int, students: int) -> str:
+    """Create a teacher with ``groups`` groups, each with a lesson today."""
+    teacher = User(
+        phone=f"+99891{groups:03d}0000",
+        first_name="Test",
+        last_name="Teacher",
+        role=UserRole.TEACHER.value,
+    )
+    course = Course(name="Dashboard", slug=f"dashboard-{groups}", price=Decimal(0))
+    pupils = [
+        User(
+            phone=f"+99892{groups:03d}{i:04d}",
+            first_name="Test",
+            last_name=f"Student {i}",
+            role=UserRole.STUDENT.value,
+        )
+        for i in range(students)
+    ]
+    session.add_all([teacher, course, *pupils])
+    await session.flush()
+
+    for g in range(groups):
+        group = Group(name=f"Dashboard {g}", course_id=course.id, teacher_id=teacher.id)
+        session.add(group)
+        await session.flush()
+        lesson = Lesson(
+            title="Lesson 1",
+            lesson_number=1,
+            group_id=group.id,
+            date=date.today(),
+            start_time=time(9, 0),
+            end_time=time(10, 30),
+        )
+        session.add(lesson)
+        await session.flush()
+        for pupil in pupils:
+            session.add(Enrollment(
+                student_id=pupil.id,
+                group_id=group.id,
+                enrolled_at=date.today(),
+                agreed_price=Decimal(0),
+                status=EnrollmentStatus.ACTIVE.value,
+            ))
+        # Only the first student is marked
+        session.add(Attendance(
+            lesson_id=lesson.id,
+            student_id=pupils[0].id,
+            status=AttendanceStatus.PRESENT.value,
+        ))
+        await session.flush()
+    return teacher.id
+
+
+@pytest.mark.parametrize("groups", [1, 10])
+async def test_teacher_today_query_count(
+    db_session: AsyncSession, test_engine, groups: int
+) -> None:
+    teacher_id = await seed_teacher(db_session, groups, students=3)
+    service = DashboardService(LessonRepository(db_session))
+    clear_dashboard_cache()
+
+    with StatementCounter(test_engine) as counter:
+        dashboard = await service.get_teacher_today(teacher_id)
+
+    # One statement regardless of the number of groups
+    assert counter.count == 1
+    assert dashboard.total_lessons == groups
+    lesson = dashboard.lessons[0]
+    assert (lesson.head_count, lesson.marked_count, lesson.present_count) == (3, 1, 1)
+    assert not lesson.attendance_complete
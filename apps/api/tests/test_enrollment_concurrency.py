@@ -0,0 +1,117 @@
+"""
+Enrollment concurrency tests.
+
+Each enrollment runs in its own session and transaction, like separate API
+requests.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from decimal import Decimal
+from typing import List, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db.models import Course, Enrollment, Group, User
+from shared import ValidationError
+from shared.constants import UserRole
+from shared.exceptions import ConflictError
+from src.repositories.group_repository import GroupRepository
+from src.repositories.report_repository import ReportRepository
+from src.schemas.group import EnrollStudentRequest
+from src.services.group_service import GroupService
+
+
+async def seed(factory: async_sessionmaker, students: int, seats: int) -> Tuple[str, str, List[str]]:
+    """Create a throwaway course, group and students."""
+    suffix = time.monotonic_ns()
+    async with factory() as session:
+        course = Course(name="Concurrency", slug=f"concurrency-{suffix}", price=Decimal(0))
+        session.add(course)
+        await session.flush()
+
+        group = Group(name="Concurrency", course_id=course.id, max_students=seats)
+        pupils = [
+            User(
+                phone=f"+99988{suffix % 10000:04d}{i:04d}",
+                first_name="Load",
+                last_name=f"Student {i}",
+                role=UserRole.STUDENT.value,
+            )
+            for i in range(students)
+        ]
+        session.add_all([group, *pupils])
+        await session.commit()
+        return course.id, group.id, [pupil.id for pupil in pupils]
+
+
+async def enroll(factory: async_sessionmaker, group_id: str, student_id: str) -> str:
+    """Enroll one student the way the API endpoint does."""
+    async with factory() as session:
+        service = GroupService(GroupRepository(session), ReportRepository(session))
+        try:
+            await service.enroll_student(
+                group_id,
+                EnrollStudentRequest(student_id=student_id, agreed_price=Decimal(0)),
+            )
+            await session.commit()
+            return "enrolled"
+        except ValidationError:
+            await session.rollback()
+            return "full"
+        except (ConflictError, IntegrityError):
+            # SQLite ignores FOR UPDATE, so here the seat index rejects
+            # duplicates that the group lock turns away on PostgreSQL
+            await session.rollback()
+            return "duplicate"
+
+
+async def counts(factory: async_sessionmaker, group_id: str) -> Tuple[int, int]:
+    """groups.reserved_seats and the number of enrollments of a group."""
+    async with factory() as session:
+        counter = await session.scalar(select(Group.reserved_seats).where(Group.id == group_id))
+        actual = await session.scalar(
+            select(func.count(Enrollment.id)).where(Enrollment.group_id == group_id)
+        )
+    return counter, actual
+
+
+async def cleanup(factory: async_sessionmaker, course_id: str, student_ids: List[str]) -> None:
+    """Delete the seeded rows."""
+    async with factory() as session:
+        await session.execute(delete(Enrollment).where(Enrollment.student_id.in_(student_ids)))
+        await session.execute(delete(Group).where(Group.course_id == course_id))
+        await session.execute(delete(User).where(User.id.in_(student_ids)))
+        await session.execute(delete(Course).where(Course.id == course_id))
+        await session.commit()
+
+
+async def test_parallel_enrollments_do_not_overbook(test_engine) -> None:
+    factory = async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)
+    course_id, group_id, student_ids = await seed(factory, students=30, seats=5)
+    try:
+        outcomes = Counter(await asyncio.gather(*(
+            enroll(factory, group_id, student_id) for student_id in student_ids
+        )))
+
+        assert outcomes == {"enrolled": 5, "full": 25}
+        assert await counts(factory, group_id) == (5, 5)
+    finally:
+        await cleanup(factory, course_id, student_ids)
+
+
+async def test_parallel_enrollments_of_one_student(test_engine) -> None:
+    factory = async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)
+    course_id, group_id, student_ids = await seed(factory, students=1, seats=10)
+    try:
+        outcomes = Counter(await asyncio.gather(*(
+            enroll(factory, group_id, student_ids[0]) for _ in range(10)
+        )))
+
+        assert outcomes == {"enrolled": 1, "duplicate": 9}
+        assert await counts(factory, group_id) == (1, 1)
+    finally:
+        await cleanup(factory, course_id, student_ids)
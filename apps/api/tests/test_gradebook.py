@@ -0,0 +1,109 @@
+"""
+Gradebook tests.
+"""
+
+import json
+from datetime import date, time
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Attendance, Course, Enrollment, Group, Lesson, User
+from db.session import StatementCounter
+from shared.constants import AttendanceStatus, EnrollmentStatus, UserRole
+from src.repositories.group_repository import GroupRepository
+from src.repositories.lesson_repository import LessonRepository
+from src.services.gradebook_service import GradebookService
+
+
+async def seed_group(session: AsyncSession, lessons: int, students: int) -> str:
+    """
+    Create a group with ``lessons`` lessons and ``students`` students.
+
+    Every student is marked on the first lesson only: the first one present
+    with grades 5 and 4, the others absent.
+    """
+    course = Course(name="Gradebook", slug=f"gradebook-{lessons}-{students}", price=Decimal(0))
+    session.add(course)
+    await session.flush()
+    group = Group(name="Gradebook", course_id=course.id)
+    pupils = [
+        User(
+            phone=f"+99893{lessons:03d}{i:04d}",
+            first_name="Test",
+            last_name=f"Student {i}",
+            role=UserRole.STUDENT.value,
+        )
+        for i in range(students)
+    ]
+    session.add_all([group, *pupils])
+    await session.flush()
+
+    rows = [
+        Lesson(
+            title=f"Lesson {n}",
+            lesson_number=n,
+            group_id=group.id,
+            date=date(2026, 3, n),
+            start_time=time(9, 0),
+            end_time=time(10, 30),
+        )
+        for n in range(1, lessons + 1)
+    ]
+    session.add_all(rows)
+    for pupil in pupils:
+        session.add(Enrollment(
+            student_id=pupil.id,
+            group_id=group.id,
+            enrolled_at=date(2026, 3, 1),
+            agreed_price=Decimal(0),
+            status=EnrollmentStatus.ACTIVE.value,
+        ))
+    await session.flush()
+
+    for i, pupil in enumerate(pupils):
+        session.add(Attendance(
+            lesson_id=rows[0].id,
+            student_id=pupil.id,
+            status=AttendanceStatus.PRESENT.value if i == 0 else AttendanceStatus.ABSENT.value,
+            grade=5 if i == 0 else None,
+            homework_grade=4 if i == 0 else None,
+        ))
+    await session.flush()
+    return group.id
+
+
+@pytest.mark.parametrize("lessons, students", [(2, 2), (12, 20)])
+async def test_gradebook_grid_and_query_count(
+    db_session: AsyncSession, test_engine, lessons: int, students: int
+) -> None:
+    group_id = await seed_group(db_session, lessons, students)
+    service = GradebookService(GroupRepository(db_session), LessonRepository(db_session))
+
+    with StatementCounter(test_engine) as counter:
+        gradebook = await service.get_gradebook(group_id)
+
+    # Group check, lessons, roster and cells, whatever the size
+    assert counter.count == 4
+
+    data = json.loads("".join(gradebook.iter_json()))
+    assert [lesson["lesson_number"] for lesson in data["lessons"]] == list(range(1, lessons + 1))
+    assert len(data["students"]) == students
+
+    first, second = data["students"][:2]
+    assert first["cells"][0] == [AttendanceStatus.PRESENT.value, 5, 4]
+    assert first["cells"][1:] == [[None, None, None]] * (lessons - 1)
+    assert (first["average_grade"], first["average_homework_grade"], first["attendance_rate"]) == (5, 4, 1)
+    assert second["cells"][0] == [AttendanceStatus.ABSENT.value, None, None]
+    assert (second["average_grade"], second["attendance_rate"]) == (None, 0)
+
+
+async def test_gradebook_csv_has_one_row_per_student(db_session: AsyncSession) -> None:
+    group_id = await seed_group(db_session, lessons=2, students=3)
+    service = GradebookService(GroupRepository(db_session), LessonRepository(db_session))
+
+    lines = "".join((await service.get_gradebook(group_id)).iter_csv()).splitlines()
+
+    assert lines[0].startswith("student_id,student_name,#1 2026-03-01 status,")
+    assert len(lines) == 4
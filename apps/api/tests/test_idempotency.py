@@ -0,0 +1,100 @@
+"""
+Idempotency middleware tests.
+"""
+
+import uuid
+from typing import List
+
+from starlette.types import Message, Receive, Scope, Send
+
+from src.core.idempotency import (
+    MAX_REQUEST_BODY,
+    IdempotencyMiddleware,
+    transaction_committed,
+    transaction_started,
+)
+
+
+class EchoApp:
+    """Counts calls and answers with the request body."""
+
+    def __init__(self, commits: bool = True) -> None:
+        self.calls = 0
+        self.commits = commits
+
+    async def __call__(self, _scope: Scope, receive: Receive, send: Send) -> None:
+        self.calls += 1
+        transaction_started()
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+        # Like get_db, the commit happens after the response was sent
+        if self.commits:
+            transaction_committed()
+
+
+async def call(app, key: str, query: bytes, chunks: List[bytes]) -> List[Message]:
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/payments",
+        "query_string": query,
+        "headers": [(b"idempotency-key", key.encode())],
+    }
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    sent: List[Message] = []
+
+    async def receive() -> Message:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+async def test_query_string_is_part_of_the_fingerprint() -> None:
+    echo = EchoApp()
+    app = IdempotencyMiddleware(echo, ttl=60)
+    key = str(uuid.uuid4())
+
+    first = await call(app, key, b"amount=100", [b"{}"])
+    replay = await call(app, key, b"amount=100", [b"{}"])
+    other = await call(app, key, b"amount=900", [b"{}"])
+
+    assert echo.calls == 1
+    assert first[0]["status"] == replay[0]["status"] == 200
+    assert other[0]["status"] == 422
+
+
+async def test_large_chunked_body_is_passed_through() -> None:
+    echo = EchoApp()
+    app = IdempotencyMiddleware(echo, ttl=60)
+    key = str(uuid.uuid4())
+    chunks = [b"x" * (MAX_REQUEST_BODY // 2)] * 3 + [b"tail"]
+
+    first = await call(app, key, b"", list(chunks))
+    second = await call(app, key, b"", list(chunks))
+
+    assert echo.calls == 2
+    assert first[1]["body"] == second[1]["body"] == b"".join(chunks)
+
+
+async def test_response_is_not_stored_without_a_commit() -> None:
+    echo = EchoApp(commits=False)
+    app = IdempotencyMiddleware(echo, ttl=60)
+    key = str(uuid.uuid4())
+
+    await call(app, key, b"", [b"{}"])
+    await call(app, key, b"", [b"{}"])
+
+    assert echo.calls == 2
@@ -0,0 +1,75 @@
+"""
+Notification schema and push tests.
+"""
+
+import json
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from shared.constants import BroadcastAudience
+from src.core.security import create_access_token, create_stream_token, decode_stream_token
+from src.repositories.notification_repository import broadcast_notification_id
+from src.schemas.notification import BroadcastRequest, NotificationCreateRequest
+from src.services.notification_stream import NotificationBroker, format_event
+
+
+@pytest.mark.parametrize("selector", [
+    {"audience": BroadcastAudience.USERS, "user_ids": ["not-a-uuid"]},
+    {"audience": BroadcastAudience.COURSE, "course_id": "1"},
+    {"audience": BroadcastAudience.GROUP, "group_id": "group"},
+])
+def test_broadcast_rejects_malformed_ids(selector: dict) -> None:
+    with pytest.raises(ValidationError):
+        BroadcastRequest(title="Hello", message="World", **selector)
+
+
+def test_broadcast_ids_are_normalized() -> None:
+    user_id = uuid.uuid4()
+    request = BroadcastRequest(
+        audience=BroadcastAudience.USERS,
+        user_ids=[str(user_id).upper()],
+        title="Hello",
+        message="World",
+    )
+    assert request.user_ids == [str(user_id)]
+    assert request.send_telegram is False
+
+
+def test_notification_rejects_malformed_user_id() -> None:
+    with pytest.raises(ValidationError):
+        NotificationCreateRequest(user_id="42", title="Hello", message="World")
+
+
+async def test_broadcast_frames_carry_each_recipients_id() -> None:
+    user_id = str(uuid.uuid4())
+    broadcast_id = str(uuid.uuid4())
+    broker = NotificationBroker()
+    subscription = broker.subscribe(user_id)
+
+    await broker.dispatch({
+        "type": "broadcast",
+        "broadcast_id": broadcast_id,
+        "notification": {"title": "Hello", "message": "World"},
+        "unread_counts": {user_id: 3, str(uuid.uuid4()): 1},
+    })
+
+    frame = subscription.queue.get_nowait()
+    data = json.loads(frame.split("data: ", 1)[1])
+    assert data["id"] == broadcast_notification_id(broadcast_id, user_id)
+    assert uuid.UUID(data["id"])
+    assert subscription.queue.get_nowait() == format_event("unread_count", {"count": 3})
+    assert subscription.queue.empty()
+
+
+async def test_stream_rejects_access_token_in_query(client) -> None:
+    user_id = str(uuid.uuid4())
+
+    response = await client.get(
+        "/api/v1/notifications/stream",
+        params={"stream_token": create_access_token({"sub": user_id})},
+    )
+    assert response.status_code == 401
+
+    assert decode_stream_token(create_stream_token(user_id))["sub"] == user_id
@@ -0,0 +1,32 @@
+"""
+Financial report tests.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Course, Group, GroupBalance
+from src.repositories.report_repository import ReportRepository
+
+
+async def test_debt_total_matches_listed_groups(db_session: AsyncSession) -> None:
+    course = Course(name="Reports", slug="reports-test", price=Decimal(0))
+    db_session.add(course)
+    await db_session.flush()
+    live = Group(name="Live", course_id=course.id)
+    deleted = Group(name="Deleted", course_id=course.id, deleted_at=datetime.now(timezone.utc))
+    db_session.add_all([live, deleted])
+    await db_session.flush()
+    db_session.add_all([
+        GroupBalance(group_id=live.id, debt_total=Decimal(300)),
+        GroupBalance(group_id=deleted.id, debt_total=Decimal(500)),
+    ])
+    await db_session.flush()
+
+    repo = ReportRepository(db_session)
+    debts = await repo.get_group_debts()
+    assert [row.group_name for row in debts] == ["Live"]
+    assert await repo.get_debt_total() == sum(row.debt_total for row in debts)
+    assert await repo.get_debt_total(course.id) == Decimal(300)
@@ -0,0 +1,93 @@
+"""
+Term schedule generator tests.
+"""
+
+from datetime import date, time
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Course, Group, Lesson, User
+from shared.constants import UserRole
+from src.repositories.group_repository import GroupRepository
+from src.repositories.lesson_repository import LessonRepository
+from src.schemas.schedule import ScheduleGenerateRequest
+from src.services.schedule_service import ScheduleService
+
+
+async def seed_group(session: AsyncSession) -> str:
+    """Create a Mon/Wed/Fri group for two weeks."""
+    teacher = User(
+        phone="+998930000000",
+        first_name="Test",
+        last_name="Teacher",
+        role=UserRole.TEACHER.value,
+    )
+    course = Course(name="Schedule", slug="schedule-test", price=Decimal(0))
+    session.add_all([teacher, course])
+    await session.flush()
+    group = Group(
+        name="Schedule",
+        course_id=course.id,
+        teacher_id=teacher.id,
+        start_date=date(2026, 3, 2),
+        end_date=date(2026, 3, 13),
+        start_time=time(15, 0),
+        end_time=time(16, 30),
+        days_of_week="1,3,5",
+    )
+    session.add(group)
+    await session.flush()
+    return group.id
+
+
+async def test_generate_leaves_teacher_to_group(db_session: AsyncSession) -> None:
+    group_id = await seed_group(db_session)
+    service = ScheduleService(GroupRepository(db_session), LessonRepository(db_session))
+    request = ScheduleGenerateRequest(group_ids=[group_id])
+
+    result = await service.generate(request)
+    assert result.lessons == 6
+
+    lessons = (
+        await db_session.execute(
+            select(Lesson.lesson_number, Lesson.teacher_id)
+            .where(Lesson.group_id == group_id)
+            .order_by(Lesson.date)
+        )
+    ).all()
+    assert [number for number, _ in lessons] == [1, 2, 3, 4, 5, 6]
+    # The group's teacher applies; teacher_id is only a per-lesson override
+    assert all(teacher_id is None for _, teacher_id in lessons)
+
+    # Generating again keeps the existing days
+    assert (await service.generate(request)).lessons == 0
+    count = await db_session.scalar(
+        select(func.count(Lesson.id)).where(Lesson.group_id == group_id)
+    )
+    assert count == 6
+
+
+async def test_group_may_have_two_lessons_a_day(db_session: AsyncSession) -> None:
+    group_id = await seed_group(db_session)
+    service = ScheduleService(GroupRepository(db_session), LessonRepository(db_session))
+    await service.generate(ScheduleGenerateRequest(group_ids=[group_id]))
+
+    # A make-up lesson on a generated day
+    db_session.add(Lesson(
+        title="Make-up",
+        lesson_number=99,
+        group_id=group_id,
+        date=date(2026, 3, 2),
+        start_time=time(17, 0),
+        end_time=time(18, 30),
+    ))
+    await db_session.flush()
+
+    # ... is kept as is when the schedule is generated again
+    assert (await service.generate(ScheduleGenerateRequest(group_ids=[group_id]))).lessons == 0
+    count = await db_session.scalar(
+        select(func.count(Lesson.id)).where(Lesson.date == date(2026, 3, 2))
+    )
+    assert count == 2
@@ -0,0 +1,48 @@
+"""
+Session helper tests.
+"""
+
+import asyncio
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db.session import run_on_commit
+
+
+async def test_run_on_commit(test_engine) -> None:
+    factory = async_sessionmaker(bind=test_engine, class_=AsyncSession)
+    calls: List[str] = []
+
+    async def invalidate() -> None:
+        calls.append("async")
+
+    async with factory() as session:
+        await session.execute(text("SELECT 1"))
+        run_on_commit(session, lambda: calls.append("sync"))
+        run_on_commit(session, invalidate)
+        assert calls == []
+        await session.commit()
+        await asyncio.sleep(0)
+        assert calls == ["sync", "async"]
+
+        await session.execute(text("SELECT 1"))
+        run_on_commit(session, lambda: calls.append("rolled back"))
+        await session.rollback()
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+        await asyncio.sleep(0)
+        assert calls == ["sync", "async"]
+
+
+async def test_run_on_commit_once_per_key(test_engine) -> None:
+    factory = async_sessionmaker(bind=test_engine, class_=AsyncSession)
+    calls: List[int] = []
+
+    async with factory() as session:
+        await session.execute(text("SELECT 1"))
+        for n in range(3):
+            run_on_commit(session, lambda n=n: calls.append(n), key="bump")
+        await session.commit()
+        assert calls == [0]
@@ -0,0 +1,52 @@
+"""
+Soft-delete filter tests.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.base import include_deleted
+from db.models import Course, Group
+
+
+async def seed_course(session: AsyncSession) -> str:
+    """Create a course with one live and one soft-deleted group."""
+    course = Course(name="Soft delete", slug="soft-delete", price=Decimal(0))
+    session.add(course)
+    await session.flush()
+    session.add_all([
+        Group(name="Live", course_id=course.id),
+        Group(name="Deleted", course_id=course.id, deleted_at=datetime.now(timezone.utc)),
+    ])
+    await session.flush()
+    session.expunge_all()
+    return course.id
+
+
+async def test_select_hides_soft_deleted_rows(db_session: AsyncSession) -> None:
+    course_id = await seed_course(db_session)
+
+    groups = (await db_session.scalars(select(Group).where(Group.course_id == course_id))).all()
+    assert [group.name for group in groups] == ["Live"]
+
+
+async def test_relationship_load_hides_soft_deleted_rows(db_session: AsyncSession) -> None:
+    course_id = await seed_course(db_session)
+
+    course = await db_session.scalar(select(Course).where(Course.id == course_id))
+    assert [group.name for group in course.groups] == ["Live"]
+
+
+async def test_include_deleted_shows_soft_deleted_rows(db_session: AsyncSession) -> None:
+    course_id = await seed_course(db_session)
+
+    groups = (await db_session.scalars(
+        include_deleted(select(Group).where(Group.course_id == course_id).order_by(Group.name))
+    )).all()
+    assert [group.name for group in groups] == ["Deleted", "Live"]
+
+    course = await db_session.scalar(include_deleted(select(Course).where(Course.id == course_id)))
+    assert sorted(group.name for group in course.groups) == ["Deleted", "Live"]
@@ -0,0 +1,52 @@
+"""
+Statement import parser tests.
+"""
+
+from typing import AsyncIterator, List
+
+import pytest
+
+from src.services.statement_service import InvalidRecord, _parse_time, iter_csv_records
+
+
+CSV = (
+    'id,amount,note\n'
+    '1,100,"multi\nline, with comma"\n'
+    '2,200,plain\n'
+    '3,300\n'
+    '\n'
+    '4,400,"say ""hi"""\n'
+)
+
+
+async def chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def parse(data: str, size: int) -> List[tuple]:
+    return [item async for item in iter_csv_records(chunked(data.encode(), size))]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1024])
+async def test_csv_records_do_not_depend_on_chunk_size(size: int) -> None:
+    assert await parse(CSV, size) == [
+        (2, {"id": "1", "amount": "100", "note": "multi\nline, with comma"}),
+        (4, {"id": "2", "amount": "200", "note": "plain"}),
+        (5, InvalidRecord("expected 3 columns, got 2")),
+        (7, {"id": "4", "amount": "400", "note": 'say "hi"'}),
+    ]
+
+
+async def test_csv_unterminated_quote_is_reported() -> None:
+    records = await parse('id,note\n1,ok\n2,"open\nstill open\n', 4)
+    assert records[0] == (2, {"id": "1", "note": "ok"})
+    number, record = records[1]
+    assert number == 3
+    assert isinstance(record, InvalidRecord)
+
+
+@pytest.mark.parametrize("value", ["9" * 30, "-1" + "0" * 20])
+def test_out_of_range_timestamp_is_a_value_error(value: str) -> None:
+    with pytest.raises(ValueError):
+        _parse_time(value)
@@ -0,0 +1,110 @@
+"""
+Telegram outbox delivery tests.
+"""
+
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from shared.constants import TelegramDeliveryStatus
+from src.core.rate_limit import TelegramRateLimiter
+from src.repositories.notification_repository import NotificationRepository
+from src.services.telegram_service import DeliveryResult
+from src.workers.telegram_outbox import TelegramOutboxWorker
+
+
+async def test_limiter_does_not_start_sends_past_the_deadline() -> None:
+    limiter = TelegramRateLimiter(global_rate=30, chat_rate=1)
+    deadline = time.monotonic() + 0.5
+
+    assert await limiter.acquire(1, deadline)
+    started = time.monotonic()
+    # The chat's next slot is a second away
+    assert not await limiter.acquire(1, deadline)
+    assert await limiter.acquire(2, deadline)
+    assert time.monotonic() - started < 0.1
+
+
+async def test_limiter_does_not_wait_out_flood_control_past_the_deadline() -> None:
+    limiter = TelegramRateLimiter(global_rate=30, chat_rate=1)
+    limiter.block(60)
+
+    started = time.monotonic()
+    assert not await limiter.acquire(1, time.monotonic() + 1)
+    assert time.monotonic() - started < 0.1
+    assert limiter.delay(1) > 59
+
+
+class FakeTelegram:
+    """Answers every send with a fixed result and records the calls."""
+
+    def __init__(self, outcome: DeliveryResult):
+        self.outcome = outcome
+        self.sent: List[Tuple[int, str]] = []
+
+    async def send_many(self, messages, **_kwargs) -> List[DeliveryResult]:
+        self.sent.extend(messages)
+        return [self.outcome for _ in messages]
+
+
+class FakeSession:
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+
+def row(id: str = "n1", telegram_id: Optional[int] = 42, attempts: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=id,
+        telegram_id=telegram_id,
+        title="Hello",
+        message="World",
+        action_url=None,
+        telegram_attempts=attempts,
+    )
+
+
+async def run_batch(monkeypatch, telegram: FakeTelegram, rows: list) -> Dict[str, dict]:
+    recorded: List[dict] = []
+
+    async def claim(_self, _limit, _lease):
+        return rows
+
+    async def record(_self, results):
+        recorded.extend(results)
+        return len(results)
+
+    monkeypatch.setattr(NotificationRepository, "claim_telegram_batch", claim)
+    monkeypatch.setattr(NotificationRepository, "record_telegram_results", record)
+    worker = TelegramOutboxWorker(telegram, session_factory=FakeSession, batch_size=10, max_attempts=1)
+    assert await worker.run_once() == len(rows)
+    return {result["id"]: result for result in recorded}
+
+
+async def test_batch_is_sent_with_send_many(monkeypatch) -> None:
+    telegram = FakeTelegram(DeliveryResult(sent=True))
+    results = await run_batch(monkeypatch, telegram, [
+        row("n1", telegram_id=1, attempts=3),
+        row("n2", telegram_id=None),
+    ])
+
+    assert [chat for chat, _ in telegram.sent] == [1]
+    assert results["n1"]["status"] == TelegramDeliveryStatus.SENT.value
+    assert results["n1"]["attempts"] == 3
+    assert results["n2"]["status"] == TelegramDeliveryStatus.SKIPPED.value
+
+
+async def test_unsent_rows_go_back_without_using_an_attempt(monkeypatch) -> None:
+    telegram = FakeTelegram(DeliveryResult(sent=False, retry_after=5.0, attempted=False))
+    results = await run_batch(monkeypatch, telegram, [row("n1", attempts=1)])
+
+    result = results["n1"]
+    assert result["attempted"] is False
+    assert result["attempts"] == 1
+    assert result["status"] == TelegramDeliveryStatus.PENDING.value
+    assert result["next_attempt_at"] is not None
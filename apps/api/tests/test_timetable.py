@@ -0,0 +1,147 @@
+"""
+Timetable export tests.
+"""
+
+import csv
+import io
+from contextlib import asynccontextmanager
+from datetime import date, time
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import AsyncIterator, List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Course, Group, Lesson, User
+from shared.constants import LessonStatus, UserRole
+from src.services import timetable_service
+from src.services.timetable_service import TimetableService, format_event
+
+
+DAY = date(2026, 6, 1)
+
+
+def row(**overrides) -> SimpleNamespace:
+    values = {
+        "lesson_id": "l1",
+        "date": DAY,
+        "start_time": time(9, 0),
+        "end_time": time(10, 30),
+        "title": "Intro",
+        "lesson_number": 1,
+        "status": LessonStatus.SCHEDULED.value,
+        "group_name": "A",
+        "course_name": "Python",
+        "room": None,
+        "teacher_first_name": None,
+        "teacher_last_name": None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def unfold(text: str) -> List[str]:
+    return text.replace("\r\n ", "").split("\r\n")
+
+
+def test_event_text_is_escaped() -> None:
+    event = format_event(row(title='Sets; lists, and "\\"', room="101, 2nd floor\nleft"), "20260601T000000Z")
+
+    lines = unfold(event)
+    assert 'SUMMARY:Python: Sets\\; lists\\, and "\\\\"' in lines
+    assert "LOCATION:101\\, 2nd floor\\nleft" in lines
+    assert "DTSTART;TZID=Asia/Tashkent:20260601T090000" in lines
+
+
+def test_long_lines_are_folded_between_characters() -> None:
+    event = format_event(row(title="Oʻzbek tili " * 20), "20260601T000000Z")
+
+    for line in event.split("\r\n"):
+        assert len(line.encode("utf-8")) <= 75
+    assert any(line.startswith("SUMMARY:Python: Oʻzbek tili") for line in unfold(event))
+
+
+def test_cancelled_lesson_is_marked() -> None:
+    assert "STATUS:CANCELLED\r\n" in format_event(row(status=LessonStatus.CANCELLED.value), "x")
+    assert "STATUS:" not in format_event(row(), "x")
+
+
+async def seed_lessons(session: AsyncSession, count: int) -> str:
+    """Create ``count`` lessons of one group; return the group ID."""
+    teacher = User(
+        phone="+998950000001",
+        first_name="Ali",
+        last_name="Valiyev",
+        role=UserRole.TEACHER.value,
+    )
+    course = Course(name="Python, basics", slug="timetable", price=Decimal(0))
+    session.add_all([teacher, course])
+    await session.flush()
+    group = Group(name='Group "A"', course_id=course.id, teacher_id=teacher.id, room="101")
+    session.add(group)
+    await session.flush()
+    session.add_all([
+        Lesson(
+            title=f"Lesson {n}",
+            lesson_number=n,
+            group_id=group.id,
+            date=DAY,
+            start_time=time(8 + n, 0),
+            end_time=time(8 + n, 45),
+        )
+        for n in range(1, count + 1)
+    ])
+    await session.flush()
+    return group.id
+
+
+@pytest.fixture
+def service(db_session: AsyncSession) -> TimetableService:
+    @asynccontextmanager
+    async def session_factory() -> AsyncIterator[AsyncSession]:
+        yield db_session
+
+    return TimetableService(session_factory)
+
+
+async def collect(chunks: AsyncIterator[str]) -> List[str]:
+    return [chunk async for chunk in chunks]
+
+
+async def test_ics_export_streams_in_chunks(
+    db_session: AsyncSession, service: TimetableService, monkeypatch
+) -> None:
+    group_id = await seed_lessons(db_session, 5)
+    monkeypatch.setattr(timetable_service, "EXPORT_CHUNK_ROWS", 2)
+
+    chunks = await collect(service.iter_ics(DAY, DAY, "Group, A", group_id=group_id))
+
+    # Header, three chunks of events (2 + 2 + 1), footer
+    assert len(chunks) == 5
+    document = "".join(chunks)
+    assert document.startswith("BEGIN:VCALENDAR\r\n")
+    assert document.endswith("END:VCALENDAR\r\n")
+    lines = unfold(document)
+    assert "X-WR-CALNAME:Group\\, A" in lines
+    assert lines.count("BEGIN:VEVENT") == 5
+    assert "SUMMARY:Python\\, basics: Lesson 1" in lines
+    assert 'DESCRIPTION:Group "A"\\, #1\\nAli Valiyev' in lines
+
+
+async def test_csv_export_quotes_fields(
+    db_session: AsyncSession, service: TimetableService, monkeypatch
+) -> None:
+    await seed_lessons(db_session, 3)
+    monkeypatch.setattr(timetable_service, "EXPORT_CHUNK_ROWS", 2)
+
+    chunks = await collect(service.iter_csv(DAY, DAY))
+
+    assert len(chunks) == 2
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == timetable_service.CSV_HEADER
+    assert rows[1] == [
+        "2026-06-01", "09:00", "09:45", "Python, basics", 'Group "A"',
+        "1", "Lesson 1", "101", "Ali Valiyev", LessonStatus.SCHEDULED.value,
+    ]
+    assert len(rows) == 4
@@ -2,7 +2,7 @@
 Authentication filters.
 """
 
-from typing import Any, Union
+from typing import Any, Dict, Union
 
 from aiogram.filters import BaseFilter
 from aiogram.types import CallbackQuery, Message
@@ -17,13 +17,17 @@ settings = get_settings()
 
 
 class RegisteredUserFilter(BaseFilter):
-    """Filter for registered users only."""
+    """
+    Filter for registered users only.
+
+    Passes the cached ``db_user`` snapshot on to the handler.
+    """
 
     async def __call__(
         self,
         event: Union[Message, CallbackQuery],
         **kwargs: Any,
-    ) -> bool:
+    ) -> Union[bool, Dict[str, Any]]:
         """Check if user is registered."""
         user = event.from_user
         if not user:
@@ -35,21 +39,14 @@ class RegisteredUserFilter(BaseFilter):
         # open a short-lived session just for this check.
         if session is None:
             async with AsyncSessionLocal() as session_fallback:
-                user_service = UserService(session_fallback)
-                db_user = await user_service.get_user_by_telegram_id(user.id)
+                db_user = await UserService(session_fallback).get_user_snapshot(user.id)
         else:
-            user_service = UserService(session)
-            db_user = await user_service.get_user_by_telegram_id(user.id)
-
-        if not db_user:
-            return False
+            db_user = await UserService(session).get_user_snapshot(user.id)
 
         # User must be verified and have real phone number
-        return (
-            db_user.is_verified
-            and db_user.phone
-            and db_user.phone != "+998000000000"
-        )
+        if not db_user or not db_user.is_registered:
+            return False
+        return {"db_user": db_user}
 
 
 class AdminFilter(BaseFilter):
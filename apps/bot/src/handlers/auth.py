@@ -16,6 +16,7 @@ from src.keyboards.auth import (
     get_role_keyboard,
 )
 from src.keyboards.main import get_main_keyboard
+from src.middlewares.throttling import Limit
 from src.utils.messages import MESSAGES
 from src.utils.validators import validate_phone, format_phone
 from src.services.user_service import UserService
@@ -183,7 +184,11 @@ async def process_role(message: Message, state: FSMContext) -> None:
     )
 
 
-@router.message(RegistrationStates.confirmation, F.text == "✅ Tasdiqlash")
+@router.message(
+    RegistrationStates.confirmation,
+    F.text == "✅ Tasdiqlash",
+    flags={"throttling": Limit(rate=0.1, burst=3, key="register")},
+)
 async def confirm_registration(
     message: Message,
     state: FSMContext,
@@ -254,7 +259,7 @@ async def confirm_registration(
 # ===========================================
 
 
-@router.message(F.text == "❌ Bekor qilish")
+@router.message(F.text == "❌ Bekor qilish", flags={"throttling": False})
 async def cancel_action(message: Message, state: FSMContext) -> None:
     """Cancel current action."""
     current_state = await state.get_state()
@@ -2,8 +2,6 @@
 Common handlers - start, help, etc.
 """
 
-from urllib.parse import urlparse
-
 from aiogram import Router, F
 from aiogram.filters import CommandStart, Command
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
@@ -12,28 +10,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from shared import get_settings
 from src.keyboards.main import get_main_keyboard, get_guest_keyboard
 from src.utils.messages import MESSAGES
+from src.services.course_catalog import CATALOG_TEXT, get_course_catalog
 from src.services.user_service import UserService
+from src.utils.validators import is_valid_web_url
 
 
 settings = get_settings()
 WEB_URL = settings.web_url
 
 
-def _is_valid_web_url(url: str) -> bool:
-    """Return True if url can be used in Telegram inline keyboard buttons."""
-    if not url:
-        return False
-    parsed = urlparse(url)
-    if parsed.scheme not in {"http", "https"}:
-        return False
-    if not parsed.netloc:
-        return False
-    # Telegram rejects localhost URLs for buttons
-    if parsed.hostname == "localhost":
-        return False
-    return True
-
-
 router = Router(name="common")
 
 
@@ -53,7 +38,7 @@ async def cmd_start(message: Message, session: AsyncSession) -> None:
     )
 
     web_keyboard: InlineKeyboardMarkup | None = None
-    if _is_valid_web_url(WEB_URL):
+    if is_valid_web_url(WEB_URL):
         # Web sahifa havolasi
         web_keyboard = InlineKeyboardMarkup(
             inline_keyboard=[
@@ -123,21 +108,8 @@ async def cmd_contact(message: Message) -> None:
 @router.message(F.text == "📚 Kurslar")
 async def show_courses(message: Message, session: AsyncSession) -> None:
     """Show available courses."""
-    from src.keyboards.student import get_courses_keyboard
-    
-    # TODO: Ma'lumotlar bazasidan kurslarni olish
-    # Hozircha mock ma'lumotlar
-    mock_courses = [
-        type('Course', (), {'id': '1', 'name': 'Ingliz tili - Boshlang\'ich'}),
-        type('Course', (), {'id': '2', 'name': 'Matematika - Abituriyent'}),
-        type('Course', (), {'id': '3', 'name': 'Dasturlash asoslari'}),
-    ]
-    
-    await message.answer(
-        "📚 <b>Mavjud kurslar:</b>\n\n"
-        "Qiziqarli kursni tanlang:",
-        reply_markup=get_courses_keyboard(mock_courses),
-    )
+    catalog = await get_course_catalog().get(session)
+    await message.answer(CATALOG_TEXT, reply_markup=catalog.page(0))
 
 
 @router.message(F.text == "📞 Bog'lanish")
@@ -155,7 +127,7 @@ async def show_help(message: Message) -> None:
 @router.message(F.text == "🌐 Web sahifa")
 async def show_web_link(message: Message) -> None:
     """Show web site link."""
-    if not _is_valid_web_url(WEB_URL):
+    if not is_valid_web_url(WEB_URL):
         await message.answer(
             "⚠️ Web sahifa havolasi sozlanmagan (yoki localhost). "
             "Admin `.env` faylida `WEB_URL` ni public URL (masalan, ngrok) qilib qo'ysin."
@@ -2,8 +2,6 @@
 Student handlers - courses, schedule, payments.
 """
 
-from urllib.parse import urlparse
-
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.types import (
@@ -15,49 +13,31 @@ from aiogram.types import (
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared import get_settings
-from src.keyboards.student import (
-    get_courses_keyboard,
-    get_schedule_keyboard,
-)
+from src.keyboards.student import get_schedule_keyboard
 from src.filters.auth import RegisteredUserFilter
+from src.services.course_catalog import CATALOG_TEXT, get_course_catalog
+from src.services.user_cache import UserSnapshot
 from src.services.user_service import UserService
+from src.utils.validators import is_valid_web_url
 
 
 settings = get_settings()
 WEB_URL = settings.web_url
 
 
-def _is_valid_web_url(url: str) -> bool:
-    """Return True if url can be used in Telegram inline keyboard buttons."""
-    if not url:
-        return False
-    parsed = urlparse(url)
-    if parsed.scheme not in {"http", "https"}:
-        return False
-    if not parsed.netloc:
-        return False
-    if parsed.hostname == "localhost":
-        return False
-    return True
-
-
 router = Router(name="student")
 router.message.filter(RegisteredUserFilter())
 
 
 @router.message(F.text == "👤 Mening profilim")
 @router.message(Command("profile"))
-async def show_profile(message: Message, session: AsyncSession) -> None:
+async def show_profile(message: Message, db_user: UserSnapshot) -> None:
     """Show user profile."""
     telegram_user = message.from_user
     if not telegram_user:
         return
 
-    user_service = UserService(session)
-
-    # Get user from database
-    db_user = await user_service.get_user_by_telegram_id(telegram_user.id)
-
+    # Cached by RegisteredUserFilter
     if not db_user:
         await message.answer(
             "❌ Profil topilmadi. Iltimos, ro'yxatdan o'ting.",
@@ -65,7 +45,7 @@ async def show_profile(message: Message, session: AsyncSession) -> None:
         return
 
     web_keyboard: InlineKeyboardMarkup | None = None
-    if _is_valid_web_url(WEB_URL):
+    if is_valid_web_url(WEB_URL):
         profile_url = f"{WEB_URL.rstrip('/')}/profile"
         web_keyboard = InlineKeyboardMarkup(
             inline_keyboard=[
@@ -155,128 +135,48 @@ async def show_homework(message: Message) -> None:
 # ===========================================
 
 
-@router.callback_query(F.data.startswith("course_"))
-async def course_callback(callback: CallbackQuery) -> None:
-    """Handle course selection."""
+@router.callback_query(F.data.startswith("cat:"))
+async def course_catalog_callback(callback: CallbackQuery, session: AsyncSession) -> None:
+    """Catalog page or course card, answered from the cached catalog."""
     if not callback.message:
         await callback.answer()
         return
 
-    course_id = callback.data.split("_")[1]
+    catalog = await get_course_catalog().get(session)
+    try:
+        _, stamp, kind, value = callback.data.split(":", 3)
+    except ValueError:
+        stamp, kind, value = "", "p", "0"
 
-    # TODO: Ma'lumotlar bazasidan kurs olish
-    # Hozircha mock ma'lumotlar
-    mock_courses = {
-        '1': {
-            'name': "Ingliz tili - Boshlang'ich",
-            'description': "Ingliz tilini noldan o'rganing",
-            'price': '500,000',
-            'duration': '3 oy',
-            'schedule': 'Dush, Chor, Juma - 15:00',
-        },
-        '2': {
-            'name': 'Matematika - Abituriyent',
-            'description': "DTM tayyorlov kursi",
-            'price': '400,000',
-            'duration': '4 oy',
-            'schedule': 'Sesh, Pay, Shan - 10:00',
-        },
-        '3': {
-            'name': 'Dasturlash asoslari',
-            'description': "Python dasturlash tilini o'rganing",
-            'price': '600,000',
-            'duration': '3 oy',
-            'schedule': 'Dush, Chor - 18:00',
-        },
-    }
-    
-    course = mock_courses.get(course_id, {
-        'name': f'Kurs #{course_id}',
-        'description': "Ma'lumot mavjud emas",
-        'price': '-',
-        'duration': '-',
-        'schedule': '-',
-    })
-
-    # Web sahifaga havola
-    enroll_keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text="📝 Kursga yozilish",
-                    callback_data=f"enroll_{course_id}",
-                ),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="📞 Qo'ng'iroq qilish",
-                    callback_data="contact_call",
-                ),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="⬅️ Orqaga",
-                    callback_data="back_to_courses",
-                ),
-            ],
-        ]
-    )
-    
-    if _is_valid_web_url(WEB_URL):
-        enroll_keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="🌐 Web sahifada ko'rish",
-                        url=f"{WEB_URL.rstrip('/')}/courses",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="📝 Kursga yozilish",
-                        callback_data=f"enroll_{course_id}",
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="⬅️ Orqaga",
-                        callback_data="back_to_courses",
-                    ),
-                ],
-            ]
-        )
+    if stamp != catalog.stamp:
+        # Rendered before the catalog changed
+        await callback.message.edit_text(CATALOG_TEXT, reply_markup=catalog.page(0))
+        await callback.answer("Kurslar ro'yxati yangilandi")
+        return
 
-    await callback.message.edit_text(
-        f"📚 <b>{course['name']}</b>\n\n"
-        f"📝 {course['description']}\n\n"
-        f"💰 Narxi: {course['price']} so'm/oy\n"
-        f"⏱ Davomiyligi: {course['duration']}\n"
-        f"📅 Jadval: {course['schedule']}\n\n"
-        f"Kursga yozilish uchun quyidagi tugmani bosing:",
-        reply_markup=enroll_keyboard,
-    )
+    if kind == "c" and value in catalog.cards:
+        text, keyboard = catalog.cards[value]
+    elif kind == "p" and value.isdigit():
+        text, keyboard = CATALOG_TEXT, catalog.page(int(value))
+    else:
+        text, keyboard = CATALOG_TEXT, catalog.page(0)
+
+    # The "n/N" button points at the page already shown
+    if callback.message.reply_markup != keyboard:
+        await callback.message.edit_text(text, reply_markup=keyboard)
     await callback.answer()
 
 
+@router.callback_query(F.data.startswith("course_"))
 @router.callback_query(F.data == "back_to_courses")
-async def back_to_courses(callback: CallbackQuery) -> None:
-    """Back to courses list."""
+async def back_to_courses(callback: CallbackQuery, session: AsyncSession) -> None:
+    """Back to courses list (also old ``course_<id>`` buttons)."""
     if not callback.message:
         await callback.answer()
         return
 
-    # Mock kurslar
-    mock_courses = [
-        type('Course', (), {'id': '1', 'name': 'Ingliz tili - Boshlang\'ich'}),
-        type('Course', (), {'id': '2', 'name': 'Matematika - Abituriyent'}),
-        type('Course', (), {'id': '3', 'name': 'Dasturlash asoslari'}),
-    ]
-
-    await callback.message.edit_text(
-        "📚 <b>Mavjud kurslar:</b>\n\n"
-        "Qiziqarli kursni tanlang:",
-        reply_markup=get_courses_keyboard(mock_courses),
-    )
+    catalog = await get_course_catalog().get(session)
+    await callback.message.edit_text(CATALOG_TEXT, reply_markup=catalog.page(0))
     await callback.answer()
 
 
@@ -290,7 +190,7 @@ async def enroll_course(callback: CallbackQuery, session: AsyncSession) -> None:
     course_id = callback.data.split("_")[1]
     
     user_service = UserService(session)
-    db_user = await user_service.get_user_by_telegram_id(callback.from_user.id)
+    db_user = await user_service.get_user_snapshot(callback.from_user.id)
     
     if not db_user or not db_user.is_verified:
         # Ro'yxatdan o'tmagan foydalanuvchi
@@ -2,7 +2,7 @@
 Student keyboards.
 """
 
-from typing import List, Any
+from typing import List, Optional, Tuple
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
@@ -23,17 +23,27 @@ def get_student_menu() -> InlineKeyboardMarkup:
     )
 
 
-def get_courses_keyboard(courses: List[Any]) -> InlineKeyboardMarkup:
-    """Get courses keyboard."""
-    buttons = []
+def catalog_callback(stamp: str, kind: str, value: str) -> str:
+    """Callback data of the course catalog: ``cat:<stamp>:<p|c>:<page|course id>``."""
+    return f"cat:{stamp}:{kind}:{value}"
 
-    for course in courses:
-        buttons.append([
+
+def get_catalog_page_keyboard(
+    courses: List[Tuple[str, str]],
+    stamp: str,
+    page: int,
+    pages: int,
+) -> InlineKeyboardMarkup:
+    """Get one page of the course catalog; ``courses`` are (id, name) pairs."""
+    buttons = [
+        [
             InlineKeyboardButton(
-                text=f"📚 {course.name}",
-                callback_data=f"course_{course.id}",
+                text=f"📚 {name}",
+                callback_data=catalog_callback(stamp, "c", course_id),
             )
-        ])
+        ]
+        for course_id, name in courses
+    ]
 
     if not buttons:
         buttons.append([
@@ -43,6 +53,49 @@ def get_courses_keyboard(courses: List[Any]) -> InlineKeyboardMarkup:
             )
         ])
 
+    if pages > 1:
+        navigation = []
+        if page > 0:
+            navigation.append(InlineKeyboardButton(
+                text="⬅️", callback_data=catalog_callback(stamp, "p", str(page - 1))
+            ))
+        navigation.append(InlineKeyboardButton(
+            text=f"{page + 1}/{pages}", callback_data=catalog_callback(stamp, "p", str(page))
+        ))
+        if page < pages - 1:
+            navigation.append(InlineKeyboardButton(
+                text="➡️", callback_data=catalog_callback(stamp, "p", str(page + 1))
+            ))
+        buttons.append(navigation)
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
+def get_course_card_keyboard(
+    course_id: str,
+    stamp: str,
+    page: int,
+    web_url: Optional[str] = None,
+) -> InlineKeyboardMarkup:
+    """Get course detail keyboard; ``web_url`` only if usable in buttons."""
+    buttons = []
+    if web_url:
+        buttons.append([
+            InlineKeyboardButton(text="🌐 Web sahifada ko'rish", url=web_url),
+        ])
+    buttons.append([
+        InlineKeyboardButton(text="📝 Kursga yozilish", callback_data=f"enroll_{course_id}"),
+    ])
+    if not web_url:
+        buttons.append([
+            InlineKeyboardButton(text="📞 Qo'ng'iroq qilish", callback_data="contact_call"),
+        ])
+    buttons.append([
+        InlineKeyboardButton(
+            text="⬅️ Orqaga",
+            callback_data=catalog_callback(stamp, "p", str(page)),
+        ),
+    ])
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
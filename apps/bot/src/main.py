@@ -10,6 +10,8 @@ from urllib.parse import urlparse
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ParseMode
 from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
@@ -20,6 +22,8 @@ from db.session import init_db, close_db
 
 from src.handlers import register_all_handlers
 from src.middlewares import register_all_middlewares
+from src.services.course_catalog import close_course_catalog
+from src.services.user_cache import close_user_cache
 
 
 # Configure logging
@@ -114,7 +118,9 @@ async def on_shutdown(bot: Bot) -> None:
         # Don't block shutdown if webhook delete fails
         logger.exception("Failed to delete webhook on shutdown")
 
-    # Close database
+    # Close caches and database
+    await close_user_cache()
+    await close_course_catalog()
     await close_db()
 
     # Close bot HTTP session
@@ -134,8 +140,13 @@ async def main() -> None:
         raise ValueError("TELEGRAM_BOT_TOKEN is not set")
 
     # Create bot instance
+    session = None
+    if settings.telegram_api_url:
+        # Local Bot API server or scripts/fake_telegram_api.py
+        session = AiohttpSession(api=TelegramAPIServer.from_base(settings.telegram_api_url))
     bot = Bot(
         token=settings.telegram_bot_token,
+        session=session,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
 
@@ -150,7 +161,7 @@ async def main() -> None:
     dp = Dispatcher(storage=storage)
 
     # Register middlewares
-    register_all_middlewares(dp)
+    dispatch = register_all_middlewares(dp)
 
     # Register handlers
     register_all_handlers(dp)
@@ -164,11 +175,18 @@ async def main() -> None:
     if webhook:
         # Webhook server
         app = web.Application()
+        # Updates are only queued here; waiting for a free slot is the backpressure
         SimpleRequestHandler(
             dispatcher=dp,
             bot=bot,
             secret_token=webhook["secret_token"],
+            handle_in_background=False,
         ).register(app, path=webhook["path"])
+
+        async def metrics(_request: web.Request) -> web.Response:
+            return web.json_response(dispatch.metrics())
+
+        app.router.add_get("/metrics", metrics)
         setup_application(app, dp, bot=bot)
 
         runner = web.AppRunner(app)
@@ -203,9 +221,11 @@ async def main() -> None:
     else:
         # Start polling
         logger.info("Starting bot in polling mode...")
+        # Feeding only queues the update, so no extra task per update is needed
         await dp.start_polling(
             bot,
             allowed_updates=dp.resolve_used_update_types(),
+            handle_as_tasks=False,
         )
 
 
@@ -4,18 +4,37 @@ Bot middlewares.
 
 from aiogram import Dispatcher
 
+from shared import get_settings
 from src.middlewares.database import DatabaseMiddleware
+from src.middlewares.dispatch import OrderedDispatchMiddleware
 from src.middlewares.logging import LoggingMiddleware
 from src.middlewares.throttling import ThrottlingMiddleware
 
 
-def register_all_middlewares(dp: Dispatcher) -> None:
-    """Register all middlewares."""
+def register_all_middlewares(dp: Dispatcher) -> OrderedDispatchMiddleware:
+    """Register all middlewares; returns the update dispatcher (for metrics)."""
+    settings = get_settings()
+
+    # Registered after the built-in user context and FSM middlewares
+    dispatch = OrderedDispatchMiddleware(
+        concurrency=settings.bot_update_concurrency,
+        max_pending=settings.bot_update_queue_size,
+    )
+    dp.update.outer_middleware(dispatch)
+    dp.shutdown.register(dispatch.close)
+
+    # One instance, so messages and callbacks share the same buckets
+    throttling = ThrottlingMiddleware()
+    dp.shutdown.register(throttling.close)
+    database = DatabaseMiddleware()
+    dp.shutdown.register(database.log_usage)
+
     dp.message.middleware(LoggingMiddleware())
-    dp.message.middleware(ThrottlingMiddleware())
-    dp.message.middleware(DatabaseMiddleware())
+    dp.message.middleware(throttling)
+    dp.message.middleware(database)
 
     dp.callback_query.middleware(LoggingMiddleware())
-    dp.callback_query.middleware(ThrottlingMiddleware())
-    dp.callback_query.middleware(DatabaseMiddleware())
+    dp.callback_query.middleware(throttling)
+    dp.callback_query.middleware(database)
 
+    return dispatch
@@ -1,18 +1,101 @@
 """
 Database middleware.
+
+Handlers get a ``LazySession``: the real session is created on first
+use, so updates whose handlers never touch the database (most menu
+buttons) cost no pool connection, and a transaction is committed only if
+something was written. The bot shares Postgres with the API, so idle
+checkouts here take connections away from it.
 """
 
-from typing import Any, Awaitable, Callable, Dict
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState
 
 from db.session import AsyncSessionLocal
 
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DatabaseUsage:
+    """Database use of one handler."""
+
+    updates: int = 0
+    connections: int = 0  # Updates that checked out a connection
+    queries: int = 0
+    commits: int = 0
+
+
+class LazySession:
+    """``AsyncSession`` stand-in that opens the real session on first use."""
+
+    def __init__(self, factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+        self.connected = False
+        self.queries = 0
+        self.wrote = False
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+            sync_session = self._session.sync_session
+            event.listen(sync_session, "after_begin", self._on_begin)
+            event.listen(sync_session, "after_flush", self._on_flush)
+            event.listen(sync_session, "do_orm_execute", self._on_execute)
+        return getattr(self._session, name)
+
+    def _on_begin(self, *_: Any) -> None:
+        self.connected = True
+
+    def _on_flush(self, *_: Any) -> None:
+        self.wrote = True
+
+    def _on_execute(self, state: ORMExecuteState) -> None:
+        self.queries += 1
+        if not state.is_select:
+            # INSERT/UPDATE/DELETE or raw SQL
+            self.wrote = True
+
+    @property
+    def pending(self) -> bool:
+        """True if the transaction has to be committed."""
+        session = self._session
+        if session is None:
+            return False
+        return self.wrote or bool(session.new or session.dirty or session.deleted)
+
+    async def finish(self, commit: bool) -> bool:
+        """Commit (if anything was written and ``commit``) or roll back, then close."""
+        session = self._session
+        if session is None:
+            return False
+        committed = False
+        try:
+            if commit and self.pending:
+                await session.commit()
+                committed = True
+        finally:
+            # Rolls back a read-only transaction and returns the connection
+            await session.close()
+        return committed
+
+
 class DatabaseMiddleware(BaseMiddleware):
     """Middleware for database session injection."""
 
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.usage: Dict[str, DatabaseUsage] = {}
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
@@ -20,13 +103,37 @@ class DatabaseMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         """Inject database session into handler."""
-        async with AsyncSessionLocal() as session:
-            data["session"] = session
-            try:
-                result = await handler(event, data)
-                await session.commit()
-                return result
-            except Exception:
-                await session.rollback()
-                raise
+        session = LazySession(self.session_factory)
+        data["session"] = session
+        committed = False
+        try:
+            result = await handler(event, data)
+            committed = await session.finish(commit=True)
+            return result
+        except Exception:
+            await session.finish(commit=False)
+            raise
+        finally:
+            self._record(data, session, committed)
+
+    def _record(self, data: Dict[str, Any], session: LazySession, committed: bool) -> None:
+        handler = data.get("handler")
+        callback = getattr(handler, "callback", None)
+        name = (
+            f"{callback.__module__.rsplit('.', 1)[-1]}.{callback.__name__}"
+            if callback is not None
+            else "unknown"
+        )
+        usage = self.usage.setdefault(name, DatabaseUsage())
+        usage.updates += 1
+        usage.connections += session.connected
+        usage.queries += session.queries
+        usage.commits += committed
 
+    def log_usage(self) -> None:
+        """Log database use per handler (on shutdown)."""
+        for name, usage in sorted(self.usage.items(), key=lambda item: -item[1].connections):
+            logger.info(
+                f"DB usage {name}: {usage.updates} updates, {usage.connections} connections, "
+                f"{usage.queries} queries, {usage.commits} commits"
+            )
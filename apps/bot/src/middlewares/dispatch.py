@@ -0,0 +1,206 @@
+"""
+Ordered concurrent update dispatch.
+
+Registered as the innermost outer middleware of ``dp.update`` (after the
+user context and FSM middlewares), it queues each update and returns at
+once; a fixed pool of workers then runs the handlers:
+
+    - at most ``concurrency`` updates are processed at a time;
+    - updates of the same chat run one after another in arrival order, so
+      FSM steps (e.g. registration) cannot overtake each other;
+    - at most ``max_pending`` updates wait in memory, after which feeding
+      a new update blocks (polling stops fetching, webhook requests wait
+      and Telegram backs off).
+
+The FSM middleware reads ``raw_state`` when the update is queued, before
+the chat's earlier updates have run, so a worker reads it again right
+before calling the handlers.
+
+Handler exceptions no longer reach aiogram's ``ErrorsMiddleware`` (it
+wraps this middleware, which has already returned), so workers propagate
+them to the dispatcher's ``errors`` handlers themselves and log those that
+no handler took.
+
+``metrics()`` reports queue depth, throughput and latency percentiles.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import ErrorEvent, TelegramObject, Update
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 2048  # Recent updates the percentiles are computed over
+METRICS_LOG_INTERVAL = 60.0
+
+Handler = Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]]
+Job = Tuple[Handler, TelegramObject, Dict[str, Any], float]
+
+
+def _percentile(samples: Deque[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class OrderedDispatchMiddleware(BaseMiddleware):
+    """Process updates concurrently, but in order within each chat."""
+
+    def __init__(self, concurrency: int = 32, max_pending: int = 1000):
+        """
+        Initialize middleware.
+
+        Args:
+            concurrency: Updates processed at the same time
+            max_pending: Updates queued before feeding blocks
+        """
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.chats: Dict[Hashable, Deque[Job]] = {}
+        self.ready: asyncio.Queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(max_pending)
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.workers: List[asyncio.Task] = []
+        self._reporter: Optional[asyncio.Task] = None
+
+        self.pending = 0
+        self.active = 0
+        self.processed = 0
+        self.failed = 0
+        self.wait_times: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    async def __call__(
+        self,
+        handler: Handler,
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Queue the update for its chat."""
+        chat = data.get("event_chat")
+        user = data.get("event_from_user")
+        if chat is not None:
+            key: Hashable = chat.id
+        elif user is not None:
+            key = ("user", user.id)
+        else:
+            key = ("update", event.update_id if isinstance(event, Update) else id(event))
+
+        await self.slots.acquire()
+        self.start()
+        self.pending += 1
+        self.idle.clear()
+        job = (handler, event, data, time.monotonic())
+        queue = self.chats.get(key)
+        if queue is None:
+            self.chats[key] = deque([job])
+            self.ready.put_nowait(key)
+        else:
+            # The chat's current worker picks it up after the earlier updates
+            queue.append(job)
+        return None
+
+    def start(self) -> None:
+        """Start the workers (idempotent)."""
+        if self.workers:
+            return
+        self.workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        self._reporter = asyncio.create_task(self._report())
+
+    async def _work(self) -> None:
+        while True:
+            key = await self.ready.get()
+            queue = self.chats[key]
+            handler, event, data, submitted = queue[0]
+            started = time.monotonic()
+            self.wait_times.append(started - submitted)
+            self.active += 1
+            try:
+                state = data.get("state")
+                if state is not None:
+                    data["raw_state"] = await state.get_state()
+                await handler(event, data)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                await self._handle_error(event, data, e)
+            finally:
+                self.active -= 1
+                self.latencies.append(time.monotonic() - submitted)
+                queue.popleft()
+                if queue:
+                    # Back of the line, so one busy chat cannot starve others
+                    self.ready.put_nowait(key)
+                else:
+                    del self.chats[key]
+                self.pending -= 1
+                if not self.pending:
+                    self.idle.set()
+                self.slots.release()
+
+    async def _handle_error(self, event: TelegramObject, data: Dict[str, Any], error: Exception) -> None:
+        """Run the dispatcher's ``errors`` handlers, as ErrorsMiddleware would."""
+        dispatcher = data.get("dispatcher")
+        if dispatcher is not None and isinstance(event, Update):
+            try:
+                response = await dispatcher.propagate_event(
+                    update_type="error",
+                    event=ErrorEvent(update=event, exception=error),
+                    **data,
+                )
+            except Exception:
+                logger.exception("Error handler failed")
+                return
+            if response is not UNHANDLED:
+                return
+        logger.error("Failed to process update", exc_info=error)
+
+    async def _report(self) -> None:
+        reported = -1
+        while True:
+            await asyncio.sleep(METRICS_LOG_INTERVAL)
+            if self.processed + self.failed != reported:
+                reported = self.processed + self.failed
+                logger.info(f"Update dispatch: {self.metrics()}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, counters and latency percentiles (milliseconds)."""
+        return {
+            "pending": self.pending,
+            "active": self.active,
+            "chats": len(self.chats),
+            "processed": self.processed,
+            "failed": self.failed,
+            "wait_p50_ms": round(_percentile(self.wait_times, 0.5) * 1000, 1),
+            "wait_p95_ms": round(_percentile(self.wait_times, 0.95) * 1000, 1),
+            "latency_p50_ms": round(_percentile(self.latencies, 0.5) * 1000, 1),
+            "latency_p95_ms": round(_percentile(self.latencies, 0.95) * 1000, 1),
+            "latency_max_ms": round(max(self.latencies, default=0.0) * 1000, 1),
+        }
+
+    async def join(self) -> None:
+        """Wait until every queued update has been processed."""
+        await self.idle.wait()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Finish queued updates (up to ``timeout``), then stop the workers."""
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {self.pending} unprocessed updates")
+        tasks = self.workers + ([self._reporter] if self._reporter else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers = []
+        self._reporter = None
+        logger.info(f"Update dispatch: {self.metrics()}")
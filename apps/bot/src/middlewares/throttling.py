@@ -1,26 +1,163 @@
 """
 Throttling middleware to prevent spam.
+
+Every update takes one token from the sender's bucket and, in group chats,
+from the chat's bucket. With ``bot_throttle_backend=redis`` the buckets
+live in Redis and are checked and taken atomically by one Lua script, so
+the limits hold across all bot replicas; the memory backend is for a
+single process.
+
+Handlers may set their own limit through the ``throttling`` flag::
+
+    @router.message(F.text == "✅ Tasdiqlash", flags={"throttling": Limit(0.1, 3, "register")})
+
+A flag of ``False`` disables throttling for the handler.
 """
 
 import time
-from typing import Any, Awaitable, Callable, Dict
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
 from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
 from aiogram.types import TelegramObject, Message, CallbackQuery
 
+from shared import get_settings
+
+
+REDIS_PREFIX = "bot:throttle:"
+
+# KEYS: bucket keys; ARGV: rate, burst per key. Takes a token from every
+# bucket or from none; returns {allowed, seconds to wait}.
+TAKE_TOKENS = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local tokens = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    available = math.min(burst, available + math.max(0, now - ts) * rate)
+    tokens[i] = available
+    if available < 1 then
+        wait = math.max(wait, (1 - available) / rate)
+    end
+end
+if wait > 0 then
+    return {0, tostring(wait)}
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    local left = tokens[i] - 1
+    redis.call('HSET', key, 'tokens', tostring(left), 'ts', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil((burst - left) / rate * 1000) + 1000)
+end
+return {1, '0'}
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Token bucket: ``rate`` updates per second, bursts of up to ``burst``."""
+
+    rate: float
+    burst: float
+    key: str = "default"  # Handlers sharing a key share the bucket
+
+
+Bucket = Tuple[str, Limit]
+
+
+class MemoryThrottleStorage:
+    """Buckets in process memory, at most ``max_buckets`` (least recently used evicted)."""
+
+    def __init__(self, max_buckets: int = 10000):
+        self.max_buckets = max_buckets
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, buckets: Sequence[Bucket]) -> float:
+        """Take a token from every bucket; returns 0 or the seconds to wait."""
+        now = time.monotonic()
+        levels: List[float] = []
+        wait = 0.0
+        for key, limit in buckets:
+            tokens, updated = self.buckets.get(key, (limit.burst, now))
+            tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+            levels.append(tokens)
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / limit.rate)
+        if wait:
+            return wait
+
+        for (key, _), tokens in zip(buckets, levels, strict=True):
+            self.buckets[key] = (tokens - 1, now)
+            self.buckets.move_to_end(key)
+        while len(self.buckets) > self.max_buckets:
+            self.buckets.popitem(last=False)
+        return 0.0
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class RedisThrottleStorage(MemoryThrottleStorage):
+    """Buckets shared by all bot replicas."""
+
+    def __init__(self, url: str):
+        from redis import asyncio as aioredis
+
+        super().__init__()
+        self.redis = aioredis.from_url(url)
+        self.script = self.redis.register_script(TAKE_TOKENS)
+
+    async def take(self, buckets: Sequence[Bucket]) -> float:
+        args: List[float] = []
+        for _, limit in buckets:
+            args += [limit.rate, limit.burst]
+        allowed, wait = await self.script(
+            keys=[REDIS_PREFIX + key for key, _ in buckets], args=args
+        )
+        return 0.0 if int(allowed) else float(wait)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
 
 class ThrottlingMiddleware(BaseMiddleware):
     """Middleware for rate limiting."""
 
-    def __init__(self, rate_limit: float = 0.5):
+    def __init__(
+        self,
+        storage: Optional[MemoryThrottleStorage] = None,
+        user_limit: Optional[Limit] = None,
+        chat_limit: Optional[Limit] = None,
+    ):
         """
         Initialize middleware.
 
         Args:
-            rate_limit: Minimum seconds between messages
+            storage: Bucket storage (default from ``bot_throttle_backend``)
+            user_limit: Default per-user limit
+            chat_limit: Per-chat limit in group chats
         """
-        self.rate_limit = rate_limit
-        self.user_timestamps: Dict[int, float] = {}
+        settings = get_settings()
+        if storage is None:
+            if settings.bot_throttle_backend == "redis":
+                storage = RedisThrottleStorage(settings.redis_url)
+            else:
+                storage = MemoryThrottleStorage()
+        self.storage = storage
+        self.user_limit = user_limit or Limit(
+            settings.bot_throttle_rate, settings.bot_throttle_burst
+        )
+        self.chat_limit = chat_limit or Limit(
+            settings.bot_chat_throttle_rate, settings.bot_chat_throttle_burst, "chat"
+        )
 
     async def __call__(
         self,
@@ -29,33 +166,29 @@ class ThrottlingMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         """Check rate limit and call handler."""
-        user_id = None
+        limit = get_flag(data, "throttling", default=self.user_limit)
+        if limit is False or not isinstance(event, (Message, CallbackQuery)):
+            return await handler(event, data)
 
-        if isinstance(event, Message):
-            user_id = event.from_user.id if event.from_user else None
-        elif isinstance(event, CallbackQuery):
-            user_id = event.from_user.id if event.from_user else None
+        user_id = event.from_user.id if event.from_user else None
+        chat = event.chat if isinstance(event, Message) else (
+            event.message.chat if event.message else None
+        )
 
+        buckets: List[Bucket] = []
         if user_id:
-            current_time = time.time()
-            last_time = self.user_timestamps.get(user_id, 0)
-
-            if current_time - last_time < self.rate_limit:
-                # Rate limited - skip handler
-                if isinstance(event, CallbackQuery):
-                    await event.answer("Iltimos, sekinroq bosing!", show_alert=True)
-                return None
-
-            self.user_timestamps[user_id] = current_time
-
-            # Cleanup old entries periodically
-            if len(self.user_timestamps) > 1000:
-                cutoff = current_time - 60
-                self.user_timestamps = {
-                    uid: ts
-                    for uid, ts in self.user_timestamps.items()
-                    if ts > cutoff
-                }
+            buckets.append((f"{limit.key}:user:{user_id}", limit))
+        if chat and chat.type != "private":
+            buckets.append((f"{self.chat_limit.key}:chat:{chat.id}", self.chat_limit))
+
+        if buckets and await self.storage.take(buckets):
+            # Rate limited - skip handler
+            if isinstance(event, CallbackQuery):
+                await event.answer("Iltimos, sekinroq bosing!", show_alert=True)
+            return None
 
         return await handler(event, data)
 
+    async def close(self) -> None:
+        """Close the bucket storage."""
+        await self.storage.close()
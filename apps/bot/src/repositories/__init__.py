@@ -2,7 +2,8 @@
 Bot repositories.
 """
 
+from src.repositories.course_repository import CourseRepository
 from src.repositories.user_repository import UserRepository
 
-__all__ = ["UserRepository"]
+__all__ = ["CourseRepository", "UserRepository"]
 
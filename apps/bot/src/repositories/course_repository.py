@@ -0,0 +1,41 @@
+"""
+Course repository for bot.
+"""
+
+from typing import List
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Course
+from shared.constants import CourseStatus
+
+
+class CourseRepository:
+    """Course repository for bot."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository."""
+        self.session = session
+
+    async def get_published_catalog(self) -> List[Row]:
+        """Get the columns of published courses shown in the bot catalog."""
+        result = await self.session.execute(
+            select(
+                Course.id,
+                Course.slug,
+                Course.name,
+                Course.short_description,
+                Course.description,
+                Course.price,
+                Course.discount_price,
+                Course.duration_months,
+                Course.lessons_per_week,
+                Course.lesson_duration_minutes,
+                Course.level,
+                Course.updated_at,
+            )
+            .where(Course.status == CourseStatus.PUBLISHED.value)
+            .order_by(Course.is_featured.desc(), Course.name)
+        )
+        return list(result.all())
@@ -4,9 +4,10 @@ User repository for bot.
 
 from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db import include_deleted
 from db.models import User
 
 
@@ -22,17 +23,29 @@ class UserRepository:
         result = await self.session.execute(
             select(User).where(
                 User.telegram_id == telegram_id,
-                User.deleted_at.is_(None),
             )
         )
         return result.scalar_one_or_none()
 
+    async def get_snapshot_by_telegram_id(self, telegram_id: int) -> Optional[Row]:
+        """Get the columns of a user the bot caches (no relationship loading)."""
+        result = await self.session.execute(
+            select(
+                User.id,
+                User.telegram_id,
+                User.role,
+                User.is_verified,
+                User.phone,
+                User.first_name,
+                User.last_name,
+            ).where(User.telegram_id == telegram_id)
+        )
+        return result.one_or_none()
+
     async def get_by_telegram_id_include_deleted(self, telegram_id: int) -> Optional[User]:
         """Get user by Telegram ID (including deleted users)."""
         result = await self.session.execute(
-            select(User).where(
-                User.telegram_id == telegram_id,
-            )
+            include_deleted(select(User).where(User.telegram_id == telegram_id))
         )
         return result.scalar_one_or_none()
 
@@ -49,7 +62,6 @@ class UserRepository:
         result = await self.session.execute(
             select(User).where(
                 User.phone == phone,
-                User.deleted_at.is_(None),
             )
         )
         return result.scalar_one_or_none()
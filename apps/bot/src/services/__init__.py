@@ -2,7 +2,9 @@
 Bot services.
 """
 
+from src.services.course_catalog import CourseCatalog, get_course_catalog
+from src.services.user_cache import UserSnapshot, get_user_cache
 from src.services.user_service import UserService
 
-__all__ = ["UserService"]
+__all__ = ["CourseCatalog", "UserService", "UserSnapshot", "get_course_catalog", "get_user_cache"]
 
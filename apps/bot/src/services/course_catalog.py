@@ -0,0 +1,223 @@
+"""
+Course catalog served from memory.
+
+The published courses are loaded with one column-only query and rendered
+once into ``CatalogSnapshot``: every page keyboard and every course card
+(text and keyboard). Catalog callbacks are then answered without touching
+the database.
+
+The snapshot has a ``stamp`` (a hash of course ids and ``updated_at``)
+that is part of every catalog ``callback_data``; a button from a message
+rendered before the catalog changed carries an old stamp and gets the
+fresh first page instead of a wrong course.
+
+A snapshot is reloaded after ``bot_catalog_ttl`` seconds. With
+``bot_cache_backend=redis`` the API bumps ``CATALOG_VERSION_KEY`` whenever
+a course changes, and the catalog reloads as soon as it sees the bump.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from html import escape
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiogram.types import InlineKeyboardMarkup
+
+from shared import get_settings
+from shared.constants import CATALOG_VERSION_KEY
+
+from src.keyboards.student import get_catalog_page_keyboard, get_course_card_keyboard
+from src.repositories.course_repository import CourseRepository
+from src.utils.validators import is_valid_web_url
+
+
+logger = logging.getLogger(__name__)
+
+VERSION_CHECK_INTERVAL = 5.0  # Seconds between reads of CATALOG_VERSION_KEY
+MAX_DESCRIPTION_LENGTH = 600
+
+CATALOG_TEXT = "📚 <b>Mavjud kurslar:</b>\n\nQiziqarli kursni tanlang:"
+
+
+def format_price(amount: Decimal) -> str:
+    """500000 -> '500,000'."""
+    return f"{amount:,.0f}"
+
+
+def render_course(course: Any) -> str:
+    """Course card text (HTML)."""
+    description = course.short_description or course.description or ""
+    if len(description) > MAX_DESCRIPTION_LENGTH:
+        description = description[:MAX_DESCRIPTION_LENGTH].rstrip() + "…"
+
+    if course.discount_price is not None and course.discount_price < course.price:
+        price = (
+            f"<s>{format_price(course.price)}</s> "
+            f"{format_price(course.discount_price)} so'm/oy"
+        )
+    else:
+        price = f"{format_price(course.price)} so'm/oy"
+
+    text = f"📚 <b>{escape(course.name)}</b>\n\n"
+    if description:
+        text += f"📝 {escape(description)}\n\n"
+    text += (
+        f"💰 Narxi: {price}\n"
+        f"⏱ Davomiyligi: {course.duration_months} oy\n"
+        f"📅 Haftasiga {course.lessons_per_week} dars, "
+        f"{course.lesson_duration_minutes} daqiqadan\n"
+    )
+    if course.level:
+        text += f"📊 Daraja: {escape(course.level)}\n"
+    return text + "\nKursga yozilish uchun quyidagi tugmani bosing:"
+
+
+@dataclass
+class CatalogSnapshot:
+    """Pre-rendered catalog."""
+
+    stamp: str
+    pages: List[InlineKeyboardMarkup]
+    cards: Dict[str, Tuple[str, InlineKeyboardMarkup]] = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def page(self, number: int) -> InlineKeyboardMarkup:
+        """Page keyboard, clamped to the existing pages."""
+        return self.pages[max(0, min(number, len(self.pages) - 1))]
+
+    @classmethod
+    def build(cls, courses: List[Any], page_size: int, web_url: str = "") -> "CatalogSnapshot":
+        """Render all pages and cards of ``courses``."""
+        digest = hashlib.sha1()
+        for course in courses:
+            digest.update(f"{course.id}:{course.updated_at}\n".encode())
+        stamp = digest.hexdigest()[:8]
+
+        items = [(str(course.id), course.name) for course in courses]
+        pages_count = max(1, math.ceil(len(items) / page_size))
+        pages = [
+            get_catalog_page_keyboard(
+                items[number * page_size:(number + 1) * page_size],
+                stamp,
+                number,
+                pages_count,
+            )
+            for number in range(pages_count)
+        ]
+
+        cards = {}
+        base_url = web_url.rstrip("/") if is_valid_web_url(web_url) else None
+        for index, course in enumerate(courses):
+            course_id = str(course.id)
+            keyboard = get_course_card_keyboard(
+                course_id,
+                stamp,
+                index // page_size,
+                f"{base_url}/courses/{course.slug}" if base_url else None,
+            )
+            cards[course_id] = (render_course(course), keyboard)
+        return cls(stamp=stamp, pages=pages, cards=cards)
+
+
+class CourseCatalog:
+    """Cached catalog of published courses."""
+
+    def __init__(self, ttl: float, page_size: int, web_url: str = "", redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self.page_size = page_size
+        self.web_url = web_url
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._version: Optional[bytes] = None  # Version the snapshot was loaded at
+        self._version_checked = 0.0
+        self.redis = None
+        if redis_url:
+            from redis import asyncio as aioredis
+
+            self.redis = aioredis.from_url(redis_url)
+
+    async def get(self, session: Any) -> CatalogSnapshot:
+        """
+        Current snapshot, reloading it with ``session`` when stale.
+
+        Args:
+            session: Database session (only used on reload)
+
+        Returns:
+            Catalog snapshot
+        """
+        snapshot = self.snapshot
+        if snapshot is not None and not await self._stale(snapshot):
+            return snapshot
+
+        async with self._lock:
+            # Another update may have reloaded it meanwhile
+            if self.snapshot is not snapshot and self.snapshot is not None:
+                return self.snapshot
+            # Read before the courses, so a bump during the load reloads again
+            await self._read_version()
+            courses = await CourseRepository(session).get_published_catalog()
+            self.snapshot = CatalogSnapshot.build(courses, self.page_size, self.web_url)
+            logger.info(f"Course catalog loaded: {len(courses)} courses ({self.snapshot.stamp})")
+            return self.snapshot
+
+    async def _stale(self, snapshot: CatalogSnapshot) -> bool:
+        now = time.monotonic()
+        if now - snapshot.loaded_at >= self.ttl:
+            return True
+        if self.redis is None or now - self._version_checked < VERSION_CHECK_INTERVAL:
+            return False
+
+        loaded_version = self._version
+        return await self._read_version() and self._version != loaded_version
+
+    async def _read_version(self) -> bool:
+        """Read ``CATALOG_VERSION_KEY`` into ``_version``; False if Redis is unavailable."""
+        if self.redis is None:
+            return False
+        self._version_checked = time.monotonic()
+        try:
+            self._version = await self.redis.get(CATALOG_VERSION_KEY)
+        except Exception:
+            logger.warning("Catalog version unavailable", exc_info=True)
+            return False
+        return True
+
+    def invalidate(self) -> None:
+        """Reload on next use."""
+        self.snapshot = None
+
+    async def close(self) -> None:
+        """Release connections."""
+        if self.redis is not None:
+            await self.redis.aclose()
+
+
+_catalog: Optional[CourseCatalog] = None
+
+
+def get_course_catalog() -> CourseCatalog:
+    """Catalog configured from settings."""
+    global _catalog
+    if _catalog is None:
+        settings = get_settings()
+        _catalog = CourseCatalog(
+            ttl=settings.bot_catalog_ttl,
+            page_size=settings.bot_catalog_page_size,
+            web_url=settings.web_url,
+            redis_url=settings.redis_cache_url if settings.bot_cache_backend == "redis" else None,
+        )
+    return _catalog
+
+
+async def close_course_catalog() -> None:
+    """Close the catalog on shutdown."""
+    global _catalog
+    if _catalog is not None:
+        await _catalog.close()
+        _catalog = None
@@ -0,0 +1,164 @@
+"""
+Cache of the bot user looked up on almost every update.
+
+Filters and handlers only need a few columns of the user, so a slim
+``UserSnapshot`` is cached per telegram_id: in process memory (LRU) and,
+with ``bot_cache_backend=redis``, in Redis shared by all bot replicas.
+Users that are not in the database are cached too, for at most
+``NOT_FOUND_TTL`` seconds, so guests pressing buttons do not hit Postgres
+either while a user registered elsewhere is found soon.
+
+``UserService`` invalidates the entry once the transaction that creates or
+changes a user commits; changes made elsewhere (API, admin scripts) show
+up after ``bot_user_cache_ttl`` seconds.
+"""
+
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from shared import get_settings
+
+from src.utils.cache import MISSING, TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_PHONE = "+998000000000"
+REDIS_PREFIX = "bot:user:"
+LOCAL_TTL = 5.0  # With Redis, how long a replica may miss another one's invalidation
+NOT_FOUND = "null"
+NOT_FOUND_TTL = 30.0  # Seconds a "no such user" lookup is cached
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Columns of a user the bot needs on every update."""
+
+    id: str
+    telegram_id: int
+    role: str
+    is_verified: bool
+    phone: str
+    first_name: str
+    last_name: str
+
+    @classmethod
+    def from_user(cls, user: Any) -> "UserSnapshot":
+        """Snapshot of a ``User`` (or a row with the same columns)."""
+        return cls(
+            id=str(user.id),
+            telegram_id=user.telegram_id,
+            role=user.role,
+            is_verified=user.is_verified,
+            phone=user.phone,
+            first_name=user.first_name,
+            last_name=user.last_name,
+        )
+
+    @property
+    def is_registered(self) -> bool:
+        """Verified and has a real phone number."""
+        return bool(self.is_verified and self.phone and self.phone != PLACEHOLDER_PHONE)
+
+
+class UserCache:
+    """Process-local LRU of user snapshots (``None`` = no such user)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self.local: TTLCache[Optional[UserSnapshot]] = TTLCache(maxsize, ttl)
+
+    async def get(self, telegram_id: int) -> Any:
+        """Cached snapshot, ``None`` for a known non-user, or ``MISSING``."""
+        return self.local.get(telegram_id)
+
+    async def set(self, telegram_id: int, snapshot: Optional[UserSnapshot]) -> None:
+        """Cache the lookup result of ``telegram_id``."""
+        self.local.set(telegram_id, snapshot, self._local_ttl(snapshot))
+
+    async def invalidate(self, telegram_id: int) -> None:
+        """Forget ``telegram_id`` after the user changed."""
+        self.local.pop(telegram_id)
+
+    async def close(self) -> None:
+        """Release connections."""
+
+    def _local_ttl(self, snapshot: Optional[UserSnapshot]) -> Optional[float]:
+        return min(self.local.ttl, NOT_FOUND_TTL) if snapshot is None else None
+
+
+class RedisUserCache(UserCache):
+    """Snapshots shared by all bot replicas, fronted by a short-lived local LRU."""
+
+    def __init__(self, url: str, maxsize: int, ttl: float):
+        from redis import asyncio as aioredis
+
+        super().__init__(maxsize, ttl)
+        self.local.ttl = min(ttl, LOCAL_TTL)
+        self.redis = aioredis.from_url(url)
+
+    async def get(self, telegram_id: int) -> Any:
+        snapshot = self.local.get(telegram_id)
+        if snapshot is not MISSING:
+            return snapshot
+        try:
+            data = await self.redis.get(REDIS_PREFIX + str(telegram_id))
+        except Exception:
+            logger.warning("User cache unavailable", exc_info=True)
+            return MISSING
+        if data is None:
+            return MISSING
+        raw = json.loads(data)
+        snapshot = UserSnapshot(**raw) if raw is not None else None
+        self.local.set(telegram_id, snapshot, self._local_ttl(snapshot))
+        return snapshot
+
+    async def set(self, telegram_id: int, snapshot: Optional[UserSnapshot]) -> None:
+        self.local.set(telegram_id, snapshot, self._local_ttl(snapshot))
+        if snapshot is not None:
+            data, ttl = json.dumps(asdict(snapshot)), self.ttl
+        else:
+            data, ttl = NOT_FOUND, min(self.ttl, NOT_FOUND_TTL)
+        try:
+            await self.redis.set(REDIS_PREFIX + str(telegram_id), data, ex=int(ttl))
+        except Exception:
+            logger.warning("User cache unavailable", exc_info=True)
+
+    async def invalidate(self, telegram_id: int) -> None:
+        self.local.pop(telegram_id)
+        try:
+            await self.redis.delete(REDIS_PREFIX + str(telegram_id))
+        except Exception:
+            logger.warning("User cache unavailable", exc_info=True)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+_user_cache: Optional[UserCache] = None
+
+
+def get_user_cache() -> UserCache:
+    """Cache configured by ``bot_cache_backend``."""
+    global _user_cache
+    if _user_cache is None:
+        settings = get_settings()
+        if settings.bot_cache_backend == "redis":
+            _user_cache = RedisUserCache(
+                settings.redis_cache_url,
+                settings.bot_user_cache_size,
+                settings.bot_user_cache_ttl,
+            )
+        else:
+            _user_cache = UserCache(settings.bot_user_cache_size, settings.bot_user_cache_ttl)
+    return _user_cache
+
+
+async def close_user_cache() -> None:
+    """Close the cache on shutdown."""
+    global _user_cache
+    if _user_cache is not None:
+        await _user_cache.close()
+        _user_cache = None
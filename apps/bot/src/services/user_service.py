@@ -2,19 +2,25 @@
 User service for bot.
 """
 
+from functools import partial
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import User
+from db.session import run_on_commit
 from src.repositories.user_repository import UserRepository
+from src.services.user_cache import UserCache, UserSnapshot, get_user_cache
+from src.utils.cache import MISSING
 from shared.constants import UserRole
 
 
 class UserService:
     """User service for bot operations."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: UserCache | None = None):
         """Initialize service."""
         self.repo = UserRepository(session)
+        self.cache = cache or get_user_cache()
 
     async def get_or_create_by_telegram(
         self,
@@ -64,6 +70,7 @@ class UserService:
                     is_verified=False,
                 )
                 await self.repo.create(user)
+            self._invalidate_on_commit(telegram_id)
 
         return user
 
@@ -143,9 +150,31 @@ class UserService:
                 is_verified=True,
             )
 
+        self._invalidate_on_commit(telegram_id)
         return user
 
     async def get_user_by_telegram_id(self, telegram_id: int) -> User | None:
         """Get user by Telegram ID."""
         return await self.repo.get_by_telegram_id(telegram_id)
 
+    async def get_user_snapshot(self, telegram_id: int) -> UserSnapshot | None:
+        """
+        Get the cached snapshot of a user by Telegram ID.
+
+        Args:
+            telegram_id: Telegram user ID
+
+        Returns:
+            User snapshot, or None if there is no such user
+        """
+        snapshot = await self.cache.get(telegram_id)
+        if snapshot is MISSING:
+            row = await self.repo.get_snapshot_by_telegram_id(telegram_id)
+            snapshot = UserSnapshot.from_user(row) if row else None
+            await self.cache.set(telegram_id, snapshot)
+        return snapshot
+
+    def _invalidate_on_commit(self, telegram_id: int) -> None:
+        # Dropping the entry before the commit would let a concurrent update
+        # cache the old row again
+        run_on_commit(self.repo.session, partial(self.cache.invalidate, telegram_id))
@@ -0,0 +1,55 @@
+"""
+In-process LRU cache with per-entry expiry.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+V = TypeVar("V")
+
+MISSING: Any = object()  # Returned by TTLCache.get for absent or expired keys
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded LRU mapping whose entries expire after ``ttl`` seconds.
+
+    Not thread-safe; meant for one event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """Value of ``key``, or ``MISSING`` when absent or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return MISSING
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            return MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store ``value``, evicting the least recently used entry when full."""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop ``key`` if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
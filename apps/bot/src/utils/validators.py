@@ -3,6 +3,7 @@ Input validators.
 """
 
 import re
+from urllib.parse import urlparse
 
 from shared.constants import UZ_PHONE_REGEX
 
@@ -44,3 +45,25 @@ def format_phone(phone: str) -> str:
 
     return f"+{digits}"
 
+
+def is_valid_web_url(url: str) -> bool:
+    """
+    Check that a URL can be used in Telegram inline keyboard buttons.
+
+    Args:
+        url: URL to check
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if not url:
+        return False
+    parsed = urlparse(url)
+    if parsed.scheme not in {"http", "https"}:
+        return False
+    if not parsed.netloc:
+        return False
+    # Telegram rejects localhost URLs for buttons
+    if parsed.hostname == "localhost":
+        return False
+    return True
@@ -0,0 +1,80 @@
+"""
+Ordered update dispatch tests.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+from aiogram import Dispatcher
+from aiogram.types import ErrorEvent, Update
+
+from src.middlewares.dispatch import OrderedDispatchMiddleware
+
+
+def update_data(chat_id: int, **extra: Any) -> Dict[str, Any]:
+    return {"event_chat": SimpleNamespace(id=chat_id), **extra}
+
+
+async def test_updates_of_a_chat_run_in_arrival_order() -> None:
+    dispatch = OrderedDispatchMiddleware(concurrency=8)
+    handled: Dict[int, List[int]] = {}
+
+    async def handler(event: Update, data: Dict[str, Any]) -> None:
+        await asyncio.sleep(random.uniform(0, 0.005))
+        handled.setdefault(data["event_chat"].id, []).append(event.update_id)
+
+    for update_id in range(200):
+        await dispatch(handler, Update(update_id=update_id), update_data(update_id % 5))
+    await asyncio.wait_for(dispatch.join(), 5)
+    await dispatch.close()
+
+    assert sorted(handled) == list(range(5))
+    for chat_id, update_ids in handled.items():
+        assert update_ids == list(range(chat_id, 200, 5))
+    assert dispatch.processed == 200
+
+
+async def test_concurrency_is_capped() -> None:
+    dispatch = OrderedDispatchMiddleware(concurrency=3)
+    running = peak = 0
+
+    async def handler(_event: Update, _data: Dict[str, Any]) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    for update_id in range(20):
+        # Every update in its own chat, so only the cap limits concurrency
+        await dispatch(handler, Update(update_id=update_id), update_data(update_id))
+    await asyncio.wait_for(dispatch.join(), 5)
+    await dispatch.close()
+
+    assert peak == 3
+    assert dispatch.processed == 20
+
+
+async def test_handler_errors_reach_the_errors_handlers() -> None:
+    dp = Dispatcher()
+    dispatch = OrderedDispatchMiddleware(concurrency=2)
+    errors: List[Tuple[int, str]] = []
+
+    @dp.errors()
+    async def on_error(event: ErrorEvent) -> None:
+        errors.append((event.update.update_id, str(event.exception)))
+
+    async def handler(event: Update, _data: Dict[str, Any]) -> None:
+        if event.update_id == 2:
+            raise RuntimeError("boom")
+
+    for update_id in range(3):
+        await dispatch(handler, Update(update_id=update_id), update_data(1, dispatcher=dp))
+    await asyncio.wait_for(dispatch.join(), 5)
+    await dispatch.close()
+
+    assert errors == [(2, "boom")]
+    assert dispatch.processed == 2
+    assert dispatch.failed == 1
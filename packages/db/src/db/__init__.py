@@ -9,7 +9,7 @@ from db.session import (
     AsyncSessionLocal,
     engine,
 )
-from db.base import Base
+from db.base import Base, include_deleted
 from db.models import (
     User,
     Course,
@@ -30,6 +30,7 @@ __all__ = [
     "engine",
     # Base
     "Base",
+    "include_deleted",
     # Models
     "User",
     "Course",
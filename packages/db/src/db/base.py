@@ -5,12 +5,27 @@ Provides base model class with common functionality.
 """
 
 from datetime import datetime
-from typing import Any
+from typing import Any, TypeVar
 from uuid import uuid4
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import DateTime, String, event, func
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, declared_attr
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    ORMExecuteState,
+    Session,
+    mapped_column,
+    declared_attr,
+    with_loader_criteria,
+)
+
+
+ExecutableType = TypeVar("ExecutableType", bound=Executable)
+
+# Execution option that disables the global soft-delete filter
+INCLUDE_DELETED_OPTION = "include_deleted"
 
 
 class Base(DeclarativeBase):
@@ -76,6 +91,46 @@ class SoftDeleteMixin:
         return self.deleted_at is not None
 
 
+def include_deleted(statement: ExecutableType) -> ExecutableType:
+    """
+    Opt a statement out of the global soft-delete filter.
+
+    Args:
+        statement: ORM statement (select, update, ...)
+
+    Returns:
+        Statement that also returns soft-deleted rows
+
+    Usage:
+        await session.execute(include_deleted(select(User).where(...)))
+    """
+    return statement.execution_options(**{INCLUDE_DELETED_OPTION: True})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _filter_soft_deleted(execute_state: ORMExecuteState) -> None:
+    """
+    Hide soft-deleted rows from every ORM SELECT.
+
+    The criteria is attached once per top-level statement and propagates to
+    relationship and column loads, so repositories no longer repeat
+    ``deleted_at IS NULL`` and the partial indexes always match.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get(INCLUDE_DELETED_OPTION, False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True,
+            )
+        )
+
+
 class SlugMixin:
     """Mixin for slug field."""
 
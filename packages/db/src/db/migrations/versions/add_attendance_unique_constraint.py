@@ -0,0 +1,40 @@
+"""add unique constraint on attendances (lesson_id, student_id)
+
+Revision ID: attendance_unique_lesson_student
+Revises: soft_delete_partial_indexes
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'attendance_unique_lesson_student'
+down_revision: Union[str, None] = 'soft_delete_partial_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop duplicate rows first, keeping the most recently updated one
+    op.execute(
+        """
+        DELETE FROM attendances a
+        USING attendances b
+        WHERE a.lesson_id = b.lesson_id
+          AND a.student_id = b.student_id
+          AND (a.updated_at, a.id) < (b.updated_at, b.id)
+        """
+    )
+    op.create_unique_constraint(
+        'uq_attendances_lesson_student',
+        'attendances',
+        ['lesson_id', 'student_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_attendances_lesson_student', 'attendances', type_='unique')
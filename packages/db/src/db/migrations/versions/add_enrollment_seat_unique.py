@@ -0,0 +1,65 @@
+"""one seat-holding enrollment per student and group
+
+Revision ID: enrollment_seat_unique
+Revises: group_seat_backfill
+Create Date: 2026-10-20 09:30:00.000000
+
+Existing duplicates (a student with several pending/active enrollments in
+one group) keep their oldest enrollment; the others are marked dropped and
+the seat counters recounted. Run scripts/reconcile_counters.py afterwards to
+rebuild the report rollups.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'enrollment_seat_unique'
+down_revision: Union[str, None] = 'group_seat_backfill'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE enrollments e
+        SET status = 'dropped', updated_at = now()
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY group_id, student_id ORDER BY created_at, id
+            ) AS n
+            FROM enrollments
+            WHERE status IN ('pending', 'active')
+        ) d
+        WHERE d.id = e.id AND d.n > 1
+        """
+    )
+    op.execute(
+        """
+        UPDATE groups g
+        SET active_students = coalesce(c.n, 0)
+        FROM groups g2
+        LEFT JOIN (
+            SELECT group_id, count(*) AS n
+            FROM enrollments
+            WHERE status IN ('pending', 'active')
+            GROUP BY group_id
+        ) c ON c.group_id = g2.id
+        WHERE g2.id = g.id
+        """
+    )
+    op.create_index(
+        'uq_enrollments_group_student_seat',
+        'enrollments',
+        ['group_id', 'student_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'active')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_enrollments_group_student_seat', table_name='enrollments')
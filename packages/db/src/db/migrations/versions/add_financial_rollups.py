@@ -0,0 +1,81 @@
+"""add financial report rollups
+
+Revision ID: financial_rollups
+Revises: payment_ledger
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'financial_rollups'
+down_revision: Union[str, None] = 'payment_ledger'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('payment_daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('course_id', sa.UUID(as_uuid=False), nullable=True),
+    sa.Column('method', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('payments_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('amount_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('id', sa.UUID(as_uuid=False), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_payment_daily_rollups_bucket',
+        'payment_daily_rollups',
+        ['day', 'course_id', 'method', 'status'],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+    op.create_table('group_balances',
+    sa.Column('group_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('enrollments_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('agreed_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('paid_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('debt_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id')
+    )
+
+    # Initial fill; later rebuilds go through ReportRepository.rebuild
+    op.execute(
+        """
+        INSERT INTO payment_daily_rollups (id, day, course_id, method, status, payments_count, amount_total)
+        SELECT gen_random_uuid(), d.day, d.course_id, d.method, d.status, count(*), sum(d.amount)
+        FROM (
+            SELECT timezone('Asia/Tashkent', coalesce(p.paid_at, p.created_at))::date AS day,
+                   g.course_id, p.method, p.status, p.amount
+            FROM payments p
+            LEFT JOIN enrollments e ON e.id = p.enrollment_id
+            LEFT JOIN groups g ON g.id = e.group_id
+        ) d
+        GROUP BY d.day, d.course_id, d.method, d.status
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO group_balances (group_id, enrollments_count, agreed_total, paid_total, debt_total)
+        SELECT group_id, count(*), sum(agreed_price), sum(paid_amount),
+               sum(greatest(agreed_price - paid_amount, 0))
+        FROM enrollments
+        WHERE status IN ('pending', 'active', 'completed', 'suspended')
+        GROUP BY group_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('group_balances')
+    op.drop_index('uq_payment_daily_rollups_bucket', table_name='payment_daily_rollups')
+    op.drop_table('payment_daily_rollups')
@@ -0,0 +1,53 @@
+"""add active_students counter to groups
+
+Revision ID: group_active_students
+Revises: attendance_unique_lesson_student
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'group_active_students'
+down_revision: Union[str, None] = 'attendance_unique_lesson_student'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('groups', sa.Column('active_students', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing active enrollments
+    op.execute(
+        """
+        UPDATE groups g
+        SET active_students = c.n
+        FROM (
+            SELECT group_id, count(*) AS n
+            FROM enrollments
+            WHERE status = 'active'
+            GROUP BY group_id
+        ) c
+        WHERE c.group_id = g.id
+        """
+    )
+
+    op.create_index(
+        'ix_groups_open_seats',
+        'groups',
+        ['course_id'],
+        unique=False,
+        postgresql_include=['id'],
+        postgresql_where=sa.text(
+            'is_active IS true AND deleted_at IS NULL AND active_students < max_students'
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_groups_open_seats', table_name='groups')
+    op.drop_column('groups', 'active_students')
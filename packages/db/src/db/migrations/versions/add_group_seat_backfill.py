@@ -0,0 +1,46 @@
+"""count pending enrollments in groups.active_students
+
+Revision ID: group_seat_backfill
+Revises: notification_partitions
+Create Date: 2026-10-20 09:00:00.000000
+
+A pending enrollment already occupies a seat, so the counter covers pending
+and active enrollments. Databases that ran group_active_students counted
+active ones only.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'group_seat_backfill'
+down_revision: Union[str, None] = 'notification_partitions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill(statuses: str) -> None:
+    op.execute(
+        f"""
+        UPDATE groups g
+        SET active_students = coalesce(c.n, 0)
+        FROM groups g2
+        LEFT JOIN (
+            SELECT group_id, count(*) AS n
+            FROM enrollments
+            WHERE status IN ({statuses})
+            GROUP BY group_id
+        ) c ON c.group_id = g2.id
+        WHERE g2.id = g.id
+        """
+    )
+
+
+def upgrade() -> None:
+    _backfill("'pending', 'active'")
+
+
+def downgrade() -> None:
+    _backfill("'active'")
@@ -0,0 +1,50 @@
+"""add notification archive for retention
+
+Revision ID: notification_archive
+Revises: notification_counters
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'notification_archive'
+down_revision: Union[str, None] = 'notification_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('archived_notifications',
+    sa.Column('id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('user_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=False),
+    sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('sent_via_telegram', sa.Boolean(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('telegram_status', sa.String(length=20), nullable=True),
+    sa.Column('action_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_notifications_user_created',
+        'archived_notifications',
+        ['user_id', 'created_at'],
+        unique=False,
+    )
+    op.create_index('ix_notifications_created_at', 'notifications', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_created_at', table_name='notifications')
+    op.drop_index('ix_archived_notifications_user_created', table_name='archived_notifications')
+    op.drop_table('archived_notifications')
@@ -0,0 +1,49 @@
+"""add per-user unread notification counters
+
+Revision ID: notification_counters
+Revises: notification_telegram_outbox
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'notification_counters'
+down_revision: Union[str, None] = 'notification_telegram_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('notification_counters',
+    sa.Column('user_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(
+        'ix_notifications_user_unread',
+        'notifications',
+        ['user_id'],
+        postgresql_where=sa.text('is_read IS false'),
+    )
+
+    op.execute(
+        """
+        INSERT INTO notification_counters (user_id, unread_count)
+        SELECT user_id, count(*)
+        FROM notifications
+        WHERE is_read IS false
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_table('notification_counters')
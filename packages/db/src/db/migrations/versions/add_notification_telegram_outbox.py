@@ -0,0 +1,47 @@
+"""add telegram outbox columns to notifications
+
+Revision ID: notification_telegram_outbox
+Revises: payment_external_id
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'notification_telegram_outbox'
+down_revision: Union[str, None] = 'payment_external_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('telegram_status', sa.String(length=20), nullable=True))
+    op.add_column(
+        'notifications',
+        sa.Column('telegram_attempts', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'notifications',
+        sa.Column('telegram_next_attempt_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column('notifications', sa.Column('telegram_error', sa.String(length=500), nullable=True))
+
+    # Existing rows keep telegram_status NULL so old notifications are not sent now
+    op.create_index(
+        'ix_notifications_telegram_pending',
+        'notifications',
+        ['telegram_next_attempt_at'],
+        postgresql_where=sa.text("telegram_status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_telegram_pending', table_name='notifications')
+    op.drop_column('notifications', 'telegram_error')
+    op.drop_column('notifications', 'telegram_next_attempt_at')
+    op.drop_column('notifications', 'telegram_attempts')
+    op.drop_column('notifications', 'telegram_status')
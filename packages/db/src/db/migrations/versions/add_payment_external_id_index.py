@@ -0,0 +1,57 @@
+"""add unique index on payment provider transaction id
+
+Revision ID: payment_external_id
+Revises: financial_rollups
+Create Date: 2026-10-19 15:00:00.000000
+
+Existing duplicates are not removed automatically, since they are money:
+the upgrade stops and lists them so they can be resolved by hand.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'payment_external_id'
+down_revision: Union[str, None] = 'financial_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(sa.text(
+        """
+        SELECT method, external_id, string_agg(id::text, ', ' ORDER BY created_at)
+        FROM payments
+        WHERE external_id IS NOT NULL
+        GROUP BY method, external_id
+        HAVING count(*) > 1
+        ORDER BY method, external_id
+        LIMIT 50
+        """
+    )).all()
+    if duplicates:
+        listing = "\n".join(
+            f"  {method} {external_id}: payments {ids}"
+            for method, external_id, ids in duplicates
+        )
+        raise RuntimeError(
+            "Cannot add uq_payments_method_external_id: these provider transactions "
+            f"are recorded more than once (first 50 shown):\n{listing}\n"
+            "Delete or clear external_id of the duplicates, then run the upgrade again."
+        )
+
+    op.create_index(
+        'uq_payments_method_external_id',
+        'payments',
+        ['method', 'external_id'],
+        unique=True,
+        postgresql_where=sa.text('external_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_payments_method_external_id', table_name='payments')
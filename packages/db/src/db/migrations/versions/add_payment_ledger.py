@@ -0,0 +1,84 @@
+"""add payment ledger and user balances
+
+Revision ID: payment_ledger
+Revises: group_active_students
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'payment_ledger'
+down_revision: Union[str, None] = 'group_active_students'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ledger_entries',
+    sa.Column('payment_id', sa.UUID(as_uuid=False), nullable=True),
+    sa.Column('user_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('enrollment_id', sa.UUID(as_uuid=False), nullable=True),
+    sa.Column('entry_type', sa.String(length=50), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['payment_id'], ['payments.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['enrollment_id'], ['enrollments.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ledger_entries_payment_id'), 'ledger_entries', ['payment_id'], unique=False)
+    op.create_index(op.f('ix_ledger_entries_user_id'), 'ledger_entries', ['user_id'], unique=False)
+    op.create_index(op.f('ix_ledger_entries_enrollment_id'), 'ledger_entries', ['enrollment_id'], unique=False)
+
+    op.create_table('user_balances',
+    sa.Column('user_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('paid_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Seed the ledger with already confirmed payments
+    op.execute(
+        """
+        INSERT INTO ledger_entries (id, payment_id, user_id, enrollment_id, entry_type, amount, created_at)
+        SELECT gen_random_uuid(), id, user_id, enrollment_id, 'payment', amount, coalesce(paid_at, updated_at)
+        FROM payments
+        WHERE status = 'completed'
+        """
+    )
+    op.execute(
+        """
+        UPDATE enrollments e
+        SET paid_amount = coalesce(l.total, 0)
+        FROM (
+            SELECT e2.id, sum(le.amount) AS total
+            FROM enrollments e2
+            LEFT JOIN ledger_entries le ON le.enrollment_id = e2.id
+            GROUP BY e2.id
+        ) l
+        WHERE l.id = e.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_balances (user_id, paid_total)
+        SELECT user_id, sum(amount)
+        FROM ledger_entries
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_balances')
+    op.drop_index(op.f('ix_ledger_entries_enrollment_id'), table_name='ledger_entries')
+    op.drop_index(op.f('ix_ledger_entries_user_id'), table_name='ledger_entries')
+    op.drop_index(op.f('ix_ledger_entries_payment_id'), table_name='ledger_entries')
+    op.drop_table('ledger_entries')
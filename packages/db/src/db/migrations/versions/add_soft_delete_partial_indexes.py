@@ -0,0 +1,42 @@
+"""add partial indexes for soft-deleted tables
+
+Revision ID: soft_delete_partial_indexes
+Revises: add_specialization_user
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'soft_delete_partial_indexes'
+down_revision: Union[str, None] = 'add_specialization_user'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NOT_DELETED = sa.text('deleted_at IS NULL')
+
+
+def upgrade() -> None:
+    # Only live rows are ever read now that the ORM filters soft-deleted rows globally
+    op.create_index('ix_users_phone_not_deleted', 'users', ['phone'], unique=False, postgresql_include=['id'], postgresql_where=NOT_DELETED)
+    op.create_index('ix_users_telegram_id_not_deleted', 'users', ['telegram_id'], unique=False, postgresql_include=['id'], postgresql_where=NOT_DELETED)
+    op.create_index('ix_users_role_not_deleted', 'users', ['role'], unique=False, postgresql_include=['id'], postgresql_where=NOT_DELETED)
+    op.create_index('ix_courses_status_not_deleted', 'courses', ['status', 'created_at'], unique=False, postgresql_include=['id'], postgresql_where=NOT_DELETED)
+    op.create_index('ix_groups_course_id_not_deleted', 'groups', ['course_id'], unique=False, postgresql_include=['id'], postgresql_where=NOT_DELETED)
+    # No migration creates "tests" yet; databases built with create_all have it
+    if sa.inspect(op.get_bind()).has_table('tests'):
+        op.create_index('ix_tests_course_id_not_deleted', 'tests', ['course_id'], unique=False, postgresql_include=['id'], postgresql_where=NOT_DELETED)
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_tests_course_id_not_deleted')
+    op.drop_index('ix_groups_course_id_not_deleted', table_name='groups')
+    op.drop_index('ix_courses_status_not_deleted', table_name='courses')
+    op.drop_index('ix_users_role_not_deleted', table_name='users')
+    op.drop_index('ix_users_telegram_id_not_deleted', table_name='users')
+    op.drop_index('ix_users_phone_not_deleted', table_name='users')
@@ -0,0 +1,42 @@
+"""partition notifications by month (optional)
+
+Revision ID: notification_partitions
+Revises: notification_archive
+Create Date: 2026-10-19 18:30:00.000000
+
+Only runs when requested, since it rewrites the whole table:
+
+    alembic -x partition_notifications=true upgrade head
+
+A database that already passed this revision is converted with
+``make db-partition-notifications`` (scripts/partition_notifications.py),
+which runs the same conversion outside the revision chain. Monthly
+partitions are named ``notifications_YYYY_MM``; scripts/prune_notifications.py
+keeps creating upcoming months and drops expired ones.
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+from db.partitioning import partition_notifications, unpartition_notifications
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'notification_partitions'
+down_revision: Union[str, None] = 'notification_archive'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _requested() -> bool:
+    return context.get_x_argument(as_dictionary=True).get('partition_notifications') == 'true'
+
+
+def upgrade() -> None:
+    if _requested():
+        partition_notifications(op.get_bind())
+
+
+def downgrade() -> None:
+    unpartition_notifications(op.get_bind())
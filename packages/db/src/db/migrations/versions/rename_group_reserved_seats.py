@@ -0,0 +1,28 @@
+"""rename groups.active_students to reserved_seats
+
+Revision ID: group_reserved_seats
+Revises: enrollment_seat_unique
+Create Date: 2026-10-20 12:00:00.000000
+
+The counter holds seats of pending and active enrollments, not just active
+students. ix_groups_open_seats follows the renamed column.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'group_reserved_seats'
+down_revision: Union[str, None] = 'enrollment_seat_unique'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('groups', 'active_students', new_column_name='reserved_seats')
+
+
+def downgrade() -> None:
+    op.alter_column('groups', 'reserved_seats', new_column_name='active_students')
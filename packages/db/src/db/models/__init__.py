@@ -8,7 +8,9 @@ from db.models.lesson import Lesson
 from db.models.enrollment import Enrollment
 from db.models.attendance import Attendance
 from db.models.payment import Payment
-from db.models.notification import Notification
+from db.models.ledger import LedgerEntry, UserBalance
+from db.models.report import PaymentDailyRollup, GroupBalance
+from db.models.notification import ArchivedNotification, Notification, NotificationCounter
 from db.models.test import Test, TestQuestion, TestQuestionOption
 from db.models.test_result import TestResult
 
@@ -20,7 +22,13 @@ __all__ = [
     "Enrollment",
     "Attendance",
     "Payment",
+    "LedgerEntry",
+    "UserBalance",
+    "PaymentDailyRollup",
+    "GroupBalance",
     "Notification",
+    "NotificationCounter",
+    "ArchivedNotification",
     "Test",
     "TestQuestion",
     "TestQuestionOption",
@@ -4,7 +4,7 @@ Attendance model.
 
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.base import Base, TimestampMixin, UUIDMixin
@@ -19,6 +19,10 @@ class Attendance(Base, UUIDMixin, TimestampMixin):
     """Attendance model."""
 
     __tablename__ = "attendances"
+    __table_args__ = (
+        # One attendance row per student per lesson (target of the bulk upsert)
+        UniqueConstraint("lesson_id", "student_id", name="uq_attendances_lesson_student"),
+    )
 
     # Relations
     student_id: Mapped[str] = mapped_column(
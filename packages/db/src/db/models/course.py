@@ -10,11 +10,13 @@ from sqlalchemy import (
     Boolean,
     Date,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     Time,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,6 +32,16 @@ if TYPE_CHECKING:
 class Course(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin, SlugMixin):
     """Course model."""
 
+    __table_args__ = (
+        Index(
+            "ix_courses_status_not_deleted",
+            "status",
+            "created_at",
+            postgresql_include=["id"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+
     # Basic info
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -96,6 +108,24 @@ class Group(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     """Group model - students study in groups."""
 
     __tablename__ = "groups"
+    __table_args__ = (
+        Index(
+            "ix_groups_course_id_not_deleted",
+            "course_id",
+            postgresql_include=["id"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Groups with free seats (see GroupRepository.get_groups_with_capacity)
+        Index(
+            "ix_groups_open_seats",
+            "course_id",
+            postgresql_include=["id"],
+            postgresql_where=text(
+                "is_active IS true AND deleted_at IS NULL "
+                "AND reserved_seats < max_students"
+            ),
+        ),
+    )
 
     # Basic info
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -127,6 +157,12 @@ class Group(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
 
     # Capacity
     max_students: Mapped[int] = mapped_column(Integer, default=20, nullable=False)
+    reserved_seats: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )  # Seats held by pending/active enrollments, see GroupRepository
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     # Room
@@ -146,19 +182,18 @@ class Group(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     enrollments: Mapped[List["Enrollment"]] = relationship(
         "Enrollment",
         back_populates="group",
-        lazy="selectin",
+        lazy="select",
     )
 
     @property
     def current_students_count(self) -> int:
-        """Get current number of enrolled students."""
-        from shared.constants import EnrollmentStatus
-        return len([e for e in self.enrollments if e.status == EnrollmentStatus.ACTIVE.value])
+        """Get number of students holding a seat (pending or active)."""
+        return self.reserved_seats
 
     @property
     def has_capacity(self) -> bool:
         """Check if group has capacity for more students."""
-        return self.current_students_count < self.max_students
+        return self.reserved_seats < self.max_students
 
     def __repr__(self) -> str:
         return f"<Group {self.id}: {self.name}>"
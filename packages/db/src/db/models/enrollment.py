@@ -6,7 +6,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Date, ForeignKey, Numeric, String, Text
+from sqlalchemy import Date, ForeignKey, Index, Numeric, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.base import Base, TimestampMixin, UUIDMixin
@@ -20,6 +20,17 @@ if TYPE_CHECKING:
 class Enrollment(Base, UUIDMixin, TimestampMixin):
     """Enrollment model."""
 
+    __table_args__ = (
+        # A student holds at most one seat per group
+        Index(
+            "uq_enrollments_group_student_seat",
+            "group_id",
+            "student_id",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'active')"),
+        ),
+    )
+
     # Relations
     student_id: Mapped[str] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
@@ -0,0 +1,76 @@
+"""
+Payment ledger models.
+
+Every change of money on an enrollment is an append-only ledger entry.
+``Enrollment.paid_amount`` and ``UserBalance.paid_total`` are running sums
+of the ledger, adjusted in the same transaction as the entry is written.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base, UUIDMixin
+
+
+class LedgerEntry(Base, UUIDMixin):
+    """Ledger entry (signed amount)."""
+
+    __tablename__ = "ledger_entries"
+
+    # Relations
+    payment_id: Mapped[Optional[str]] = mapped_column(
+        ForeignKey("payments.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    enrollment_id: Mapped[Optional[str]] = mapped_column(
+        ForeignKey("enrollments.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
+    # Entry
+    entry_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<LedgerEntry {self.id}: {self.entry_type} {self.amount}>"
+
+
+class UserBalance(Base):
+    """Per-user total of confirmed payments."""
+
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    paid_total: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2),
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserBalance {self.user_id}: {self.paid_total}>"
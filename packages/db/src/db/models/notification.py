@@ -5,7 +5,8 @@ Notification model.
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.base import Base, TimestampMixin, UUIDMixin
@@ -18,6 +19,23 @@ if TYPE_CHECKING:
 class Notification(Base, UUIDMixin, TimestampMixin):
     """Notification model."""
 
+    __table_args__ = (
+        # Telegram outbox: due pending deliveries in claim order
+        Index(
+            "ix_notifications_telegram_pending",
+            "telegram_next_attempt_at",
+            postgresql_where=text("telegram_status = 'pending'"),
+        ),
+        # Unread counter reconciliation and mark-all-as-read
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            postgresql_where=text("is_read IS false"),
+        ),
+        # Retention scans oldest first
+        Index("ix_notifications_created_at", "created_at"),
+    )
+
     # Recipient
     user_id: Mapped[str] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
@@ -51,6 +69,19 @@ class Notification(Base, UUIDMixin, TimestampMixin):
         DateTime(timezone=True),
         nullable=True,
     )
+    telegram_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    telegram_attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    # Earliest next delivery attempt; also the lease of a claimed batch
+    telegram_next_attempt_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    telegram_error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     # Action URL (optional)
     action_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
@@ -59,7 +90,7 @@ class Notification(Base, UUIDMixin, TimestampMixin):
     user: Mapped["User"] = relationship(
         "User",
         back_populates="notifications",
-        lazy="joined",
+        lazy="raise",
     )
 
     def mark_as_read(self) -> None:
@@ -71,3 +102,57 @@ class Notification(Base, UUIDMixin, TimestampMixin):
     def __repr__(self) -> str:
         return f"<Notification {self.id}: {self.title}>"
 
+
+
+class NotificationCounter(Base):
+    """Per-user count of unread notifications."""
+
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    unread_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<NotificationCounter {self.user_id}: {self.unread_count}>"
+
+
+class ArchivedNotification(Base):
+    """Notification moved out of ``notifications`` by retention."""
+
+    __table_args__ = (
+        Index("ix_archived_notifications_user_created", "user_id", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True)
+    # No foreign key: the archive outlives deleted users
+    user_id: Mapped[str] = mapped_column(UUID(as_uuid=False), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    is_read: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    read_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    sent_via_telegram: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    telegram_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    action_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<ArchivedNotification {self.id}: {self.title}>"
@@ -6,7 +6,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.base import Base, TimestampMixin, UUIDMixin
@@ -20,6 +20,17 @@ if TYPE_CHECKING:
 class Payment(Base, UUIDMixin, TimestampMixin):
     """Payment model."""
 
+    __table_args__ = (
+        # Provider transaction IDs are unique per provider (statement import)
+        Index(
+            "uq_payments_method_external_id",
+            "method",
+            "external_id",
+            unique=True,
+            postgresql_where=text("external_id IS NOT NULL"),
+        ),
+    )
+
     # Relations
     user_id: Mapped[str] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
@@ -0,0 +1,99 @@
+"""
+Financial report rollups.
+
+Pre-aggregated tables behind the admin reports. Rows are adjusted by deltas
+in the same transaction as the payment or enrollment change, and can be
+rebuilt in bulk from the source tables.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.base import Base, UUIDMixin
+
+
+class PaymentDailyRollup(Base, UUIDMixin):
+    """Payment count and amount per local day, course, method and status."""
+
+    __tablename__ = "payment_daily_rollups"
+    __table_args__ = (
+        # One row per bucket; payments without enrollment have no course
+        Index(
+            "uq_payment_daily_rollups_bucket",
+            "day",
+            "course_id",
+            "method",
+            "status",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    # No foreign key: rows of deleted courses stay in the history
+    course_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False), nullable=True)
+    method: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    payments_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    amount_total: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2),
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<PaymentDailyRollup {self.day} {self.method}/{self.status}: {self.amount_total}>"
+
+
+class GroupBalance(Base):
+    """Per-group totals of debt-bearing enrollments."""
+
+    group_id: Mapped[str] = mapped_column(
+        ForeignKey("groups.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    enrollments_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    agreed_total: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2),
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    paid_total: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2),
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    debt_total: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2),
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<GroupBalance {self.group_id}: {self.debt_total}>"
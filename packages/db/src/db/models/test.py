@@ -5,7 +5,7 @@ Test/Exam models.
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional, Dict, Any
 
-from sqlalchemy import Boolean, Integer, String, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import Boolean, Index, Integer, String, Text, ForeignKey, DateTime, JSON, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.base import Base, TimestampMixin, UUIDMixin, SoftDeleteMixin
@@ -19,6 +19,15 @@ if TYPE_CHECKING:
 class Test(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     """Test/Exam model."""
 
+    __table_args__ = (
+        Index(
+            "ix_tests_course_id_not_deleted",
+            "course_id",
+            postgresql_include=["id"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+
     course_id: Mapped[Optional[str]] = mapped_column(
         ForeignKey("courses.id", ondelete="SET NULL"),
         nullable=True,
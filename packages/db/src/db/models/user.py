@@ -5,7 +5,7 @@ User model for authentication and authorization.
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional, List
 
-from sqlalchemy import Boolean, Date, String, BigInteger, Text
+from sqlalchemy import Boolean, Date, Index, String, BigInteger, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.base import Base, TimestampMixin, UUIDMixin, SoftDeleteMixin
@@ -21,6 +21,28 @@ if TYPE_CHECKING:
 class User(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     """User model."""
 
+    __table_args__ = (
+        # Partial indexes for hot-path lookups of live (not soft-deleted) users
+        Index(
+            "ix_users_phone_not_deleted",
+            "phone",
+            postgresql_include=["id"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_users_telegram_id_not_deleted",
+            "telegram_id",
+            postgresql_include=["id"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_users_role_not_deleted",
+            "role",
+            postgresql_include=["id"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+
     # Basic info
     phone: Mapped[str] = mapped_column(
         String(20),
@@ -86,10 +108,12 @@ class User(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
         foreign_keys="[Payment.user_id]",
         lazy="selectin",
     )
+    # Unbounded history: query through NotificationRepository instead
     notifications: Mapped[List["Notification"]] = relationship(
         "Notification",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
     test_results: Mapped[List["TestResult"]] = relationship(
         "TestResult",
@@ -0,0 +1,117 @@
+"""
+Monthly range partitioning of the notifications table.
+
+Shared by the optional ``notification_partitions`` migration and
+scripts/partition_notifications.py, which converts a database that is
+already past that revision without touching the migration history.
+Monthly partitions are named ``notifications_YYYY_MM``; the primary key
+becomes (id, created_at) because it must contain the partition key.
+"""
+
+from datetime import date, datetime, timezone
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+MONTHS_AHEAD = 3
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _months(first: date, last: date) -> List[date]:
+    months = []
+    month = first.replace(day=1)
+    while month <= last:
+        months.append(month)
+        month = _next_month(month)
+    return months
+
+
+def _create_constraints_and_indexes(connection: Connection, primary_key: str) -> None:
+    for statement in (
+        f"ALTER TABLE notifications ADD CONSTRAINT notifications_pkey PRIMARY KEY ({primary_key})",
+        "ALTER TABLE notifications ADD CONSTRAINT notifications_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE",
+        "CREATE INDEX ix_notifications_user_id ON notifications (user_id)",
+        "CREATE INDEX ix_notifications_created_at ON notifications (created_at)",
+        "CREATE INDEX ix_notifications_telegram_pending ON notifications "
+        "(telegram_next_attempt_at) WHERE telegram_status = 'pending'",
+        "CREATE INDEX ix_notifications_user_unread ON notifications (user_id) "
+        "WHERE is_read IS false",
+    ):
+        connection.execute(text(statement))
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether notifications is already range-partitioned."""
+    return bool(connection.scalar(text(
+        "SELECT count(*) FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'notifications'"
+    )))
+
+
+def partition_notifications(connection: Connection, months_ahead: int = MONTHS_AHEAD) -> bool:
+    """
+    Rewrite notifications as a table partitioned by month of created_at.
+
+    Partitions cover the oldest notification up to ``months_ahead`` months
+    from now, plus a default partition. Runs in the caller's transaction.
+
+    Args:
+        connection: Connection inside a transaction
+        months_ahead: Upcoming months to create partitions for
+
+    Returns:
+        False if the table was already partitioned
+    """
+    if is_partitioned(connection):
+        return False
+
+    now = datetime.now(timezone.utc).date()
+    oldest = connection.scalar(text("SELECT min(created_at) FROM notifications"))
+    first = oldest.astimezone(timezone.utc).date() if oldest else now
+    last = now
+    for _ in range(months_ahead):
+        last = _next_month(last)
+
+    connection.execute(text(
+        "CREATE TABLE notifications_partitioned (LIKE notifications INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    ))
+    for month in _months(first, last):
+        connection.execute(text(
+            f"CREATE TABLE notifications_{month:%Y_%m} PARTITION OF notifications_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{_next_month(month).isoformat()} 00:00:00+00')"
+        ))
+    connection.execute(text(
+        "CREATE TABLE notifications_default PARTITION OF notifications_partitioned DEFAULT"
+    ))
+
+    connection.execute(text("INSERT INTO notifications_partitioned SELECT * FROM notifications"))
+    connection.execute(text("DROP TABLE notifications"))
+    connection.execute(text("ALTER TABLE notifications_partitioned RENAME TO notifications"))
+    _create_constraints_and_indexes(connection, "id, created_at")
+    return True
+
+
+def unpartition_notifications(connection: Connection) -> bool:
+    """
+    Rewrite a partitioned notifications table back into a plain table.
+
+    Returns:
+        False if the table was not partitioned
+    """
+    if not is_partitioned(connection):
+        return False
+
+    connection.execute(text("CREATE TABLE notifications_plain (LIKE notifications INCLUDING DEFAULTS)"))
+    connection.execute(text("INSERT INTO notifications_plain SELECT * FROM notifications"))
+    connection.execute(text("DROP TABLE notifications CASCADE"))
+    connection.execute(text("ALTER TABLE notifications_plain RENAME TO notifications"))
+    _create_constraints_and_indexes(connection, "id")
+    return True
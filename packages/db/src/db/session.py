@@ -4,13 +4,18 @@ Database session management.
 Provides async session factory and dependency injection.
 """
 
-from typing import AsyncGenerator
+import asyncio
+import inspect
+from typing import Any, AsyncGenerator, Callable, Dict, Hashable, Optional, Set
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from shared import get_settings
@@ -73,3 +78,71 @@ async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
 
+
+_ON_COMMIT = "on_commit"
+_ON_COMMIT_HOOKED = "on_commit_hooked"
+_tasks: Set[asyncio.Task] = set()
+
+
+def _run_pending(session: Session) -> None:
+    callbacks: Dict[Hashable, Callable[[], Any]] = session.info.pop(_ON_COMMIT, {})
+    for callback in callbacks.values():
+        result = callback()
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            _tasks.add(task)
+            task.add_done_callback(_tasks.discard)
+
+
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_ON_COMMIT, None)
+
+
+def run_on_commit(
+    session: AsyncSession,
+    callback: Callable[[], Any],
+    key: Optional[Hashable] = None,
+) -> None:
+    """
+    Call ``callback`` once the session's transaction commits.
+
+    Callbacks run in the order they were added and are dropped if the
+    transaction rolls back. A callback returning an awaitable (e.g. a
+    coroutine function) is scheduled on the event loop. With ``key``, a
+    callback already pending under the same key is not added again.
+
+    Usage:
+        run_on_commit(session, partial(cache.invalidate, key))
+    """
+    sync_session = session.sync_session
+    if not sync_session.info.get(_ON_COMMIT_HOOKED):
+        event.listen(sync_session, "after_commit", _run_pending)
+        event.listen(sync_session, "after_rollback", _drop_pending)
+        sync_session.info[_ON_COMMIT_HOOKED] = True
+    pending = sync_session.info.setdefault(_ON_COMMIT, {})
+    pending.setdefault(object() if key is None else key, callback)
+
+
+class StatementCounter:
+    """
+    Count SQL statements sent to the database.
+
+    Usage:
+        with StatementCounter() as counter:
+            await service.get_teacher_today(teacher_id)
+        print(counter.count)
+    """
+
+    def __init__(self, bind: Optional[AsyncEngine] = None) -> None:
+        self.bind = bind or engine
+        self.count = 0
+
+    def _count(self, *_: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(self.bind.sync_engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        event.remove(self.bind.sync_engine, "before_cursor_execute", self._count)
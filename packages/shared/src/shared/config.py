@@ -4,6 +4,7 @@ Application configuration using Pydantic Settings.
 Centralized configuration management for all services.
 """
 
+from datetime import date
 from functools import lru_cache
 from typing import List
 
@@ -83,6 +84,9 @@ class Settings(BaseSettings):
     jwt_refresh_token_expire_days: int = Field(
         default=7, description="Refresh token expiry"
     )
+    jwt_stream_token_expire_seconds: int = Field(
+        default=60, description="Notification stream token expiry"
+    )
 
     # ===========================================
     # Telegram
@@ -93,6 +97,100 @@ class Settings(BaseSettings):
     telegram_admin_ids: List[int] = Field(
         default=[], description="Admin Telegram IDs"
     )
+    telegram_api_url: str = Field(
+        default="", description="Bot API server base URL (empty = api.telegram.org)"
+    )
+    telegram_rate_limit: float = Field(
+        default=30.0, description="Messages per second per sending process"
+    )
+    telegram_chat_rate_limit: float = Field(
+        default=1.0, description="Messages per second to one chat"
+    )
+    telegram_pool_size: int = Field(
+        default=20, description="Max open connections to the Bot API per process"
+    )
+    telegram_concurrency: int = Field(
+        default=10, description="Concurrent sends of send_many and the background queue"
+    )
+    telegram_queue_size: int = Field(
+        default=1000, description="Background sends buffered before new ones are dropped"
+    )
+    telegram_outbox_batch_size: int = Field(
+        default=100, description="Notifications claimed per outbox worker batch"
+    )
+    telegram_outbox_max_attempts: int = Field(
+        default=5, description="Delivery attempts before a notification is marked failed"
+    )
+
+    # ===========================================
+    # Bot
+    # ===========================================
+    bot_cache_backend: str = Field(
+        default="memory", description="Bot caches: memory (one bot process) or redis (redis_cache_url)"
+    )
+    bot_user_cache_ttl: int = Field(
+        default=60, description="Seconds a cached user snapshot is trusted"
+    )
+    bot_user_cache_size: int = Field(
+        default=10000, description="User snapshots kept in process memory"
+    )
+    bot_throttle_backend: str = Field(
+        default="memory", description="Throttling buckets: memory (one bot process) or redis (redis_url)"
+    )
+    bot_throttle_rate: float = Field(default=2.0, description="Updates per second per user")
+    bot_throttle_burst: float = Field(default=3.0, description="Burst of updates per user")
+    bot_chat_throttle_rate: float = Field(
+        default=10.0, description="Updates per second per group chat"
+    )
+    bot_chat_throttle_burst: float = Field(default=20.0, description="Burst of updates per group chat")
+    bot_catalog_ttl: int = Field(
+        default=300, description="Seconds the bot serves its course catalog before reloading"
+    )
+    bot_catalog_page_size: int = Field(default=8, description="Courses per catalog page in the bot")
+    bot_update_concurrency: int = Field(
+        default=32, description="Updates processed at the same time (each chat stays in order)"
+    )
+    bot_update_queue_size: int = Field(
+        default=1000, description="Updates queued before the bot stops accepting new ones"
+    )
+
+    # ===========================================
+    # Schedule
+    # ===========================================
+    schedule_holidays: List[date] = Field(
+        default=[],
+        description="Extra non-teaching dates, e.g. Ramazon/Qurbon hayit (YYYY-MM-DD, comma separated)",
+    )
+
+    # ===========================================
+    # Idempotency
+    # ===========================================
+    idempotency_backend: str = Field(
+        default="memory", description="Idempotency key store: memory or redis (redis_cache_url)"
+    )
+    idempotency_ttl: int = Field(
+        default=86400, description="Seconds a response is replayed for the same Idempotency-Key"
+    )
+
+    # ===========================================
+    # Notifications
+    # ===========================================
+    notification_broker: str = Field(
+        default="memory",
+        description="Real-time notification fan-out: memory (one API process) or redis (redis_url)",
+    )
+    notification_read_ttl_days: int = Field(
+        default=90, description="Days read notifications are kept (0 = forever)"
+    )
+    notification_unread_ttl_days: int = Field(
+        default=365, description="Days unread notifications are kept (0 = forever)"
+    )
+    notification_archive: bool = Field(
+        default=True, description="Move expired notifications to archived_notifications instead of deleting"
+    )
+    notification_retention_batch: int = Field(
+        default=5000, description="Notifications moved or deleted per retention transaction"
+    )
 
     # ===========================================
     # Logging
@@ -139,6 +237,14 @@ class Settings(BaseSettings):
             return [int(x.strip()) for x in v.split(",") if x.strip()]
         return v
 
+    @field_validator("schedule_holidays", mode="before")
+    @classmethod
+    def parse_schedule_holidays(cls, v: str | List[date]) -> List[date]:
+        """Parse holiday dates from string or list."""
+        if isinstance(v, str):
+            return [date.fromisoformat(x.strip()) for x in v.split(",") if x.strip()]
+        return v
+
     @property
     def is_production(self) -> bool:
         """Check if running in production."""
@@ -76,6 +76,15 @@ class PaymentStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class LedgerEntryType(str, Enum):
+    """Payment ledger entry type."""
+
+    PAYMENT = "payment"  # Payment confirmed (+)
+    REFUND = "refund"  # Confirmed payment refunded (-)
+    REVERSAL = "reversal"  # Confirmed payment cancelled (-)
+    ADJUSTMENT = "adjustment"  # Correction written by reconciliation (+/-)
+
+
 class PaymentMethod(str, Enum):
     """Payment methods."""
 
@@ -86,6 +95,29 @@ class PaymentMethod(str, Enum):
     BANK_TRANSFER = "bank_transfer"
 
 
+class StatementMismatchType(str, Enum):
+    """Reasons a provider statement row was not applied."""
+
+    INVALID_ROW = "invalid_row"
+    DUPLICATE = "duplicate"
+    NOT_FOUND = "not_found"
+    AMOUNT_MISMATCH = "amount_mismatch"
+    STATUS_MISMATCH = "status_mismatch"
+    METHOD_MISMATCH = "method_mismatch"
+    EXTERNAL_ID_CONFLICT = "external_id_conflict"
+    CHANGED_CONCURRENTLY = "changed_concurrently"
+
+
+class ReportDimension(str, Enum):
+    """Grouping of financial reports."""
+
+    DAY = "day"
+    MONTH = "month"
+    COURSE = "course"
+    METHOD = "method"
+    STATUS = "status"
+
+
 class NotificationType(str, Enum):
     """Notification types."""
 
@@ -96,6 +128,25 @@ class NotificationType(str, Enum):
     REMINDER = "reminder"
 
 
+class TelegramDeliveryStatus(str, Enum):
+    """Telegram delivery state of a notification (NULL = not requested)."""
+
+    PENDING = "pending"  # Waiting in the outbox
+    SENT = "sent"
+    FAILED = "failed"  # Gave up after retries or a permanent error
+    SKIPPED = "skipped"  # Recipient has no linked Telegram account
+
+
+class BroadcastAudience(str, Enum):
+    """Recipients of a notification broadcast."""
+
+    ALL = "all"  # Every active user
+    ROLE = "role"  # Active users with the given roles
+    COURSE = "course"  # Students enrolled in any group of a course
+    GROUP = "group"  # Students enrolled in a group
+    USERS = "users"  # Explicit user list
+
+
 class MessagePriority(IntEnum):
     """Message priority levels."""
 
@@ -136,12 +187,33 @@ class ScoringModel(str, Enum):
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
 
+# Enrollment statuses that occupy a seat (counted in groups.reserved_seats)
+SEAT_HOLDING_ENROLLMENT_STATUSES = (
+    EnrollmentStatus.PENDING.value,
+    EnrollmentStatus.ACTIVE.value,
+)
+
+# Enrollment statuses whose unpaid price counts as debt
+DEBT_BEARING_ENROLLMENT_STATUSES = (
+    EnrollmentStatus.PENDING.value,
+    EnrollmentStatus.ACTIVE.value,
+    EnrollmentStatus.COMPLETED.value,
+    EnrollmentStatus.SUSPENDED.value,
+)
+
+# Calendar day boundaries of financial reports
+REPORT_TIMEZONE = "Asia/Tashkent"
+
 # Cache TTL (seconds)
 CACHE_TTL_SHORT = 60  # 1 minute
 CACHE_TTL_MEDIUM = 300  # 5 minutes
 CACHE_TTL_LONG = 3600  # 1 hour
 CACHE_TTL_DAY = 86400  # 24 hours
 
+# Redis counter bumped by the API whenever a course changes; bot replicas
+# reload their cached course catalog when it moves
+CATALOG_VERSION_KEY = "bot:catalog:version"
+
 # Rate Limiting
 RATE_LIMIT_REQUESTS = 100
 RATE_LIMIT_WINDOW = 60  # seconds
@@ -152,6 +224,18 @@ ALLOWED_DOCUMENT_EXTENSIONS = {".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt",
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_DOCUMENT_SIZE = 10 * 1024 * 1024  # 10MB
 
+# Fixed-date public holidays (month, day) - no lessons are scheduled on them.
+# Movable holidays go to Settings.schedule_holidays.
+UZ_PUBLIC_HOLIDAYS = {
+    (1, 1),  # Yangi yil
+    (3, 8),  # Xalqaro xotin-qizlar kuni
+    (3, 21),  # Navro'z
+    (5, 9),  # Xotira va qadrlash kuni
+    (9, 1),  # Mustaqillik kuni
+    (10, 1),  # O'qituvchi va murabbiylar kuni
+    (12, 8),  # Konstitutsiya kuni
+}
+
 # Uzbek Phone Regex
 UZ_PHONE_REGEX = r"^\+998[0-9]{9}$"
 
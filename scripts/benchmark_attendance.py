@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Attendance marking benchmark.
+
+Compares the old per-student attendance loop (SELECT + flush + refresh for
+every student) with the bulk ``INSERT ... ON CONFLICT`` upsert used by
+``LessonService.mark_attendance``.
+
+Runs against the database from DATABASE_URL inside a single transaction that
+is rolled back at the end, so no data is left behind.
+
+Foydalanish:
+    python scripts/benchmark_attendance.py
+    python scripts/benchmark_attendance.py --groups 20 --students 30 --lessons 3
+"""
+
+import asyncio
+import sys
+import argparse
+import time
+from datetime import date, time as dt_time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "shared" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "db" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "apps" / "api"))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import AsyncSessionLocal, StatementCounter, engine
+from db.models import Attendance, Course, Group, Lesson, User
+from shared.constants import AttendanceStatus, UserRole
+from src.repositories.lesson_repository import LessonRepository
+
+
+async def seed(
+    session: AsyncSession,
+    groups: int,
+    students: int,
+    lessons: int,
+) -> tuple[list[str], list[str]]:
+    """Create throwaway course, groups, lessons and students."""
+    suffix = int(time.time() * 1000)
+    course = Course(name="Benchmark", slug=f"benchmark-{suffix}", price=Decimal(0))
+    session.add(course)
+    await session.flush()
+
+    student_ids = []
+    for i in range(students):
+        user = User(
+            phone=f"+99999{suffix % 10000:04d}{i:04d}",
+            first_name="Bench",
+            last_name=f"Student {i}",
+            role=UserRole.STUDENT.value,
+        )
+        session.add(user)
+        await session.flush()
+        student_ids.append(user.id)
+
+    lesson_ids = []
+    for g in range(groups):
+        group = Group(name=f"Bench {g}", course_id=course.id)
+        session.add(group)
+        await session.flush()
+        for n in range(lessons):
+            lesson = Lesson(
+                title=f"Lesson {n + 1}",
+                lesson_number=n + 1,
+                group_id=group.id,
+                date=date.today() + timedelta(days=n),
+                start_time=dt_time(9, 0),
+                end_time=dt_time(10, 30),
+            )
+            session.add(lesson)
+            await session.flush()
+            lesson_ids.append(lesson.id)
+
+    return lesson_ids, student_ids
+
+
+async def mark_per_student(
+    session: AsyncSession,
+    lesson_ids: list[str],
+    student_ids: list[str],
+    status: str,
+) -> None:
+    """Old implementation: one lookup and one flush per student."""
+    for lesson_id in lesson_ids:
+        for student_id in student_ids:
+            result = await session.execute(
+                select(Attendance).where(
+                    Attendance.lesson_id == lesson_id,
+                    Attendance.student_id == student_id,
+                )
+            )
+            existing = result.scalar_one_or_none()
+            if existing:
+                existing.status = status
+                await session.flush()
+                await session.refresh(existing)
+            else:
+                attendance = Attendance(
+                    lesson_id=lesson_id,
+                    student_id=student_id,
+                    status=status,
+                )
+                session.add(attendance)
+                await session.flush()
+                await session.refresh(attendance)
+
+
+async def mark_bulk(
+    session: AsyncSession,
+    lesson_ids: list[str],
+    student_ids: list[str],
+    status: str,
+) -> None:
+    """New implementation: one upsert for the whole submission."""
+    rows = [
+        {
+            "lesson_id": lesson_id,
+            "student_id": student_id,
+            "status": status,
+            "grade": None,
+            "homework_grade": None,
+            "notes": None,
+        }
+        for lesson_id in lesson_ids
+        for student_id in student_ids
+    ]
+    await LessonRepository(session).upsert_attendances(rows)
+
+
+async def run(groups: int, students: int, lessons: int) -> None:
+    """Run both implementations and print timings."""
+    async with AsyncSessionLocal() as session:
+        try:
+            lesson_ids, student_ids = await seed(session, groups, students, lessons)
+            rows = len(lesson_ids) * len(student_ids)
+            print(f"\n📋 {len(lesson_ids)} lessons x {len(student_ids)} students = {rows} rows")
+            print("-" * 80)
+
+            cases = [
+                ("per-student (insert)", mark_per_student, AttendanceStatus.PRESENT.value),
+                ("per-student (update)", mark_per_student, AttendanceStatus.LATE.value),
+            ]
+            for name, func, status in cases:
+                with StatementCounter() as counter:
+                    started = time.perf_counter()
+                    await func(session, lesson_ids, student_ids, status)
+                    elapsed = time.perf_counter() - started
+                print(f"   {name:24} | {elapsed * 1000:10.1f} ms | {counter.count:6} statements")
+
+            # Start the bulk run from the same state as the loop did
+            await session.rollback()
+            lesson_ids, student_ids = await seed(session, groups, students, lessons)
+
+            cases = [
+                ("bulk upsert (insert)", mark_bulk, AttendanceStatus.PRESENT.value),
+                ("bulk upsert (update)", mark_bulk, AttendanceStatus.LATE.value),
+            ]
+            for name, func, status in cases:
+                with StatementCounter() as counter:
+                    started = time.perf_counter()
+                    await func(session, lesson_ids, student_ids, status)
+                    elapsed = time.perf_counter() - started
+                print(f"   {name:24} | {elapsed * 1000:10.1f} ms | {counter.count:6} statements")
+            print()
+        finally:
+            await session.rollback()
+    await engine.dispose()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Attendance marking benchmark")
+    parser.add_argument("--groups", type=int, default=10, help="Number of groups")
+    parser.add_argument("--students", type=int, default=30, help="Students per group")
+    parser.add_argument("--lessons", type=int, default=1, help="Lessons per group")
+    args = parser.parse_args()
+
+    await run(args.groups, args.students, args.lessons)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
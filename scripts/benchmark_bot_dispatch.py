@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Bot update dispatch benchmark.
+
+Replays a burst of updates (like the one at a class start time) through
+``Dispatcher.feed_update`` in three ways and reports throughput, latency,
+how many chats saw their updates handled out of order and how many
+updates saw the wrong FSM state:
+
+    - sequential: one update at a time (polling with handle_as_tasks=False)
+    - tasks:      a task per update (aiogram's default, unbounded)
+    - ordered:    ``OrderedDispatchMiddleware`` (bounded, in order per chat)
+
+The handler only simulates I/O (``--io-ms``), so no database or Telegram
+is needed. Generated updates walk each chat through FSM states: the
+message "step N" expects state ``step:N`` (none for step 0) and moves the
+chat to ``step:N+1``, like a registration flow. Recorded updates can be
+replayed from a JSON-lines file with one raw Telegram update per line.
+
+Foydalanish:
+    python scripts/benchmark_bot_dispatch.py
+    python scripts/benchmark_bot_dispatch.py --chats 1000 --per-chat 5 --concurrency 64
+    python scripts/benchmark_bot_dispatch.py --updates updates.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "shared" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "db" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "apps" / "bot"))
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message, Update
+
+from src.middlewares.dispatch import OrderedDispatchMiddleware
+
+
+def generate_updates(chats: int, per_chat: int) -> List[dict]:
+    """Interleaved message updates: ``per_chat`` steps from each chat."""
+    steps = [(chat, step) for chat in range(chats) for step in range(per_chat)]
+    # Keep each chat's steps in order but interleave the chats randomly
+    random.seed(42)
+    random.shuffle(steps)
+    seen: Dict[int, int] = {}
+    updates = []
+    for update_id, (chat, _) in enumerate(steps, start=1):
+        seen[chat] = seen.get(chat, -1) + 1
+        chat_id = 100000 + chat
+        updates.append({
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "Talaba"},
+                "text": f"step {seen[chat]}",
+            },
+        })
+    return updates
+
+
+def load_updates(path: Path) -> List[dict]:
+    """Raw updates recorded one per line."""
+    with path.open() as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+STEP_RE = re.compile(r"step (\d+)")
+
+
+class Recorder:
+    """Handler that simulates I/O and records the order updates finish in."""
+
+    def __init__(self, io_seconds: float):
+        self.io_seconds = io_seconds
+        self.order: Dict[int, List[int]] = {}
+        self.fed: Dict[int, float] = {}
+        self.latencies: List[float] = []
+        self.wrong_state = 0
+
+    async def handle(
+        self,
+        event: Message | CallbackQuery,
+        update_id: int,
+        state: FSMContext,
+        raw_state: Optional[str],
+    ) -> None:
+        chat = event.chat.id if isinstance(event, Message) else event.from_user.id
+        match = STEP_RE.fullmatch(event.text or "") if isinstance(event, Message) else None
+        if match:
+            step = int(match.group(1))
+            # What a StateFilter of this step would have been matched against
+            if raw_state != (f"step:{step}" if step else None):
+                self.wrong_state += 1
+        # Jitter, so that unordered processing actually reorders
+        await asyncio.sleep(self.io_seconds * random.uniform(0.5, 1.5))
+        if match:
+            await state.set_state(f"step:{step + 1}")
+        self.order.setdefault(chat, []).append(update_id)
+        self.latencies.append(time.perf_counter() - self.fed[update_id])
+
+    def out_of_order(self) -> int:
+        return sum(ids != sorted(ids) for ids in self.order.values())
+
+
+def build_dispatcher(recorder: Recorder) -> Dispatcher:
+    router = Router()
+
+    @router.message()
+    async def on_message(
+        message: Message,
+        event_update: Update,
+        state: FSMContext,
+        raw_state: Optional[str],
+    ) -> None:
+        await recorder.handle(message, event_update.update_id, state, raw_state)
+
+    @router.callback_query()
+    async def on_callback(
+        callback: CallbackQuery,
+        event_update: Update,
+        state: FSMContext,
+        raw_state: Optional[str],
+    ) -> None:
+        await recorder.handle(callback, event_update.update_id, state, raw_state)
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+async def run(mode: str, raw_updates: List[dict], bot: Bot, args: argparse.Namespace) -> None:
+    recorder = Recorder(args.io_ms / 1000)
+    dp = build_dispatcher(recorder)
+    dispatch = None
+    if mode == "ordered":
+        dispatch = OrderedDispatchMiddleware(args.concurrency, args.queue_size)
+        dp.update.outer_middleware(dispatch)
+
+    updates = [Update.model_validate(raw, context={"bot": bot}) for raw in raw_updates]
+    started = time.perf_counter()
+    tasks = []
+    for update in updates:
+        recorder.fed[update.update_id] = time.perf_counter()
+        if mode == "tasks":
+            tasks.append(asyncio.create_task(dp.feed_update(bot, update)))
+        else:
+            await dp.feed_update(bot, update)
+    if tasks:
+        await asyncio.gather(*tasks)
+    if dispatch is not None:
+        await dispatch.join()
+        await dispatch.close()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(recorder.latencies)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    print(
+        f"{mode:<11} {elapsed:8.2f}s  {len(updates) / elapsed:8.0f} upd/s  "
+        f"p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  "
+        f"out of order: {recorder.out_of_order()} chats  "
+        f"wrong state: {recorder.wrong_state} updates"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bot update dispatch benchmark")
+    parser.add_argument("--updates", type=Path, help="JSON-lines file of recorded updates")
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument("--per-chat", type=int, default=8)
+    parser.add_argument("--io-ms", type=float, default=20.0, help="Simulated I/O per update")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args()
+
+    raw_updates = load_updates(args.updates) if args.updates else generate_updates(
+        args.chats, args.per_chat
+    )
+    print(f"{len(raw_updates)} updates, {args.io_ms:.0f} ms I/O each\n")
+
+    bot = Bot("123456:BENCHMARK")
+    try:
+        modes = ["tasks", "ordered"] if args.skip_sequential else ["sequential", "tasks", "ordered"]
+        for mode in modes:
+            await run(mode, raw_updates, bot, args)
+    finally:
+        await bot.session.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
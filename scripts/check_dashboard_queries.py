@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Teacher dashboard query-count check.
+
+Seeds a teacher with 1, 10 and 50 groups (each with a lesson today, enrolled
+students and attendance) and verifies ``DashboardService.get_teacher_today``
+sends the same number of SQL statements for every size.
+
+Runs against the database from DATABASE_URL inside a single transaction that
+is rolled back at the end, so no data is left behind.
+
+Foydalanish:
+    python scripts/check_dashboard_queries.py
+    python scripts/check_dashboard_queries.py --sizes 1 20 100 --students 15
+"""
+
+import asyncio
+import sys
+import argparse
+import time
+from datetime import date, time as dt_time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "shared" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "db" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "apps" / "api"))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import AsyncSessionLocal, StatementCounter, engine
+from db.models import Attendance, Course, Enrollment, Group, Lesson, User
+from shared.constants import AttendanceStatus, EnrollmentStatus, UserRole
+from src.repositories.lesson_repository import LessonRepository
+from src.services.dashboard_service import DashboardService, clear_dashboard_cache
+
+
+async def seed(session: AsyncSession, groups: int, students: int) -> str:
+    """Create a teacher with `groups` groups, each with a lesson today."""
+    suffix = int(time.time() * 1000)
+    teacher = User(
+        phone=f"+99977{suffix % 10000:04d}0000",
+        first_name="Bench",
+        last_name="Teacher",
+        role=UserRole.TEACHER.value,
+    )
+    course = Course(name="Dashboard", slug=f"dashboard-{suffix}", price=Decimal(0))
+    session.add_all([teacher, course])
+    await session.flush()
+
+    pupils = [
+        User(
+            phone=f"+99976{suffix % 10000:04d}{i:04d}",
+            first_name="Bench",
+            last_name=f"Student {i}",
+            role=UserRole.STUDENT.value,
+        )
+        for i in range(students)
+    ]
+    session.add_all(pupils)
+    await session.flush()
+
+    for g in range(groups):
+        group = Group(
+            name=f"Dashboard {g}",
+            course_id=course.id,
+            teacher_id=teacher.id,
+            reserved_seats=students,
+        )
+        session.add(group)
+        await session.flush()
+        lesson = Lesson(
+            title="Lesson 1",
+            lesson_number=1,
+            group_id=group.id,
+            date=date.today(),
+            start_time=dt_time(9, 0),
+            end_time=dt_time(10, 30),
+        )
+        session.add(lesson)
+        await session.flush()
+        for pupil in pupils:
+            session.add(Enrollment(
+                student_id=pupil.id,
+                group_id=group.id,
+                enrolled_at=date.today(),
+                agreed_price=Decimal(0),
+                status=EnrollmentStatus.ACTIVE.value,
+            ))
+            session.add(Attendance(
+                lesson_id=lesson.id,
+                student_id=pupil.id,
+                status=AttendanceStatus.PRESENT.value,
+            ))
+        await session.flush()
+
+    return teacher.id
+
+
+async def run(sizes: list[int], students: int) -> bool:
+    """Measure statements per dashboard for each size."""
+    counts = []
+    async with AsyncSessionLocal() as session:
+        try:
+            service = DashboardService(LessonRepository(session))
+            print()
+            for size in sizes:
+                teacher_id = await seed(session, size, students)
+                clear_dashboard_cache()
+                with StatementCounter() as counter:
+                    dashboard = await service.get_teacher_today(teacher_id)
+                counts.append(counter.count)
+                print(
+                    f"   {size:4} groups | {dashboard.total_lessons:4} lessons | "
+                    f"{counter.count} statements"
+                )
+        finally:
+            await session.rollback()
+    await engine.dispose()
+
+    ok = len(set(counts)) == 1
+    print("✅ O(1) queries\n" if ok else "❌ Query count grows with group count\n")
+    return ok
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Teacher dashboard query-count check")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50], help="Group counts")
+    parser.add_argument("--students", type=int, default=10, help="Students per group")
+    args = parser.parse_args()
+
+    if not await run(args.sizes, args.students):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Provider statement import benchmark.
+
+Seeds N pending Payme payments, builds a matching CSV statement in memory
+(with a few amount mismatches, cancellations and unknown transactions) and
+times ``StatementService.import_statement`` on it.
+
+Runs against the database from DATABASE_URL inside a single transaction that
+is rolled back at the end, so no data is left behind.
+
+Foydalanish:
+    python scripts/check_statement_import.py
+    python scripts/check_statement_import.py --rows 100000 --limit 60
+"""
+
+import asyncio
+import sys
+import argparse
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "shared" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "db" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "apps" / "api"))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import AsyncSessionLocal, engine
+from db.models import Payment, User
+from shared.constants import PaymentMethod, PaymentStatus, UserRole
+from src.repositories.ledger_repository import LedgerRepository
+from src.repositories.payment_repository import PaymentRepository
+from src.repositories.report_repository import ReportRepository
+from src.services.statement_service import StatementService
+
+SEED_CHUNK = 2000
+
+
+async def seed(session: AsyncSession, rows: int, prefix: str) -> None:
+    """Create a student with `rows` pending Payme payments."""
+    student = User(
+        phone=f"+99975{int(time.time()) % 10**7:07d}",
+        first_name="Bench",
+        last_name="Payer",
+        role=UserRole.STUDENT.value,
+    )
+    session.add(student)
+    await session.flush()
+
+    for start in range(0, rows, SEED_CHUNK):
+        await session.execute(
+            insert(Payment).values([
+                {
+                    "user_id": student.id,
+                    "amount": Decimal(100000),
+                    "method": PaymentMethod.PAYME.value,
+                    "status": PaymentStatus.PENDING.value,
+                    "transaction_id": f"{prefix}-{i}",
+                }
+                for i in range(start, min(start + SEED_CHUNK, rows))
+            ])
+        )
+
+
+def build_statement(rows: int, prefix: str) -> bytes:
+    """CSV statement for the seeded payments (amounts in sum)."""
+    stamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+    lines = ["id,order_id,amount,state,perform_time"]
+    for i in range(rows):
+        amount = 99000 if i % 1000 == 0 else 100000
+        state = -1 if i % 50 == 0 else 2
+        lines.append(f"{prefix}-px-{i},{prefix}-{i},{amount},{state},{stamp}")
+    for i in range(rows // 1000):
+        lines.append(f"{prefix}-unknown-{i},,100000,2,{stamp}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def chunks(data: bytes, size: int = 64 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def run(rows: int, limit: float) -> bool:
+    """Seed, import and report the timing."""
+    prefix = f"bench{int(time.time())}"
+    async with AsyncSessionLocal() as session:
+        try:
+            print(f"\n🌱 Seeding {rows} pending payments...")
+            await seed(session, rows, prefix)
+            data = build_statement(rows, prefix)
+
+            service = StatementService(
+                PaymentRepository(session),
+                LedgerRepository(session),
+                ReportRepository(session),
+            )
+            started = time.monotonic()
+            result = await service.import_statement(PaymentMethod.PAYME, chunks(data), "csv")
+            elapsed = time.monotonic() - started
+        finally:
+            await session.rollback()
+    await engine.dispose()
+
+    print(
+        f"   rows: {result.total_rows} | confirmed: {result.confirmed} | "
+        f"cancelled: {result.cancelled} | mismatches: {result.mismatch_count}"
+    )
+    print(f"   {dict(Counter(m.type for m in result.mismatches))}")
+    ok = elapsed < limit
+    print(f"{'✅' if ok else '❌'} Imported in {elapsed:.1f}s (limit {limit:.0f}s)\n")
+    return ok
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Provider statement import benchmark")
+    parser.add_argument("--rows", type=int, default=100_000, help="Statement rows")
+    parser.add_argument("--limit", type=float, default=60, help="Time limit in seconds")
+    args = parser.parse_args()
+
+    if not await run(args.rows, args.limit):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Fake Telegram Bot API server for load tests.
+
+Answers the Bot API methods the bot and the API use (sendMessage,
+editMessageText, answerCallbackQuery, setWebhook, deleteWebhook, getMe,
+getUpdates) without talking to Telegram. Latency and 429 "Too Many
+Requests" answers can be injected to see how senders cope.
+
+Point the bot or the API at it with TELEGRAM_API_URL, e.g.
+TELEGRAM_API_URL=http://localhost:8089. scripts/load_test_bot.py starts
+it in-process.
+
+Foydalanish:
+    python scripts/fake_telegram_api.py
+    python scripts/fake_telegram_api.py --port 8089 --latency-ms 50 --retry-after-rate 0.01
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+
+class FakeBotAPI:
+    """In-memory Bot API stand-in."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        retry_after_rate: float = 0.0,
+        retry_after: int = 1,
+    ):
+        """
+        Args:
+            latency_ms: Delay added to every call
+            jitter_ms: Random extra delay (uniform 0..jitter_ms)
+            retry_after_rate: Share of send calls answered with 429
+            retry_after: ``retry_after`` seconds of injected 429 answers
+        """
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.retry_after_rate = retry_after_rate
+        self.retry_after = retry_after
+        self.calls: Counter = Counter()
+        self.throttled: Counter = Counter()
+        self.message_id = 0
+        self._runner: Optional[web.AppRunner] = None
+
+        self.methods = {
+            "getme": self._get_me,
+            "getupdates": self._get_updates,
+            "sendmessage": self._send_message,
+            "editmessagetext": self._edit_message_text,
+            "answercallbackquery": self._true,
+            "setwebhook": self._true,
+            "deletewebhook": self._true,
+        }
+
+    def app(self) -> web.Application:
+        """aiohttp application serving ``/bot{token}/{method}``."""
+        app = web.Application()
+        app.router.add_route("*", "/bot{token}/{method}", self._handle)
+        app.router.add_get("/stats", self._stats)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8089) -> None:
+        """Serve in the running event loop."""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"].lower()
+        params: Dict[str, Any] = dict(await request.post())
+        if not params and request.can_read_body:
+            params = await request.json()
+        self.calls[method] += 1
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if method in {"sendmessage", "editmessagetext"} and random.random() < self.retry_after_rate:
+            self.throttled[method] += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {self.retry_after}",
+                    "parameters": {"retry_after": self.retry_after},
+                },
+                status=429,
+            )
+
+        result = await self.methods.get(method, self._true)(params)
+        return web.json_response({"ok": True, "result": result})
+
+    async def _stats(self, _request: web.Request) -> web.Response:
+        return web.json_response({"calls": self.calls, "throttled": self.throttled})
+
+    async def _true(self, _params: Dict[str, Any]) -> Any:
+        return True
+
+    async def _get_me(self, _params: Dict[str, Any]) -> Any:
+        return {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"}
+
+    async def _get_updates(self, params: Dict[str, Any]) -> Any:
+        # Long polling that never receives anything
+        await asyncio.sleep(min(float(params.get("timeout") or 0), 10.0))
+        return []
+
+    def _message(self, params: Dict[str, Any], message_id: Optional[int] = None) -> Dict[str, Any]:
+        if message_id is None:
+            self.message_id += 1
+            message_id = self.message_id
+        return {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": int(params.get("chat_id") or 0), "type": "private"},
+            "from": {"id": 1, "is_bot": True, "first_name": "Fake"},
+            "text": params.get("text", ""),
+        }
+
+    async def _send_message(self, params: Dict[str, Any]) -> Any:
+        return self._message(params)
+
+    async def _edit_message_text(self, params: Dict[str, Any]) -> Any:
+        return self._message(params, int(params.get("message_id") or 0))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--retry-after-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    api = FakeBotAPI(args.latency_ms, args.jitter_ms, args.retry_after_rate, args.retry_after)
+    await api.start(args.host, args.port)
+    print(f"✅ Fake Bot API: http://{args.host}:{args.port} (stats: /stats)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Bot load test.
+
+Runs the real dispatcher, middlewares and handlers against the fake Bot
+API (scripts/fake_telegram_api.py) and the database from DATABASE_URL.
+Virtual users arrive at a steady rate and each one goes through:
+
+    /start -> registration (phone, names, password, role, confirm)
+           -> profile, courses, a course card, contact
+
+Reports per step the handler latency (p50/p99, queue wait excluded) and
+SQL statements per update, plus queue wait and failures, so that a
+regression in handlers/ shows up as a number.
+
+Virtual users get telegram_id from --id-base upwards and are deleted at
+the end (unless --keep).
+
+Foydalanish:
+    python scripts/load_test_bot.py
+    python scripts/load_test_bot.py --users 500 --rate 100 --latency-ms 40
+    python scripts/load_test_bot.py --retry-after-rate 0.02
+"""
+
+import argparse
+import asyncio
+import contextvars
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "shared" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "db" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "apps" / "bot"))
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.enums import ParseMode
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import TelegramObject, Update
+from sqlalchemy import delete, event
+
+from db.models import User
+from db.session import AsyncSessionLocal, engine
+from src.handlers import register_all_handlers
+from src.keyboards.student import catalog_callback
+from src.middlewares import register_all_middlewares
+from src.services.course_catalog import CatalogSnapshot, get_course_catalog
+
+from fake_telegram_api import FakeBotAPI
+
+
+_queries: contextvars.ContextVar = contextvars.ContextVar("load_test_queries", default=None)
+
+
+def _count_query(*_: Any) -> None:
+    counter = _queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class UpdateProbe(BaseMiddleware):
+    """Time each update's processing and count its SQL statements."""
+
+    def __init__(self, labels: Dict[int, str]):
+        self.labels = labels
+        self.samples: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        counter = [0]
+        token = _queries.set(counter)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            label = self.labels.get(getattr(event, "update_id", 0), "other")
+            self.samples[label].append((time.perf_counter() - started, counter[0]))
+            _queries.reset(token)
+
+
+class Scenario:
+    """Builds the updates of one virtual user."""
+
+    def __init__(self, telegram_id: int, index: int, catalog: Optional[CatalogSnapshot] = None):
+        self.telegram_id = telegram_id
+        self.phone = f"+99877{index:07d}"
+        self.message_id = 0
+        # Card of the first course (page 0 if there are no courses)
+        self.course_data = catalog_callback("", "p", "0")
+        if catalog is not None:
+            course_id = next(iter(catalog.cards), None)
+            self.course_data = (
+                catalog_callback(catalog.stamp, "c", course_id)
+                if course_id
+                else catalog_callback(catalog.stamp, "p", "0")
+            )
+
+    def _base(self) -> Dict[str, Any]:
+        self.message_id += 1
+        return {
+            "message_id": self.message_id,
+            "date": int(time.time()),
+            "chat": {"id": self.telegram_id, "type": "private"},
+            "from": {"id": self.telegram_id, "is_bot": False, "first_name": "Yuklama"},
+        }
+
+    def text(self, text: str) -> Dict[str, Any]:
+        return {"message": {**self._base(), "text": text}}
+
+    def contact(self) -> Dict[str, Any]:
+        return {
+            "message": {
+                **self._base(),
+                "contact": {
+                    "phone_number": self.phone,
+                    "first_name": "Yuklama",
+                    "user_id": self.telegram_id,
+                },
+            }
+        }
+
+    def callback(self, data: str) -> Dict[str, Any]:
+        message = self._base()
+        return {
+            "callback_query": {
+                "id": f"{self.telegram_id}-{self.message_id}",
+                "from": message["from"],
+                "chat_instance": str(self.telegram_id),
+                "message": {**message, "text": "📚 Mavjud kurslar"},
+                "data": data,
+            }
+        }
+
+    def steps(self) -> List[Tuple[str, Dict[str, Any]]]:
+        return [
+            ("start", self.text("/start")),
+            ("register", self.text("📝 Ro'yxatdan o'tish")),
+            ("phone", self.contact()),
+            ("first_name", self.text("Yuklama")),
+            ("last_name", self.text("Testov")),
+            ("password", self.text("parol123")),
+            ("role", self.text("👨‍🎓 O'quvchi")),
+            ("confirm", self.text("✅ Tasdiqlash")),
+            ("profile", self.text("👤 Mening profilim")),
+            ("courses", self.text("📚 Kurslar")),
+            ("course", self.callback(self.course_data)),
+            ("contact", self.text("📞 Bog'lanish")),
+        ]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_user(
+    index: int,
+    args: argparse.Namespace,
+    dp: Dispatcher,
+    bot: Bot,
+    labels: Dict[int, str],
+    update_ids: List[int],
+    catalog: CatalogSnapshot,
+) -> None:
+    scenario = Scenario(args.id_base + index, index, catalog)
+    for label, payload in scenario.steps():
+        update_ids[0] += 1
+        labels[update_ids[0]] = label
+        update = Update.model_validate(
+            {"update_id": update_ids[0], **payload}, context={"bot": bot}
+        )
+        await dp.feed_update(bot, update)
+        await asyncio.sleep(args.step_interval)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bot load test")
+    parser.add_argument("--users", type=int, default=200, help="Virtual users")
+    parser.add_argument("--rate", type=float, default=50.0, help="Target updates per second")
+    parser.add_argument("--step-interval", type=float, default=1.0, help="Seconds between a user's steps")
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="Fake Bot API latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--retry-after-rate", type=float, default=0.0, help="Share of 429 answers")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--id-base", type=int, default=7_000_000_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the virtual users")
+    args = parser.parse_args()
+
+    api = FakeBotAPI(args.latency_ms, args.jitter_ms, args.retry_after_rate)
+    await api.start(port=args.port)
+    bot = Bot(
+        token="123456:LOADTEST",
+        session=AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{args.port}")),
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+
+    labels: Dict[int, str] = {}
+    dp = Dispatcher(storage=MemoryStorage())
+    dispatch = register_all_middlewares(dp)
+    probe = UpdateProbe(labels)
+    # Registered after the dispatcher, so it runs in its workers
+    dp.update.outer_middleware(probe)
+    register_all_handlers(dp)
+    async with AsyncSessionLocal() as session:
+        # Stamp and course ids of the catalog the bot will answer from
+        catalog = await get_course_catalog().get(session)
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_query)
+
+    steps = len(Scenario(0, 0).steps())
+    user_interval = steps / args.rate
+    update_ids = [0]
+    print(
+        f"{args.users} users x {steps} updates, ~{args.rate:.0f} updates/s, "
+        f"Bot API latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms\n"
+    )
+
+    started = time.perf_counter()
+    try:
+        users = []
+        for index in range(1, args.users + 1):
+            users.append(asyncio.create_task(run_user(index, args, dp, bot, labels, update_ids, catalog)))
+            await asyncio.sleep(user_interval)
+        await asyncio.gather(*users)
+        await dispatch.join()
+        elapsed = time.perf_counter() - started
+
+        print(f"{'step':<12} {'updates':>8} {'p50 ms':>9} {'p99 ms':>9} {'queries':>8}")
+        all_samples = []
+        for label in [label for label, _ in Scenario(0, 0).steps()] + ["other"]:
+            samples = probe.samples.get(label)
+            if not samples:
+                continue
+            all_samples += samples
+            latencies = [latency * 1000 for latency, _ in samples]
+            queries = sum(count for _, count in samples) / len(samples)
+            print(
+                f"{label:<12} {len(samples):>8} {_percentile(latencies, 0.5):>9.1f} "
+                f"{_percentile(latencies, 0.99):>9.1f} {queries:>8.1f}"
+            )
+        latencies = [latency * 1000 for latency, _ in all_samples]
+        metrics = dispatch.metrics()
+        print(
+            f"\n✅ {len(all_samples)} updates in {elapsed:.1f}s "
+            f"({len(all_samples) / elapsed:.0f}/s), failed: {metrics['failed']}\n"
+            f"   handler p50 {_percentile(latencies, 0.5):.1f} ms, "
+            f"p99 {_percentile(latencies, 0.99):.1f} ms, "
+            f"queries/update {sum(q for _, q in all_samples) / len(all_samples):.2f}\n"
+            f"   queue wait p95 {metrics['wait_p95_ms']} ms\n"
+            f"   Bot API calls: {dict(api.calls)}, 429s: {sum(api.throttled.values())}"
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _count_query)
+        await dp.emit_shutdown()
+        if not args.keep:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    delete(User).where(
+                        User.telegram_id.between(args.id_base, args.id_base + args.users)
+                    )
+                )
+                await session.commit()
+        await bot.session.close()
+        await api.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
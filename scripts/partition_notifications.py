@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Notification partitioning.
+
+Converts the notifications table to monthly range partitions in a single
+transaction. Unlike the optional ``notification_partitions`` migration, this
+works on a database at any revision: nothing is downgraded, so later
+migrations stay applied. Does nothing if the table is already partitioned.
+
+The whole table is rewritten and locked while it runs; schedule a
+maintenance window.
+
+Foydalanish:
+    python scripts/partition_notifications.py
+    python scripts/partition_notifications.py --months-ahead 6
+    python scripts/partition_notifications.py --undo
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "shared" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "db" / "src"))
+
+from db.partitioning import MONTHS_AHEAD, partition_notifications, unpartition_notifications
+from db.session import engine
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Partition notifications by month")
+    parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD, help="Upcoming partitions to create")
+    parser.add_argument("--undo", action="store_true", help="Convert back to a plain table")
+    args = parser.parse_args()
+
+    async with engine.begin() as connection:
+        if args.undo:
+            changed = await connection.run_sync(unpartition_notifications)
+        else:
+            changed = await connection.run_sync(partition_notifications, args.months_ahead)
+    await engine.dispose()
+
+    if not changed:
+        print("ℹ️  notifications: nothing to do")
+    elif args.undo:
+        print("✅ notifications: converted to a plain table")
+    else:
+        print("✅ notifications: partitioned by month")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
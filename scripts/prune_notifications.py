@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Notification retention.
+
+Removes notifications older than their TTL in small transactions, so the
+notifications table stays a bounded working set:
+
+    - read notifications older than NOTIFICATION_READ_TTL_DAYS
+    - unread notifications older than NOTIFICATION_UNREAD_TTL_DAYS
+
+With NOTIFICATION_ARCHIVE=true the rows are moved to archived_notifications.
+Unread counters are decremented in the same statement.
+
+If the table is partitioned (``make db-partition-notifications``), upcoming
+monthly partitions are created first and whole expired months are dropped
+instead of being deleted row by row.
+
+Foydalanish:
+    python scripts/prune_notifications.py
+    python scripts/prune_notifications.py --batch-size 1000 --max-batches 50
+
+Cron orqali (har kuni tunda):
+    30 3 * * * cd /home/ubuntu/uzbek-talim && .venv/bin/python scripts/prune_notifications.py
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "shared" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "db" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "apps" / "api"))
+
+from db.session import AsyncSessionLocal, engine
+from shared import get_settings
+from src.repositories.notification_repository import NotificationRepository, next_month
+
+
+async def manage_partitions(session, read_before, unread_before, months_ahead: int, archive: bool):
+    repo = NotificationRepository(session)
+    if not await repo.is_partitioned():
+        return
+
+    today = datetime.now(timezone.utc).date()
+    created = await repo.create_partitions(today, months_ahead + 1)
+    await session.commit()
+    for name in created:
+        print(f"✅ {name}: created")
+
+    # A whole month can go only once both kinds of notifications in it expired
+    if read_before is None or unread_before is None:
+        return
+    cutoff = min(read_before, unread_before).date()
+    for name, month in await repo.get_partitions():
+        if next_month(month) > cutoff:
+            break
+        await repo.drop_partition(name, archive=archive)
+        await session.commit()
+        print(f"✅ {name}: dropped")
+
+
+async def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Prune expired notifications")
+    parser.add_argument("--batch-size", type=int, default=settings.notification_retention_batch)
+    parser.add_argument("--max-batches", type=int, default=0, help="0 = until done")
+    parser.add_argument("--months-ahead", type=int, default=3, help="Partitions to keep ready")
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    read_ttl = settings.notification_read_ttl_days
+    unread_ttl = settings.notification_unread_ttl_days
+    read_before = now - timedelta(days=read_ttl) if read_ttl else None
+    unread_before = now - timedelta(days=unread_ttl) if unread_ttl else None
+    archive = settings.notification_archive
+
+    async with AsyncSessionLocal() as session:
+        await manage_partitions(session, read_before, unread_before, args.months_ahead, archive)
+
+        repo = NotificationRepository(session)
+        total = batches = 0
+        while not args.max_batches or batches < args.max_batches:
+            removed = await repo.purge_expired(read_before, unread_before, args.batch_size, archive)
+            await session.commit()
+            total += removed
+            batches += 1
+            if removed < args.batch_size:
+                break
+        action = "archived" if archive else "deleted"
+        print(f"✅ notifications: {total} {action}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)
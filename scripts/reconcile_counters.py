@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Denormalized counter reconciliation.
+
+Recomputes maintained counters from their source tables in bulk and fixes
+any drift (e.g. after manual SQL edits or a failed deploy):
+
+    - groups.reserved_seats   <- count of pending/active enrollments
+    - ledger_entries          <- adjustment entries where a payment's ledger
+                                 net differs from its status
+    - enrollments.paid_amount, user_balances.paid_total <- ledger sums
+    - payment_daily_rollups, group_balances <- rebuilt from payments and
+                                               enrollments
+    - notification_counters   <- count of unread notifications
+
+Foydalanish:
+    python scripts/reconcile_counters.py
+
+Cron orqali (har kuni tunda):
+    0 3 * * * cd /home/ubuntu/uzbek-talim && .venv/bin/python scripts/reconcile_counters.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "shared" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "packages" / "db" / "src"))
+sys.path.insert(0, str(ROOT_DIR / "apps" / "api"))
+
+from db.session import AsyncSessionLocal, engine
+from src.repositories.group_repository import GroupRepository
+from src.repositories.ledger_repository import LedgerRepository
+from src.repositories.notification_repository import NotificationRepository
+from src.repositories.report_repository import ReportRepository
+
+
+async def main():
+    async with AsyncSessionLocal() as session:
+        fixed = await GroupRepository(session).reconcile_reserved_seats()
+        await session.commit()
+        print(f"✅ groups.reserved_seats: {fixed} corrected")
+
+        ledger = await LedgerRepository(session).reconcile()
+        await session.commit()
+        for name, count in ledger.items():
+            print(f"✅ {name}: {count}")
+
+        rollups = await ReportRepository(session).rebuild()
+        await session.commit()
+        for name, count in rollups.items():
+            print(f"✅ {name}: {count} rows rebuilt")
+
+        fixed = await NotificationRepository(session).reconcile_unread_counters()
+        await session.commit()
+        print(f"✅ notification_counters: {fixed} corrected")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled by user")
+        sys.exit(1)